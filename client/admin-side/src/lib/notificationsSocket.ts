@@ -10,6 +10,7 @@
  *   { type: 'notification_created', notification: {...} }
  *   { type: 'notification_updated', notification: {...} }
  *   { type: 'unread_count', count: number }
+ *   { type: 'import_progress', importId, status, progress, errorMessage }
  */
 
 import { API_BASE_URL } from '@/config/api';
@@ -21,6 +22,16 @@ export interface NotificationsSocketHandlers {
   onCreated?: (notification: unknown) => void;
   /** Called when the server pushes an update to an existing notification. */
   onUpdated?: (notification: unknown) => void;
+  /** Called with live progress of a result-PDF import this admin uploaded. */
+  onImportProgress?: (event: ImportProgressEvent) => void;
+}
+
+export interface ImportProgressEvent {
+  importId: string;
+  status: 'processing' | 'completed' | 'failed';
+  /** { stage: parse|persist|sync|analytics|done, done?, total?, matched? } */
+  progress: { stage: string; done?: number; total?: number; matched?: number };
+  errorMessage: string;
 }
 
 export interface NotificationsSocket {
@@ -107,6 +118,9 @@ export function connectNotificationsSocket(
         case 'notification_updated':
           handlers.onUpdated?.(data.notification);
           break;
+        case 'import_progress':
+          handlers.onImportProgress?.(data as unknown as ImportProgressEvent);
+          break;
         default:
           break;
       }
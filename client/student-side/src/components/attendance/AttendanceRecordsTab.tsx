@@ -683,7 +683,7 @@ export function AttendanceRecordsTab() {
                             <p className="text-[10px] text-muted-foreground">Roll: {student.roll}</p>
                           </td>
                           {register.dates.map(d => {
-                            const cell = student.cells[d];
+                            const cell = student.cells?.[d];
                             const style = cell ? CELL_STYLES[cell] : null;
                             return (
                               <td key={d} className="p-1 text-center">
@@ -147,7 +147,10 @@ export interface AttendanceRegister {
     student_id: string;
     name: string;
     roll: string;
-    cells: Record<string, 'present' | 'absent'>;
+    /** Omitted with `layout: 'compact'`. */
+    cells?: Record<string, 'present' | 'absent'>;
+    /** `layout: 'compact'` only: one 'P' / 'A' / '-' per entry of `dates`. */
+    marks?: string;
     present: number;
     absent: number;
     total: number;
@@ -404,10 +407,46 @@ export const attendanceService = {
     session?: string;
     date_from?: string;
     date_to?: string;
+    layout?: 'compact';
   }): Promise<AttendanceRegister> => {
     return await apiClient.get<AttendanceRegister>('attendance/attendance_register/', filters);
   },
 
+  /**
+   * Download the attendance register as CSV or Excel (streamed by the server)
+   */
+  downloadAttendanceRegister: async (
+    filters: {
+      department: string;
+      semester: number | string;
+      shift: string;
+      subject_code: string;
+      session?: string;
+      date_from?: string;
+      date_to?: string;
+    },
+    format: 'csv' | 'xlsx',
+  ): Promise<Blob> => {
+    const { API_BASE_URL } = await import('@/config/api');
+    const query = new URLSearchParams({ export: format });
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value !== undefined && value !== '') query.set(key, String(value));
+    });
+    const response = await fetch(`${API_BASE_URL}/attendance/attendance_register/?${query}`, {
+      method: 'GET',
+      credentials: 'include',
+    });
+
+    if (!response.ok) {
+      if (response.status === 401) {
+        throw new Error('Authentication required. Please log in.');
+      }
+      throw new Error('Failed to download attendance register');
+    }
+
+    return await response.blob();
+  },
+
   /**
    * Get aggregated analytics for the logged-in teacher's classes
    */
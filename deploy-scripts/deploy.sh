@@ -475,6 +475,12 @@ GOOGLE_OAUTH_CLIENT_ID=${GOOGLE_OAUTH_CLIENT_ID:-}
 VAPID_PUBLIC_KEY=${VAPID_PUBLIC_KEY:-}
 VAPID_PRIVATE_KEY=${VAPID_PRIVATE_KEY:-}
 VAPID_SUBJECT=${VAPID_SUBJECT:-mailto:${CONTACT_EMAIL:-admin@${STUDENT_DOMAIN:-spisg.gov.bd}}}
+
+# --- File delivery -------------------------------------------------------------
+# SecureFileView authorises every /files/ request, then nginx sends the bytes
+# (and answers Range requests) from the internal /protected-files/ location.
+FILE_DELIVERY_MODE=x-accel
+FILE_ACCEL_REDIRECT_PREFIX=/protected-files/
 EOF
 
   chown "${RUN_AS_USER}:${RUN_AS_USER}" "${env_file}"
@@ -508,6 +514,9 @@ setup_backend() {
     #  - profile-photo documents must be public so <img> tags can load them.
     "${PYBIN}" manage.py seed_document_templates
     "${PYBIN}" manage.py publish_profile_photos
+    #  - storage stats / orphan cleanup read the stored-file catalog; only
+    #    new or changed files are hashed, so re-runs are cheap.
+    "${PYBIN}" manage.py sync_file_catalog
   )
 
   # Optional superuser (all three secrets set + user absent).
@@ -656,6 +665,10 @@ Environment=PYTHONUNBUFFERED=1
 #      of who created it — this survives even without a restart.
 # So `sudo systemctl restart sipi` (or ./deploy.sh --restart) always heals it.
 ExecStartPre=+/bin/sh -c 'mkdir -p ${SERVER_DIR}/storage ${SERVER_DIR}/media && chown -R ${RUN_AS_USER}:${RUN_AS_USER} ${SERVER_DIR}/storage ${SERVER_DIR}/media && chmod -R u+rwX,g+rX,o-rwx ${SERVER_DIR}/storage ${SERVER_DIR}/media && (command -v setfacl >/dev/null 2>&1 && setfacl -R -m u:${RUN_AS_USER}:rX -m d:u:${RUN_AS_USER}:rX ${SERVER_DIR}/storage ${SERVER_DIR}/media || true)'
+# Resume background jobs (emails, pushes, result imports) a previous process
+# left queued or half-done. Bounded so a backlog can never block startup; the
+# '-' prefix keeps a drain failure from preventing the server from starting.
+ExecStartPre=-${VENV_DIR}/bin/python ${SERVER_DIR}/manage.py drain_jobs --max-seconds 120
 ExecStart=${VENV_DIR}/bin/gunicorn -c ${GUNICORN_CONF} slms_core.asgi:application
 # SIGHUP = graceful reload (finish in-flight requests, then swap workers).
 ExecReload=/bin/kill -s HUP \$MAINPID
@@ -694,6 +707,11 @@ setup_timers() {
   RUN_AS_USER="${RUN_AS_USER}" bash "${SCRIPT_DIR}/purge-timer.sh" \
     && ok "deletion-purge timer installed (sipi-purge.timer)" \
     || warn "purge timer install failed — run deploy-scripts/purge-timer.sh manually"
+
+  # Nightly reconciliation of the stored-file catalog with storage/.
+  RUN_AS_USER="${RUN_AS_USER}" bash "${SCRIPT_DIR}/file-catalog-timer.sh" \
+    && ok "file-catalog timer installed (sipi-file-catalog.timer)" \
+    || warn "file-catalog timer install failed — run deploy-scripts/file-catalog-timer.sh manually"
 }
 
 # ===========================================================================
@@ -883,6 +901,14 @@ nginx_app_locations() {
         proxy_pass http://${BACKEND_BIND};
         include ${NGINX_ROOT}/snippets/sipi-proxy.conf;
     }
+    # Only reachable through X-Accel-Redirect: once SecureFileView has
+    # authorised a /files/ request it hands the transfer (ranges included)
+    # to nginx, so app workers never stream document bytes.
+    location /protected-files/ {
+        internal;
+        alias ${SERVER_DIR}/storage/;
+        include ${NGINX_ROOT}/snippets/sipi-security-headers.conf;
+    }
 
     # --- SPA assets: content-hashed filenames -> cache forever ---------------
     location /assets/ {
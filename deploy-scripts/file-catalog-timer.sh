@@ -0,0 +1,95 @@
+#!/usr/bin/env bash
+# ---------------------------------------------------------------------------
+# file-catalog-timer.sh — install a nightly systemd timer that reconciles the
+# stored-file catalog (documents.StoredFile) with the storage directories.
+#
+# Storage statistics and orphan cleanup read the catalog instead of walking
+# storage/. Uploads and deletes keep it current by themselves; this timer
+# runs `manage.py sync_file_catalog` once a night to pick up changes made
+# behind the app's back (restores, rsync, manual edits). Unchanged files are
+# only stat'ed, never re-read. The same run then trims the document
+# thumbnails back under DOCUMENT_THUMBNAIL_CACHE_MAX_MB (prune_thumbnails).
+#
+# Usage (on the server, as root):
+#   sudo ./file-catalog-timer.sh                 # install + enable the nightly timer
+#   sudo ./file-catalog-timer.sh --uninstall     # remove the timer
+#
+# One-off manual run (no timer needed):
+#   cd server && ./venv/bin/python manage.py sync_file_catalog
+#   cd server && ./venv/bin/python manage.py sync_file_catalog --rehash
+#   cd server && ./venv/bin/python manage.py prune_thumbnails
+#
+# Mirrors the sipi-purge.timer pattern in purge-timer.sh.
+# ---------------------------------------------------------------------------
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_PATH="$(cd "${SCRIPT_DIR}/.." && pwd)"
+SERVER_DIR="${PROJECT_PATH}/server"
+VENV_DIR="${SERVER_DIR}/venv"
+PYBIN="${VENV_DIR}/bin/python"
+
+# Run as the same unprivileged user that owns the app (override with
+# RUN_AS_USER=... if your deploy uses a different account).
+RUN_AS_USER="${RUN_AS_USER:-www-data}"
+# Nightly at 04:15 by default; override with FILE_CATALOG_SCHEDULE (systemd OnCalendar).
+FILE_CATALOG_SCHEDULE="${FILE_CATALOG_SCHEDULE:-*-*-* 04:15:00}"
+SYSTEMD_DIR="${SYSTEMD_DIR:-/etc/systemd/system}"
+
+require_root() { [[ "${EUID}" -eq 0 ]] || { echo "Run as root (sudo)."; exit 1; }; }
+
+uninstall() {
+  require_root
+  systemctl disable --now sipi-file-catalog.timer 2>/dev/null || true
+  rm -f "${SYSTEMD_DIR}/sipi-file-catalog.timer" "${SYSTEMD_DIR}/sipi-file-catalog.service"
+  systemctl daemon-reload
+  echo "sipi-file-catalog timer removed."
+}
+
+install() {
+  require_root
+  [[ -x "${PYBIN}" ]] || { echo "Missing venv python at ${PYBIN}"; exit 1; }
+
+  cat > "${SYSTEMD_DIR}/sipi-file-catalog.service" <<EOF
+# GENERATED by file-catalog-timer.sh
+[Unit]
+Description=SIPI — reconcile the stored-file catalog with storage/
+After=network-online.target postgresql.service
+Wants=network-online.target
+
+[Service]
+Type=oneshot
+User=${RUN_AS_USER}
+WorkingDirectory=${SERVER_DIR}
+Environment=PYTHONUNBUFFERED=1
+ExecStart=${PYBIN} manage.py sync_file_catalog
+ExecStart=${PYBIN} manage.py prune_thumbnails
+Nice=10
+IOSchedulingClass=idle
+TimeoutStartSec=2h
+EOF
+
+  cat > "${SYSTEMD_DIR}/sipi-file-catalog.timer" <<EOF
+# GENERATED by file-catalog-timer.sh
+[Unit]
+Description=Reconcile the SIPI stored-file catalog nightly
+
+[Timer]
+OnCalendar=${FILE_CATALOG_SCHEDULE}
+RandomizedDelaySec=300
+Persistent=true
+
+[Install]
+WantedBy=timers.target
+EOF
+
+  systemctl daemon-reload
+  systemctl enable --now sipi-file-catalog.timer
+  echo "Nightly file-catalog timer installed: ${FILE_CATALOG_SCHEDULE}"
+  systemctl list-timers sipi-file-catalog.timer --no-pager || true
+}
+
+case "${1:-}" in
+  --uninstall) uninstall ;;
+  *)           install ;;
+esac
@@ -0,0 +1,141 @@
+"""
+In-memory, batched writer for request audit entries.
+
+ActivityLogMiddleware hands each entry to `activity_log_buffer` instead of
+INSERTing it inside the response path. A daemon flusher thread writes the
+buffer with one `bulk_create` whenever it reaches ACTIVITY_LOG_BUFFER_SIZE
+entries or every ACTIVITY_LOG_FLUSH_SECONDS, and whatever is left is flushed
+at interpreter shutdown.
+
+Memory is bounded: while the database is unreachable at most
+ACTIVITY_LOG_MAX_PENDING entries are held and further entries are dropped
+(and counted) rather than growing without limit. With buffering disabled
+(ACTIVITY_LOG_ASYNC = False, as under the test runner) entries are written
+synchronously, exactly as before.
+
+An entry's timestamp is fixed when it is buffered, so a row written seconds
+later by the flusher still records when the request happened.
+"""
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 200
+DEFAULT_FLUSH_SECONDS = 2.0
+DEFAULT_MAX_PENDING = 10000
+
+
+class ActivityLogBuffer:
+    def __init__(self, batch_size=None, flush_interval=None, max_pending=None):
+        self.batch_size = batch_size or getattr(settings, 'ACTIVITY_LOG_BUFFER_SIZE', DEFAULT_BUFFER_SIZE)
+        self.flush_interval = flush_interval or getattr(settings, 'ACTIVITY_LOG_FLUSH_SECONDS', DEFAULT_FLUSH_SECONDS)
+        self.max_pending = max_pending or getattr(settings, 'ACTIVITY_LOG_MAX_PENDING', DEFAULT_MAX_PENDING)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._entries = []
+        self._thread = None
+        self._counters = {'buffered': 0, 'written': 0, 'dropped': 0, 'sync_writes': 0}
+
+    def enabled(self):
+        return getattr(settings, 'ACTIVITY_LOG_ASYNC', True)
+
+    def add(self, entry):
+        """
+        Queue an unsaved ActivityLog. Returns False when the entry was dropped.
+        Falls back to a synchronous INSERT when buffering is disabled or the
+        flusher thread cannot be started.
+        """
+        if entry.timestamp is None:
+            entry.timestamp = timezone.now()
+        if not self.enabled() or not self._ensure_thread():
+            return self._write_now(entry)
+
+        with self._lock:
+            if len(self._entries) >= self.max_pending:
+                self._counters['dropped'] += 1
+                return False
+            self._entries.append(entry)
+            self._counters['buffered'] += 1
+            full = len(self._entries) >= self.batch_size
+        if full:
+            self._wake.set()
+        return True
+
+    def flush(self):
+        """Write everything buffered so far. Returns the number of rows written."""
+        from .models import ActivityLog
+
+        with self._flush_lock:
+            with self._lock:
+                batch, self._entries = self._entries, []
+            if not batch:
+                return 0
+            try:
+                ActivityLog.objects.bulk_create(batch, batch_size=self.batch_size)
+                written = len(batch)
+            except Exception as exc:  # noqa: BLE001
+                # One bad row (e.g. a user deleted meanwhile) must not lose the
+                # whole batch: retry row by row and count what still fails.
+                logger.warning("Activity log batch insert failed (%s rows), retrying singly: %s", len(batch), exc)
+                written = sum(1 for entry in batch if self._write_now(entry, count=False))
+            with self._lock:
+                self._counters['written'] += written
+                self._counters['dropped'] += len(batch) - written
+            return written
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, 'pending': len(self._entries)}
+
+    def _write_now(self, entry, count=True):
+        try:
+            entry.save(force_insert=True)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Activity log write failed: %s", exc)
+            if count:
+                with self._lock:
+                    self._counters['dropped'] += 1
+            return False
+        if count:
+            with self._lock:
+                self._counters['sync_writes'] += 1
+        return True
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            try:
+                self._thread = threading.Thread(
+                    target=self._run, name='activity-log-flusher', daemon=True,
+                )
+                self._thread.start()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Activity log flusher could not start: %s", exc)
+                self._thread = None
+                return False
+        return True
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001 - keep the flusher alive
+                logger.exception("Activity log flush failed")
+            finally:
+                close_old_connections()
+
+
+activity_log_buffer = ActivityLogBuffer()
+atexit.register(activity_log_buffer.flush)
@@ -5,6 +5,7 @@ from threading import local
 from typing import Any
 import uuid
 
+from .buffer import activity_log_buffer
 from .models import ActivityLog
 
 _thread_locals = local()
@@ -276,7 +277,8 @@ class ActivityLogMiddleware:
                         f"{actor_user.username} performed {action_type} on "
                         f"{entity_type} via {request.method.upper()} {request.path}"
                     )
-                    ActivityLog.objects.create(
+                    # Buffered: written in batches off the response path.
+                    activity_log_buffer.add(ActivityLog(
                         user=actor_user,
                         action_type=action_type,
                         entity_type=entity_type,
@@ -290,7 +292,7 @@ class ActivityLogMiddleware:
                         },
                         ip_address=get_client_ip(request),
                         user_agent=request.META.get('HTTP_USER_AGENT'),
-                    )
+                    ))
         except Exception:
             # Activity logging should never break user-facing API responses.
             pass
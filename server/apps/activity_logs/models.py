@@ -2,6 +2,7 @@
 Activity Log Models
 """
 from django.db import models
+from django.utils import timezone
 import uuid
 
 
@@ -43,8 +44,9 @@ class ActivityLog(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(null=True, blank=True)
     
-    # Timestamp
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Timestamp: when the action happened. Not auto_now_add, which would
+    # stamp buffered entries (buffer.py) with their flush time instead.
+    timestamp = models.DateTimeField(default=timezone.now)
     
     class Meta:
         db_table = 'activity_logs'
@@ -1,7 +1,7 @@
 """
 Tests for Activity Logs app
 """
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -12,6 +12,7 @@ from apps.authentication.models import User
 from apps.students.models import Student
 from apps.departments.models import Department
 from .models import ActivityLog
+from .buffer import ActivityLogBuffer
 from .middleware import ActivityLogMiddleware
 
 
@@ -199,3 +200,67 @@ class ActivityLogMiddlewareTest(TestCase):
         self.assertEqual(log.entity_type, 'Admission')
         self.assertEqual(log.entity_id, admission_id)
         self.assertEqual(log.user, self.user)
+
+
+@override_settings(ACTIVITY_LOG_ASYNC=True)
+class ActivityLogBufferTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='buffer_user',
+            email='buffer@example.com',
+            password='testpass123',
+            role='registrar'
+        )
+
+    def _entry(self, n):
+        return ActivityLog(
+            user=self.user, action_type='create', entity_type='Student',
+            entity_id=str(n), description=f'entry {n}'
+        )
+
+    def test_entries_are_written_in_one_batch_on_flush(self):
+        buffer = ActivityLogBuffer(batch_size=50, flush_interval=60, max_pending=100)
+        for n in range(3):
+            self.assertTrue(buffer.add(self._entry(n)))
+        self.assertEqual(ActivityLog.objects.count(), 0)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(ActivityLog.objects.count(), 3)
+        self.assertEqual(buffer.stats()['written'], 3)
+
+    def test_flushed_rows_keep_the_time_they_were_buffered(self):
+        from datetime import timedelta
+        from unittest import mock
+
+        from django.utils import timezone
+
+        buffer = ActivityLogBuffer(batch_size=50, flush_interval=60, max_pending=100)
+        buffered_at = timezone.now() - timedelta(minutes=5)
+        stamped = self._entry(1)
+        stamped.timestamp = buffered_at
+        buffer.add(stamped)
+        unstamped = self._entry(2)
+        unstamped.timestamp = None
+        with mock.patch('apps.activity_logs.buffer.timezone.now', return_value=buffered_at):
+            buffer.add(unstamped)
+
+        buffer.flush()
+        stamps = dict(ActivityLog.objects.values_list('entity_id', 'timestamp'))
+        self.assertEqual(stamps, {'1': buffered_at, '2': buffered_at})
+
+    def test_entries_beyond_max_pending_are_dropped(self):
+        buffer = ActivityLogBuffer(batch_size=50, flush_interval=60, max_pending=2)
+        results = [buffer.add(self._entry(n)) for n in range(3)]
+        self.assertEqual(results, [True, True, False])
+        stats = buffer.stats()
+        self.assertEqual(stats['buffered'], 2)
+        self.assertEqual(stats['dropped'], 1)
+        self.assertEqual(stats['pending'], 2)
+
+    @override_settings(ACTIVITY_LOG_ASYNC=False)
+    def test_disabled_buffer_writes_synchronously(self):
+        buffer = ActivityLogBuffer(batch_size=50, flush_interval=60, max_pending=100)
+        buffer.add(self._entry(1))
+        self.assertEqual(ActivityLog.objects.count(), 1)
+        self.assertEqual(buffer.stats()['sync_writes'], 1)
@@ -1799,7 +1799,7 @@ class AlumniViewSet(viewsets.ModelViewSet):
         except Document.DoesNotExist:
             return Response({'error': 'Document not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        structured_storage.delete_file(document.filePath)
+        structured_storage.delete_file(document.filePath, document.fileHash)
         document.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
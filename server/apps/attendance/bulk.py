@@ -0,0 +1,250 @@
+"""
+Set-based upsert behind AttendanceViewSet.bulk_create.
+
+A class submission (one routine, one date, a few dozen students) used to
+cost a user lookup, up to three existence lookups and a save per row, plus
+a refresh per record. `upsert_records` resolves everything up front:
+
+- recorders: one query (User.in_bulk)
+- students: one existence query, so a bad row is reported on its own
+  instead of failing the batch
+- existing rows: one query over (students x dates), matched in memory with
+  the same precedence as before — routine identity first, then the legacy
+  row without a routine; subject identity when no routine is given
+- writes: one bulk_create and one bulk_update in a transaction, together
+  with the matching AttendanceCounter deltas (counters.py), then one
+  select_related read for the response/notifications
+- badges: bulk writes skip post_save, so the sidebar badges of the
+  students (and teachers) the written records belong to are invalidated
+  once the transaction commits
+
+If the set-based write hits an IntegrityError (a concurrent submission
+created the same row, or a database still on the legacy uniqueness), the
+batch is rolled back and replayed row by row with the original
+lookup/create logic, which relinks legacy rows and reports failures per row.
+"""
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from .counters import apply_changes, state
+from .models import AttendanceRecord
+
+logger = logging.getLogger(__name__)
+
+# Fields a re-submission overwrites on an existing record (class_routine
+# only when the submission names one).
+_COPIED_FIELDS = [
+    'subject_name', 'semester', 'is_present', 'attendance_type', 'status',
+    'notes', 'recorded_by',
+]
+UPDATE_FIELDS = _COPIED_FIELDS + ['class_routine']
+
+_REQUIRED = ('student_id', 'subject_code', 'subject_name', 'semester', 'date')
+
+
+def row_error(record_data, exc):
+    """The per-row error entry reported back to the client."""
+    return {
+        'student': str(record_data.get('student', '')),
+        'error': str(exc) if settings.DEBUG else 'Failed to save record',
+    }
+
+
+def _apply(record, data):
+    for field in _COPIED_FIELDS:
+        setattr(record, field, data[field])
+    if 'class_routine_id' in data:
+        record.class_routine_id = data['class_routine_id']
+
+
+def _normalize(data):
+    """Coerce the lookup fields to their Python types (ValidationError on bad input)."""
+    from apps.authentication.models import User
+
+    meta = AttendanceRecord._meta
+    data['student_id'] = meta.get_field('student').target_field.to_python(data['student_id'])
+    data['date'] = meta.get_field('date').to_python(data['date'])
+    data['semester'] = meta.get_field('semester').to_python(data['semester'])
+    for field in _REQUIRED:
+        if data[field] is None:
+            raise ValueError(f'{field} is required')
+    if data['recorded_by']:
+        data['recorded_by'] = User._meta.pk.to_python(data['recorded_by'])
+
+
+class _ExistingIndex:
+    """In-memory version of the three existence lookups bulk_create used."""
+
+    def __init__(self):
+        self.by_routine = {}
+        self.by_legacy = {}
+        self.by_subject = {}
+
+    def add(self, record, newest=False):
+        # Rows arrive in model ordering (-date, -recorded_at), so the first
+        # one seen per key is what `.first()` returned; a record created in
+        # this batch is the newest and takes over its subject key.
+        subject_key = (record.student_id, record.subject_code, record.date)
+        if record.class_routine_id:
+            self.by_routine.setdefault((record.student_id, record.class_routine_id, record.date), record)
+            if self.by_legacy.get(subject_key) is record:
+                del self.by_legacy[subject_key]  # relinked to a routine
+        else:
+            self.by_legacy.setdefault(subject_key, record)
+        if newest:
+            self.by_subject[subject_key] = record
+        else:
+            self.by_subject.setdefault(subject_key, record)
+
+    def match(self, data):
+        subject_key = (data['student_id'], data['subject_code'], data['date'])
+        if data.get('class_routine_id'):
+            # Prefer routine-scoped identity to avoid cross-class overwrites;
+            # only relink legacy rows that have no routine set.
+            return (
+                self.by_routine.get((data['student_id'], data['class_routine_id'], data['date']))
+                or self.by_legacy.get(subject_key)
+            )
+        return self.by_subject.get(subject_key)
+
+
+def upsert_records(items, *, default_recorder=None):
+    """
+    Create or update one attendance record per item.
+
+    `items` is a list of (raw record data, processed data) pairs; processed
+    data carries the model field values plus ``recorded_by`` as a raw user
+    id (or None) and an optional ``class_routine_id``. Unknown recorders fall
+    back to `default_recorder`. Returns (records in item order, row errors).
+    """
+    from apps.authentication.models import User
+    from apps.students.models import Student
+
+    errors = []
+    valid = []
+    for record_data, data in items:
+        try:
+            _normalize(data)
+        except Exception as e:
+            logger.warning("Bulk attendance: invalid record for student %s: %s",
+                           record_data.get('student'), e)
+            errors.append(row_error(record_data, e))
+            continue
+        valid.append((record_data, data))
+    if not valid:
+        return [], errors
+
+    recorders = User.objects.in_bulk({data['recorded_by'] for _, data in valid if data['recorded_by']})
+    student_ids = {data['student_id'] for _, data in valid}
+    known_students = set(Student.objects.filter(pk__in=student_ids).values_list('pk', flat=True))
+
+    index = _ExistingIndex()
+    old_states = {}
+    for record in AttendanceRecord.objects.filter(
+        student_id__in=student_ids, date__in={data['date'] for _, data in valid},
+    ):
+        index.add(record)
+        old_states[record.pk] = state(record)
+
+    records, rows = [], []
+    to_create, to_update = [], {}
+    for record_data, data in valid:
+        if data['student_id'] not in known_students:
+            errors.append(row_error(record_data, ValueError(f"Student not found: {data['student_id']}")))
+            continue
+        data['recorded_by'] = recorders.get(data['recorded_by'], default_recorder)
+        record = index.match(data)
+        if record is None:
+            record = AttendanceRecord(**data)
+            to_create.append(record)
+        else:
+            _apply(record, data)
+            if not record._state.adding:
+                to_update[record.pk] = record
+        index.add(record, newest=True)
+        records.append(record)
+        rows.append((record_data, data))
+
+    try:
+        with transaction.atomic():
+            AttendanceRecord.objects.bulk_create(to_create)
+            AttendanceRecord.objects.bulk_update(list(to_update.values()), UPDATE_FIELDS)
+            apply_changes(
+                [(None, state(record)) for record in to_create]
+                + [(old_states[pk], state(record)) for pk, record in to_update.items()]
+            )
+        written = to_create + list(to_update.values())
+        transaction.on_commit(lambda: _invalidate_badges(written))
+    except IntegrityError as e:
+        logger.warning("Bulk attendance upsert conflicted (%s); saving row by row", e)
+        records = []
+        for record_data, data in rows:
+            try:
+                with transaction.atomic():
+                    records.append(_save_one(data))
+            except Exception as exc:
+                logger.exception("Bulk attendance: error saving record for student %s",
+                                 record_data.get('student'))
+                errors.append(row_error(record_data, exc))
+
+    fetched = AttendanceRecord.objects.select_related(
+        'student', 'recorded_by', 'approved_by', 'class_routine',
+    ).in_bulk([record.pk for record in records])
+    return [fetched[record.pk] for record in records], errors
+
+
+def _invalidate_badges(records):
+    """bulk_create/bulk_update bypass post_save, so bump the badges of the
+    students (and today's teachers) these records belong to."""
+    try:
+        from apps.notifications.badges import invalidate_instances
+
+        invalidate_instances('attendance.AttendanceRecord', records)
+    except Exception:
+        logger.exception('Badge invalidation after bulk attendance failed')
+
+
+def _save_one(data):
+    """Row-at-a-time upsert: the fallback when the set-based write conflicts."""
+    if data.get('class_routine_id'):
+        existing = AttendanceRecord.objects.filter(
+            student_id=data['student_id'],
+            class_routine_id=data['class_routine_id'],
+            date=data['date'],
+        ).first()
+        # Backward-compat fallback for databases still on old uniqueness.
+        # Only relink legacy rows that have no routine set.
+        if not existing:
+            existing = AttendanceRecord.objects.filter(
+                student_id=data['student_id'],
+                subject_code=data['subject_code'],
+                date=data['date'],
+                class_routine__isnull=True,
+            ).first()
+    else:
+        existing = AttendanceRecord.objects.filter(
+            student_id=data['student_id'],
+            subject_code=data['subject_code'],
+            date=data['date'],
+        ).first()
+
+    if existing is None:
+        # Create new record (fallback to update if legacy unique constraint conflicts)
+        try:
+            with transaction.atomic():
+                return AttendanceRecord.objects.create(**data)
+        except IntegrityError:
+            existing = AttendanceRecord.objects.filter(
+                student_id=data['student_id'],
+                subject_code=data['subject_code'],
+                date=data['date'],
+                class_routine__isnull=True,
+            ).first()
+            if not existing:
+                raise
+
+    _apply(existing, data)
+    existing.save()
+    return existing
@@ -0,0 +1,145 @@
+"""
+Running attendance counters (AttendanceCounter).
+
+Every change to an AttendanceRecord is reduced to a before/after *state* —
+``(student_id, semester, subject_code, subject_name, is_present)`` when the
+record counts toward the profile, None when it does not (draft, pending,
+rejected, or no subject) — and `apply_changes` turns a batch of such pairs
+into per-(student, semester, subject) deltas written with F() expressions,
+so concurrent submissions never lose an increment.
+
+Who reports changes:
+
+- signals.py for records saved one at a time (single create/update,
+  approval, the bulk fallback path) and for deletes (API, Django admin,
+  queryset deletes), inside the delete's transaction. A student's own
+  delete is skipped: its counters cascade with it;
+- bulk.upsert_records for its bulk_create/bulk_update.
+
+Anything that bypasses these (raw SQL, queryset.update()) is repaired by
+`manage.py sync_attendance --rebuild-counters`.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+
+from .models import AttendanceCounter, AttendanceRecord
+
+logger = logging.getLogger(__name__)
+
+
+def state(record):
+    """The record's contribution to the counters, or None if it has none."""
+    from .sync import SYNC_STATUSES
+
+    if record.status not in SYNC_STATUSES or not record.subject_code:
+        return None
+    return (
+        record.student_id, record.semester, record.subject_code,
+        record.subject_name, bool(record.is_present),
+    )
+
+
+def apply_changes(changes):
+    """
+    Apply (old state, new state) pairs to the counters.
+
+    Returns the (student_id, semester) pairs whose counters moved, i.e. the
+    profiles that need re-syncing.
+    """
+    deltas = {}
+    for old, new in changes:
+        if old == new:
+            continue
+        for current, sign in ((old, -1), (new, 1)):
+            if current is None:
+                continue
+            delta = deltas.setdefault(current[:3], [0, 0, ''])
+            delta[0] += sign
+            delta[1] += sign if current[4] else 0
+            if sign > 0 and current[3]:
+                delta[2] = current[3]
+    deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1] or delta[2]}
+    if not deltas:
+        return set()
+
+    with transaction.atomic():
+        AttendanceCounter.objects.bulk_create(
+            [
+                AttendanceCounter(
+                    student_id=student_id, semester=semester,
+                    subject_code=code, subject_name=delta[2],
+                )
+                for (student_id, semester, code), delta in deltas.items()
+            ],
+            ignore_conflicts=True,
+        )
+        counters = AttendanceCounter.objects.filter(
+            student_id__in={key[0] for key in deltas},
+            semester__in={key[1] for key in deltas},
+            subject_code__in={key[2] for key in deltas},
+        )
+        changed = []
+        for counter in counters:
+            delta = deltas.get((counter.student_id, counter.semester, counter.subject_code))
+            if delta is None:
+                continue
+            counter.total = F('total') + delta[0]
+            counter.present = F('present') + delta[1]
+            if delta[2]:
+                counter.subject_name = delta[2]
+            changed.append(counter)
+        AttendanceCounter.objects.bulk_update(changed, ['total', 'present', 'subject_name'])
+    return {key[:2] for key in deltas}
+
+
+def counts_for(pairs):
+    """{(student_id, semester): [counter, ...]} for the given pairs, in one query."""
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    result = {pair: [] for pair in pairs}
+    for counter in AttendanceCounter.objects.filter(
+        student_id__in={student_id for student_id, _ in pairs},
+        semester__in={semester for _, semester in pairs},
+    ):
+        bucket = result.get((counter.student_id, counter.semester))
+        if bucket is not None:
+            bucket.append(counter)
+    return result
+
+
+@transaction.atomic
+def rebuild_counters(student_ids=None):
+    """Recompute counters from AttendanceRecord (all students, or these).
+    Returns the number of counter rows written."""
+    from .sync import SYNC_STATUSES
+
+    records = AttendanceRecord.objects.filter(status__in=SYNC_STATUSES).exclude(subject_code='')
+    counters = AttendanceCounter.objects.all()
+    if student_ids is not None:
+        records = records.filter(student_id__in=student_ids)
+        counters = counters.filter(student_id__in=student_ids)
+    counters.delete()
+    rows = (
+        records.values('student_id', 'semester', 'subject_code')
+        .annotate(
+            total=Count('id'),
+            present=Count('id', filter=Q(is_present=True)),
+            name=Max('subject_name'),
+        )
+        .order_by()
+    )
+    created = AttendanceCounter.objects.bulk_create(
+        [
+            AttendanceCounter(
+                student_id=row['student_id'], semester=row['semester'],
+                subject_code=row['subject_code'], subject_name=row['name'] or '',
+                present=row['present'], total=row['total'],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+    return len(created)
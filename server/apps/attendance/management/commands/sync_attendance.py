@@ -5,13 +5,20 @@ Only touches departments where autoAttendanceSync is enabled (or the one
 passed with --department, which can be combined with --force to sync a
 department regardless of its toggle — useful for one-off backfills).
 
+Profiles are regenerated from the running AttendanceCounter rows;
+--rebuild-counters first recomputes those from the attendance records
+(repairs drift after writes that bypass them: raw SQL and
+queryset.update()).
+
 Usage:
     python manage.py sync_attendance
     python manage.py sync_attendance --department <uuid>
     python manage.py sync_attendance --department <uuid> --force
+    python manage.py sync_attendance --rebuild-counters
 """
 from django.core.management.base import BaseCommand
 
+from apps.attendance.counters import rebuild_counters
 from apps.attendance.sync import sync_student_attendance
 from apps.departments.models import Department
 from apps.students.models import Student
@@ -26,6 +33,10 @@ class Command(BaseCommand):
             '--force', action='store_true',
             help='Sync even when the department toggle is off (requires --department)',
         )
+        parser.add_argument(
+            '--rebuild-counters', action='store_true',
+            help='Recompute attendance counters from records before syncing',
+        )
 
     def handle(self, *args, **options):
         departments = Department.objects.all()
@@ -37,6 +48,16 @@ class Command(BaseCommand):
             self.stderr.write('--force requires --department')
             return
 
+        if options['rebuild_counters']:
+            student_ids = None
+            if options['department']:
+                student_ids = list(
+                    Student.objects.filter(department_id=options['department'])
+                    .values_list('id', flat=True)
+                )
+            written = rebuild_counters(student_ids)
+            self.stdout.write(f'Rebuilt {written} attendance counters')
+
         total = 0
         for department in departments:
             students = Student.objects.filter(
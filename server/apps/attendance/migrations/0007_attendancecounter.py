@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:58
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+import django.db.models.deletion
+
+
+def backfill_counters(apps, schema_editor):
+    AttendanceRecord = apps.get_model('attendance', 'AttendanceRecord')
+    AttendanceCounter = apps.get_model('attendance', 'AttendanceCounter')
+    rows = (
+        AttendanceRecord.objects.filter(status__in=['approved', 'direct'])
+        .exclude(subject_code='')
+        .values('student_id', 'semester', 'subject_code')
+        .annotate(
+            total=Count('id'),
+            present=Count('id', filter=Q(is_present=True)),
+            name=Max('subject_name'),
+        )
+        .order_by()
+    )
+    AttendanceCounter.objects.bulk_create(
+        [
+            AttendanceCounter(
+                student_id=row['student_id'], semester=row['semester'],
+                subject_code=row['subject_code'], subject_name=row['name'] or '',
+                present=row['present'], total=row['total'],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0006_student_publicprofileenabled'),
+        ('attendance', '0006_attendancerecord_archive_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.IntegerField()),
+                ('subject_code', models.CharField(max_length=50)),
+                ('subject_name', models.CharField(blank=True, max_length=255)),
+                ('present', models.IntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_counters', to='students.student')),
+            ],
+            options={
+                'db_table': 'attendance_counters',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='attendancecounter',
+            constraint=models.UniqueConstraint(fields=('student', 'semester', 'subject_code'), name='attendance_counter_unique_student_semester_subject'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -151,3 +151,38 @@ class AttendanceRecord(models.Model):
     def __str__(self):
         status_str = "Present" if self.is_present else "Absent"
         return f"{self.student.fullNameEnglish} - {self.subject_name} ({self.date}) - {status_str} [{self.status}]"
+
+
+class AttendanceCounter(models.Model):
+    """
+    Running verified-attendance totals per (student, semester, subject).
+
+    Maintained with deltas as records are created, updated, approved or
+    deleted (see counters.py), so profile sync reads a handful of counter
+    rows instead of aggregating the student's whole semester history.
+    Only records whose status counts toward the profile (approved/direct)
+    are included.
+    """
+    student = models.ForeignKey(
+        'students.Student',
+        on_delete=models.CASCADE,
+        related_name='attendance_counters'
+    )
+    semester = models.IntegerField()
+    subject_code = models.CharField(max_length=50)
+    # Latest subject name seen on a counted record for this code.
+    subject_name = models.CharField(max_length=255, blank=True)
+    present = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'attendance_counters'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student', 'semester', 'subject_code'],
+                name='attendance_counter_unique_student_semester_subject'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} sem {self.semester} {self.subject_code}: {self.present}/{self.total}"
@@ -0,0 +1,162 @@
+"""
+Attendance register (students x class dates) built from DB aggregates.
+
+The register view used to load every verified AttendanceRecord with its
+student, build a per-student dict of cells and rescan those cells for the
+totals. `build_register` instead asks the database for one row per
+(student, date) — "present" when any record for that slot is present, so
+legacy duplicates never double-count — and keeps the matrix columnar:
+
+- ``dates``: the class dates, in order (the column index);
+- ``marks``: one bytearray per student, one byte per date
+  (NONE / ABSENT / PRESENT).
+
+Per-student totals are byte counts over a row; per-date totals come from a
+second aggregate query. The JSON view expands rows into the legacy
+``cells`` mapping (or a ``marks`` string with ``layout=compact``), and
+`stream_csv` / `write_xlsx` render exports row by row without building the
+JSON first.
+"""
+import csv
+
+from django.db.models import Case, Count, IntegerField, Max, Q, When
+
+NONE, ABSENT, PRESENT = 0, 1, 2
+# Characters of the ``layout=compact`` marks string and the exports.
+MARK_CHARS = {NONE: '-', ABSENT: 'A', PRESENT: 'P'}
+_CELL_TYPES = {ABSENT: 'absent', PRESENT: 'present'}
+
+
+class Register:
+    """Columnar attendance matrix; see the module docstring."""
+
+    def __init__(self, dates, students, marks, totals_by_date):
+        self.dates = dates
+        # [(student_id, name, roll)] sorted by roll.
+        self.students = students
+        self.marks = marks
+        self.totals_by_date = totals_by_date
+
+    def totals(self, student_id):
+        """(present, total) for one student."""
+        row = self.marks[student_id]
+        present = row.count(PRESENT)
+        return present, present + row.count(ABSENT)
+
+    def mark_string(self, student_id):
+        return ''.join(MARK_CHARS[mark] for mark in self.marks[student_id])
+
+    def rows(self, compact=False):
+        """The per-student rows of the JSON response."""
+        date_keys = [day.isoformat() for day in self.dates]
+        for student_id, name, roll in self.students:
+            present, total = self.totals(student_id)
+            row = {
+                'student_id': str(student_id),
+                'name': name,
+                'roll': roll,
+                'present': present,
+                'absent': total - present,
+                'total': total,
+                'percentage': round(present / total * 100, 1) if total else 0,
+            }
+            if compact:
+                row['marks'] = self.mark_string(student_id)
+            else:
+                row['cells'] = {
+                    date_keys[index]: _CELL_TYPES[mark]
+                    for index, mark in enumerate(self.marks[student_id])
+                    if mark
+                }
+            yield row
+
+
+def build_register(records):
+    """
+    Build the Register for an AttendanceRecord queryset (already filtered to
+    the class, statuses and date range). Three queries regardless of size.
+    """
+    from apps.students.models import Student
+
+    slots = (
+        records.values_list('student_id', 'date')
+        .annotate(present=Max(Case(
+            When(is_present=True, then=PRESENT),
+            default=ABSENT,
+            output_field=IntegerField(),
+        )))
+        .order_by()
+    )
+    slots = list(slots)
+    dates = sorted({day for _, day, _ in slots})
+    column = {day: index for index, day in enumerate(dates)}
+    marks = {}
+    for student_id, day, mark in slots:
+        row = marks.get(student_id)
+        if row is None:
+            row = marks[student_id] = bytearray(len(dates))
+        row[column[day]] = mark
+
+    students = sorted(
+        Student.objects.filter(pk__in=marks).values_list('id', 'fullNameEnglish', 'currentRollNumber'),
+        key=lambda student: student[2] or '',
+    )
+
+    totals_by_date = {day.isoformat(): {'present': 0, 'absent': 0} for day in dates}
+    per_date = (
+        records.values('date')
+        .annotate(
+            students=Count('student', distinct=True),
+            present=Count('student', filter=Q(is_present=True), distinct=True),
+        )
+        .order_by()
+    )
+    for item in per_date:
+        totals_by_date[item['date'].isoformat()] = {
+            'present': item['present'],
+            'absent': item['students'] - item['present'],
+        }
+    return Register(dates, students, marks, totals_by_date)
+
+
+def _export_rows(register):
+    yield ['Roll', 'Name'] + [day.isoformat() for day in register.dates] + [
+        'Present', 'Absent', 'Total', 'Percentage',
+    ]
+    for student_id, name, roll in register.students:
+        present, total = register.totals(student_id)
+        yield (
+            [roll or '', name or '']
+            + [MARK_CHARS[mark] for mark in register.marks[student_id]]
+            + [present, total - present, total,
+               round(present / total * 100, 1) if total else 0]
+        )
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(register):
+    """Yield the register as CSV lines (for StreamingHttpResponse)."""
+    writer = csv.writer(_Echo())
+    for row in _export_rows(register):
+        yield writer.writerow(row)
+
+
+def write_xlsx(register, target, title='Attendance'):
+    """Write the register workbook into ``target`` (a path or binary file).
+
+    Uses openpyxl's write-only mode, so rows go out as they are appended.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title[:31])
+    ws.freeze_panes = 'C2'
+    for row in _export_rows(register):
+        ws.append(row)
+    wb.save(target)
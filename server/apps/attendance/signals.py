@@ -0,0 +1,56 @@
+"""
+Keep AttendanceCounter (counters.py) in step with attendance records saved
+or deleted one at a time (API, Django admin, queryset deletes). Bulk writes
+report their own changes.
+"""
+import logging
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .counters import apply_changes, state
+from .models import AttendanceRecord
+
+logger = logging.getLogger(__name__)
+
+_STATE_FIELDS = ('student_id', 'semester', 'subject_code', 'subject_name', 'is_present', 'status')
+
+
+@receiver(pre_save, sender=AttendanceRecord, dispatch_uid='attendance_counter_old_state')
+def remember_counter_state(sender, instance, **kwargs):
+    """Capture what the record contributed before this save (the row in the
+    database still holds the old values)."""
+    if instance._state.adding:
+        instance._counter_old_state = None
+        return
+    old = AttendanceRecord.objects.filter(pk=instance.pk).only(*_STATE_FIELDS).first()
+    instance._counter_old_state = state(old) if old is not None else None
+
+
+@receiver(post_save, sender=AttendanceRecord, dispatch_uid='attendance_counter_apply')
+def update_counters(sender, instance, **kwargs):
+    new = state(instance)
+    try:
+        apply_changes([(getattr(instance, '_counter_old_state', None), new)])
+    except Exception:
+        # A failed counter update must never break an attendance save;
+        # sync_attendance --rebuild-counters repairs drift.
+        logger.exception('Attendance counter update failed for record %s', instance.pk)
+    instance._counter_old_state = new
+
+
+@receiver(post_delete, sender=AttendanceRecord, dispatch_uid='attendance_counter_delete')
+def remove_from_counters(sender, instance, origin=None, **kwargs):
+    """Take a deleted record out of the counters, in the delete's transaction."""
+    from apps.students.models import Student
+
+    # Deleting a student cascades to its counters as well as its records.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is Student:
+        return
+    try:
+        apply_changes([(state(instance), None)])
+    except Exception:
+        # Same policy as saves: sync_attendance --rebuild-counters repairs drift.
+        logger.exception('Attendance counter update failed for deleted record %s', instance.pk)
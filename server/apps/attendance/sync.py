@@ -7,14 +7,16 @@ each student's profile attendance (`Student.semesterAttendance` JSON), and the
 subject list always follows the class routine for the student's
 department/semester/shift.
 
+Counts come from the running AttendanceCounter rows (counters.py), which are
+kept current with deltas on every attendance write, so a sync costs a
+couple of queries per batch, not an aggregate over the semester history.
+
 When the toggle is off, nothing here runs — the manual admin workflow is
 untouched.
 """
 import logging
 from datetime import date as date_cls
 
-from django.db.models import Count, Q
-
 logger = logging.getLogger(__name__)
 
 # Only verified records count toward the student profile.
@@ -38,21 +40,21 @@ def _routine_subjects_for(student):
     return {r['subject_code']: r['subject_name'] for r in routines if r['subject_code']}
 
 
-def sync_student_attendance(student, semester=None):
+def sync_student_attendance(student, semester=None, *, counters=None, routine_subjects=None):
     """
-    Recompute one student's profile attendance for a semester from
-    AttendanceRecord data + routine subjects.
+    Regenerate one student's profile attendance for a semester from the
+    running AttendanceCounter rows + routine subjects.
 
     - Creates/updates the semesterAttendance entry for `semester`
       (defaults to the student's current semester).
     - Subjects present in the routine always appear (0/0 when untaken).
-    - Subjects with attendance records get real present/total counts.
+    - Subjects with counted attendance get real present/total counts.
     - Manually added subjects that have neither routine nor records are kept.
 
+    Batch callers pass the student's `counters` and cohort
+    `routine_subjects` they already loaded; otherwise both are queried.
     Returns True when the student row was updated.
     """
-    from apps.attendance.models import AttendanceRecord
-
     department = getattr(student, 'department', None)
     if not department or not getattr(department, 'autoAttendanceSync', False):
         return False
@@ -61,24 +63,15 @@ def sync_student_attendance(student, semester=None):
     if not semester:
         return False
 
-    # Aggregate verified attendance per subject for this semester.
-    aggregates = (
-        AttendanceRecord.objects.filter(
-            student=student,
-            semester=semester,
-            status__in=SYNC_STATUSES,
-        )
-        .values('subject_code', 'subject_name')
-        .annotate(
-            total=Count('id'),
-            present=Count('id', filter=Q(is_present=True)),
-        )
-    )
-    record_subjects = {
-        row['subject_code']: row for row in aggregates if row['subject_code']
-    }
+    if counters is None:
+        from .counters import counts_for
+        counters = counts_for([(student.pk, semester)])[(student.pk, semester)]
+    record_subjects = {counter.subject_code: counter for counter in counters}
 
-    routine_subjects = _routine_subjects_for(student) if semester == student.semester else {}
+    if semester != student.semester:
+        routine_subjects = {}
+    elif routine_subjects is None:
+        routine_subjects = _routine_subjects_for(student)
 
     semester_attendance = list(student.semesterAttendance or [])
     entry = None
@@ -113,13 +106,13 @@ def sync_student_attendance(student, semester=None):
         elif name and not merged[code].get('name'):
             merged[code]['name'] = name
 
-    # Attendance records overwrite counts for their subjects (source of truth).
-    for code, row in record_subjects.items():
+    # Attendance counters overwrite counts for their subjects (source of truth).
+    for code, counter in record_subjects.items():
         current = merged.get(code, {'code': code})
-        current['name'] = current.get('name') or row['subject_name'] or code
-        current['present'] = row['present']
-        current['total'] = row['total']
-        current['percentage'] = round(row['present'] / row['total'] * 100, 2) if row['total'] else 0
+        current['name'] = current.get('name') or counter.subject_name or code
+        current['present'] = counter.present
+        current['total'] = counter.total
+        current['percentage'] = round(counter.present / counter.total * 100, 2) if counter.total else 0
         merged[code] = current
 
     subjects = sorted(merged.values(), key=lambda s: s.get('code', ''))
@@ -141,22 +134,44 @@ def sync_students_for_records(records):
     """
     Best-effort sync for the students touched by a batch of attendance
     records. Never raises — sync problems must not break attendance saving.
+
+    Students, their counters and the routine subjects of each cohort are
+    loaded once for the whole batch.
     """
-    seen = set()
+    from apps.students.models import Student
+
+    from .counters import counts_for
+
+    pairs = {(record.student_id, record.semester) for record in records}
+    if not pairs:
+        return 0
+    try:
+        students = Student.objects.select_related('department').filter(
+            pk__in={student_id for student_id, _ in pairs},
+            department__autoAttendanceSync=True,
+        ).in_bulk()
+        pairs = {pair for pair in pairs if pair[0] in students}
+        counters = counts_for(pairs)
+    except Exception:
+        logger.exception("Attendance sync failed to load %d students", len(pairs))
+        return 0
+
+    routines = {}
     synced = 0
-    for record in records:
+    for student_id, semester in sorted(pairs, key=str):
+        student = students[student_id]
         try:
-            key = (record.student_id, record.semester)
-            if key in seen:
-                continue
-            seen.add(key)
-            student = record.student
-            if sync_student_attendance(student, semester=record.semester):
+            cohort = (student.department_id, student.semester, student.shift)
+            if cohort not in routines:
+                routines[cohort] = _routine_subjects_for(student)
+            if sync_student_attendance(
+                student, semester=semester,
+                counters=counters[(student_id, semester)],
+                routine_subjects=routines[cohort],
+            ):
                 synced += 1
         except Exception:
-            logger.exception(
-                "Attendance sync failed for student %s", getattr(record, 'student_id', '?')
-            )
+            logger.exception("Attendance sync failed for student %s", student_id)
     if synced:
         logger.info("Attendance sync updated %d student profiles", synced)
     return synced
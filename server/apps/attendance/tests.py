@@ -5,7 +5,11 @@ Tests for Attendance app (model + basic CRUD via an admin/registrar user).
 Role-based access-control scoping is covered separately in
 ``test_role_access.py``.
 """
+from unittest import mock
+
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 from datetime import date, timedelta
@@ -104,3 +108,294 @@ class AttendanceViewSetTest(TestCase):
     def test_student_summary_without_student_id(self):
         response = self.client.get('/api/attendance/student_summary/')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkCreateTest(TestCase):
+    """Set-based upsert behind POST /api/attendance/bulk_create/."""
+
+    def setUp(self):
+        from apps.class_routines.models import ClassRoutine
+
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='bulkuser', email='bulk@example.com',
+            password='testpass123', role='registrar')
+        self.client.force_authenticate(user=self.user)
+        self.department = Department.objects.create(name=f'Computer Science {uuid.uuid4().hex[:6]}', code=f'CS{uuid.uuid4().hex[:5]}')
+        self.students = [_make_student(self.department, roll=f'CS{i:03d}') for i in range(6)]
+        self.routine = ClassRoutine.objects.create(
+            department=self.department, semester=1, shift='Day', session='2023-24',
+            day_of_week='Sunday', start_time='09:00', end_time='10:00',
+            subject_name='Programming', subject_code='CS101', room_number='101')
+        self.day = date.today().isoformat()
+
+    def _post(self, rows):
+        return self.client.post('/api/attendance/bulk_create/', {
+            'class_routine_id': str(self.routine.id),
+            'records': [
+                {'student': str(student_id), 'subject_code': 'CS101',
+                 'subject_name': 'Programming', 'semester': 1, 'date': self.day,
+                 'attendance_type': kind}
+                for student_id, kind in rows
+            ],
+        }, format='json')
+
+    def test_upsert_updates_and_relinks_legacy_rows(self):
+        first, second = self.students[:2]
+        AttendanceRecord.objects.create(
+            student=first, subject_code='CS101', subject_name='Programming', semester=1,
+            date=date.today(), is_present=False, class_routine=self.routine)
+        legacy = AttendanceRecord.objects.create(
+            student=second, subject_code='CS101', subject_name='Programming', semester=1,
+            date=date.today(), is_present=False)
+
+        response = self._post([(s.id, 'present') for s in self.students])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 6)
+        self.assertEqual(AttendanceRecord.objects.count(), 6)
+        self.assertFalse(AttendanceRecord.objects.filter(is_present=False).exists())
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.class_routine_id, self.routine.id)
+        self.assertEqual(legacy.recorded_by, self.user)
+        self.assertEqual(
+            [row['student_roll'] for row in response.data['records']],
+            [s.currentRollNumber for s in self.students])
+
+    def test_query_count_does_not_grow_with_class_size(self):
+        def queries_for(students):
+            AttendanceRecord.objects.all().delete()
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(
+                    self._post([(s.id, 'present') for s in students]).status_code,
+                    status.HTTP_201_CREATED)
+            # Per-student notification/profile-sync work is out of scope here.
+            return len([q for q in ctx.captured_queries if 'attendance_records' in q['sql']])
+
+        self.assertEqual(queries_for(self.students[:2]), queries_for(self.students))
+
+    def test_bad_rows_reported_individually(self):
+        response = self._post([
+            (self.students[0].id, 'present'),
+            (uuid.uuid4(), 'present'),
+            ('not-a-uuid', 'present'),
+            (self.students[1].id, 'maybe'),
+        ])
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(len(response.data['errors']), 3)
+        self.assertEqual(AttendanceRecord.objects.count(), 1)
+
+    def test_conflicting_batch_falls_back_to_row_by_row(self):
+        """A concurrent insert makes the set-based write fail; rows still land."""
+        with mock.patch.object(AttendanceRecord.objects, 'bulk_create', side_effect=IntegrityError):
+            response = self._post([(s.id, 'absent') for s in self.students[:3]])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(AttendanceRecord.objects.filter(is_present=False).count(), 3)
+
+    def test_batch_submit_refreshes_student_badge(self):
+        """bulk_create skips post_save; the cached badge must still move."""
+        from apps.notifications.badges import compute_badges, reconcile_all
+
+        reconcile_all()
+        student = self.students[0]
+        account = User.objects.create_user(
+            username='bulkstudent', password='testpass123', role='student',
+            related_profile_id=student.id)
+        self.assertEqual(compute_badges(account)['attendance'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._post([(student.id, 'present')])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(compute_badges(account)['attendance'], 1)
+
+
+class AttendanceCounterTest(TestCase):
+    """Running counters follow every write path and feed the profile sync."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='counteruser', email='counter@example.com',
+            password='testpass123', role='registrar', is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.department = Department.objects.create(
+            name=f'Computer Science {uuid.uuid4().hex[:6]}', code=f'CS{uuid.uuid4().hex[:5]}',
+            autoAttendanceSync=True)
+        self.student = _make_student(self.department)
+
+    def _counter(self):
+        from .models import AttendanceCounter
+        counter = AttendanceCounter.objects.get(student=self.student, semester=1, subject_code='CS101')
+        return counter.present, counter.total
+
+    def _submit(self, day, kind, record_status='direct'):
+        return self.client.post('/api/attendance/bulk_create/', {'records': [
+            {'student': str(self.student.id), 'subject_code': 'CS101',
+             'subject_name': 'Programming', 'semester': 1, 'date': day.isoformat(),
+             'attendance_type': kind, 'status': record_status},
+        ]}, format='json')
+
+    def test_counters_follow_writes_and_feed_profile(self):
+        today = date.today()
+        self._submit(today, 'present')
+        self._submit(today - timedelta(days=1), 'absent')
+        self.assertEqual(self._counter(), (1, 2))
+
+        # Re-submitting a day updates in place: a delta, not a new count.
+        self._submit(today - timedelta(days=1), 'present')
+        self.assertEqual(self._counter(), (2, 2))
+
+        # Pending submissions only count once approved.
+        self._submit(today - timedelta(days=2), 'absent', record_status='pending')
+        self.assertEqual(self._counter(), (2, 2))
+        pending = AttendanceRecord.objects.get(status='pending')
+        self.client.post('/api/attendance/approve_attendance/', {
+            'action': 'approve', 'attendance_ids': [str(pending.id)]}, format='json')
+        self.assertEqual(self._counter(), (2, 3))
+
+        self.client.delete(f'/api/attendance/{pending.id}/')
+        self.assertEqual(self._counter(), (2, 2))
+
+        self.student.refresh_from_db()
+        subject = self.student.semesterAttendance[0]['subjects'][0]
+        self.assertEqual((subject['code'], subject['present'], subject['total']), ('CS101', 2, 2))
+
+        from .counters import rebuild_counters
+        rebuild_counters()
+        self.assertEqual(self._counter(), (2, 2))
+
+    def test_sync_reads_counters_not_history(self):
+        for offset in range(5):
+            self._submit(date.today() - timedelta(days=offset), 'present')
+        from .sync import sync_students_for_records
+        records = list(AttendanceRecord.objects.all())
+        with CaptureQueriesContext(connection) as ctx:
+            sync_students_for_records(records)
+        self.assertFalse(any('attendance_records' in q['sql'] for q in ctx.captured_queries))
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.semesterAttendance[0]['averagePercentage'], 100.0)
+
+    def test_queryset_and_admin_deletes_update_counters(self):
+        today = date.today()
+        for offset in range(3):
+            self._submit(today - timedelta(days=offset), 'present')
+        self.assertEqual(self._counter(), (3, 3))
+
+        AttendanceRecord.objects.filter(date=today).delete()
+        self.assertEqual(self._counter(), (2, 2))
+        AttendanceRecord.objects.filter(date=today - timedelta(days=1)).get().delete()
+        self.assertEqual(self._counter(), (1, 1))
+
+    def test_failed_api_delete_leaves_counters_untouched(self):
+        self._submit(date.today(), 'present')
+        record = AttendanceRecord.objects.get()
+        with mock.patch('rest_framework.mixins.DestroyModelMixin.perform_destroy',
+                        side_effect=lambda instance: (instance.delete(), 1 / 0)):
+            with self.assertRaises(ZeroDivisionError):
+                self.client.delete(f'/api/attendance/{record.id}/')
+        self.assertTrue(AttendanceRecord.objects.filter(pk=record.pk).exists())
+        self.assertEqual(self._counter(), (1, 1))
+
+    def test_student_delete_skips_counter_updates(self):
+        from .models import AttendanceCounter
+
+        self._submit(date.today(), 'present')
+        with mock.patch('apps.attendance.signals.apply_changes') as apply:
+            self.student.delete()
+        apply.assert_not_called()
+        self.assertFalse(AttendanceCounter.objects.exists())
+
+
+class TeacherRegisterTest(TestCase):
+    """Register and subject summary are aggregated in the database."""
+
+    def setUp(self):
+        from apps.class_routines.models import ClassRoutine
+        from apps.teachers.models import Teacher
+
+        self.department = Department.objects.create(
+            name=f'Computer Science {uuid.uuid4().hex[:6]}', code=f'CS{uuid.uuid4().hex[:5]}')
+        teacher = Teacher.objects.create(
+            fullNameEnglish='T One', email='reg-teacher@example.com', department=self.department,
+            designation='Instructor', mobileNumber='01700000000',
+            employmentStatus='permanent', joiningDate=date(2020, 1, 1),
+        )
+        user = User.objects.create_user(
+            username='reg-teacher', email='reg-teacher@example.com', password='testpass123',
+            role='teacher', related_profile_id=teacher.id)
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+        self.routine = ClassRoutine.objects.create(
+            department=self.department, semester=1, shift='Day', session='2024-25',
+            day_of_week='Sunday', start_time='08:00', end_time='09:00',
+            subject_name='Programming', subject_code='CS101',
+            teacher=teacher, room_number='101',
+        )
+        self.first = _make_student(self.department, roll='CS001')
+        self.second = _make_student(self.department, roll='CS002')
+        self.days = [date(2026, 1, 4), date(2026, 1, 11), date(2026, 1, 18)]
+        marks = {self.first: [True, False, True], self.second: [False, None, True]}
+        for student, row in marks.items():
+            for day, present in zip(self.days, row):
+                if present is not None:
+                    self._record(student, day, present)
+        # A second period of the same class on the first day: one register
+        # cell per date (present wins), but a separate class in the summary.
+        second_period = ClassRoutine.objects.create(
+            department=self.department, semester=1, shift='Day', session='2024-25',
+            day_of_week='Sunday', start_time='09:00', end_time='10:00',
+            subject_name='Programming', subject_code='CS101',
+            teacher=teacher, room_number='101',
+        )
+        self._record(self.second, self.days[0], True, routine=second_period)
+
+    def _record(self, student, day, present, routine=None):
+        AttendanceRecord.objects.create(
+            student=student, subject_code='CS101', subject_name='Programming', semester=1,
+            class_routine=routine or self.routine, date=day, is_present=present, status='direct')
+
+    def _register(self, **extra):
+        return self.client.get('/api/attendance/attendance_register/', {
+            'department': str(self.department.id), 'semester': 1, 'shift': 'Day',
+            'subject_code': 'CS101', **extra})
+
+    def test_register_matrix_and_totals(self):
+        response = self._register()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['dates'], [d.isoformat() for d in self.days])
+        first, second = response.data['students']
+        self.assertEqual(first['roll'], 'CS001')
+        self.assertEqual(first['cells'], {
+            '2026-01-04': 'present', '2026-01-11': 'absent', '2026-01-18': 'present'})
+        self.assertEqual((second['present'], second['absent'], second['total']), (2, 0, 2))
+        self.assertEqual(response.data['totalsByDate']['2026-01-04'], {'present': 2, 'absent': 0})
+        self.assertEqual(response.data['totalsByDate']['2026-01-11'], {'present': 0, 'absent': 1})
+
+        compact = self._register(layout='compact').data['students']
+        self.assertEqual([row['marks'] for row in compact], ['PAP', 'P-P'])
+        self.assertNotIn('cells', compact[0])
+
+    def test_register_exports(self):
+        response = self._register(export='csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'Roll,Name,2026-01-04,2026-01-11,2026-01-18,Present,Absent,Total,Percentage')
+        self.assertEqual(lines[1], 'CS001,Test Student,P,A,P,2,1,3,66.7')
+
+        from io import BytesIO
+        from openpyxl import load_workbook
+        response = self._register(export='xlsx')
+        sheet = load_workbook(BytesIO(b''.join(response.streaming_content))).active
+        self.assertEqual([cell.value for cell in sheet[3]][:5], ['CS002', 'Test Student', 'P', '-', 'P'])
+
+        self.assertEqual(self._register(export='pdf').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_subject_summary(self):
+        response = self.client.get('/api/attendance/teacher_subject_summary/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        subject, = response.data['subjects']
+        self.assertEqual(subject['total_classes'], 4)
+        first, second = subject['students']
+        self.assertEqual((first['present'], first['absent'], first['total'], first['percentage']),
+                         (2, 1, 3, 66.7))
+        self.assertEqual((second['present'], second['absent'], second['total']), (2, 1, 3))
@@ -1,16 +1,18 @@
 import logging
+import tempfile
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db import IntegrityError
+from django.db import transaction
 from django.db.models import Count, Q
 from django.db.models.functions import TruncMonth, TruncWeek
+from django.http import FileResponse, StreamingHttpResponse
 from django.utils import timezone
-from django.conf import settings
 from .models import AttendanceRecord
+from .register import build_register, stream_csv, write_xlsx
 from .serializers import (
     AttendanceRecordSerializer,
     AttendanceCreateSerializer,
@@ -216,6 +218,33 @@ def _log_attendance_activity(request, action_type, description, entity_id='', ch
         logger.warning("Attendance activity log failed: %s", exc)
 
 
+REGISTER_EXPORTS = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def _register_export(register, subject, export):
+    """Stream the attendance register as a CSV or XLSX download."""
+    if export not in REGISTER_EXPORTS:
+        return Response(
+            {'error': f"Unsupported export '{export}'. Use one of: {', '.join(REGISTER_EXPORTS)}."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    filename = f"attendance_{subject['subject_code']}_sem{subject['semester']}_{subject['shift']}.{export}"
+    if export == 'csv':
+        response = StreamingHttpResponse(stream_csv(register), content_type=REGISTER_EXPORTS[export])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    # Write-only workbooks need a real file; FileResponse then streams it in chunks.
+    handle = tempfile.TemporaryFile()
+    write_xlsx(register, handle, title=subject['subject_code'])
+    handle.seek(0)
+    return FileResponse(
+        handle, as_attachment=True, filename=filename, content_type=REGISTER_EXPORTS[export],
+    )
+
+
 class AttendanceViewSet(viewsets.ModelViewSet):
     queryset = AttendanceRecord.objects.all()
     permission_classes = [AttendanceAccessPermission]
@@ -347,9 +376,12 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             changes={'is_present': instance.is_present, 'status': instance.status},
         )
         student, semester = instance.student, instance.semester
-        response = super().destroy(request, *args, **kwargs)
+        # The post_delete receiver (signals.py) takes the record out of the
+        # running counters in this same transaction.
+        with transaction.atomic():
+            response = super().destroy(request, *args, **kwargs)
 
-        # Re-sync the student's profile attendance after the deletion.
+        # Re-sync the student's profile attendance from the counters.
         try:
             from .sync import sync_student_attendance
             sync_student_attendance(student, semester=semester)
@@ -585,7 +617,10 @@ class AttendanceViewSet(viewsets.ModelViewSet):
 
         GET /api/attendance/attendance_register/
         Required: department, semester, shift, subject_code
-        Optional: session, date_from, date_to
+        Optional: session, date_from, date_to,
+                  layout=compact (per-student ``marks`` string, one P/A/-
+                  per date, instead of the ``cells`` mapping),
+                  export=csv|xlsx (download instead of JSON)
         """
         routines = _teacher_routines(request.user)
         if routines is None:
@@ -619,66 +654,31 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         records = AttendanceRecord.objects.filter(
             class_routine__in=class_routines,
             status__in=VERIFIED_STATUSES,
-        ).select_related('student')
+        )
         if params.get('date_from'):
             records = records.filter(date__gte=params['date_from'])
         if params.get('date_to'):
             records = records.filter(date__lte=params['date_to'])
 
-        # Build the matrix: one column per class date, one row per student.
-        dates = sorted({r.date for r in records})
-        students = {}
-        for record in records:
-            sid = str(record.student_id)
-            if sid not in students:
-                students[sid] = {
-                    'student_id': sid,
-                    'name': record.student.fullNameEnglish,
-                    'roll': record.student.currentRollNumber,
-                    'cells': {},
-                    'present': 0,
-                    'absent': 0,
-                }
-            row = students[sid]
-            date_key = record.date.isoformat()
-            # Present/Absent only — fold any legacy late/leave via is_present.
-            cell_type = 'present' if record.is_present else 'absent'
-            # One cell per date — a present record wins over an earlier absent.
-            previous = row['cells'].get(date_key)
-            if previous is None or (record.is_present and previous == 'absent'):
-                row['cells'][date_key] = cell_type
-
-        # Totals from the final cell values (so duplicates never double-count).
-        date_keys = [d.isoformat() for d in dates]
-        totals_by_date = {key: {'present': 0, 'absent': 0} for key in date_keys}
-        rows = []
-        for row in students.values():
-            present = sum(1 for v in row['cells'].values() if v == 'present')
-            total = len(row['cells'])
-            row['present'] = present
-            row['absent'] = total - present
-            row['total'] = total
-            row['percentage'] = round(present / total * 100, 1) if total else 0
-            for key, value in row['cells'].items():
-                if value == 'present':
-                    totals_by_date[key]['present'] += 1
-                else:
-                    totals_by_date[key]['absent'] += 1
-            rows.append(row)
-        rows.sort(key=lambda r: r['roll'] or '')
+        register = build_register(records)
+        subject = {
+            'subject_code': sample.subject_code,
+            'subject_name': sample.subject_name,
+            'department': sample.department.name,
+            'semester': sample.semester,
+            'shift': sample.shift,
+            'session': sample.session,
+        }
+
+        export = params.get('export')
+        if export:
+            return _register_export(register, subject, export)
 
         return Response({
-            'subject': {
-                'subject_code': sample.subject_code,
-                'subject_name': sample.subject_name,
-                'department': sample.department.name,
-                'semester': sample.semester,
-                'shift': sample.shift,
-                'session': sample.session,
-            },
-            'dates': date_keys,
-            'students': rows,
-            'totalsByDate': totals_by_date,
+            'subject': subject,
+            'dates': [day.isoformat() for day in register.dates],
+            'students': list(register.rows(compact=params.get('layout') == 'compact')),
+            'totalsByDate': register.totals_by_date,
         })
 
     @action(detail=False, methods=['get'])
@@ -834,11 +834,10 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        created_records = []
-        errors = []
-
-        from apps.authentication.models import User
+        from .bulk import row_error, upsert_records
 
+        errors = []
+        items = []
         for idx, record_data in enumerate(records_data):
             try:
                 raw_type = record_data.get('attendance_type') or record_data.get('attendanceType') or ''
@@ -872,87 +871,20 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 # Add routine if provided
                 if routine:
                     processed_data['class_routine_id'] = routine.id
-
-                # Resolve recorded_by user object
-                if processed_data['recorded_by']:
-                    try:
-                        processed_data['recorded_by'] = User.objects.get(id=processed_data['recorded_by'])
-                    except User.DoesNotExist:
-                        processed_data['recorded_by'] = request.user if getattr(request.user, 'is_authenticated', False) else None
-                else:
-                    processed_data['recorded_by'] = request.user if getattr(request.user, 'is_authenticated', False) else None
-
-                # Check if record already exists.
-                # Prefer routine-scoped identity to avoid cross-class overwrites.
-                if processed_data.get('class_routine_id'):
-                    existing = AttendanceRecord.objects.filter(
-                        student_id=processed_data['student_id'],
-                        class_routine_id=processed_data['class_routine_id'],
-                        date=processed_data['date']
-                    ).first()
-                    # Backward-compat fallback for databases still on old uniqueness.
-                    # Only relink legacy rows that have no routine set.
-                    if not existing:
-                        existing = AttendanceRecord.objects.filter(
-                            student_id=processed_data['student_id'],
-                            subject_code=processed_data['subject_code'],
-                            date=processed_data['date'],
-                            class_routine__isnull=True
-                        ).first()
-                else:
-                    existing = AttendanceRecord.objects.filter(
-                        student_id=processed_data['student_id'],
-                        subject_code=processed_data['subject_code'],
-                        date=processed_data['date']
-                    ).first()
-
-                if existing:
-                    # Update existing record
-                    existing.subject_name = processed_data['subject_name']
-                    existing.semester = processed_data['semester']
-                    existing.is_present = processed_data['is_present']
-                    existing.attendance_type = processed_data['attendance_type']
-                    existing.status = processed_data['status']
-                    existing.notes = processed_data['notes']
-                    existing.recorded_by = processed_data['recorded_by']
-                    if 'class_routine_id' in processed_data:
-                        existing.class_routine_id = processed_data['class_routine_id']
-                    existing.save()
-                    created_records.append(existing)
-                else:
-                    # Create new record (fallback to update if legacy unique constraint conflicts)
-                    try:
-                        record = AttendanceRecord.objects.create(**processed_data)
-                    except IntegrityError:
-                        fallback_existing = AttendanceRecord.objects.filter(
-                            student_id=processed_data['student_id'],
-                            subject_code=processed_data['subject_code'],
-                            date=processed_data['date'],
-                            class_routine__isnull=True
-                        ).first()
-                        if not fallback_existing:
-                            raise
-
-                        fallback_existing.subject_name = processed_data['subject_name']
-                        fallback_existing.semester = processed_data['semester']
-                        fallback_existing.is_present = processed_data['is_present']
-                        fallback_existing.attendance_type = processed_data['attendance_type']
-                        fallback_existing.status = processed_data['status']
-                        fallback_existing.notes = processed_data['notes']
-                        fallback_existing.recorded_by = processed_data['recorded_by']
-                        if 'class_routine_id' in processed_data:
-                            fallback_existing.class_routine_id = processed_data['class_routine_id']
-                        fallback_existing.save()
-                        created_records.append(fallback_existing)
-                        continue
-                    created_records.append(record)
-
             except Exception as e:
-                logger.exception("Bulk attendance: error processing record %s", idx + 1)
-                errors.append({
-                    'student': str(record_data.get('student', '')),
-                    'error': str(e) if settings.DEBUG else 'Failed to save record'
-                })
+                logger.warning("Bulk attendance: invalid record %s: %s", idx + 1, e)
+                errors.append(row_error(record_data, e))
+                continue
+            items.append((record_data, processed_data))
+
+        # Users, existing rows and writes are resolved set-wise (see bulk.py);
+        # the records come back with their relations loaded for the
+        # notifications and the response below.
+        created_records, upsert_errors = upsert_records(
+            items,
+            default_recorder=request.user if getattr(request.user, 'is_authenticated', False) else None,
+        )
+        errors.extend(upsert_errors)
 
         # Send notifications to students
         try:
@@ -961,10 +893,6 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         except Exception as e:
             logger.warning("Failed to send bulk attendance notifications: %s", e)
 
-        # Ensure all records are refreshed from database
-        for record in created_records:
-            record.refresh_from_db()
-
         # Auto-sync student profile attendance (no-op unless dept toggle is on).
         try:
             from .sync import sync_students_for_records
@@ -1133,6 +1061,8 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def teacher_subject_summary(self, request):
         """Get attendance summary by subject for a teacher"""
+        from apps.students.models import Student
+
         routines = _teacher_routines(request.user)
         if routines is None:
             return Response(
@@ -1164,58 +1094,60 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                     'routine_ids': set(),
                     'total_classes': 0,
                     'students': {},
-                    'class_sessions': set(),
                 }
             subjects[key]['routine_ids'].add(routine_id)
 
-        # Get all attendance records for these routines
-        attendance_records = AttendanceRecord.objects.filter(
+        records = AttendanceRecord.objects.filter(
             class_routine__in=teacher_routines,
             status__in=VERIFIED_STATUSES
-        ).select_related('student', 'class_routine')
-
-        # Aggregate classes and student attendance per class group.
-        # Use one attendance contribution per student per date to avoid
-        # inflation from legacy duplicate records.
-        seen_student_sessions = set()
-        for record in attendance_records:
-            if not record.class_routine_id:
-                continue
-
-            routine_key = str(record.class_routine_id)
-            subject_key = routine_to_subject_key.get(routine_key)
-            if not subject_key or subject_key not in subjects:
-                continue
+        )
 
-            student_id = str(record.student.id)
-            # Count one class per routine per date so different periods for the
-            # same subject/day are counted separately.
-            session_key = f"{routine_key}::{record.date.isoformat()}"
-            subjects[subject_key]['class_sessions'].add(session_key)
-            # Deduplicate only exact duplicate rows of the same routine/date.
-            student_session_key = f"{subject_key}::{student_id}::{session_key}"
-            if student_session_key in seen_student_sessions:
+        # One class per routine per date, so different periods for the same
+        # subject/day count separately while duplicate rows of the same
+        # routine/date do not (a present row wins over an absent duplicate).
+        for item in records.values('class_routine').annotate(
+            days=Count('date', distinct=True),
+        ).order_by():
+            subject_key = routine_to_subject_key.get(str(item['class_routine']))
+            if subject_key:
+                subjects[subject_key]['total_classes'] += item['days']
+
+        per_student = list(
+            records.values('class_routine', 'student')
+            .annotate(
+                total=Count('date', distinct=True),
+                present=Count('date', filter=Q(is_present=True), distinct=True),
+            )
+            .order_by()
+        )
+        student_info = {
+            student_id: (name, roll, gender)
+            for student_id, name, roll, gender in Student.objects.filter(
+                pk__in={item['student'] for item in per_student},
+            ).values_list('id', 'fullNameEnglish', 'currentRollNumber', 'gender')
+        }
+        for item in per_student:
+            subject_key = routine_to_subject_key.get(str(item['class_routine']))
+            if not subject_key:
                 continue
-            seen_student_sessions.add(student_session_key)
-
-            if student_id not in subjects[subject_key]['students']:
-                subjects[subject_key]['students'][student_id] = {
+            student_id = str(item['student'])
+            students = subjects[subject_key]['students']
+            if student_id not in students:
+                name, roll, gender = student_info[item['student']]
+                students[student_id] = {
                     'student_id': student_id,
-                    'student_name': record.student.fullNameEnglish,
-                    'student_roll': record.student.currentRollNumber,
-                    'gender': record.student.gender,
-                    'avatarVariant': 'female' if record.student.gender == 'Female' else 'default',
+                    'student_name': name,
+                    'student_roll': roll,
+                    'gender': gender,
+                    'avatarVariant': 'female' if gender == 'Female' else 'default',
                     'present': 0,
                     'absent': 0,
                     'total': 0,
                     'percentage': 0
                 }
-
-            subjects[subject_key]['students'][student_id]['total'] += 1
-            if record.is_present:
-                subjects[subject_key]['students'][student_id]['present'] += 1
-            else:
-                subjects[subject_key]['students'][student_id]['absent'] += 1
+            students[student_id]['total'] += item['total']
+            students[student_id]['present'] += item['present']
+            students[student_id]['absent'] += item['total'] - item['present']
 
         # Calculate percentages
         for subject in subjects.values():
@@ -1223,9 +1155,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 if student['total'] > 0:
                     student['percentage'] = round((student['present'] / student['total']) * 100, 1)
 
-            subject['total_classes'] = len(subject['class_sessions'])
             subject['routine_ids'] = sorted(list(subject['routine_ids']))
-            subject.pop('class_sessions', None)
             # Convert students dict to list
             subject['students'] = list(subject['students'].values())
             # Sort by roll number
@@ -1,6 +1,8 @@
 """
 Authentication Middleware
 """
+from functools import lru_cache
+
 from django.http import JsonResponse
 
 
@@ -91,6 +93,25 @@ ROLE_API_POLICY = {
 SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
 
 
+@lru_cache(maxsize=4096)
+def admin_path_allowed(role, path, safe_method):
+    """
+    Policy decision for an admin role on an /api/ path, memoized per
+    (role, path, read/write) so repeat requests skip the prefix scans. The
+    policy is static for the life of the process, so entries never go stale.
+    """
+    policy = ROLE_API_POLICY[role]
+    if path.startswith(SHARED_ADMIN_PREFIXES):
+        return True
+    if path.startswith(SHARED_ADMIN_READONLY_PREFIXES):
+        return safe_method
+    if path.startswith(policy['full']):
+        return True
+    if path.startswith(policy['read_only']):
+        return safe_method
+    return False
+
+
 class RoleBasedAccessMiddleware:
     """
     Middleware to enforce role-based access control
@@ -154,28 +175,8 @@ class RoleBasedAccessMiddleware:
         if not path.startswith('/api/'):
             return self.get_response(request)
 
-        policy = ROLE_API_POLICY[role]
-
-        # Always-allowed shared endpoints.
-        if path.startswith(SHARED_ADMIN_PREFIXES):
+        if admin_path_allowed(role, path, request.method in SAFE_METHODS):
             return self.get_response(request)
-
-        # Shared read-only reference endpoints.
-        if path.startswith(SHARED_ADMIN_READONLY_PREFIXES):
-            if request.method in SAFE_METHODS:
-                return self.get_response(request)
-            return self._denied(role)
-
-        # Role's full-access prefixes.
-        if path.startswith(policy['full']):
-            return self.get_response(request)
-
-        # Role's read-only prefixes.
-        if path.startswith(policy['read_only']):
-            if request.method in SAFE_METHODS:
-                return self.get_response(request)
-            return self._denied(role)
-
         # Anything else under /api/ is outside this role's permissions.
         return self._denied(role)
 
@@ -6,9 +6,8 @@ These guard against password brute-forcing and OTP/email-verification abuse
 ['DEFAULT_THROTTLE_RATES'] and are disabled automatically under the test runner
 so the suite is not rate-limited (the dedicated throttle test re-enables them).
 
-NOTE: the default cache backend is per-process LocMemCache, so with multiple
-web workers each worker keeps its own counter. For strict global limits in
-production, point Django's CACHES at the shared Redis instance.
+Counters live in the shared cache (Redis in production, see settings.CACHES),
+so limits hold globally across web workers.
 """
 from rest_framework.throttling import AnonRateThrottle
 
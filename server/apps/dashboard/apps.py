@@ -8,3 +8,8 @@ class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.dashboard'
     verbose_name = 'Dashboard'
+
+    def ready(self):
+        from utils.cache import invalidate_on_change
+        from .views import STATS_CACHE_NAMESPACE, STATS_SOURCE_MODELS
+        invalidate_on_change(STATS_CACHE_NAMESPACE, *STATS_SOURCE_MODELS)
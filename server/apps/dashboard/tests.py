@@ -46,6 +46,27 @@ class DashboardStatsViewTest(TestCase):
         self.assertIn('alumni', response.data)
         self.assertIn('applications', response.data)
 
+    def test_stats_are_cached_until_a_counted_model_changes(self):
+        url = reverse('dashboard-stats')
+        self.assertEqual(self.client.get(url).data['students']['active'], 1)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        Student.objects.create(
+            rollNumber='CS002',
+            currentRollNumber='CS002',
+            currentRegistrationNumber='REG-CS002',
+            fullNameEnglish='Second Student',
+            fullNameBangla='টেস্ট স্টুডেন্ট',
+            department=self.department,
+            semester=1,
+            shift='day',
+            status='active'
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.data['students']['total'], 2)
+        self.assertEqual(response.data['students']['active'], 2)
+
 
 class AdminDashboardViewTest(TestCase):
     def setUp(self):
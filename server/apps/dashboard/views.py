@@ -17,12 +17,179 @@ from apps.marks.models import MarksRecord
 from apps.class_routines.models import ClassRoutine
 from uuid import UUID
 from django.conf import settings
+from utils.cache import get_or_set
 import logging
 
 logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
+# Dashboard payloads are cached for DASHBOARD_CACHE_SECONDS under this
+# namespace; saving or deleting any counted model bumps it (DashboardConfig.ready).
+STATS_CACHE_NAMESPACE = 'dashboard_stats'
+STATS_SOURCE_MODELS = (Student, Alumni, Application, Admission, Teacher, Department)
+
+
+def _status_counts(queryset, field, values):
+    """
+    Total plus one count per value of `field`, in a single conditional
+    aggregate: {'total': n, value: n, ...}.
+    """
+    return queryset.aggregate(
+        total=Count('pk'),
+        **{value: Count('pk', filter=Q(**{field: value})) for value in values},
+    )
+
+
+def _compute_dashboard_stats():
+    # Base queryset of CONFIRMED students only — alumni self-registrations
+    # still pending review (or rejected) are not students yet, so they are
+    # excluded from every count below.
+    students = exclude_unapproved_alumni(Student.objects.all())
+
+    # Student statistics by status (the totals are derived from the same
+    # grouped query instead of one COUNT per status).
+    student_stats_by_status = list(students.values('status').annotate(
+        count=Count('id')
+    ).order_by('status'))
+    per_status = {row['status']: row['count'] for row in student_stats_by_status}
+
+    # Student statistics by department
+    student_stats_by_department = list(students.values(
+        'department__name', 'department__code'
+    ).annotate(
+        count=Count('id')
+    ).order_by('department__name'))
+
+    # Student statistics by semester — active students only, so graduated
+    # students (who sit at semester 8) never inflate the 8th-semester count.
+    student_stats_by_semester = list(students.filter(status='active').values('semester').annotate(
+        count=Count('id')
+    ).order_by('semester'))
+
+    # Alumni statistics (career-prefill rows of current students are
+    # not alumni and never counted)
+    from apps.alumni.models import exclude_student_prefill
+    real_alumni = exclude_student_prefill(Alumni.objects.all())
+    alumni_counts = real_alumni.aggregate(
+        total=Count('pk'),
+        recent=Count('pk', filter=Q(alumniType='recent')),
+        established=Count('pk', filter=Q(alumniType='established')),
+    )
+
+    # Convert support categories to dict format
+    support_dict = {}
+    alumni_by_support = real_alumni.values('currentSupportCategory').annotate(
+        count=Count('student_id')
+    )
+    for item in alumni_by_support:
+        support_dict[item['currentSupportCategory']] = item['count']
+
+    # Convert years to dict format
+    year_dict = {}
+    alumni_by_year = real_alumni.values('graduationYear').annotate(
+        count=Count('student_id')
+    ).order_by('-graduationYear')
+    for item in alumni_by_year:
+        year_dict[str(item['graduationYear'])] = item['count']
+
+    # Application statistics
+    applications_by_status = list(Application.objects.values('status').annotate(
+        count=Count('id')
+    ).order_by('status'))
+    per_application_status = {row['status']: row['count'] for row in applications_by_status}
+
+    applications_by_type = list(Application.objects.values('applicationType').annotate(
+        count=Count('id')
+    ).order_by('applicationType'))
+
+    # Admission statistics
+    admission_counts = _status_counts(Admission.objects.all(), 'status', ('pending', 'approved', 'rejected'))
+
+    # Compile all statistics
+    return {
+        'students': {
+            'total': sum(per_status.values()),
+            'active': per_status.get('active', 0),
+            'graduated': per_status.get('graduated', 0),
+            'discontinued': per_status.get('discontinued', 0),
+            'byStatus': student_stats_by_status,
+            'byDepartment': student_stats_by_department,
+            'bySemester': student_stats_by_semester,
+        },
+        'alumni': {
+            'total': alumni_counts['total'],
+            'recent': alumni_counts['recent'],
+            'established': alumni_counts['established'],
+            'bySupport': support_dict,
+            'byYear': year_dict,
+        },
+        'applications': {
+            'total': sum(per_application_status.values()),
+            'pending': per_application_status.get('pending', 0),
+            'approved': per_application_status.get('approved', 0),
+            'rejected': per_application_status.get('rejected', 0),
+            'byStatus': applications_by_status,
+            'byType': applications_by_type,
+        },
+        'admissions': admission_counts,
+        'teachers': {
+            'total': Teacher.objects.count(),
+        },
+        'departments': {
+            'total': Department.objects.count(),
+        }
+    }
+
+
+def _compute_admin_dashboard(department_filter):
+    # Base querysets
+    students_qs = Student.objects.all()
+    if department_filter:
+        students_qs = students_qs.filter(department_id=department_filter)
+    student_counts = students_qs.aggregate(
+        total=Count('pk'), active=Count('pk', filter=Q(status='active')),
+    )
+    pending_admissions = Admission.objects.filter(status='pending').count()
+    pending_applications = Application.objects.filter(status='pending').count()
+
+    # KPIs
+    kpis = {
+        'totalStudents': student_counts['total'],
+        'activeStudents': student_counts['active'],
+        'totalTeachers': Teacher.objects.count(),
+        'totalDepartments': Department.objects.count(),
+        'pendingAdmissions': pending_admissions,
+        'pendingApplications': pending_applications,
+    }
+
+    # Department summaries. Students and teachers are counted with one
+    # grouped query each: annotating both reverse relations on Department
+    # joins them into a students x teachers product per department.
+    student_counts_by_department = dict(
+        Student.objects.values_list('department_id').annotate(n=Count('pk')).order_by()
+    )
+    teacher_counts_by_department = dict(
+        Teacher.objects.values_list('department_id').annotate(n=Count('pk')).order_by()
+    )
+    department_summaries = [
+        {
+            **department,
+            'student_count': student_counts_by_department.get(department['id'], 0),
+            'teacher_count': teacher_counts_by_department.get(department['id'], 0),
+        }
+        for department in Department.objects.values('id', 'name', 'code')
+    ]
+
+    return {
+        'kpis': kpis,
+        'departmentSummaries': department_summaries,
+        # "Recent" is the latest five pending items.
+        'recentAdmissions': min(pending_admissions, 5),
+        'recentApplications': min(pending_applications, 5),
+    }
+
+
 class DashboardStatsView(APIView):
     """
     API view for dashboard statistics
@@ -35,125 +202,11 @@ class DashboardStatsView(APIView):
         Get comprehensive dashboard statistics
         """
         try:
-            # Base queryset of CONFIRMED students only — alumni self-registrations
-            # still pending review (or rejected) are not students yet, so they are
-            # excluded from every count below.
-            students = exclude_unapproved_alumni(Student.objects.all())
-
-            # Total students count
-            total_students = students.count()
-            active_students = students.filter(status='active').count()
-            graduated_students = students.filter(status='graduated').count()
-            discontinued_students = students.filter(status='discontinued').count()
-
-            # Student statistics by status
-            student_stats_by_status = list(students.values('status').annotate(
-                count=Count('id')
-            ).order_by('status'))
-
-            # Student statistics by department
-            student_stats_by_department = list(students.values(
-                'department__name', 'department__code'
-            ).annotate(
-                count=Count('id')
-            ).order_by('department__name'))
-
-            # Student statistics by semester — active students only, so graduated
-            # students (who sit at semester 8) never inflate the 8th-semester count.
-            student_stats_by_semester = list(students.filter(status='active').values('semester').annotate(
-                count=Count('id')
-            ).order_by('semester'))
-            
-            # Alumni statistics (career-prefill rows of current students are
-            # not alumni and never counted)
-            from apps.alumni.models import exclude_student_prefill
-            real_alumni = exclude_student_prefill(Alumni.objects.all())
-            total_alumni = real_alumni.count()
-            recent_alumni = real_alumni.filter(alumniType='recent').count()
-            established_alumni = real_alumni.filter(alumniType='established').count()
-
-            # Convert support categories to dict format
-            support_dict = {}
-            alumni_by_support = real_alumni.values('currentSupportCategory').annotate(
-                count=Count('student_id')
+            stats = get_or_set(
+                STATS_CACHE_NAMESPACE, 'stats',
+                loader=_compute_dashboard_stats,
+                timeout=getattr(settings, 'DASHBOARD_CACHE_SECONDS', 60),
             )
-            for item in alumni_by_support:
-                support_dict[item['currentSupportCategory']] = item['count']
-
-            # Convert years to dict format
-            year_dict = {}
-            alumni_by_year = real_alumni.values('graduationYear').annotate(
-                count=Count('student_id')
-            ).order_by('-graduationYear')
-            for item in alumni_by_year:
-                year_dict[str(item['graduationYear'])] = item['count']
-            
-            # Application statistics
-            total_applications = Application.objects.count()
-            pending_applications = Application.objects.filter(status='pending').count()
-            approved_applications = Application.objects.filter(status='approved').count()
-            rejected_applications = Application.objects.filter(status='rejected').count()
-            
-            applications_by_status = list(Application.objects.values('status').annotate(
-                count=Count('id')
-            ).order_by('status'))
-            
-            applications_by_type = list(Application.objects.values('applicationType').annotate(
-                count=Count('id')
-            ).order_by('applicationType'))
-            
-            # Admission statistics
-            total_admissions = Admission.objects.count()
-            pending_admissions = Admission.objects.filter(status='pending').count()
-            approved_admissions = Admission.objects.filter(status='approved').count()
-            rejected_admissions = Admission.objects.filter(status='rejected').count()
-            
-            # Teacher statistics
-            total_teachers = Teacher.objects.count()
-            
-            # Department statistics
-            total_departments = Department.objects.count()
-            
-            # Compile all statistics
-            stats = {
-                'students': {
-                    'total': total_students,
-                    'active': active_students,
-                    'graduated': graduated_students,
-                    'discontinued': discontinued_students,
-                    'byStatus': student_stats_by_status,
-                    'byDepartment': student_stats_by_department,
-                    'bySemester': student_stats_by_semester,
-                },
-                'alumni': {
-                    'total': total_alumni,
-                    'recent': recent_alumni,
-                    'established': established_alumni,
-                    'bySupport': support_dict,
-                    'byYear': year_dict,
-                },
-                'applications': {
-                    'total': total_applications,
-                    'pending': pending_applications,
-                    'approved': approved_applications,
-                    'rejected': rejected_applications,
-                    'byStatus': applications_by_status,
-                    'byType': applications_by_type,
-                },
-                'admissions': {
-                    'total': total_admissions,
-                    'pending': pending_admissions,
-                    'approved': approved_admissions,
-                    'rejected': rejected_admissions,
-                },
-                'teachers': {
-                    'total': total_teachers,
-                },
-                'departments': {
-                    'total': total_departments,
-                }
-            }
-            
             return Response(stats, status=status.HTTP_200_OK)
         except Exception as e:
             import traceback
@@ -175,45 +228,12 @@ class AdminDashboardView(APIView):
         """Get admin dashboard data with KPIs"""
         try:
             # Apply filters if provided
-            department_filter = request.query_params.get('department')
-            
-            # Base querysets
-            students_qs = Student.objects.all()
-            if department_filter:
-                students_qs = students_qs.filter(department_id=department_filter)
-            
-            # KPIs
-            kpis = {
-                'totalStudents': students_qs.count(),
-                'activeStudents': students_qs.filter(status='active').count(),
-                'totalTeachers': Teacher.objects.count(),
-                'totalDepartments': Department.objects.count(),
-                'pendingAdmissions': Admission.objects.filter(status='pending').count(),
-                'pendingApplications': Application.objects.filter(status='pending').count(),
-            }
-            
-            # Department summaries.
-            # NOTE: Student.department has no related_name, so its reverse query
-            # lookup is the default 'student' (not 'students'); Teacher uses
-            # related_name='teachers'. Using the wrong keyword here 500s the
-            # whole admin dashboard.
-            department_summaries = list(Department.objects.annotate(
-                student_count=Count('student'),
-                teacher_count=Count('teachers')
-            ).values('id', 'name', 'code', 'student_count', 'teacher_count'))
-            
-            # Recent activities (would come from activity logs)
-            recent_admissions = Admission.objects.filter(status='pending').order_by('-submitted_at')[:5]
-            # Application's timestamp field is submittedAt (camelCase), unlike Admission.
-            recent_applications = Application.objects.filter(status='pending').order_by('-submittedAt')[:5]
-            
-            data = {
-                'kpis': kpis,
-                'departmentSummaries': department_summaries,
-                'recentAdmissions': recent_admissions.count(),
-                'recentApplications': recent_applications.count(),
-            }
-            
+            department_filter = request.query_params.get('department') or ''
+            data = get_or_set(
+                STATS_CACHE_NAMESPACE, 'admin', department_filter,
+                loader=lambda: _compute_admin_dashboard(department_filter),
+                timeout=getattr(settings, 'DASHBOARD_CACHE_SECONDS', 60),
+            )
             return Response(data, status=status.HTTP_200_OK)
         except Exception as e:
             return Response(
@@ -138,7 +138,7 @@ def supersede_field(field_name, *, student_id=None, source_id=None, keep_id=None
         if delete_files and doc.filePath:
             try:
                 from utils.structured_file_storage import structured_storage
-                structured_storage.delete_file(doc.filePath)
+                structured_storage.delete_file(doc.filePath, doc.fileHash)
             except Exception as exc:  # storage problems must not block the upload
                 logger.warning('Could not remove superseded file %s: %s', doc.filePath, exc)
     return superseded
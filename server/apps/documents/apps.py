@@ -8,3 +8,14 @@ class DocumentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.documents'
     verbose_name = 'Documents'
+
+    def ready(self):
+        from . import signals  # noqa: F401 — queue thumbnails for new files
+        from utils.file_storage import FileStorageService
+        from utils.structured_file_storage import StructuredFileStorage
+
+        from .catalog import LEGACY, ROOTS, STRUCTURED, RootCatalog
+
+        # The storage services keep the file catalog in step through these.
+        StructuredFileStorage.catalog = RootCatalog(STRUCTURED)
+        FileStorageService.catalog = RootCatalog(LEGACY, stats_roots=ROOTS)
@@ -0,0 +1,164 @@
+"""
+Document-search benchmark: synthetic documents at real scale, timed query
+by query.
+
+`generate_documents` builds Document rows shaped like the real archive
+(student documents named after their owner, roll-style owner ids,
+standardized categories), deterministically from a seed. `run_benchmark`
+inserts them, then times a fixed mix of searches — whole words, prefixes
+as typed, owner ids, multi-word queries and misses — through
+`search.rank_search`, and the pre-index query (five OR'ed icontains) for
+comparison. Everything runs inside a transaction that is rolled back.
+
+The numbers are only meaningful on the production backend: on PostgreSQL
+the GIN indexes of migration 0011 are used; elsewhere the in-process
+InvertedIndex is (its one-off build is reported as ``indexBuildSeconds``).
+"""
+from __future__ import annotations
+
+import platform
+import random
+import statistics
+import sys
+import time
+import uuid
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from utils.benchmark import git_revision
+
+from .models import Document
+from .search import build_search_text, rank_search
+
+_FIRST = ['Abdul', 'Ayesha', 'Farhan', 'Nusrat', 'Rakib', 'Sadia', 'Tanvir', 'Mim', 'Imran', 'Jannat',
+          'Karim', 'Lamia', 'Mahmud', 'Nabila', 'Rafi', 'Sumaiya', 'Tahmid', 'Urmi', 'Zahid', 'Faria']
+_LAST = ['Hossain', 'Rahman', 'Islam', 'Akter', 'Khan', 'Ahmed', 'Chowdhury', 'Sarkar', 'Mia', 'Begum']
+_DEPARTMENTS = ['cst', 'ct', 'et', 'pt', 'mt', 'rac', 'pwr']
+_CATEGORIES = [choice for choice, _ in Document._meta.get_field('document_category').choices]
+_EXTENSIONS = ['pdf', 'jpg', 'png']
+
+#: (label, query) pairs timed by run_benchmark. Owner ids and names are
+#: drawn from the generated data so they always hit.
+QUERY_MIX = [
+    ('word', 'certificate'),
+    ('prefix', 'marks'),
+    ('prefix_short', 'na'),
+    ('name', '{name}'),
+    ('name_category', '{first} nid'),
+    ('owner_id', '{owner_id}'),
+    ('miss', 'zzqxj'),
+]
+
+
+def generate_documents(count, *, seed=0):
+    """Yield ``count`` unsaved Documents with search_text filled in."""
+    rng = random.Random(seed)
+    for index in range(count):
+        first, last = rng.choice(_FIRST), rng.choice(_LAST)
+        department = rng.choice(_DEPARTMENTS)
+        category = rng.choice(_CATEGORIES)
+        extension = rng.choice(_EXTENSIONS)
+        session = f'{rng.randint(2018, 2025)}-{rng.randint(19, 26)}'
+        owner_id = f'{department.upper()}-{session[:4]}-{index % 100000:05d}'
+        document = Document(
+            id=uuid.UUID(int=rng.getrandbits(128), version=4),
+            fileName=f'{first}{last}_{category}.{extension}',
+            fileType=extension,
+            document_category=category,
+            department_code=department,
+            session=session,
+            owner_name=f'{first} {last}',
+            owner_id=owner_id,
+            filePath=f'students/{department}/{session}/{owner_id}/{category}.{extension}',
+            fileSize=rng.randint(20_000, 2_000_000),
+            year=int(session[:4]),
+        )
+        document.search_text = build_search_text(document)
+        yield document
+
+
+def _legacy_search(queryset, query):
+    return queryset.filter(
+        Q(fileName__icontains=query)
+        | Q(document_category__icontains=query)
+        | Q(search_text__icontains=query)
+        | Q(owner_name__icontains=query)
+        | Q(owner_id__icontains=query)
+    ).order_by('-uploadDate')
+
+
+def _summary(samples):
+    samples = sorted(samples)
+    return {
+        'p50Ms': round(statistics.median(samples) * 1000, 2),
+        'p95Ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 2),
+        'maxMs': round(samples[-1] * 1000, 2),
+    }
+
+
+def _time(run, repeat):
+    samples, hits = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        hits = run()
+        samples.append(time.perf_counter() - started)
+    return {**_summary(samples), 'hits': hits}
+
+
+def run_benchmark(*, documents=100_000, repeat=20, limit=50, seed=0, legacy=True, batch_size=5000):
+    """Insert synthetic documents, time the query mix and return the report dict."""
+    sample = {}
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': sys.platform,
+        'database': connection.vendor,
+        'backend': 'postgres' if connection.vendor == 'postgresql' else 'inverted-index',
+        'scale': {'documents': documents, 'repeat': repeat, 'limit': limit, 'seed': seed},
+        'queries': {},
+    }
+    with transaction.atomic():
+        started = time.perf_counter()
+        batch = []
+        for document in generate_documents(documents, seed=seed):
+            if not sample and document.owner_name:
+                sample = {
+                    'name': document.owner_name.lower(),
+                    'first': document.owner_name.split()[0].lower(),
+                    'owner_id': document.owner_id.lower(),
+                }
+            batch.append(document)
+            if len(batch) >= batch_size:
+                Document.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Document.objects.bulk_create(batch)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE documents')
+        report['insertSeconds'] = round(time.perf_counter() - started, 2)
+
+        queryset = Document.objects.filter(status='active')
+        started = time.perf_counter()
+        rank_search(queryset, 'warmup').exists()
+        report['indexBuildSeconds'] = round(time.perf_counter() - started, 3)
+
+        for label, template in QUERY_MIX:
+            query = template.format(**sample)
+
+            def ranked(query=query):
+                return len(list(
+                    rank_search(queryset, query).order_by('-search_rank', '-uploadDate')
+                    .values_list('pk', flat=True)[:limit]
+                ))
+
+            entry = {'query': query, 'ranked': _time(ranked, repeat)}
+            if legacy:
+                entry['legacy'] = _time(
+                    lambda query=query: len(list(_legacy_search(queryset, query).values_list('pk', flat=True)[:limit])),
+                    repeat,
+                )
+            report['queries'][label] = entry
+        transaction.set_rollback(True)
+    return report
@@ -0,0 +1,315 @@
+"""
+File catalog (StoredFile): what is on disk, without walking the disk.
+
+Two storage roots are catalogued:
+
+- ``structured``: utils.structured_file_storage (paths match Document.filePath);
+- ``legacy``: utils.file_storage under FILE_STORAGE_ROOT, minus the folders
+  other components own there (the structured root, thumbnails, blobs,
+  result caches).
+
+The storage services live in utils and do not import this app: each gets
+a `RootCatalog` bound to its root from DocumentsConfig.ready(). Every
+save/delete then calls `record` / `forget`, with the hash computed during
+the write. `reconcile` (``manage.py sync_file_catalog``, nightly timer)
+catches changes made behind the services' back: it stats every file, but
+hashes only new or changed ones (size, mtime or inode differ, or no hash
+yet) and removes rows for vanished paths.
+
+`stats` and `orphans` replace the os.walk scans used by storage statistics
+and orphan cleanup. A root that was never reconciled (a fresh deploy) is
+first backfilled by a stat-only scan, so they never read an empty catalog;
+the nightly sync fills in the hashes.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+STRUCTURED = 'structured'
+LEGACY = 'legacy'
+ROOTS = (STRUCTURED, LEGACY)
+
+# FILE_STORAGE_ROOT folders that are not legacy uploads (besides the
+# structured root itself): document thumbnails, the blob store, result
+# parse/export caches.
+LEGACY_SKIP_DIRS = {'thumbnails', 'blobs', 'results'}
+
+_BATCH = 1000
+_UPDATE_FIELDS = ['document_type', 'category', 'size', 'file_hash', 'inode', 'mtime_ns', 'updated_at']
+
+
+def storage_root(root: str) -> Path:
+    # Same settings (and defaults) as the storage services use.
+    if root == STRUCTURED:
+        return Path(getattr(settings, 'STRUCTURED_STORAGE_ROOT', settings.BASE_DIR / 'storage' / 'Documents'))
+    return Path(getattr(settings, 'FILE_STORAGE_ROOT', settings.BASE_DIR / 'storage'))
+
+
+def _skipped_dirs(root: str) -> set:
+    if root != LEGACY:
+        return set()
+    skipped = set(LEGACY_SKIP_DIRS)
+    structured = storage_root(STRUCTURED).resolve()
+    if structured.parent == storage_root(LEGACY).resolve():
+        skipped.add(structured.name)
+    return skipped
+
+
+def classify(root: str, path: str) -> Tuple[str, str]:
+    """(document_type, category) of a stored path, from its location/name."""
+    parts = path.split('/')
+    if root == LEGACY:
+        # documents/{year}/{month}/..., images/... (FILE_STORAGE_STRUCTURE)
+        return '', parts[0] if len(parts) > 1 else ''
+    from utils.structured_file_storage import StructuredFileStorage
+    folders = {folder: doc_type for doc_type, folder in StructuredFileStorage.DOCUMENT_TYPES.items()}
+    stem = parts[-1].rsplit('.', 1)[0]
+    category = stem if stem in StructuredFileStorage.DOCUMENT_CATEGORIES else 'other'
+    return folders.get(parts[0], ''), category
+
+
+def _hash_file(full_path) -> str:
+    digest = hashlib.sha256()
+    with open(full_path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _row(root, path, stat_result, file_hash):
+    from .models import StoredFile
+
+    document_type, category = classify(root, path)
+    return StoredFile(
+        root=root, path=path, document_type=document_type, category=category,
+        size=stat_result.st_size, file_hash=file_hash, inode=stat_result.st_ino,
+        mtime_ns=stat_result.st_mtime_ns, updated_at=timezone.now(),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Maintenance (called by the storage services)
+# ---------------------------------------------------------------------------
+
+def record(root: str, path: str, full_path=None, file_hash: str = '') -> None:
+    """Upsert the row of a path that was just written. Never raises."""
+    from .models import StoredFile
+
+    try:
+        stat_result = os.stat(full_path or storage_root(root) / path)
+        if not file_hash:
+            file_hash = _hash_file(full_path or storage_root(root) / path)
+        row = _row(root, path, stat_result, file_hash)
+        defaults = {field: getattr(row, field) for field in _UPDATE_FIELDS}
+        with transaction.atomic():
+            StoredFile.objects.update_or_create(root=root, path=path, defaults=defaults)
+    except Exception as exc:  # noqa: BLE001 - the catalog must never fail a save
+        logger.warning("File catalog: could not record %s:%s: %s", root, path, exc)
+
+
+def forget(root: str, paths: Iterable[str]) -> None:
+    """Drop the rows of deleted paths. Never raises."""
+    from .models import StoredFile
+
+    paths = list(paths)
+    try:
+        with transaction.atomic():
+            for start in range(0, len(paths), _BATCH):
+                StoredFile.objects.filter(root=root, path__in=paths[start:start + _BATCH]).delete()
+    except Exception as exc:  # noqa: BLE001 - the catalog must never fail a delete
+        logger.warning("File catalog: could not forget %d %s paths: %s", len(paths), root, exc)
+
+
+def recorded_hash(root: str, path: str) -> str:
+    """The hash recorded for a path, '' when it is not catalogued. Never raises."""
+    from .models import StoredFile
+
+    try:
+        return StoredFile.objects.filter(root=root, path=path).values_list('file_hash', flat=True).first() or ''
+    except Exception as exc:  # noqa: BLE001 - the catalog must never fail a delete
+        logger.warning("File catalog: could not look up %s:%s: %s", root, path, exc)
+        return ''
+
+
+def move(root: str, old_path: str, new_path: str) -> None:
+    forget(root, [old_path])
+    record(root, new_path)
+
+
+# ---------------------------------------------------------------------------
+# Reconciliation
+# ---------------------------------------------------------------------------
+
+def reconcile(root: str, *, rehash: bool = False, hash_files: bool = True) -> Dict[str, int]:
+    """
+    Bring the catalog of ``root`` in line with the disk. Unchanged files
+    (same size, mtime and inode, already hashed) are not read; ``rehash``
+    re-reads all, and ``hash_files=False`` reads none (rows get no hash).
+    """
+    from .models import StoredFile
+
+    base = storage_root(root)
+    skipped = _skipped_dirs(root)
+    known = {
+        path: (size, mtime_ns, inode, pk, bool(file_hash) or not hash_files)
+        for path, size, mtime_ns, inode, pk, file_hash in StoredFile.objects.filter(root=root)
+        .values_list('path', 'size', 'mtime_ns', 'inode', 'pk', 'file_hash').iterator(chunk_size=5000)
+    }
+    counts = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    to_create, to_update = [], []
+
+    def flush():
+        if to_create:
+            StoredFile.objects.bulk_create(to_create, batch_size=_BATCH, ignore_conflicts=True)
+            to_create.clear()
+        if to_update:
+            StoredFile.objects.bulk_update(to_update, _UPDATE_FIELDS, batch_size=_BATCH)
+            to_update.clear()
+
+    for dirpath, dirnames, filenames in os.walk(base):
+        if Path(dirpath) == base:
+            dirnames[:] = [name for name in dirnames if name not in skipped]
+        for name in filenames:
+            # Dot files and .part files are uploads in flight.
+            if name.startswith('.') or name.endswith('.part'):
+                continue
+            full_path = os.path.join(dirpath, name)
+            path = os.path.relpath(full_path, base).replace(os.sep, '/')
+            try:
+                stat_result = os.stat(full_path)
+                current = known.pop(path, None)
+                if (current and current[4] and not rehash and current[:3] ==
+                        (stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)):
+                    counts['unchanged'] += 1
+                    continue
+                row = _row(root, path, stat_result, _hash_file(full_path) if hash_files else '')
+            except OSError as exc:
+                logger.warning("File catalog: skipping %s: %s", full_path, exc)
+                continue
+            if current:
+                row.pk = current[3]
+                to_update.append(row)
+                counts['updated'] += 1
+            else:
+                to_create.append(row)
+                counts['added'] += 1
+            if len(to_create) + len(to_update) >= _BATCH:
+                flush()
+    flush()
+
+    gone = [entry[3] for entry in known.values()]
+    for start in range(0, len(gone), _BATCH):
+        StoredFile.objects.filter(pk__in=gone[start:start + _BATCH]).delete()
+    counts['removed'] = len(gone)
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def _backfill(roots: Iterable[str]) -> None:
+    """Stat-only scan of every root the catalog knows nothing about."""
+    from .models import StoredFile
+
+    for root in roots:
+        if not StoredFile.objects.filter(root=root).exists():
+            counts = reconcile(root, hash_files=False)
+            if counts['added']:
+                logger.info("File catalog: backfilled %d %s paths", counts['added'], root)
+
+
+def stats(roots: Iterable[str] = (STRUCTURED,)) -> Dict:
+    """
+    Storage totals and a per-document-type breakdown. ``disk_size_bytes``
+    counts each stored content once — hard-linked blob-store paths by inode,
+    copies (the blob store's fallback where links are unsupported) by hash;
+    ``shared_size_bytes`` is what that sharing saves.
+    """
+    from .models import StoredFile
+
+    roots = list(roots)
+    _backfill(roots)
+    rows = StoredFile.objects.filter(root__in=roots)
+    totals = rows.aggregate(files=Count('id'), size=Sum('size'), updated=Max('updated_at'))
+    first_per_hash = rows.exclude(file_hash='').values('file_hash').annotate(first=Min('id')).values('first')
+    first_per_inode = rows.filter(file_hash='').values('inode').annotate(first=Min('id')).values('first')
+    disk = sum(
+        StoredFile.objects.filter(pk__in=first).aggregate(size=Sum('size'))['size'] or 0
+        for first in (first_per_hash, first_per_inode)
+    )
+    total_size = totals['size'] or 0
+
+    by_type = {}
+    for item in rows.exclude(document_type='').values('document_type').annotate(
+            files=Count('id'), size_bytes=Sum('size')).order_by('document_type'):
+        by_type[item['document_type']] = {
+            'files': item['files'],
+            'size_bytes': item['size_bytes'],
+            'size_mb': round(item['size_bytes'] / (1024 * 1024), 2),
+        }
+    return {
+        'total_files': totals['files'],
+        'total_size_bytes': total_size,
+        'total_size_mb': round(total_size / (1024 * 1024), 2),
+        'total_size_gb': round(total_size / (1024 * 1024 * 1024), 2),
+        'disk_size_bytes': disk,
+        'shared_size_bytes': total_size - disk,
+        'by_type': by_type,
+        'catalog_updated_at': totals['updated'],
+    }
+
+
+def orphans(root: str, valid_paths):
+    """
+    StoredFile rows no valid path refers to. ``valid_paths`` may be a
+    values_list queryset (evaluated as a subquery) or an iterable of paths.
+    """
+    from django.db.models.query import QuerySet
+
+    from .models import StoredFile
+
+    _backfill([root])
+    if not isinstance(valid_paths, QuerySet):
+        valid_paths = {str(path).replace('\\', '/') for path in valid_paths if path}
+    return StoredFile.objects.filter(root=root).exclude(path__in=valid_paths)
+
+
+class RootCatalog:
+    """
+    The catalog of one storage root, as a storage service uses it. ``stats``
+    aggregates ``stats_roots`` (the legacy service reports both roots).
+    """
+
+    def __init__(self, root: str, stats_roots: Iterable[str] = ()):
+        self.root = root
+        self.stats_roots = tuple(stats_roots) or (root,)
+
+    def record(self, path: str, full_path=None, file_hash: str = '') -> None:
+        record(self.root, path, full_path, file_hash)
+
+    def forget(self, paths: Iterable[str]) -> None:
+        forget(self.root, paths)
+
+    def move(self, old_path: str, new_path: str) -> None:
+        move(self.root, old_path, new_path)
+
+    def recorded_hash(self, path: str) -> str:
+        return recorded_hash(self.root, path)
+
+    def stats(self) -> Dict:
+        return stats(self.stats_roots)
+
+    def orphans(self, valid_paths):
+        return orphans(self.root, valid_paths)
@@ -1,22 +1,41 @@
 """
 Secure file serving views
 """
-from django.http import FileResponse, Http404, HttpResponse
+from django.http import Http404, HttpResponse
 from django.views import View
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_control
-from django.views.decorators.http import etag
 from django.core.exceptions import PermissionDenied
+from utils.file_response import serve_file
 from utils.file_storage import file_storage
 from .models import Document, DocumentAccessLog
+import mimetypes
 import os
-import hashlib
+import stat
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def locate_stored_file(file_path):
+    """
+    (absolute path, stat result) of a stored file, or None.
+
+    Structured storage (new system) is tried first, then the old flat
+    storage — one stat per candidate.
+    """
+    from utils.structured_file_storage import structured_storage
+    for storage in (structured_storage, file_storage):
+        full_path = storage._get_secure_path(file_path)
+        if full_path is None:
+            continue
+        try:
+            stat_result = full_path.stat()
+        except OSError:
+            continue
+        if stat.S_ISREG(stat_result.st_mode):
+            return str(full_path), stat_result
+    return None
+
+
 class SecureFileView(View):
     """
     Secure file serving with access control and logging
@@ -55,18 +74,11 @@ class SecureFileView(View):
             logger.warning(f"Path traversal attempt: {file_path} from {request.META.get('REMOTE_ADDR')}")
             raise Http404("File not found")
         
-        # Get file info from storage
-        # Try structured storage first (new system)
-        from utils.structured_file_storage import structured_storage
-        file_info = structured_storage.get_file_info(file_path)
-        
-        # Fallback to old storage if not found
-        if not file_info or not file_info.get('exists'):
-            file_info = file_storage.get_file_info(file_path)
-        
-        if not file_info or not file_info.get('exists'):
+        located = locate_stored_file(file_path)
+        if located is None:
             raise Http404("File not found")
-        
+        storage_path, stat_result = located
+
         # Find associated document for access control
         # Use filter().first() instead of get() to handle multiple documents with same path
         # This can happen when:
@@ -85,7 +97,11 @@ class SecureFileView(View):
             document = None
         else:
             try:
-                document = Document.objects.filter(filePath=file_path, status='active').order_by('-uploadDate').first()
+                document = (
+                    Document.objects.filter(filePath=file_path, status='active')
+                    .only('id', 'student_id', 'is_public', 'source_type', 'source_id', 'fileHash')
+                    .order_by('-uploadDate').first()
+                )
                 if not document:
                     # File exists but no document record - only allow admin access
                     if not request.user.is_authenticated or not request.user.is_staff:
@@ -108,30 +124,31 @@ class SecureFileView(View):
         if document:
             self._log_access_attempt(document, request.user, request, True)
         
-        # Serve file
+        # Serve file: 304 on a matching ETag, byte ranges, and the bytes
+        # themselves handed to nginx/Apache when FILE_DELIVERY_MODE says so.
+        if document and document.fileHash:
+            etag = f'"{document.fileHash[:16]}"'
+        else:
+            etag = f'"{int(stat_result.st_mtime)}-{stat_result.st_size}"'
         try:
-            response = FileResponse(
-                open(file_info['storage_path'], 'rb'),
-                content_type=file_info['mime_type'],
-                filename=os.path.basename(file_path)
+            response = serve_file(
+                request, storage_path,
+                content_type=mimetypes.guess_type(storage_path)[0] or 'application/octet-stream',
+                filename=os.path.basename(file_path),
+                etag=etag,
+                cache_control='private, max-age=3600',  # 1 hour cache
+                as_attachment=False,
             )
-            
-            # Add security headers
-            response['X-Content-Type-Options'] = 'nosniff'
-            response['X-Frame-Options'] = 'DENY'
-            response['Cache-Control'] = 'private, max-age=3600'  # 1 hour cache
-            
-            # Add ETag for caching
-            if document and document.fileHash:
-                response['ETag'] = f'"{document.fileHash[:16]}"'
-            
-            return response
-            
-        except Exception as e:
+        except OSError as e:
             logger.error(f"Failed to serve file {file_path}: {str(e)}")
             if document:
                 self._log_access_attempt(document, request.user, request, False, str(e))
             raise Http404("File not found")
+
+        # Add security headers
+        response['X-Content-Type-Options'] = 'nosniff'
+        response['X-Frame-Options'] = 'DENY'
+        return response
     
     def _check_access_permission(self, user, document):
         """Check if user can access the document"""
@@ -189,17 +206,25 @@ class SecureFileView(View):
 
 class DocumentThumbnailView(View):
     """
-    Generate and serve document thumbnails
+    Serve document thumbnails (JPEG; see apps.documents.thumbnails)
     """
     
     def get(self, request, document_id):
         """
-        Generate thumbnail for document
+        Serve the thumbnail of a document, rendering it on first request
         
-        URL: /files/thumbnail/{document_id}/
+        URL: /files/thumbnail/{document_id}/?size=small|medium
         """
+        from . import thumbnails
+
+        size = request.GET.get('size', thumbnails.DEFAULT_SIZE)
+        if size not in thumbnails.SIZES:
+            raise Http404("Unknown thumbnail size")
         try:
-            document = Document.objects.get(id=document_id, status='active')
+            document = Document.objects.only(
+                'id', 'fileType', 'filePath', 'fileHash', 'status', 'is_public',
+                'student_id', 'source_type', 'source_id',
+            ).get(id=document_id, status='active')
         except Document.DoesNotExist:
             raise Http404("Document not found")
         
@@ -208,14 +233,19 @@ class DocumentThumbnailView(View):
             raise PermissionDenied("Access denied")
         
         # Only generate thumbnails for images and PDFs
-        if not (document.is_image or document.is_pdf):
+        if not thumbnails.supports(document):
             raise Http404("Thumbnail not available for this file type")
         
-        # For now, return a placeholder response
-        # In a full implementation, you would generate actual thumbnails
-        return HttpResponse(
-            "Thumbnail generation not implemented yet",
-            content_type="text/plain"
+        path = thumbnails.ensure_thumbnail(document, size)
+        if path is None:
+            raise Http404("Thumbnail not available")
+        thumbnails.touch(path)
+        # Content-addressed: the bytes behind this ETag never change.
+        return serve_file(
+            request, path,
+            content_type=thumbnails.CONTENT_TYPE,
+            etag=f'"{document.fileHash[:16]}-{size}-v{thumbnails.THUMBNAIL_VERSION}"',
+            cache_control='private, max-age=86400',
         )
     
     def _check_access_permission(self, user, document):
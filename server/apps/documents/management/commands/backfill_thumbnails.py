@@ -0,0 +1,71 @@
+"""
+Render thumbnails for documents uploaded before thumbnails existed.
+
+    python manage.py backfill_thumbnails                    # every size, inline
+    python manage.py backfill_thumbnails --sizes small      # grid thumbnails only
+    python manage.py backfill_thumbnails --async            # queue jobs instead
+    python manage.py backfill_thumbnails --force --limit 500
+
+Thumbnails that already exist are skipped (unless --force), so the command
+can be re-run after an interruption. The disk quota is enforced at the end.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from apps.documents import thumbnails
+from apps.documents.models import Document
+
+IMAGE_AND_PDF_TYPES = ('jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'pdf')
+
+
+class Command(BaseCommand):
+    help = 'Generate missing document thumbnails.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', default=list(thumbnails.SIZES),
+                            help=f"Sizes to render ({', '.join(thumbnails.SIZES)})")
+        parser.add_argument('--limit', type=int, help='Stop after this many documents')
+        parser.add_argument('--async', dest='use_jobs', action='store_true',
+                            help='Queue a background job per document instead of rendering here')
+        parser.add_argument('--force', action='store_true', help='Re-render existing thumbnails')
+
+    def handle(self, *args, **options):
+        sizes = options['sizes']
+        unknown = set(sizes) - set(thumbnails.SIZES)
+        if unknown:
+            raise CommandError(f"Unknown size(s): {', '.join(sorted(unknown))}")
+
+        type_filter = Q()
+        for file_type in IMAGE_AND_PDF_TYPES:
+            type_filter |= Q(fileType__iexact=file_type)
+        documents = (
+            Document.objects.filter(type_filter, status='active')
+            .only('id', 'fileType', 'filePath', 'fileHash', 'status')
+            .order_by('uploadDate')
+        )
+        if options['limit']:
+            documents = documents[:options['limit']]
+
+        rendered = skipped = failed = queued = 0
+        for document in documents.iterator(chunk_size=500):
+            if options['use_jobs']:
+                thumbnails.schedule_thumbnails(document)
+                queued += 1
+                continue
+            for size in sizes:
+                if (not options['force'] and document.fileHash
+                        and thumbnails.thumbnail_path(document.fileHash, size).exists()):
+                    skipped += 1
+                elif thumbnails.ensure_thumbnail(document, size, force=options['force']):
+                    rendered += 1
+                else:
+                    failed += 1
+
+        if options['use_jobs']:
+            self.stdout.write(self.style.SUCCESS(f'Queued thumbnail jobs for {queued} documents'))
+            return
+        pruned = thumbnails.prune()
+        self.stdout.write(self.style.SUCCESS(
+            f'Thumbnails: {rendered} rendered, {skipped} already present, '
+            f'{failed} unavailable (missing/unreadable file), {pruned} pruned'
+        ))
@@ -0,0 +1,44 @@
+"""
+Benchmark document search on synthetic data.
+
+    python manage.py benchmark_document_search                          # 100k documents
+    python manage.py benchmark_document_search --documents 1000000      # production scale
+    python manage.py benchmark_document_search --no-legacy --repeat 50  # ranked search only
+    python manage.py benchmark_document_search --output bench.json      # save the JSON report
+
+Each query of the mix is timed through the search engine (PostgreSQL
+full-text + trigram indexes, or the in-process fallback elsewhere) and,
+unless --no-legacy, through the old OR'ed icontains query. Inserted
+documents are rolled back.
+"""
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from apps.documents.benchmark import run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Time document search on synthetic documents and print a JSON report.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=100_000, help='Documents to generate')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per query')
+        parser.add_argument('--limit', type=int, default=50, help='Results fetched per query')
+        parser.add_argument('--seed', type=int, default=0, help='Generator seed')
+        parser.add_argument('--no-legacy', action='store_true', help='Skip the icontains baseline')
+        parser.add_argument('--output', help='Also write the report to this file')
+
+    def handle(self, *args, **options):
+        report = run_benchmark(
+            documents=options['documents'],
+            repeat=options['repeat'],
+            limit=options['limit'],
+            seed=options['seed'],
+            legacy=not options['no_legacy'],
+        )
+        payload = json.dumps(report, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(payload + '\n')
+        self.stdout.write(payload)
@@ -47,60 +47,37 @@ class Command(BaseCommand):
     
     def cleanup_orphaned_files(self, dry_run):
         """Remove files not referenced in database"""
+        from django.db.models import Count, Sum
+        from apps.documents import catalog
+
         self.stdout.write(self.style.SUCCESS('\n=== Checking for Orphaned Files ===\n'))
         
-        # Get all file paths from database
-        self.stdout.write('Loading file paths from database...')
-        db_paths = set(
-            Document.objects.values_list('filePath', flat=True)
-        )
-        self.stdout.write(f'Found {len(db_paths)} files in database\n')
-        
-        # Scan storage directory
-        self.stdout.write('Scanning storage directory...')
-        storage_root = structured_storage.storage_root
-        orphaned = []
-        total_size = 0
+        # File paths from database, matched against the file catalog in SQL
+        db_paths = Document.objects.values_list('filePath', flat=True)
+        self.stdout.write(f'Found {db_paths.count()} files in database\n')
         
-        for file_path in storage_root.rglob('*'):
-            if file_path.is_file():
-                relative_path = str(file_path.relative_to(storage_root)).replace('\\', '/')
-                if relative_path not in db_paths:
-                    file_size = file_path.stat().st_size
-                    orphaned.append({
-                        'path': file_path,
-                        'relative_path': relative_path,
-                        'size': file_size
-                    })
-                    total_size += file_size
+        orphaned = catalog.orphans(catalog.STRUCTURED, db_paths)
+        totals = orphaned.aggregate(count=Count('id'), size=Sum('size'))
+        total_size = totals['size'] or 0
         
-        self.stdout.write(f'\nFound {len(orphaned)} orphaned files')
+        self.stdout.write(f'\nFound {totals["count"]} orphaned files')
         self.stdout.write(f'Total size: {total_size / (1024 * 1024):.2f} MB\n')
         
-        if orphaned:
+        if totals['count']:
             if not dry_run:
                 self.stdout.write('Deleting orphaned files...')
-                deleted_count = 0
-                for item in orphaned:
-                    try:
-                        item['path'].unlink()
-                        deleted_count += 1
-                        self.stdout.write(f"✓ Deleted: {item['relative_path']}")
-                    except Exception as e:
-                        self.stdout.write(
-                            self.style.ERROR(f"✗ Failed to delete {item['relative_path']}: {e}")
-                        )
-                
+                stats = structured_storage.cleanup_orphaned_files(db_paths)
                 self.stdout.write(self.style.SUCCESS(
-                    f'\nDeleted {deleted_count} orphaned files'
+                    f"\nDeleted {stats['deleted_count']} orphaned files "
+                    f"({stats['deleted_size_mb']} MB freed)"
                 ))
             else:
                 self.stdout.write('\nFiles that would be deleted:')
-                for item in orphaned[:20]:  # Show first 20
-                    self.stdout.write(f"  - {item['relative_path']} ({item['size'] / 1024:.2f} KB)")
+                for path, size in orphaned.order_by('path').values_list('path', 'size')[:20]:  # Show first 20
+                    self.stdout.write(f"  - {path} ({size / 1024:.2f} KB)")
                 
-                if len(orphaned) > 20:
-                    self.stdout.write(f"  ... and {len(orphaned) - 20} more")
+                if totals['count'] > 20:
+                    self.stdout.write(f"  ... and {totals['count'] - 20} more")
         else:
             self.stdout.write(self.style.SUCCESS('No orphaned files found'))
     
@@ -128,7 +105,7 @@ class Command(BaseCommand):
                 total_size += file_info['file_size']
                 
                 if not dry_run:
-                    success = structured_storage.delete_file(doc.filePath)
+                    success = structured_storage.delete_file(doc.filePath, doc.fileHash)
                     if success:
                         deleted_count += 1
                         self.stdout.write(f"✓ Deleted: {doc.fileName}")
@@ -0,0 +1,59 @@
+"""
+Move existing structured-storage files into the content-addressed blob store.
+
+    python manage.py dedupe_storage             # convert every active document's file
+    python manage.py dedupe_storage --dry-run   # only count what would be converted
+
+New uploads go to the blob store by themselves once DOCUMENT_STORAGE_DEDUP
+is on; this converts files written before that. Each file is hashed once,
+stored under its SHA-256 (or dropped when the blob already exists) and
+replaced by a hard link, so identical copies end up sharing their bytes.
+Safe to re-run: files that already are links are skipped.
+"""
+import os
+
+from django.core.management.base import BaseCommand
+
+from apps.documents.models import Document
+from utils.structured_file_storage import structured_storage
+
+
+class Command(BaseCommand):
+    help = 'Store existing document files once per content hash (hard links into the blob store).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Count files without converting')
+
+    def handle(self, *args, **options):
+        paths = (
+            Document.objects.filter(status='active').exclude(filePath='')
+            .values_list('filePath', flat=True).distinct().iterator(chunk_size=1000)
+        )
+        converted = skipped = missing = 0
+        for file_path in paths:
+            full_path = structured_storage._get_secure_path(file_path)
+            try:
+                links = os.stat(full_path).st_nlink if full_path else 0
+            except OSError:
+                links = 0
+            if not links:
+                missing += 1
+            elif links > 1:
+                skipped += 1
+            elif options['dry_run']:
+                converted += 1
+            elif structured_storage.adopt_into_blob_store(file_path):
+                converted += 1
+            else:
+                missing += 1
+
+        verb = 'Would convert' if options['dry_run'] else 'Converted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {converted} files; {skipped} already linked, {missing} missing'
+        ))
+        if not options['dry_run']:
+            blobs = structured_storage.get_blob_stats()
+            self.stdout.write(
+                f"Blob store: {blobs['blobs']} blobs for {blobs['references']} paths, "
+                f"{blobs['saved_bytes'] / (1024 * 1024):.2f} MB saved"
+            )
@@ -63,23 +63,27 @@ class Command(BaseCommand):
 
     def cleanup_orphaned_files(self, dry_run=False):
         """Clean up files not referenced in database"""
-        self.stdout.write('Scanning for orphaned files...')
+        from django.db.models import Count, Sum
+        from apps.documents import catalog
+
+        self.stdout.write('Looking up orphaned files in the file catalog...')
         
-        # Get all valid file paths from database
-        valid_paths = list(
+        # Valid file paths from database (matched in SQL, never loaded)
+        valid_paths = (
             Document.objects.filter(status='active')
             .values_list('filePath', flat=True)
         )
         
-        self.stdout.write(f'Found {len(valid_paths)} valid file references in database')
+        self.stdout.write(f'Found {valid_paths.count()} valid file references in database')
         
         if dry_run:
             # Just show what would be cleaned up
-            orphaned_count = 0
-            orphaned_size = 0
+            orphaned = catalog.orphans(catalog.LEGACY, valid_paths).aggregate(
+                count=Count('id'), size=Sum('size')
+            )
+            orphaned_count = orphaned['count']
+            orphaned_size = orphaned['size'] or 0
             
-            # This would need to be implemented in file_storage service
-            # For now, just show the concept
             self.stdout.write(
                 self.style.WARNING(
                     f'Would clean up {orphaned_count} orphaned files '
@@ -0,0 +1,26 @@
+"""
+Keep the thumbnail directory under its disk quota.
+
+    python manage.py prune_thumbnails                  # DOCUMENT_THUMBNAIL_CACHE_MAX_MB
+    python manage.py prune_thumbnails --max-mb 128
+
+Drops the least recently served thumbnails first; they are re-rendered on
+demand. Run nightly by deploy-scripts/file-catalog-timer.sh, so uploads never
+pay for a walk of the directory.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.documents import thumbnails
+
+
+class Command(BaseCommand):
+    help = 'Delete least recently used thumbnails while over the disk quota.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-mb', type=int,
+                            help='Quota in MB (default: DOCUMENT_THUMBNAIL_CACHE_MAX_MB)')
+
+    def handle(self, *args, **options):
+        max_bytes = options['max_mb'] * 1024 * 1024 if options['max_mb'] else None
+        removed = thumbnails.prune(max_bytes)
+        self.stdout.write(self.style.SUCCESS(f'Thumbnails: {removed} pruned'))
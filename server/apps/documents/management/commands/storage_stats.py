@@ -89,13 +89,19 @@ class Command(BaseCommand):
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Error calculating duplicates: {e}"))
         
-        # File system stats
+        # File system stats (from the file catalog; see sync_file_catalog)
         self.stdout.write('\n--- File System Stats ---')
         try:
             fs_stats = structured_storage.get_storage_stats()
             self.stdout.write(f"Storage root: {fs_stats['storage_root']}")
             self.stdout.write(f"Total files on disk: {fs_stats['total_files']:,}")
             self.stdout.write(f"Total size on disk: {fs_stats['total_size_gb']:.2f} GB")
+            if fs_stats['shared_size_bytes']:
+                self.stdout.write(
+                    f"Shared by hard links (blob store): {fs_stats['shared_size_bytes'] / (1024**2):.2f} MB"
+                )
+            if fs_stats['catalog_updated_at']:
+                self.stdout.write(f"Catalog last updated: {fs_stats['catalog_updated_at']:%Y-%m-%d %H:%M}")
             
             if fs_stats['by_type']:
                 self.stdout.write('\nBy type on disk:')
@@ -0,0 +1,35 @@
+"""
+Reconcile the file catalog (StoredFile) with what is on disk.
+
+    python manage.py sync_file_catalog                      # both roots, incremental
+    python manage.py sync_file_catalog --root structured    # one root only
+    python manage.py sync_file_catalog --rehash             # re-read every file
+
+Uploads and deletes through the storage services keep the catalog current
+on their own; this picks up everything else (restores, rsync, manual
+edits). Unchanged files (same size, mtime and inode) are only stat'ed, so
+the nightly run (deploy-scripts/file-catalog-timer.sh) stays cheap. The
+first run after deploying the catalog hashes every file once.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.documents import catalog
+
+
+class Command(BaseCommand):
+    help = 'Bring the stored-file catalog in line with the storage directories.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--root', choices=[*catalog.ROOTS, 'all'], default='all',
+                            help='Storage root to reconcile')
+        parser.add_argument('--rehash', action='store_true',
+                            help='Hash every file again, not only new or changed ones')
+
+    def handle(self, *args, **options):
+        roots = catalog.ROOTS if options['root'] == 'all' else [options['root']]
+        for root in roots:
+            counts = catalog.reconcile(root, rehash=options['rehash'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{root}: {counts['added']} added, {counts['updated']} updated, "
+                f"{counts['removed']} removed, {counts['unchanged']} unchanged"
+            ))
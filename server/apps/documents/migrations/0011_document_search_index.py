@@ -0,0 +1,86 @@
+"""
+Full-text / trigram search over Document.search_text.
+
+search_text now also carries the standardized document_category (searches
+used to OR a separate icontains on it), so existing rows are rebuilt. On
+PostgreSQL two GIN indexes serve apps.documents.search:
+
+- documents_search_tsv_idx: to_tsvector('simple', search_text), for word
+  and prefix matches;
+- documents_search_trgm_idx: search_text gin_trgm_ops, for substring
+  (LIKE '%...%') matches and similarity ranking.
+
+Other databases use the in-process fallback and get no indexes.
+"""
+from django.db import migrations, models
+
+
+SEARCH_INDEXES = [
+    ('documents_search_tsv_idx', "USING GIN (to_tsvector('simple', search_text))"),
+    ('documents_search_trgm_idx', 'USING GIN (search_text gin_trgm_ops)'),
+]
+
+
+def _search_text(doc):
+    # Mirrors documents.search.build_search_text.
+    parts = [doc.fileName, doc.document_category]
+    if doc.description:
+        parts.append(doc.description)
+    if doc.tags:
+        parts.extend(str(tag) for tag in doc.tags)
+    if doc.owner_name:
+        parts.append(doc.owner_name)
+    if doc.owner_id:
+        parts.append(doc.owner_id)
+    return ' '.join(part for part in parts if part).lower()
+
+
+def rebuild_search_text(apps, schema_editor):
+    Document = apps.get_model('documents', 'Document')
+    batch = []
+    qs = Document.objects.only(
+        'id', 'fileName', 'document_category', 'description', 'tags',
+        'owner_name', 'owner_id', 'search_text',
+    )
+    for doc in qs.iterator(chunk_size=2000):
+        text = _search_text(doc)
+        if text != doc.search_text:
+            doc.search_text = text
+            batch.append(doc)
+        if len(batch) >= 1000:
+            Document.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        Document.objects.bulk_update(batch, ['search_text'])
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, definition in SEARCH_INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON documents {definition}')
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0010_unique_active_document_per_field'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='search_text',
+            field=models.TextField(blank=True, default='', help_text='Searchable text combining filename, category, description, tags and owner'),
+        ),
+        migrations.RunPython(rebuild_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
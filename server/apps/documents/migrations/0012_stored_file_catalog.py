@@ -0,0 +1,41 @@
+"""
+StoredFile: catalog of files on disk (documents.catalog).
+
+Storage statistics and orphan cleanup query this table instead of walking
+the storage tree. It starts empty; `manage.py sync_file_catalog` (run by
+deploy.sh and nightly) fills it from the existing files.
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0011_document_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('root', models.CharField(choices=[('structured', 'Structured storage'), ('legacy', 'Legacy flat storage')], default='structured', max_length=20)),
+                ('path', models.CharField(help_text='Path relative to the storage root', max_length=500)),
+                ('document_type', models.CharField(blank=True, help_text='student / teacher / alumni / ... (structured top folder)', max_length=20)),
+                ('category', models.CharField(blank=True, max_length=50)),
+                ('size', models.BigIntegerField()),
+                ('file_hash', models.CharField(blank=True, max_length=64)),
+                ('inode', models.BigIntegerField(default=0)),
+                ('mtime_ns', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'stored_files',
+                'indexes': [models.Index(fields=['root', 'document_type'], name='stored_file_type_idx'), models.Index(fields=['file_hash'], name='stored_file_hash_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='storedfile',
+            constraint=models.UniqueConstraint(fields=('root', 'path'), name='stored_file_unique_path'),
+        ),
+    ]
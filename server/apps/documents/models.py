@@ -152,7 +152,7 @@ class Document(models.Model):
     search_text = models.TextField(
         blank=True,
         default='',
-        help_text='Searchable text combining filename, description, and tags'
+        help_text='Searchable text combining filename, category, description, tags and owner'
     )
     status = models.CharField(
         max_length=20,
@@ -377,18 +377,18 @@ class Document(models.Model):
             from django.utils import timezone
             self.year = timezone.now().year
 
-        # Populate search_text field
-        search_parts = [self.fileName]
-        if self.description:
-            search_parts.append(self.description)
-        if self.tags:
-            search_parts.extend(self.tags)
-        if self.owner_name:
-            search_parts.append(self.owner_name)
-        if self.owner_id:
-            search_parts.append(self.owner_id)
-
-        self.search_text = ' '.join(search_parts).lower()
+        # Populate search_text, only when a field it is built from is saved
+        # (a status/metadata update leaves the column alone). lastModified is
+        # saved with it: the fallback search index rebuilds when it moves.
+        from .search import SEARCH_SOURCE_FIELDS, build_search_text
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.search_text = build_search_text(self)
+        elif SEARCH_SOURCE_FIELDS.intersection(update_fields):
+            self.search_text = build_search_text(self)
+            kwargs['update_fields'] = {*update_fields, 'search_text', 'lastModified'}
+        elif 'search_text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'lastModified'}
 
         super().save(*args, **kwargs)
 
@@ -489,3 +489,45 @@ class DocumentAccessLog(models.Model):
     
     def __str__(self):
         return f"{self.access_type} - {self.document.fileName} by {self.user}"
+
+
+class StoredFile(models.Model):
+    """
+    Catalog of the files on disk, one row per stored path.
+
+    The storage services (utils.structured_file_storage, utils.file_storage)
+    record every save and delete here, and `manage.py sync_file_catalog`
+    reconciles it with the disk incrementally (see documents.catalog), so
+    storage statistics and orphan detection are queries, not tree walks.
+    """
+    ROOT_CHOICES = [
+        ('structured', 'Structured storage'),
+        ('legacy', 'Legacy flat storage'),
+    ]
+
+    root = models.CharField(max_length=20, choices=ROOT_CHOICES, default='structured')
+    path = models.CharField(max_length=500, help_text="Path relative to the storage root")
+    document_type = models.CharField(
+        max_length=20, blank=True,
+        help_text="student / teacher / alumni / ... (structured top folder)"
+    )
+    category = models.CharField(max_length=50, blank=True)
+    size = models.BigIntegerField()
+    file_hash = models.CharField(max_length=64, blank=True)
+    # Hard links (blob store) share an inode; disk usage counts it once.
+    inode = models.BigIntegerField(default=0)
+    mtime_ns = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'stored_files'
+        constraints = [
+            models.UniqueConstraint(fields=['root', 'path'], name='stored_file_unique_path'),
+        ]
+        indexes = [
+            models.Index(fields=['root', 'document_type'], name='stored_file_type_idx'),
+            models.Index(fields=['file_hash'], name='stored_file_hash_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.root}:{self.path}"
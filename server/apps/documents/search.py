@@ -1,15 +1,210 @@
 """
-Simple Document Search
-Provides fast, simple search functionality without complex dependencies
+Document search.
+
+Every searchable attribute of a Document (file name, standardized category,
+description, tags, owner name and id) is folded into the lower-cased
+``search_text`` column by `build_search_text`, which Document.save() keeps
+current — and only rewrites when one of SEARCH_SOURCE_FIELDS is being
+saved. Searching therefore touches one column, through one of two backends:
+
+- PostgreSQL (production): a GIN index on ``to_tsvector('simple',
+  search_text)`` and a pg_trgm GIN index on ``search_text`` (migration
+  0011). A query matches when all of its terms match as word prefixes, or
+  when it occurs as a substring (LIKE, served by the trigram index); results
+  are ranked by ts_rank + trigram similarity.
+- Anything else (SQLite in tests/dev): `InvertedIndex`, an in-process
+  token -> documents index rebuilt when the table changes, with the same
+  prefix semantics and an exact > prefix > infix term ranking.
+
+`rank_search` applies either backend to a queryset (annotating
+``search_rank``); `DocumentSearch.search` and `DocumentSearchFilter` (the
+``?search=`` parameter of the documents API) are built on it. See the
+`benchmark_document_search` management command for latency at scale.
 """
-from django.db.models import Q
 import logging
+import re
+import threading
+from bisect import bisect_left
+
+from django.db import connections
+from django.db.models import BooleanField, Case, Count, FloatField, Max, Value, When
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
 
 logger = logging.getLogger(__name__)
 
+# Document fields whose values end up in search_text.
+SEARCH_SOURCE_FIELDS = frozenset(
+    ['fileName', 'document_category', 'description', 'tags', 'owner_name', 'owner_id']
+)
+
+_TERM = re.compile(r'[^\W_]+')
+
+# InvertedIndex term weights.
+_EXACT, _PREFIX, _INFIX = 1.0, 0.75, 0.25
+
+
+def search_terms(text):
+    """Lower-cased word tokens of ``text`` (punctuation and '_' separate)."""
+    return _TERM.findall((text or '').lower())
+
+
+def build_search_text(document):
+    """The search_text value for a document."""
+    parts = [document.fileName, document.document_category]
+    if document.description:
+        parts.append(document.description)
+    if document.tags:
+        parts.extend(str(tag) for tag in document.tags)
+    if document.owner_name:
+        parts.append(document.owner_name)
+    if document.owner_id:
+        parts.append(document.owner_id)
+    return ' '.join(part for part in parts if part).lower()
+
+
+class InvertedIndex:
+    """
+    In-process inverted index over Document.search_text, for databases
+    without full-text indexes. Rebuilt lazily whenever the row count or the
+    newest ``lastModified`` of the table changes; Document.save() moves
+    lastModified whenever it writes search_text, so writes that bypass it
+    (``update()``, ``bulk_update``) must set lastModified too.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._postings = {}
+        self._vocabulary = []
+
+    def _refresh(self, model, using):
+        manager = model._default_manager.using(using)
+        stamp = manager.aggregate(rows=Count('pk'), changed=Max('lastModified'))
+        key = (using, stamp['rows'], stamp['changed'])
+        if key == self._key:
+            return
+        postings = {}
+        for pk, text in manager.values_list('pk', 'search_text').iterator(chunk_size=2000):
+            for term in search_terms(text):
+                postings.setdefault(term, set()).add(pk)
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+        self._key = key
+
+    def _matches(self, term):
+        """{pk: weight} of documents with a token equal to, starting with or
+        containing ``term``."""
+        weights = {}
+        vocabulary = self._vocabulary
+        index = bisect_left(vocabulary, term)
+        while index < len(vocabulary) and vocabulary[index].startswith(term):
+            token = vocabulary[index]
+            weight = _EXACT if token == term else _PREFIX
+            for pk in self._postings[token]:
+                weights[pk] = max(weights.get(pk, 0), weight)
+            index += 1
+        if len(term) >= 3:
+            for token in vocabulary:
+                if term in token and not token.startswith(term):
+                    for pk in self._postings[token]:
+                        weights.setdefault(pk, _INFIX)
+        return weights
+
+    def scores(self, model, using, terms):
+        """{pk: rank} of the documents matching every term."""
+        with self._lock:
+            self._refresh(model, using)
+            scores = None
+            for term in terms:
+                weights = self._matches(term)
+                if scores is None:
+                    scores = weights
+                else:
+                    scores = {pk: score + weights[pk] for pk, score in scores.items() if pk in weights}
+                if not scores:
+                    return {}
+            return scores or {}
+
+
+_fallback_index = InvertedIndex()
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _postgres_search(queryset, query, terms):
+    quote = connections[queryset.db].ops.quote_name
+    column = f"{quote(queryset.model._meta.db_table)}.{quote('search_text')}"
+    # Must match the expression indexed by migration 0011.
+    vector = f"to_tsvector('simple', {column})"
+    pattern = f'%{_escape_like(query)}%'
+    if terms:
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        condition = RawSQL(
+            f"({vector} @@ to_tsquery('simple', %s) OR {column} LIKE %s)",
+            (tsquery, pattern), output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"ts_rank({vector}, to_tsquery('simple', %s)) + similarity({column}, %s)",
+            (tsquery, query), output_field=FloatField(),
+        )
+    else:
+        condition = RawSQL(f'{column} LIKE %s', (pattern,), output_field=BooleanField())
+        rank = RawSQL(f'similarity({column}, %s)', (query,), output_field=FloatField())
+    return queryset.filter(condition).annotate(search_rank=rank)
+
+
+def _fallback_search(queryset, terms):
+    scores = _fallback_index.scores(queryset.model, queryset.db, terms)
+    if not scores:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+    return queryset.filter(pk__in=scores).annotate(search_rank=Case(
+        *(When(pk=pk, then=Value(score)) for pk, score in scores.items()),
+        default=Value(0.0),
+        output_field=FloatField(),
+    ))
+
+
+def rank_search(queryset, query):
+    """
+    Filter a Document queryset to the matches of ``query`` and annotate each
+    with ``search_rank`` (higher is better). The ordering is left to the
+    caller.
+    """
+    query = ' '.join((query or '').lower().split())
+    if not query:
+        return queryset
+    terms = search_terms(query)
+    if connections[queryset.db].vendor == 'postgresql':
+        return _postgres_search(queryset, query, terms)
+    if not terms:
+        return queryset.filter(search_text__contains=query).annotate(
+            search_rank=Value(0.0, output_field=FloatField()),
+        )
+    return _fallback_search(queryset, terms)
+
+
+class DocumentSearchFilter(BaseFilterBackend):
+    """
+    ``?search=`` for the documents API, through `rank_search`. Results are
+    ordered by rank unless the request asks for an explicit ``ordering``.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not query.strip():
+            return queryset
+        queryset = rank_search(queryset, query)
+        if request.query_params.get('ordering'):
+            return queryset
+        return queryset.order_by('-search_rank', '-uploadDate')
+
 
 class DocumentSearch:
-    """Simple but effective document search"""
+    """Document search with structured filters (see the module docstring)"""
     
     @staticmethod
     def search(query, filters=None):
@@ -27,23 +222,13 @@ class DocumentSearch:
                 - session: str
                 
         Returns:
-            QuerySet of matching documents
+            QuerySet of matching documents, best matches first when a
+            query is given (newest first otherwise)
         """
         from apps.documents.models import Document
         
         queryset = Document.objects.filter(status='active')
         
-        # Text search
-        if query:
-            query = query.strip().lower()
-            queryset = queryset.filter(
-                Q(fileName__icontains=query) |
-                Q(document_category__icontains=query) |
-                Q(search_text__icontains=query) |
-                Q(owner_name__icontains=query) |
-                Q(owner_id__icontains=query)
-            )
-        
         # Apply filters
         if filters:
             if 'student_id' in filters and filters['student_id']:
@@ -64,7 +249,10 @@ class DocumentSearch:
             if 'session' in filters and filters['session']:
                 queryset = queryset.filter(session=filters['session'])
         
-        return queryset.select_related('student').order_by('-uploadDate')
+        queryset = queryset.select_related('student')
+        if query and query.strip():
+            return rank_search(queryset, query).order_by('-search_rank', '-uploadDate')
+        return queryset.order_by('-uploadDate')
     
     @staticmethod
     def search_student_documents(student_id, query=None):
@@ -146,21 +334,7 @@ class DocumentSearch:
         Args:
             document: Document instance
         """
-        search_parts = [document.fileName]
-        
-        if document.description:
-            search_parts.append(document.description)
-        
-        if document.tags:
-            search_parts.extend(document.tags)
-        
-        if document.owner_name:
-            search_parts.append(document.owner_name)
-        
-        if document.owner_id:
-            search_parts.append(document.owner_id)
-        
-        document.search_text = ' '.join(search_parts).lower()
+        document.search_text = build_search_text(document)
         document.save(update_fields=['search_text'])
 
 
@@ -0,0 +1,31 @@
+"""
+Queue thumbnail generation when a document gets a (new) file, so
+DocumentThumbnailView usually finds the thumbnail already rendered.
+"""
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from . import thumbnails
+from .models import Document
+
+# Saving any of these can point the document at different bytes.
+_FILE_FIELDS = {'filePath', 'fileHash', 'fileType'}
+
+
+@receiver(post_save, sender=Document, dispatch_uid='documents_schedule_thumbnails')
+def schedule_thumbnails(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or instance.status != 'active' or not thumbnails.supports(instance):
+        return
+    if not created:
+        if update_fields is not None:
+            if not _FILE_FIELDS.intersection(update_fields):
+                return
+        # Full save: only when the current file has no thumbnail yet.
+        elif not instance.fileHash or thumbnails.thumbnail_path(
+                instance.fileHash, thumbnails.DEFAULT_SIZE).exists():
+            return
+    # After commit: the job must see the row (and the upload's file).
+    transaction.on_commit(lambda: thumbnails.schedule_thumbnails(instance))
@@ -274,7 +274,7 @@ class StudentDocumentDetailView(APIView):
         try:
             with transaction.atomic():
                 # Delete physical file
-                file_deleted = structured_storage.delete_file(document.filePath)
+                file_deleted = structured_storage.delete_file(document.filePath, document.fileHash)
                 
                 if not file_deleted:
                     logger.warning(f"Physical file not found: {document.filePath}")
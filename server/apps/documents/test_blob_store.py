@@ -0,0 +1,161 @@
+"""
+Content-addressed blob store (DOCUMENT_STORAGE_DEDUP): identical uploads
+share one blob, structured paths are hard links, deletes and orphan cleanup
+respect the link count.
+"""
+import hashlib
+import io
+import os
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+
+from utils.structured_file_storage import StructuredFileStorage
+from utils.testing import TempStorageMixin
+
+PAYLOAD = b'%PDF-1.4 ' + os.urandom(4096)
+STUDENT = {'department_code': 'cst', 'session': '2024-2025', 'shift': '1st-shift'}
+
+
+def _student(name, student_id):
+    return {**STUDENT, 'student_name': name, 'student_id': student_id}
+
+
+def _upload(payload=PAYLOAD, name='transcript.pdf'):
+    return SimpleUploadedFile(name, payload, content_type='application/pdf')
+
+
+class BlobStoreTestMixin(TempStorageMixin):
+    dedup = True
+
+    @property
+    def storage_settings(self):
+        return {'DOCUMENT_STORAGE_DEDUP': self.dedup}
+
+    def setUp(self):
+        super().setUp()
+        self.storage = StructuredFileStorage()
+
+    def _save(self, name, student_id, payload=PAYLOAD):
+        return self.storage.save_student_document(_upload(payload), _student(name, student_id), 'transcript')
+
+
+class BlobStoreTests(BlobStoreTestMixin, TestCase):
+    def test_identical_uploads_share_one_blob(self):
+        first = self._save('Ayesha', 'S1')
+        second = self._save('Rakib', 'S2')
+        digest = hashlib.sha256(PAYLOAD).hexdigest()
+        self.assertEqual(first['file_hash'], digest)
+        self.assertEqual(second['file_hash'], digest)
+
+        blob = self.storage.blob_path(digest)
+        self.assertTrue(os.path.samefile(blob, first['storage_path']))
+        self.assertTrue(os.path.samefile(blob, second['storage_path']))
+        self.assertEqual(second['storage_path'].read_bytes(), PAYLOAD)
+        self.assertEqual(self.storage.get_blob_stats(), {
+            'blobs': 1, 'references': 2, 'stored_bytes': len(PAYLOAD),
+            'referenced_bytes': 2 * len(PAYLOAD), 'saved_bytes': len(PAYLOAD),
+        })
+        # No temporary files are left behind.
+        self.assertEqual([p.name for p in self.storage.blob_root.rglob('*.part')], [])
+
+    def test_identical_reupload_to_the_same_path_leaves_no_stray_link(self):
+        first = self._save('Ayesha', 'S1')
+        second = self._save('Ayesha', 'S1')
+        self.assertEqual(first['storage_path'], second['storage_path'])
+
+        blob = self.storage.blob_path(first['file_hash'])
+        self.assertEqual(os.listdir(first['storage_path'].parent), [first['storage_path'].name])
+        self.assertEqual(os.stat(blob).st_nlink, 2)
+
+        self.assertTrue(self.storage.delete_file(first['file_path']))
+        self.assertFalse(blob.exists())
+
+    def test_delete_releases_the_blob_with_its_last_link(self):
+        first = self._save('Ayesha', 'S1')
+        second = self._save('Rakib', 'S2')
+        blob = self.storage.blob_path(first['file_hash'])
+
+        self.assertTrue(self.storage.delete_file(first['file_path']))
+        self.assertTrue(blob.exists())
+        self.assertEqual(second['storage_path'].read_bytes(), PAYLOAD)
+
+        self.assertTrue(self.storage.delete_file(second['file_path']))
+        self.assertFalse(blob.exists())
+
+    def test_delete_finds_the_blob_without_reading_the_file(self):
+        from unittest import mock
+
+        from .models import StoredFile
+
+        saved = self._save('Ayesha', 'S1')
+        blob = self.storage.blob_path(saved['file_hash'])
+        with mock.patch('hashlib.sha256', side_effect=AssertionError('file re-hashed')):
+            self.assertTrue(self.storage.delete_file(saved['file_path'], saved['file_hash']))
+        self.assertFalse(blob.exists())
+
+        # Neither a hash nor a catalog row: the blob waits for the collector.
+        saved = self._save('Rakib', 'S2')
+        StoredFile.objects.all().delete()
+        with mock.patch('hashlib.sha256', side_effect=AssertionError('file re-hashed')):
+            self.assertTrue(self.storage.delete_file(saved['file_path']))
+        self.assertTrue(blob.exists())
+        self.assertEqual(self.storage.collect_blob_garbage()['deleted_count'], 1)
+
+    def test_reupload_replaces_the_link_without_touching_shared_bytes(self):
+        first = self._save('Ayesha', 'S1')
+        second = self._save('Rakib', 'S2')
+        replaced = self._save('Ayesha', 'S1', payload=b'new scan')
+        self.assertEqual(replaced['file_path'], first['file_path'])
+        self.assertEqual(Path(replaced['storage_path']).read_bytes(), b'new scan')
+        self.assertEqual(second['storage_path'].read_bytes(), PAYLOAD)
+
+    def test_orphan_cleanup_counts_freed_bytes_once(self):
+        first = self._save('Ayesha', 'S1')
+        second = self._save('Rakib', 'S2')
+        kept = self._save('Sadia', 'S3', payload=b'unique')
+
+        stats = self.storage.cleanup_orphaned_files([kept['file_path']])
+        self.assertEqual(stats['deleted_count'], 2)
+        self.assertEqual(stats['blobs_deleted'], 1)
+        self.assertEqual(stats['deleted_size_bytes'], len(PAYLOAD))
+        self.assertFalse(first['storage_path'].exists() or second['storage_path'].exists())
+        self.assertEqual(Path(kept['storage_path']).read_bytes(), b'unique')
+        self.assertEqual(self.storage.collect_blob_garbage()['deleted_count'], 0)
+
+
+class PlainStorageTests(BlobStoreTestMixin, TestCase):
+    dedup = False
+
+    def test_disabled_store_writes_plain_files(self):
+        saved = self._save('Ayesha', 'S1')
+        self.assertEqual(saved['file_hash'], hashlib.sha256(PAYLOAD).hexdigest())
+        self.assertEqual(os.stat(saved['storage_path']).st_nlink, 1)
+        self.assertFalse(self.storage.blob_root.exists())
+
+
+class DedupeStorageCommandTests(BlobStoreTestMixin, TestCase):
+    dedup = False
+
+    def test_existing_copies_collapse_into_one_blob(self):
+        from unittest import mock
+
+        from .models import Document
+
+        paths = [self._save(name, sid)['file_path'] for name, sid in (('Ayesha', 'S1'), ('Rakib', 'S2'))]
+        for path in paths:
+            Document.objects.create(fileName='transcript.pdf', fileType='pdf', filePath=path,
+                                    fileSize=len(PAYLOAD))
+
+        with mock.patch('apps.documents.management.commands.dedupe_storage.structured_storage',
+                        self.storage):
+            out = io.StringIO()
+            call_command('dedupe_storage', stdout=out)
+            self.assertIn('Converted 2 files', out.getvalue())
+            self.assertEqual(self.storage.get_blob_stats()['saved_bytes'], len(PAYLOAD))
+
+            out = io.StringIO()
+            call_command('dedupe_storage', stdout=out)
+            self.assertIn('Converted 0 files; 2 already linked', out.getvalue())
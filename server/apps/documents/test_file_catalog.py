@@ -0,0 +1,175 @@
+"""
+File catalog (StoredFile): kept in step by the storage services, reconciled
+incrementally with the disk, and queried for stats and orphan cleanup.
+"""
+import os
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from utils.file_storage import FileStorageService
+from utils.structured_file_storage import StructuredFileStorage
+from utils.testing import TempStorageMixin
+
+from . import catalog
+from .models import Document, StoredFile
+
+STUDENT = {'department_code': 'cst', 'session': '2024-2025', 'shift': '1st-shift',
+           'student_name': 'Ayesha', 'student_id': 'S1'}
+
+
+class CatalogTestCase(TempStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.root = self.storage_root
+        self.storage = StructuredFileStorage()
+
+    def _save(self, category='transcript', payload=b'%PDF-1.4 transcript', name='scan.pdf', **student):
+        return self.storage.save_student_document(
+            SimpleUploadedFile(name, payload), {**STUDENT, **student}, category,
+        )
+
+    def _row(self, path, root=catalog.STRUCTURED):
+        return StoredFile.objects.get(root=root, path=path)
+
+
+class MaintenanceTests(CatalogTestCase):
+    def test_saves_and_deletes_are_recorded(self):
+        saved = self._save()
+        row = self._row(saved['file_path'])
+        self.assertEqual((row.document_type, row.category, row.size, row.file_hash),
+                         ('student', 'transcript', len(b'%PDF-1.4 transcript'), saved['file_hash']))
+        self.assertEqual(row.inode, os.stat(saved['storage_path']).st_ino)
+
+        self.assertTrue(self.storage.delete_file(saved['file_path']))
+        self.assertFalse(StoredFile.objects.exists())
+
+    def test_stats_are_aggregated_from_the_catalog(self):
+        self._save()
+        self._save('photo', b'jpeg bytes', name='me.jpg')
+        with override_settings(DOCUMENT_STORAGE_DEDUP=True):
+            self._save(student_name='Rakib', student_id='S2')
+
+        stats = self.storage.get_storage_stats()
+        self.assertEqual(stats['total_files'], 3)
+        self.assertEqual(stats['by_type']['student']['files'], 3)
+        self.assertEqual(stats['storage_root'], str(self.root / 'Documents'))
+        # Identical content counts once toward disk usage, linked or copied.
+        self.assertEqual(stats['shared_size_bytes'], len(b'%PDF-1.4 transcript'))
+
+        with override_settings(DOCUMENT_STORAGE_DEDUP=True):
+            self._save(student_name='Sadia', student_id='S3')
+        self.assertEqual(self.storage.get_storage_stats()['shared_size_bytes'],
+                         2 * len(b'%PDF-1.4 transcript'))
+
+    def test_copied_blobs_count_once(self):
+        link = os.link
+
+        def link_into_blob_store_only(source, target):
+            if self.storage.blob_root not in Path(target).parents:
+                raise OSError('too many links')
+            return link(source, target)
+
+        with override_settings(DOCUMENT_STORAGE_DEDUP=True), \
+                mock.patch('os.link', side_effect=link_into_blob_store_only):
+            first = self._save()
+            second = self._save(student_name='Rakib', student_id='S2')
+        self.assertNotEqual(os.stat(first['storage_path']).st_ino, os.stat(second['storage_path']).st_ino)
+
+        stats = self.storage.get_storage_stats()
+        self.assertEqual(stats['disk_size_bytes'], len(b'%PDF-1.4 transcript'))
+        self.assertEqual(stats['shared_size_bytes'], len(b'%PDF-1.4 transcript'))
+
+    def test_an_empty_catalog_is_backfilled_before_it_is_read(self):
+        saved = self._save()
+        self._save('nid', b'nid', name='nid.pdf')
+        StoredFile.objects.all().delete()
+
+        self.assertEqual(self.storage.get_storage_stats()['total_files'], 2)
+        self.assertEqual(self._row(saved['file_path']).file_hash, '')
+        self.assertEqual(list(catalog.orphans(catalog.STRUCTURED, [saved['file_path']])
+                              .values_list('category', flat=True)), ['nid'])
+        # The nightly sync hashes what the backfill only stat'ed.
+        self.assertEqual(catalog.reconcile(catalog.STRUCTURED)['updated'], 2)
+        self.assertEqual(self._row(saved['file_path']).file_hash, saved['file_hash'])
+
+
+class ReconcileTests(CatalogTestCase):
+    def test_incremental_reconciliation(self):
+        kept = self._save()
+        changed = self._save('nid', b'front', name='nid.pdf')
+        removed = self._save('photo', b'jpeg', name='me.jpg')
+
+        stray = self.root / 'Documents' / 'Student_Documents' / 'stray.pdf'
+        stray.write_bytes(b'restored from backup')
+        Path(changed['storage_path']).write_bytes(b'front and back')
+        os.unlink(removed['storage_path'])
+        (stray.parent / '.upload.part').write_bytes(b'in flight')
+
+        counts = catalog.reconcile(catalog.STRUCTURED)
+        self.assertEqual(counts, {'added': 1, 'updated': 1, 'removed': 1, 'unchanged': 1})
+        self.assertEqual(self._row('Student_Documents/stray.pdf').category, 'other')
+        self.assertEqual(self._row(changed['file_path']).size, len(b'front and back'))
+        self.assertEqual(self._row(kept['file_path']).file_hash, kept['file_hash'])
+
+        self.assertEqual(catalog.reconcile(catalog.STRUCTURED)['unchanged'], 3)
+        self.assertEqual(catalog.reconcile(catalog.STRUCTURED, rehash=True)['updated'], 3)
+
+    def test_legacy_root_skips_areas_it_does_not_own(self):
+        self._save()
+        for folder in ('thumbnails', 'blobs', 'results'):
+            (self.root / folder).mkdir()
+            (self.root / folder / 'cached.bin').write_bytes(b'x')
+        legacy = FileStorageService().save_file(SimpleUploadedFile('old.pdf', b'legacy'), validate=False)
+        StoredFile.objects.filter(root=catalog.LEGACY).delete()
+
+        self.assertEqual(catalog.reconcile(catalog.LEGACY)['added'], 1)
+        self.assertEqual(
+            list(StoredFile.objects.filter(root=catalog.LEGACY).values_list('path', 'category')),
+            [(legacy['file_path'], 'documents')],
+        )
+
+
+class OrphanTests(CatalogTestCase):
+    def test_orphans_are_found_and_deleted_by_query(self):
+        referenced = self._save()
+        orphan = self._save('nid', b'nid', name='nid.pdf')
+        Document.objects.create(fileName='scan.pdf', fileType='pdf', filePath=referenced['file_path'],
+                                fileSize=1)
+        valid = Document.objects.values_list('filePath', flat=True)
+
+        self.assertEqual(list(catalog.orphans(catalog.STRUCTURED, valid).values_list('path', flat=True)),
+                         [orphan['file_path']])
+        stats = self.storage.cleanup_orphaned_files(valid)
+        self.assertEqual(stats['deleted_count'], 1)
+        self.assertFalse(Path(orphan['storage_path']).exists())
+        self.assertTrue(Path(referenced['storage_path']).exists())
+        self.assertEqual(list(StoredFile.objects.values_list('path', flat=True)), [referenced['file_path']])
+
+    def test_legacy_cleanup_never_touches_structured_files(self):
+        structured = self._save()
+        legacy = FileStorageService()
+        stale = legacy.save_file(SimpleUploadedFile('old.pdf', b'legacy'), validate=False)
+
+        stats = legacy.cleanup_orphaned_files([])
+        self.assertEqual(stats['deleted_count'], 1)
+        self.assertFalse((self.root / stale['file_path']).exists())
+        self.assertTrue(Path(structured['storage_path']).exists())
+
+
+class StorageStatsEndpointTests(CatalogTestCase, APITestCase):
+    def test_endpoint_reads_the_catalog(self):
+        self._save()
+        user = get_user_model().objects.create_user(
+            username='stats_admin', email='stats_admin@example.com', password='testpass123',
+            role='registrar', account_status='active', is_staff=True,
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.get('/api/documents/storage-stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['storage']['total_files'], 1)
+        self.assertEqual(response.data['storage']['by_type']['student']['files'], 1)
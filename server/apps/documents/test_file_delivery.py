@@ -0,0 +1,79 @@
+"""
+SecureFileView delivery: conditional GET on the fileHash ETag, byte ranges,
+and handing the bytes to the web server (FILE_DELIVERY_MODE).
+"""
+import uuid
+
+from django.test import TestCase, override_settings
+
+from utils.structured_file_storage import structured_storage
+from utils.testing import TempStorageMixin
+
+from .models import Document
+
+PAYLOAD = b'%PDF-1.4 ' + bytes(range(256)) * 8
+
+
+class SecureFileDeliveryTests(TempStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.folder = f'test-delivery-{uuid.uuid4().hex[:8]}'
+        self.file_path = f'{self.folder}/transcript.pdf'
+        directory = structured_storage.storage_root / self.folder
+        directory.mkdir()
+        (directory / 'transcript.pdf').write_bytes(PAYLOAD)
+        self.document = Document.objects.create(
+            fileName='transcript.pdf', fileType='pdf', filePath=self.file_path,
+            fileSize=len(PAYLOAD), fileHash='ab' * 32, is_public=True,
+        )
+        self.url = f'/files/{self.file_path}'
+
+    def test_python_streaming_with_etag_and_range(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), PAYLOAD)
+        self.assertEqual(response['ETag'], '"' + 'ab' * 8 + '"')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertTrue(response['Content-Disposition'].startswith('inline'))
+
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+        partial = self.client.get(self.url, HTTP_RANGE='bytes=9-12')
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(b''.join(partial.streaming_content), PAYLOAD[9:13])
+        self.assertEqual(partial['Content-Range'], f'bytes 9-12/{len(PAYLOAD)}')
+
+    def test_offload_modes_hand_the_file_to_the_web_server(self):
+        with override_settings(FILE_DELIVERY_MODE='x-accel',
+                               FILE_ACCEL_REDIRECT_PREFIX='/protected-files/'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(
+            response['X-Accel-Redirect'],
+            f'/protected-files/{structured_storage.storage_root.name}/{self.file_path}',
+        )
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+        with override_settings(FILE_DELIVERY_MODE='x-sendfile'):
+            response = self.client.get(self.url)
+        self.assertEqual(
+            response['X-Sendfile'],
+            str((structured_storage.storage_root / self.file_path).resolve()),
+        )
+
+        # The ETag check still happens in Django, before any offload.
+        with override_settings(FILE_DELIVERY_MODE='x-sendfile'):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"' + 'ab' * 8 + '"')
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn('X-Sendfile', response)
+
+    def test_access_is_checked_before_delivery(self):
+        Document.objects.filter(pk=self.document.pk).update(is_public=False)
+        with override_settings(FILE_DELIVERY_MODE='x-sendfile'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn('X-Sendfile', response)
+        self.assertEqual(response['Cache-Control'], 'no-store')
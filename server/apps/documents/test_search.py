@@ -0,0 +1,109 @@
+"""
+Document search: search_text maintenance, ranking/prefix semantics of the
+engine, the ``?search=`` API parameter and the benchmark.
+"""
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from .benchmark import run_benchmark
+from .models import Document
+from .search import DocumentSearch, rank_search
+
+
+def _document(file_name, category='other', **extra):
+    return Document.objects.create(
+        fileName=file_name, fileType=file_name.rsplit('.', 1)[-1], document_category=category,
+        filePath=f'documents/{uuid.uuid4().hex}/{file_name}', fileSize=1024, **extra,
+    )
+
+
+class SearchTextTests(TestCase):
+    def test_search_text_is_rebuilt_only_when_its_sources_are_saved(self):
+        doc = _document('Scan.PDF', category='nid', owner_name='Ayesha Akter', owner_id='CST-2024-001',
+                        tags=['Front'])
+        self.assertEqual(doc.search_text, 'scan.pdf nid front ayesha akter cst-2024-001')
+
+        Document.objects.filter(pk=doc.pk).update(search_text='stale')
+        doc.status = 'archived'
+        doc.save(update_fields=['status'])
+        doc.refresh_from_db()
+        self.assertEqual(doc.search_text, 'stale')
+
+        doc.owner_name = 'Nusrat Jahan'
+        doc.save(update_fields=['owner_name'])
+        doc.refresh_from_db()
+        self.assertEqual(doc.search_text, 'scan.pdf nid front nusrat jahan cst-2024-001')
+
+
+class DocumentSearchTests(TestCase):
+    def setUp(self):
+        self.marksheet = _document('ssc_marksheet.pdf', category='ssc_marksheet', owner_name='Rakib Hasan')
+        self.marks = _document('marks.pdf', owner_name='Sadia Islam')
+        self.nid = _document('nid_front.jpg', category='nid', owner_name='Rakib Khan', owner_id='CT-2023-017')
+        _document('inactive_marks.pdf', status='archived')
+
+    def _ids(self, query, **filters):
+        return [doc.pk for doc in DocumentSearch.search(query, filters)]
+
+    def test_prefix_and_ranked_matches(self):
+        # Whole-word hit ranks above the prefix hit; archived rows never match.
+        self.assertEqual(self._ids('marks'), [self.marks.pk, self.marksheet.pk])
+        self.assertEqual(set(self._ids('MARK')), {self.marks.pk, self.marksheet.pk})
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self._ids('rakib nid'), [self.nid.pk])
+        self.assertEqual(self._ids('rakib ha'), [self.marksheet.pk])
+        self.assertEqual(self._ids('ct-2023'), [self.nid.pk])
+        self.assertEqual(self._ids('2023-017'), [self.nid.pk])
+        self.assertEqual(self._ids('rakib', category='nid'), [self.nid.pk])
+        self.assertEqual(self._ids('zzz'), [])
+
+    def test_index_follows_new_documents(self):
+        self.assertEqual(self._ids('transcript'), [])
+        created = _document('transcript.pdf', category='transcript')
+        self.assertEqual(self._ids('transcript'), [created.pk])
+
+    def test_index_follows_search_text_only_saves(self):
+        self.assertEqual(self._ids('diploma'), [])
+        self.marks.search_text = 'diploma certificate'
+        self.marks.save(update_fields=['search_text'])
+        self.assertEqual(self._ids('diploma'), [self.marks.pk])
+
+    def test_rank_search_without_query_is_a_no_op(self):
+        queryset = Document.objects.filter(status='active')
+        self.assertIs(rank_search(queryset, '  '), queryset)
+
+
+class DocumentSearchAPITests(APITestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username='search_admin', email='search_admin@example.com',
+            password='testpass123', role='registrar', account_status='active',
+        )
+        self.client.force_authenticate(user=user)
+        self.prefix = _document('certificates_scan.pdf')
+        self.exact = _document('certificate.pdf')
+
+    def test_search_param_uses_ranked_engine(self):
+        response = self.client.get('/api/documents/', {'search': 'certificate'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.data['results']],
+                         [str(self.exact.pk), str(self.prefix.pk)])
+
+        response = self.client.get('/api/documents/', {'search': 'certif', 'ordering': '-fileName'})
+        self.assertEqual([row['id'] for row in response.data['results']],
+                         [str(self.prefix.pk), str(self.exact.pk)])
+
+
+class BenchmarkTests(TestCase):
+    def test_benchmark_reports_every_query_and_rolls_back(self):
+        report = run_benchmark(documents=300, repeat=2, limit=10)
+        self.assertEqual(report['backend'], 'inverted-index')
+        for label in ('word', 'prefix', 'name', 'owner_id', 'miss'):
+            self.assertIn(label, report['queries'])
+        self.assertGreater(report['queries']['owner_id']['ranked']['hits'], 0)
+        self.assertEqual(report['queries']['miss']['ranked']['hits'], 0)
+        self.assertFalse(Document.objects.exists())
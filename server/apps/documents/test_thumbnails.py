@@ -0,0 +1,185 @@
+"""
+Document thumbnails: rendering (images, PDF first pages), the post-upload
+job, DocumentThumbnailView and the LRU disk quota.
+"""
+import io
+import os
+import shutil
+import uuid
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from utils.structured_file_storage import structured_storage
+from utils.testing import TempStorageMixin
+
+from . import thumbnails
+from .models import Document
+
+
+def _jpeg(size=(1200, 800), color='navy'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def _scanned_pdf():
+    # Pillow writes each page as one embedded image, like a scanner does.
+    buffer = io.BytesIO()
+    Image.new('RGB', (850, 1100), 'darkred').save(buffer, 'PDF')
+    return buffer.getvalue()
+
+
+def _vector_pdf():
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    pdf.drawString(100, 750, 'Certificate')
+    pdf.save()
+    return buffer.getvalue()
+
+
+class ThumbnailTestCase(TempStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.folder = f'test-thumbs-{uuid.uuid4().hex[:8]}'
+        self.directory = structured_storage.storage_root / self.folder
+        self.directory.mkdir()
+
+    def _document(self, name, payload, **extra):
+        (self.directory / name).write_bytes(payload)
+        extra.setdefault('fileHash', uuid.uuid4().hex * 2)
+        # Thumbnails are queued on commit (and jobs run inline under tests).
+        with self.captureOnCommitCallbacks(execute=True):
+            return Document.objects.create(
+                fileName=name, fileType=name.rsplit('.', 1)[-1], filePath=f'{self.folder}/{name}',
+                fileSize=len(payload), is_public=True, **extra,
+            )
+
+
+class RenderingTests(ThumbnailTestCase):
+    def _rendered(self, document, size):
+        path = thumbnails.ensure_thumbnail(document, size)
+        self.assertIsNotNone(path)
+        return Image.open(path)
+
+    def test_image_is_downscaled_to_the_longest_edge(self):
+        document = self._document('photo.jpg', _jpeg())
+        small = self._rendered(document, 'small')
+        self.assertEqual((small.format, small.size), ('JPEG', (160, 107)))
+        self.assertEqual(max(self._rendered(document, 'medium').size), 480)
+
+    def test_pdf_first_page_uses_the_scanned_image_or_a_placeholder(self):
+        scanned = self._rendered(self._document('marksheet.pdf', _scanned_pdf()), 'small')
+        self.assertEqual(scanned.size, (124, 160))
+        red, green, blue = scanned.getpixel((60, 80))
+        self.assertGreater(red, 100)
+        self.assertLess(green, 40)
+
+        placeholder = self._rendered(self._document('certificate.pdf', _vector_pdf()), 'small')
+        self.assertEqual(placeholder.size, (113, 160))
+
+    def test_missing_and_unreadable_files_have_no_thumbnail(self):
+        broken = self._document('broken.png', b'not an image')
+        self.assertIsNone(thumbnails.ensure_thumbnail(broken, 'small'))
+        broken.filePath = f'{self.folder}/gone.png'
+        self.assertIsNone(thumbnails.ensure_thumbnail(broken, 'small'))
+
+    def test_storage_is_content_addressed(self):
+        first = self._document('a.jpg', _jpeg(), fileHash='cd' * 32)
+        second = self._document('b.jpg', _jpeg(), fileHash='cd' * 32)
+        self.assertEqual(thumbnails.ensure_thumbnail(first), thumbnails.ensure_thumbnail(second))
+        self.assertEqual(thumbnails.ensure_thumbnail(first).name, f"{'cd' * 32}.small.v1.jpg")
+
+    def test_missing_file_hash_is_computed_and_stored(self):
+        document = self._document('nohash.jpg', _jpeg(), fileHash='')
+        self.assertIsNotNone(thumbnails.ensure_thumbnail(document))
+        document.refresh_from_db()
+        self.assertEqual(len(document.fileHash), 64)
+
+
+class GenerationTests(ThumbnailTestCase):
+    def test_upload_queues_every_size(self):
+        document = self._document('upload.jpg', _jpeg())
+        for size in thumbnails.SIZES:
+            self.assertTrue(thumbnails.thumbnail_path(document.fileHash, size).exists())
+
+    def test_metadata_saves_do_not_queue_jobs(self):
+        from apps.jobs.models import Job
+
+        document = self._document('upload.jpg', _jpeg())
+        jobs = Job.objects.count()
+        document.description = 'Front side'
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            document.save(update_fields=['description'])
+            document.save()
+        self.assertEqual(callbacks, [])
+        self.assertEqual(Job.objects.count(), jobs)
+
+    def test_prune_drops_least_recently_used(self):
+        old = self._document('old.jpg', _jpeg(color='white'))
+        recent = self._document('recent.jpg', _jpeg(color='black'))
+        old_path = thumbnails.thumbnail_path(old.fileHash, 'medium')
+        recent_path = thumbnails.thumbnail_path(recent.fileHash, 'medium')
+        os.utime(old_path, (1, 1))
+        total = sum(p.stat().st_size for p in thumbnails.thumbnail_dir().rglob('*.jpg'))
+
+        self.assertGreater(thumbnails.prune(max_bytes=total - 1), 0)
+        self.assertFalse(old_path.exists())
+        self.assertTrue(recent_path.exists())
+        self.assertEqual(thumbnails.prune(max_bytes=total), 0)
+
+    def test_uploads_leave_pruning_to_the_nightly_command(self):
+        with override_settings(DOCUMENT_THUMBNAIL_CACHE_MAX_MB=0):
+            document = self._document('over-quota.jpg', _jpeg())
+            path = thumbnails.thumbnail_path(document.fileHash, 'small')
+            self.assertTrue(path.exists())
+
+            out = io.StringIO()
+            call_command('prune_thumbnails', stdout=out)
+        self.assertIn('pruned', out.getvalue())
+        self.assertFalse(path.exists())
+
+    def test_backfill_command(self):
+        document = self._document('legacy.jpg', _jpeg())
+        shutil.rmtree(thumbnails.thumbnail_dir())
+        out = io.StringIO()
+        call_command('backfill_thumbnails', '--sizes', 'small', stdout=out)
+        self.assertIn('1 rendered', out.getvalue())
+        self.assertTrue(thumbnails.thumbnail_path(document.fileHash, 'small').exists())
+        self.assertFalse(thumbnails.thumbnail_path(document.fileHash, 'medium').exists())
+
+        out = io.StringIO()
+        call_command('backfill_thumbnails', '--sizes', 'small', stdout=out)
+        self.assertIn('1 already present', out.getvalue())
+
+
+class ThumbnailViewTests(ThumbnailTestCase):
+    def test_serves_cached_jpeg_with_etag(self):
+        document = self._document('photo.jpg', _jpeg())
+        url = f'/files/thumbnail/{document.pk}/'
+        response = self.client.get(url, {'size': 'medium'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        body = b''.join(response.streaming_content)
+        self.assertEqual(max(Image.open(io.BytesIO(body)).size), 480)
+
+        not_modified = self.client.get(url, {'size': 'medium'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(self.client.get(url, {'size': 'huge'}).status_code, 404)
+
+    def test_renders_on_demand_and_checks_access(self):
+        document = self._document('private.pdf', _scanned_pdf())
+        shutil.rmtree(thumbnails.thumbnail_dir())
+        response = self.client.get(f'/files/thumbnail/{document.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(thumbnails.thumbnail_path(document.fileHash, 'small').exists())
+
+        Document.objects.filter(pk=document.pk).update(is_public=False)
+        self.assertEqual(self.client.get(f'/files/thumbnail/{document.pk}/').status_code, 403)
+
+    def test_other_file_types_have_no_thumbnail(self):
+        document = self._document('notes.txt', b'hello')
+        self.assertEqual(self.client.get(f'/files/thumbnail/{document.pk}/').status_code, 404)
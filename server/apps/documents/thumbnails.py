@@ -0,0 +1,251 @@
+"""
+Document thumbnails (DocumentThumbnailView, admin document grids).
+
+A thumbnail depends only on the file content and the requested size, so it
+is stored content-addressed by the document's fileHash:
+
+    <FILE_STORAGE_ROOT>/thumbnails/<hash[:2]>/<hash>.<size>.v<THUMBNAIL_VERSION>.jpg
+
+Documents sharing a file share thumbnails, and a replaced file gets new
+ones. Rendering:
+
+- images: Pillow, with JPEG draft decoding (the decoder downsamples while
+  reading) and EXIF orientation applied;
+- PDFs: the largest image embedded in the first page, via pypdf —
+  scanned certificates and marksheets are exactly that — and a drawn page
+  placeholder for vector-only pages.
+
+Thumbnails are generated in the background after upload (post_save ->
+`generate_thumbnails` job) and on demand by the view if that has not
+happened yet. The directory is kept under DOCUMENT_THUMBNAIL_CACHE_MAX_MB by
+`prune` (``manage.py prune_thumbnails``, run by the nightly storage timer),
+which drops the least recently served files (every serve touches the
+mtime). `manage.py backfill_thumbnails` covers existing documents.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+#: Longest edge in pixels per named size.
+SIZES = {'small': 160, 'medium': 480}
+DEFAULT_SIZE = 'small'
+#: Bump when rendering changes; old files then age out through `prune`.
+THUMBNAIL_VERSION = 1
+CONTENT_TYPE = 'image/jpeg'
+
+_JPEG_QUALITY = 80
+# Prune down to this share of the quota, leaving room for a day's uploads.
+_PRUNE_TARGET = 0.9
+
+
+def thumbnail_dir() -> Path:
+    root = Path(getattr(settings, 'FILE_STORAGE_ROOT', settings.BASE_DIR / 'storage'))
+    return root / 'thumbnails'
+
+
+def thumbnail_path(file_hash: str, size: str) -> Path:
+    return thumbnail_dir() / file_hash[:2] / f'{file_hash}.{size}.v{THUMBNAIL_VERSION}.jpg'
+
+
+def supports(document) -> bool:
+    return document.is_image or document.is_pdf
+
+
+def source_path(document) -> Optional[Path]:
+    """Absolute path of the document's file, or None when it is missing."""
+    from .file_views import locate_stored_file
+
+    located = locate_stored_file(document.filePath) if document.filePath else None
+    return Path(located[0]) if located else None
+
+
+def _file_hash(document, path: Path) -> str:
+    """The document's fileHash, computed (and stored) when it was never set."""
+    if document.fileHash:
+        return document.fileHash
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(chunk)
+    document.fileHash = digest.hexdigest()
+    type(document).objects.filter(pk=document.pk).update(fileHash=document.fileHash)
+    return document.fileHash
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def _open_image(path: Path, edge: int):
+    from PIL import Image, ImageOps
+
+    image = Image.open(path)
+    image.draft('RGB', (edge, edge))  # JPEG only: decode at reduced scale
+    return ImageOps.exif_transpose(image)
+
+
+def _pdf_first_page(path: Path):
+    """Largest image on the first PDF page, or None when it has none."""
+    from pypdf import PdfReader
+
+    page = PdfReader(path).pages[0]
+    best = None
+    for embedded in page.images:
+        image = embedded.image
+        if best is None or image.width * image.height > best.width * best.height:
+            best = image
+    return best
+
+
+def _placeholder(edge: int, label: str):
+    """A blank page with the file type, for pages without raster content."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    width, height = int(edge * 0.707), edge
+    image = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, width - 1, height - 1], outline='#cbd5e1', width=max(1, edge // 80))
+    font = ImageFont.load_default(size=max(10, edge // 6))
+    draw.text((width / 2, height / 2), label, fill='#64748b', font=font, anchor='mm')
+    return image
+
+
+def render_thumbnail(path: Path, *, is_pdf: bool, size: str = DEFAULT_SIZE) -> bytes:
+    """JPEG bytes of the thumbnail of the file at ``path``."""
+    edge = SIZES[size]
+    image = _pdf_first_page(path) if is_pdf else _open_image(path, edge)
+    if image is None:
+        image = _placeholder(edge, 'PDF')
+    image.thumbnail((edge, edge))
+    if image.mode != 'RGB':
+        from PIL import Image
+
+        if 'A' in image.getbands():
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        else:
+            image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=_JPEG_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+def _store(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.part')
+    try:
+        with os.fdopen(handle, 'wb') as tmp:
+            tmp.write(data)
+        # mkstemp creates 0600; the web server reads these under x-accel.
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def ensure_thumbnail(document, size: str = DEFAULT_SIZE, *, force: bool = False) -> Optional[Path]:
+    """
+    Path of the document's thumbnail, rendering it on a miss. None when the
+    document has no thumbnail (unsupported type, missing or unreadable file).
+    """
+    if size not in SIZES or not supports(document):
+        return None
+    source = source_path(document)
+    if source is None:
+        return None
+    target = thumbnail_path(_file_hash(document, source), size)
+    if target.exists() and not force:
+        return target
+    try:
+        data = render_thumbnail(source, is_pdf=document.is_pdf, size=size)
+    except Exception as exc:  # noqa: BLE001 - Pillow/pypdf raise many shapes
+        logger.warning("Thumbnail failed for document %s (%s): %s", document.pk, size, exc)
+        return None
+    _store(target, data)
+    return target
+
+
+def touch(path: Path) -> None:
+    """Mark a thumbnail as recently used (LRU order for `prune`)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def generate_thumbnails(document_id, sizes=None) -> int:
+    """
+    Job handler: render every size for one document. Returns the number of
+    thumbnails available. The disk quota is enforced by the nightly `prune`.
+    """
+    from .models import Document
+
+    document = Document.objects.filter(pk=document_id, status='active').first()
+    if document is None:
+        return 0
+    return sum(1 for size in (sizes or SIZES) if ensure_thumbnail(document, size))
+
+
+def schedule_thumbnails(document) -> None:
+    """Queue background generation for a new/replaced file (best-effort)."""
+    if not supports(document):
+        return
+    try:
+        from apps.jobs.services import enqueue
+        enqueue(
+            'apps.documents.thumbnails.generate_thumbnails',
+            {'document_id': str(document.pk)},
+            queue='thumbnails', max_attempts=2,
+        )
+    except Exception as exc:  # noqa: BLE001 - never let queueing break an upload
+        logger.warning("Could not queue thumbnails for document %s: %s", document.pk, exc)
+
+
+def prune(max_bytes: Optional[int] = None) -> int:
+    """
+    Delete least recently used thumbnails while the directory is over its
+    quota (DOCUMENT_THUMBNAIL_CACHE_MAX_MB). Returns the number removed.
+    """
+    if max_bytes is None:
+        max_bytes = getattr(settings, 'DOCUMENT_THUMBNAIL_CACHE_MAX_MB', 256) * 1024 * 1024
+    entries, total = [], 0
+    for root, _dirs, files in os.walk(thumbnail_dir()):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat_result.st_mtime, stat_result.st_size, path))
+            total += stat_result.st_size
+    if total <= max_bytes:
+        return 0
+    removed = 0
+    target = max_bytes * _PRUNE_TARGET
+    for _mtime, file_size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            os.unlink(path)
+        except OSError as exc:
+            logger.warning("Could not prune thumbnail %s: %s", path, exc)
+            continue
+        total -= file_size
+        removed += 1
+    return removed
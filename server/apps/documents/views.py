@@ -6,7 +6,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from django.http import FileResponse, Http404
 from django.core.exceptions import ValidationError
 from django.db import transaction
@@ -16,6 +16,7 @@ import os
 import logging
 
 from .models import Document, DocumentAccessLog
+from .search import DocumentSearchFilter
 from .serializers import (
     DocumentSerializer,
     DocumentUploadSerializer,
@@ -50,11 +51,10 @@ class DocumentViewSet(viewsets.ModelViewSet):
     queryset = Document.objects.filter(status='active')
     permission_classes = [IsAuthenticated]
     serializer_class = DocumentSerializer
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, DocumentSearchFilter]
     filterset_fields = ['student', 'category', 'source_type', 'source_id', 'status', 'is_public']
     ordering_fields = ['uploadDate', 'fileName', 'fileSize', 'lastModified']
     ordering = ['-uploadDate']
-    search_fields = ['fileName', 'description', 'tags']
 
     def get_queryset(self):
         """
@@ -244,7 +244,7 @@ class DocumentViewSet(viewsets.ModelViewSet):
                 document.save()
                 
                 # Delete physical file from structured storage
-                file_deleted = structured_storage.delete_file(document.filePath)
+                file_deleted = structured_storage.delete_file(document.filePath, document.fileHash)
                 
                 if not file_deleted:
                     logger.warning(f"Physical file not found during deletion: {document.filePath}")
@@ -1128,8 +1128,8 @@ class DocumentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Get all valid file paths from database
-        valid_paths = list(
+        # Valid file paths from database (a subquery against the file catalog)
+        valid_paths = (
             Document.objects.filter(status='active')
             .values_list('filePath', flat=True)
         )
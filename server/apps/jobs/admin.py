@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('task', 'queue', 'status', 'attempts', 'max_attempts', 'run_after', 'created_at')
+    list_filter = ('queue', 'status')
+    search_fields = ('task', 'last_error')
+    readonly_fields = ('payload', 'attempts', 'last_error', 'started_at', 'finished_at')
@@ -0,0 +1,53 @@
+"""
+Run background jobs left over from a previous server process.
+
+    python manage.py drain_jobs                     # requeue stale + run everything due
+    python manage.py drain_jobs --queue email       # one queue only
+    python manage.py drain_jobs --max-seconds 60    # stop starting new jobs after 60s
+
+Runs before the ASGI server starts (see the systemd unit written by
+deploy-scripts/deploy.sh), when no worker can still own a `running` job, so
+those are safely returned to the queue first. Jobs that are still backing off
+stay queued for the next drain.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.services import due_jobs, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = 'Requeue interrupted background jobs and run every job that is due.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queue', help='Only drain this queue')
+        parser.add_argument(
+            '--max-seconds', type=float, default=0,
+            help='Stop starting new jobs after this many seconds (0 = no limit)',
+        )
+        parser.add_argument(
+            '--no-requeue', action='store_true',
+            help='Leave jobs stuck in "running" alone (another worker may own them)',
+        )
+
+    def handle(self, *args, **options):
+        if not options['no_requeue']:
+            requeued = requeue_stale()
+            if requeued:
+                self.stdout.write(f'Requeued {requeued} interrupted job(s)')
+
+        deadline = time.monotonic() + options['max_seconds'] if options['max_seconds'] else None
+        succeeded = failed = 0
+        for job_id in list(due_jobs(options['queue']).values_list('id', flat=True)):
+            if deadline is not None and time.monotonic() > deadline:
+                self.stdout.write(self.style.WARNING('Time budget reached; remaining jobs stay queued'))
+                break
+            if run_job(job_id):
+                succeeded += 1
+            else:
+                failed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Drained background jobs: {succeeded} succeeded, {failed} failed or retrying'
+        ))
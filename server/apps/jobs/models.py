@@ -0,0 +1,52 @@
+"""
+Background Jobs — a small persistent work queue.
+
+Every unit of background work (web push, outgoing email, result imports…) is
+a row here before it runs, so a worker restart never silently drops it: the
+`drain_jobs` management command picks up anything still queued (or stuck in
+`running` from a dead process) on startup.
+"""
+import uuid
+
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # Named queue; each queue has its own concurrency limit
+    # (settings.JOBS_QUEUE_CONCURRENCY).
+    queue = models.CharField(max_length=50, default='default')
+    # Dotted path of the handler, called as handler(**payload).
+    task = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    # Not picked up before this time (retry backoff).
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'background_jobs'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+            models.Index(fields=['queue', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.task} [{self.queue}] {self.status} ({self.attempts}/{self.max_attempts})"
@@ -0,0 +1,224 @@
+"""
+Central API for background work.
+
+`enqueue` persists a Job row and hands it to a process-wide, bounded thread
+pool once the surrounding transaction commits. Each named queue has its own
+concurrency limit, so a burst of web pushes can never starve email or a
+result import of workers, and the total thread count per process stays at
+settings.JOBS_MAX_WORKERS no matter how much work arrives.
+
+Failed jobs are retried with exponential backoff up to `max_attempts`; the
+row records every attempt, so work interrupted by a restart is resumed by
+`manage.py drain_jobs`. Handlers are plain functions referenced by dotted
+path and called as handler(**payload) — the payload must be JSON-serializable.
+"""
+import logging
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_QUEUE_CONCURRENCY = 2
+DEFAULT_BACKOFF_SECONDS = 30
+MAX_ERROR_LENGTH = 8000
+
+
+def _max_workers():
+    return getattr(settings, 'JOBS_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+
+
+def _queue_limit(queue):
+    limits = getattr(settings, 'JOBS_QUEUE_CONCURRENCY', {}) or {}
+    return max(1, int(limits.get(queue, limits.get('default', DEFAULT_QUEUE_CONCURRENCY))))
+
+
+def backoff_seconds(attempts):
+    """Delay before retry number `attempts` (1-based): base, 2x, 4x, …"""
+    base = getattr(settings, 'JOBS_RETRY_BACKOFF_SECONDS', DEFAULT_BACKOFF_SECONDS)
+    return base * (2 ** max(0, attempts - 1))
+
+
+class WorkerPool:
+    """
+    Bounded thread pool with a per-queue concurrency limit.
+
+    Jobs beyond a queue's limit wait in an in-memory deque (their rows stay
+    `queued` in the DB) and are started as soon as a slot on that queue frees.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self._running = defaultdict(int)
+        self._waiting = defaultdict(deque)
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=_max_workers(), thread_name_prefix='jobs',
+            )
+        return self._executor
+
+    def submit(self, job_id, queue):
+        with self._lock:
+            if self._running[queue] >= _queue_limit(queue):
+                self._waiting[queue].append(job_id)
+                return
+            self._running[queue] += 1
+            executor = self._get_executor()
+        executor.submit(self._work, job_id, queue)
+
+    def submit_later(self, job_id, queue, delay):
+        timer = threading.Timer(delay, self.submit, args=(job_id, queue))
+        timer.daemon = True
+        timer.start()
+
+    def _work(self, job_id, queue):
+        while job_id is not None:
+            close_old_connections()
+            try:
+                run_job(job_id)
+            except Exception:  # noqa: BLE001 - a broken job must not kill the worker
+                logger.exception("Background job %s crashed the worker", job_id)
+            finally:
+                close_old_connections()
+            # Keep this slot busy with the next waiting job of the same queue.
+            with self._lock:
+                if self._waiting[queue]:
+                    job_id = self._waiting[queue].popleft()
+                else:
+                    self._running[queue] -= 1
+                    job_id = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                queue: {'running': self._running[queue], 'waiting': len(self._waiting[queue])}
+                for queue in set(self._running) | set(self._waiting)
+            }
+
+
+pool = WorkerPool()
+
+
+def _always_eager():
+    return getattr(settings, 'JOBS_ALWAYS_EAGER', False)
+
+
+def enqueue(task, payload=None, *, queue='default', max_attempts=3, delay=0):
+    """
+    Persist a job and schedule it on the worker pool.
+
+    Args:
+        task: Dotted path of the handler, called as handler(**payload).
+        payload: JSON-serializable keyword arguments for the handler.
+        queue: Named queue (concurrency-limited independently).
+        max_attempts: Total tries before the job is marked failed.
+        delay: Seconds to wait before the first attempt.
+
+    Returns:
+        The Job instance. Under JOBS_ALWAYS_EAGER (the test runner) the job
+        has already run synchronously when this returns.
+    """
+    from .models import Job
+
+    job = Job.objects.create(
+        task=task,
+        payload=payload or {},
+        queue=queue,
+        max_attempts=max(1, max_attempts),
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    if _always_eager():
+        run_job(job.pk)
+        job.refresh_from_db()
+        return job
+
+    # The row must be visible to the worker's own DB connection first.
+    if delay:
+        transaction.on_commit(lambda: pool.submit_later(job.pk, queue, delay))
+    else:
+        transaction.on_commit(lambda: pool.submit(job.pk, queue))
+    return job
+
+
+def run_job(job_id):
+    """
+    Claim and execute one job. Returns True on success.
+
+    The claim is a conditional UPDATE (queued -> running), so the same job
+    can never run twice concurrently, even across processes.
+    """
+    from .models import Job
+
+    claimed = Job.objects.filter(pk=job_id, status='queued').update(
+        status='running', attempts=F('attempts') + 1, started_at=timezone.now(),
+    )
+    if not claimed:
+        return False
+    job = Job.objects.get(pk=job_id)
+
+    try:
+        handler = import_string(job.task)
+        handler(**(job.payload or {}))
+    except Exception as exc:  # noqa: BLE001
+        job.last_error = f"{type(exc).__name__}: {exc}"[:MAX_ERROR_LENGTH]
+        if job.attempts < job.max_attempts:
+            delay = backoff_seconds(job.attempts)
+            job.status = 'queued'
+            job.run_after = timezone.now() + timedelta(seconds=delay)
+            job.save(update_fields=['status', 'run_after', 'last_error'])
+            logger.warning(
+                "Background job %s (%s) failed, retry %s/%s in %ss: %s",
+                job.pk, job.task, job.attempts + 1, job.max_attempts, delay, exc,
+            )
+            if not _always_eager():
+                pool.submit_later(job.pk, job.queue, delay)
+        else:
+            job.status = 'failed'
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'finished_at', 'last_error'])
+            logger.error(
+                "Background job %s (%s) failed after %s attempts: %s",
+                job.pk, job.task, job.attempts, exc,
+            )
+        return False
+
+    job.status = 'succeeded'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at'])
+    return True
+
+
+def requeue_stale(older_than=None):
+    """
+    Return jobs left `running` by a dead process to the queue.
+
+    Only call this when no other worker can be running jobs (drain_jobs runs
+    before the server starts). Returns the number of jobs requeued.
+    """
+    from .models import Job
+
+    stale = Job.objects.filter(status='running')
+    if older_than is not None:
+        stale = stale.filter(started_at__lt=timezone.now() - older_than)
+    return stale.update(status='queued', run_after=timezone.now())
+
+
+def due_jobs(queue=None):
+    """Queued jobs whose backoff has elapsed, oldest first."""
+    from .models import Job
+
+    jobs = Job.objects.filter(status='queued', run_after__lte=timezone.now())
+    if queue:
+        jobs = jobs.filter(queue=queue)
+    return jobs.order_by('created_at')
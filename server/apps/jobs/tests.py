@@ -0,0 +1,101 @@
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .services import WorkerPool, enqueue, run_job
+
+CALLS = []
+
+
+def record_call(value):
+    CALLS.append(value)
+
+
+def always_fail():
+    raise ValueError('boom')
+
+
+class EnqueueTest(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_eager_job_runs_and_succeeds(self):
+        job = enqueue('apps.jobs.tests.record_call', {'value': 7})
+        self.assertEqual(CALLS, [7])
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failed_job_is_requeued_with_backoff(self):
+        job = enqueue('apps.jobs.tests.always_fail', max_attempts=3)
+        self.assertEqual(job.status, 'queued')
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('ValueError: boom', job.last_error)
+        self.assertGreater(job.run_after, timezone.now())
+
+    def test_job_fails_after_max_attempts(self):
+        job = enqueue('apps.jobs.tests.always_fail', max_attempts=2)
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        self.assertFalse(run_job(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, 2)
+
+    def test_job_is_claimed_only_once(self):
+        job = enqueue('apps.jobs.tests.record_call', {'value': 1})
+        self.assertFalse(run_job(job.pk))
+        self.assertEqual(CALLS, [1])
+
+    def test_drain_requeues_stale_and_runs_due_jobs(self):
+        stale = Job.objects.create(
+            task='apps.jobs.tests.record_call', payload={'value': 'stale'},
+            status='running', attempts=1,
+        )
+        queued = Job.objects.create(task='apps.jobs.tests.record_call', payload={'value': 'queued'})
+        later = Job.objects.create(
+            task='apps.jobs.tests.record_call', payload={'value': 'later'},
+            run_after=timezone.now() + timezone.timedelta(hours=1),
+        )
+
+        call_command('drain_jobs', stdout=StringIO())
+
+        self.assertCountEqual(CALLS, ['stale', 'queued'])
+        self.assertEqual(Job.objects.get(pk=stale.pk).status, 'succeeded')
+        self.assertEqual(Job.objects.get(pk=queued.pk).status, 'succeeded')
+        self.assertEqual(Job.objects.get(pk=later.pk).status, 'queued')
+
+
+@override_settings(JOBS_MAX_WORKERS=4, JOBS_QUEUE_CONCURRENCY={'default': 1, 'push': 2})
+class WorkerPoolTest(SimpleTestCase):
+    def test_per_queue_concurrency_limit(self):
+        release = threading.Event()
+        lock = threading.Lock()
+        active = {'now': 0, 'peak': 0}
+        done = threading.Semaphore(0)
+
+        def fake_run(job_id):
+            with lock:
+                active['now'] += 1
+                active['peak'] = max(active['peak'], active['now'])
+            release.wait(5)
+            with lock:
+                active['now'] -= 1
+            done.release()
+
+        pool = WorkerPool()
+        with mock.patch('apps.jobs.services.run_job', side_effect=fake_run), \
+                mock.patch('apps.jobs.services.close_old_connections'):
+            for i in range(5):
+                pool.submit(i, 'push')
+            self.assertEqual(pool.stats()['push'], {'running': 2, 'waiting': 3})
+            release.set()
+            for _ in range(5):
+                self.assertTrue(done.acquire(timeout=5))
+
+        self.assertEqual(active['peak'], 2)
+        self.assertEqual(pool.stats()['push'], {'running': 0, 'waiting': 0})
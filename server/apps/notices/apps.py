@@ -4,4 +4,9 @@ from django.apps import AppConfig
 class NoticesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.notices'
-    verbose_name = 'Notices'
\ No newline at end of file
+    verbose_name = 'Notices'
+
+    def ready(self):
+        from utils.cache import invalidate_on_change
+        from .models import UNREAD_CACHE_NAMESPACE, Notice
+        invalidate_on_change(UNREAD_CACHE_NAMESPACE, Notice)
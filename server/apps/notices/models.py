@@ -3,6 +3,9 @@ from django.conf import settings
 from django.utils import timezone
 from django.core.validators import MinLengthValidator
 
+# Cache namespace of the per-user unread counts (utils.cache generation key).
+UNREAD_CACHE_NAMESPACE = 'notice_unread'
+
 
 class Notice(models.Model):
     """Model for storing notices and announcements"""
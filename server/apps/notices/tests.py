@@ -293,6 +293,22 @@ class NoticeAPITest(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.data['unread_count'], 0)
         self.assertEqual(response.data['read_count'], 1)
+
+    def test_unread_count_is_invalidated_by_new_notice(self):
+        """Publishing a notice invalidates cached unread counts"""
+        self.client.force_authenticate(user=self.student_user)
+        url = reverse('notices:student-unread-count')
+        self.assertEqual(self.client.get(url).data['unread_count'], 1)
+
+        Notice.objects.create(
+            title='Second Notice',
+            content='Another notice',
+            created_by=self.admin_user
+        )
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['unread_count'], 2)
+        self.assertEqual(response.data['total_notices'], 2)
     
     def test_admin_notice_stats(self):
         """Test admin notice statistics endpoint"""
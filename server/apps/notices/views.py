@@ -3,7 +3,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from django.db.models import Count, Q, Case, When, IntegerField, Prefetch
+from django.db.models import Count, Q, Case, When, IntegerField, Prefetch, Exists, OuterRef
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from django.core.cache import cache
@@ -12,7 +12,7 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.views.decorators.vary import vary_on_headers
 
-from .models import Notice, NoticeReadStatus, NoticeAttachment
+from .models import UNREAD_CACHE_NAMESPACE, Notice, NoticeReadStatus, NoticeAttachment
 from .serializers import (
     NoticeSerializer,
     NoticeCreateUpdateSerializer,
@@ -24,9 +24,16 @@ from .serializers import (
     clean_targeting_payload,
 )
 from . import targeting
+from utils.cache import get_or_set, make_key
 
 User = get_user_model()
 
+# Unread counts are cached per user under UNREAD_CACHE_NAMESPACE. Every
+# Notice save/delete bumps the namespace generation (see NoticesConfig.ready),
+# so publishing or editing a notice invalidates all users' counts in O(1); a
+# user's own reads only drop that user's key.
+UNREAD_CACHE_TIMEOUT = 300
+
 # Attachments are limited to images and PDFs, max 10 MB each.
 ALLOWED_ATTACHMENT_TYPES = {
     'image/jpeg', 'image/png', 'image/webp', 'image/gif', 'application/pdf',
@@ -123,12 +130,7 @@ class AdminNoticeListCreateView(generics.ListCreateAPIView):
         notice.recipient_count = len(recipients)
         notice.save(update_fields=['recipient_count'])
 
-        # Invalidate all user unread count caches when a new notice is created
-        User = get_user_model()
-        user_ids = User.objects.filter(role__in=['student', 'captain', 'teacher']).values_list('id', flat=True)
-        for user_id in user_ids:
-            cache_key = f'user_unread_count_{user_id}'
-            cache.delete(cache_key)
+        # Unread-count caches were invalidated by the Notice post_save signal.
 
         # Notify the targeted recipients. Priority routing lives in
         # notify_new_notice: high -> email + in-app; low/normal -> in-app only.
@@ -284,8 +286,7 @@ def mark_notice_as_read(request, notice_id):
     )
     
     # Invalidate cache for this user's unread count
-    cache_key = f'user_unread_count_{request.user.id}'
-    cache.delete(cache_key)
+    invalidate_user_unread(request.user.id)
     
     return Response({
         'notice_id': notice_id,
@@ -308,37 +309,32 @@ def student_unread_count(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    # Use caching for unread count to improve performance
-    cache_key = f'user_unread_count_{request.user.id}'
-    cached_result = cache.get(cache_key)
-    
-    if cached_result is not None:
-        return Response(cached_result)
-    
+    return Response(get_or_set(
+        UNREAD_CACHE_NAMESPACE, request.user.id,
+        loader=lambda: _compute_unread_count(request.user),
+        timeout=UNREAD_CACHE_TIMEOUT,
+    ))
+
+
+def _compute_unread_count(user):
     # Only notices this user is targeted by count toward their unread badge.
     visible = targeting.filter_notices_for_user(
-        Notice.objects.filter(is_published=True), request.user
+        Notice.objects.filter(is_published=True), user
     )
-    total_notices = visible.count()
-
-    # Reads of notices that are no longer visible to the user are ignored so
-    # the unread count can never go negative or drift.
-    read_count = NoticeReadStatus.objects.filter(
-        student=request.user, notice__in=visible.values('id')
-    ).count()
-
-    unread_count = total_notices - read_count
-    
-    result = {
-        'unread_count': max(0, unread_count),
-        'total_notices': total_notices,
-        'read_count': read_count
+    # One aggregate over the targeted notices. Reads of notices that are no
+    # longer visible to the user are ignored so the unread count can never
+    # go negative or drift.
+    counts = Notice.objects.filter(id__in=visible.values('id')).aggregate(
+        total_notices=Count('id'),
+        read_count=Count('id', filter=Exists(
+            NoticeReadStatus.objects.filter(notice=OuterRef('pk'), student=user)
+        )),
+    )
+    return {
+        'unread_count': max(0, counts['total_notices'] - counts['read_count']),
+        'total_notices': counts['total_notices'],
+        'read_count': counts['read_count'],
     }
-    
-    # Cache for 5 minutes
-    cache.set(cache_key, result, 300)
-    
-    return Response(result)
 
 
 @api_view(['GET'])
@@ -439,13 +435,9 @@ def notice_detail_stats(request, notice_id):
     })
 
 
-def invalidate_user_caches():
-    """Helper function to invalidate all user unread count caches"""
-    User = get_user_model()
-    user_ids = User.objects.filter(role__in=['student', 'captain', 'teacher']).values_list('id', flat=True)
-    for user_id in user_ids:
-        cache_key = f'user_unread_count_{user_id}'
-        cache.delete(cache_key)
+def invalidate_user_unread(user_id):
+    """Invalidate a single user's unread count cache."""
+    cache.delete(make_key(UNREAD_CACHE_NAMESPACE, user_id))
 
 
 @api_view(['GET'])
@@ -622,8 +614,7 @@ def bulk_mark_as_read(request):
         created_statuses = NoticeReadStatus.objects.bulk_create(read_statuses_to_create)
         
         # Invalidate cache
-        cache_key = f'user_unread_count_{request.user.id}'
-        cache.delete(cache_key)
+        invalidate_user_unread(request.user.id)
         
         return Response({
             'marked_as_read': len(created_statuses),
@@ -8,4 +8,6 @@ class NotificationsConfig(AppConfig):
     def ready(self):
         """Import signals when app is ready"""
         import apps.notifications.admin_signals  # noqa
+        from .badges import connect_signals
+        connect_signals()
     verbose_name = 'Notifications'
@@ -10,7 +10,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
 
-from .badges import compute_badges, modules_for_user
+from .badges import compute_badges, modules_for_user, record_seen
 from .models import ModuleSeen
 
 
@@ -37,9 +37,11 @@ def mark_module_seen_view(request):
     if module not in modules_for_user(request.user):
         return Response({'module': module, 'count': 0})
 
+    seen_at = timezone.now()
     ModuleSeen.objects.update_or_create(
         user=request.user,
         module=module,
-        defaults={'last_seen_at': timezone.now()},
+        defaults={'last_seen_at': seen_at},
     )
+    record_seen(request.user, module, seen_at)
     return Response({'module': module, 'count': 0})
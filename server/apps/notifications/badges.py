@@ -12,11 +12,31 @@ To add a new badge later: add one entry to STUDENT_MODULES or ADMIN_MODULES.
 Every counter is wrapped so a bad query or a missing model can never break the
 badges endpoint — it just contributes 0. Counts are deliberately cheap
 (`.filter(...).count()` on indexed columns).
+
+Counts are materialized per user in the shared cache. Each module has a
+generation counter (`badge:<module>`) that save/delete signals on the models
+it counts bump (MODULE_SOURCES, wired in NotificationsConfig.ready), so a
+poll re-runs only the counters whose inputs changed — and no query at all
+when nothing did. High-churn models whose rows belong to one student,
+teacher or department (SCOPED_SOURCES) bump only that owner's generation
+(`badge:<module>:<scope>`), so an attendance save recounts one student's
+badge rather than everyone's. Code that writes those models in bulk
+(bypassing signals) calls `invalidate_instances`, or `invalidate_sources` /
+`invalidate_modules` when it cannot name the rows. Drift from anything else
+(raw UPDATEs, the clock) is reconciled by the entry TTL,
+BADGE_RECONCILE_SECONDS, after which every counter is recomputed;
+`manage.py reconcile_badges` forces that for everyone.
 """
 import logging
 from functools import wraps
 
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Q
+from django.utils import timezone as dj_timezone
+
+from utils.cache import bump, get_generations, invalidate_on_change, make_key
 
 logger = logging.getLogger(__name__)
 
@@ -271,16 +291,258 @@ def modules_for_user(user):
     return STUDENT_MODULES
 
 
-def compute_badges(user):
+# Models whose save/delete can change each module's count, for every user.
+MODULE_SOURCES = {
+    'notices': ('notices.Notice',),
+    'applications': ('applications.Application',),
+    'complaints': ('complaints.ComplaintUpdate',),
+    'routine': ('class_routines.ClassRoutine',),
+    'manage_attendance': ('class_routines.ClassRoutine',),
+    'alumni_directory': ('alumni.Alumni',),
+    'admin_admissions': ('admissions.Admission',),
+    'admin_teacher_requests': ('teacher_requests.TeacherSignupRequest',),
+    'admin_alumni': ('alumni.Alumni',),
+    'admin_applications': ('applications.Application',),
+    'admin_correction_requests': ('correction_requests.CorrectionRequest',),
+    'admin_signup_requests': ('authentication.SignupRequest',),
+    'admin_complaints': ('complaints.Complaint',),
+    'admin_notices': ('notices.Notice',),
+    'admin_analytics': ('system_reports.SystemReport',),
+}
+
+
+
+def _owner_scopes(field):
+    """Scope rows by the student/teacher profile whose id is in `field`."""
+    def scopes(instances):
+        return {f'profile:{getattr(obj, field)}' for obj in instances if getattr(obj, field)}
+    return scopes
+
+
+def _routine_teacher_scopes(records):
+    """Only today's records move a teacher's manage_attendance badge."""
+    from apps.class_routines.models import ClassRoutine
+
+    today = dj_timezone.localdate().isoformat()
+    routine_ids = {
+        record.class_routine_id for record in records
+        if record.class_routine_id and str(record.date) == today
+    }
+    if not routine_ids:
+        return set()
+    teachers = ClassRoutine.objects.filter(pk__in=routine_ids).values_list('teacher_id', flat=True)
+    return {f'profile:{teacher}' for teacher in teachers if teacher}
+
+
+def _discontinued_scopes(students):
     """
-    Return { module_key: count } for every module relevant to `user`, using each
-    module's last-seen timestamp. One query loads all the user's seen-markers.
+    Discontinuing a student raises the badge of their department head and of
+    the registrars ('all'). Reactivations only lower it and are left to the
+    entry TTL, so ordinary student edits touch no admin badge.
     """
+    scopes = set()
+    for student in students:
+        if student.status == 'discontinued':
+            scopes.add('all')
+            if student.department_id:
+                scopes.add(f'dept:{student.department_id}')
+    return scopes
+
+
+# High-churn models whose rows affect only some users' count of a module:
+# module -> {model label: fn(instances) -> scopes to bump}. A user reads the
+# scope `_user_scope` gives them.
+SCOPED_SOURCES = {
+    'documents': {'documents.Document': _owner_scopes('student_id')},
+    'routine': {'students.Student': _owner_scopes('pk')},
+    'attendance': {'attendance.AttendanceRecord': _owner_scopes('student_id')},
+    'manage_attendance': {'attendance.AttendanceRecord': _routine_teacher_scopes},
+    'admin_discontinued_students': {'students.Student': _discontinued_scopes},
+}
+
+# Counters that depend on today's date as well as on their models.
+DAILY_MODULES = {'manage_attendance'}
+
+# Generation of every user's cached entry; bumped by reconcile_badges.
+ENTRY_NAMESPACE = 'badges'
+
+DEFAULT_RECONCILE_SECONDS = 600
+
+
+def _module_namespace(module, scope=None):
+    return f'badge:{module}:{scope}' if scope else f'badge:{module}'
+
+
+def _user_scope(user, module):
+    """The scope of a SCOPED_SOURCES module that `user`'s count depends on."""
+    if module == 'admin_discontinued_students':
+        if getattr(user, 'role', None) == 'department_head' and getattr(user, 'department_id', None):
+            return f'dept:{user.department_id}'
+        return 'all'
+    pid = _profile_id(user)
+    return f'profile:{pid}' if pid else None
+
+
+def _get_model(label, module):
+    try:
+        return django_apps.get_model(label)
+    except LookupError:
+        logger.debug("badge source %s for %s is not installed", label, module)
+        return None
+
+
+def connect_signals():
+    """Bump each module's generation when one of its source models changes."""
+    from django.db.models.signals import post_delete, post_save
+
+    for module, labels in MODULE_SOURCES.items():
+        models = [model for model in (_get_model(label, module) for label in labels) if model]
+        invalidate_on_change(_module_namespace(module), *models)
+
+    for module, sources in SCOPED_SOURCES.items():
+        for label, scopes in sources.items():
+            model = _get_model(label, module)
+            if model is None:
+                continue
+
+            def _bump_scopes(sender, instance, _module=module, _scopes=scopes, **kwargs):
+                _bump_scoped(_module, _scopes, [instance])
+
+            uid = f'badges:{module}:{label}'
+            post_save.connect(_bump_scopes, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+            post_delete.connect(_bump_scopes, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
+
+
+def _bump_scoped(module, scopes, instances):
+    try:
+        for scope in scopes(instances):
+            bump(_module_namespace(module, scope))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Badge invalidation of %s failed: %s", module, exc)
+
+
+def invalidate_modules(*modules):
+    """Mark modules stale for every user (for writes that bypass signals)."""
+    for module in modules:
+        bump(_module_namespace(module))
+
+
+def invalidate_sources(*labels):
+    """
+    Mark stale, for every user, each module fed by one of the model `labels`
+    (bulk writes that cannot name their rows; prefer `invalidate_instances`).
+    """
+    wanted = set(labels)
+    invalidate_modules(*[
+        module for module, sources in {**MODULE_SOURCES, **SCOPED_SOURCES}.items()
+        if wanted & set(sources)
+    ])
+
+
+def invalidate_instances(label, instances):
+    """Do what the save signals of `instances` (rows of model `label`) would."""
+    instances = list(instances)
+    if not instances:
+        return
+    if any(label in sources for sources in MODULE_SOURCES.values()):
+        invalidate_modules(*[
+            module for module, sources in MODULE_SOURCES.items() if label in sources
+        ])
+    for module, sources in SCOPED_SOURCES.items():
+        if label in sources:
+            _bump_scoped(module, sources[label], instances)
+
+
+def reconcile_all():
+    """Drop every user's cached counters; the next poll recomputes them."""
+    return bump(ENTRY_NAMESPACE)
+
+
+def _load_seen(user, modules):
     from .models import ModuleSeen
 
-    modules = modules_for_user(user)
-    seen = dict(
+    return dict(
         ModuleSeen.objects.filter(user=user, module__in=modules.keys())
         .values_list('module', 'last_seen_at')
     )
-    return {key: fn(user, seen.get(key)) for key, fn in modules.items()}
+
+
+def _versions(modules, user=None):
+    """(entry generation, {module: version}) from one cache round trip."""
+    scopes = {
+        key: _user_scope(user, key) for key in modules if key in SCOPED_SOURCES
+    }
+    namespaces = [ENTRY_NAMESPACE] + [_module_namespace(key) for key in modules] + [
+        _module_namespace(key, scope) for key, scope in scopes.items() if scope
+    ]
+    generations = get_generations(namespaces)
+    today = dj_timezone.localdate().isoformat()
+    versions = {}
+    for key in modules:
+        version = str(generations[_module_namespace(key)])
+        if scopes.get(key):
+            version = f'{version}.{generations[_module_namespace(key, scopes[key])]}'
+        versions[key] = f'{version}:{today}' if key in DAILY_MODULES else version
+    return generations[ENTRY_NAMESPACE], versions
+
+
+def _entry_key(user, generation):
+    return make_key(ENTRY_NAMESPACE, user.pk, generation=generation)
+
+
+def compute_badges(user):
+    """
+    Return { module_key: count } for every module relevant to `user`.
+
+    Served from the user's cached entry; only modules whose generation moved
+    since the entry was written are recounted. A cold entry costs one query
+    for the seen-markers plus one per counter; a warm one costs none.
+    """
+    modules = modules_for_user(user)
+    try:
+        generation, versions = _versions(modules, user)
+        entry_key = _entry_key(user, generation)
+        entry = cache.get(entry_key) or {}
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Badge cache unavailable, counting directly: %s", exc)
+        seen = _load_seen(user, modules)
+        return {key: fn(user, seen.get(key)) for key, fn in modules.items()}
+
+    counts = entry.get('counts', {})
+    stored = entry.get('versions', {})
+    stale = [key for key in modules if key not in counts or stored.get(key) != versions[key]]
+    if not stale:
+        return {key: counts[key] for key in modules}
+
+    seen = entry.get('seen')
+    if seen is None:
+        seen = _load_seen(user, modules)
+    for key in stale:
+        counts[key] = modules[key](user, seen.get(key))
+        stored[key] = versions[key]
+    _store_entry(entry_key, {'counts': counts, 'versions': stored, 'seen': seen})
+    return {key: counts[key] for key in modules}
+
+
+def record_seen(user, module, seen_at):
+    """Reflect a ModuleSeen upsert in the cached entry (badge drops to 0)."""
+    try:
+        generation, _ = _versions({})
+        entry_key = _entry_key(user, generation)
+        entry = cache.get(entry_key)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Badge cache unavailable recording seen marker: %s", exc)
+        return
+    if not entry or entry.get('seen') is None:
+        return
+    entry['seen'][module] = seen_at
+    entry['counts'][module] = 0
+    _store_entry(entry_key, entry)
+
+
+def _store_entry(key, entry):
+    timeout = getattr(settings, 'BADGE_RECONCILE_SECONDS', DEFAULT_RECONCILE_SECONDS)
+    try:
+        cache.set(key, entry, timeout)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Badge cache unavailable writing %s: %s", key, exc)
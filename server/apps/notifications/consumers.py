@@ -88,6 +88,13 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             'notification': notification
         }))
 
+    async def user_event(self, event):
+        """Relay a transient event sent with NotificationService.push_event"""
+        await self.send(text_data=json.dumps({
+            'type': event['event'],
+            **event['data']
+        }))
+
     @database_sync_to_async
     def mark_notification_as_read(self, notification_id):
         """Mark a notification as read"""
@@ -58,6 +58,13 @@ def _create_internal(user, notification_type, title, message, data=None):
         logger.error("In-app notification failed for user %s: %s", getattr(user, "id", None), exc)
 
 
+def _create_internal_bulk(users, notification_type, title, message, data=None):
+    try:
+        NotificationService.create_bulk_notifications(users, notification_type, title, message, data or {})
+    except Exception as exc:  # noqa: BLE001
+        logger.error("Bulk in-app notification failed for %s users: %s", len(users), exc)
+
+
 # ---------------------------------------------------------------------------
 # Recipient lookups
 # ---------------------------------------------------------------------------
@@ -126,14 +133,15 @@ def notify_users(users, *, notification_type, title, message, data=None,
     """
     Notify many users (in-app for each + a single BCC email).
 
-    `users` may be a queryset or iterable of User objects.
+    `users` may be a queryset or iterable of User objects. In-app
+    notifications go through the bulk fan-out path, so the cost is a handful
+    of queries per batch rather than several per recipient.
     """
     users = list(users)
     if not users:
         return
 
-    for user in users:
-        _create_internal(user, notification_type, title, message, data)
+    _create_internal_bulk(users, notification_type, title, message, data)
 
     if send_email:
         emails = [u.email for u in users if getattr(u, "email", None)]
@@ -3,8 +3,9 @@ Reusable, modular email service.
 
 All outgoing application email goes through `send_branded_email`, which renders
 the shared branded HTML template (`emails/generic.html`) and sends it via the
-SMTP configuration in settings (server/.env). Sending is done on a background
-thread so it never blocks the API response, with full error handling/logging.
+SMTP configuration in settings (server/.env). Sending is queued on the
+background job pool ("email" queue, see apps.jobs) so it never blocks the API
+response, survives a restart, and is retried with backoff on SMTP failures.
 
 Email categories:
   - "notification" (default): respects each user's Email Notifications
@@ -12,8 +13,8 @@ Email categories:
   - "security": OTP / password / verification emails. ALWAYS sent; the user
     preference can never disable these.
 """
+import base64
 import logging
-import threading
 from datetime import datetime
 
 from django.conf import settings
@@ -92,7 +93,7 @@ def _institute_contact():
 
 
 def _deliver(subject, recipients, html_body, bcc=None, attachments=None, inline_logo=False):
-    """Actually send the email (runs on a worker thread)."""
+    """Actually send the email (runs on a background-job worker)."""
     try:
         text_body = strip_tags(html_body)
         message = EmailMultiAlternatives(
@@ -127,6 +128,64 @@ def _deliver(subject, recipients, html_body, bcc=None, attachments=None, inline_
         return False
 
 
+# BCC-only bulk sends are split into jobs of this many addresses, so a retry
+# after an SMTP outage never re-sends to a whole notice audience.
+BULK_EMAIL_CHUNK = 50
+
+
+def _encode_attachments(attachments):
+    """(filename, bytes, mimetype) tuples -> JSON-safe lists for a job payload."""
+    encoded = []
+    for attachment in attachments or []:
+        try:
+            filename, content, mimetype = attachment
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            encoded.append([filename, base64.b64encode(content).decode('ascii'), mimetype])
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Skipping bad email attachment: %s", exc)
+    return encoded
+
+
+def _decode_attachments(encoded):
+    return [
+        (filename, base64.b64decode(content), mimetype)
+        for filename, content, mimetype in encoded or []
+    ]
+
+
+def deliver_job(subject, recipients, html_body, bcc=None, attachments=None, inline_logo=False):
+    """Background-job handler (apps.jobs): send one email, raise to retry."""
+    if not _deliver(subject, recipients, html_body, bcc, _decode_attachments(attachments), inline_logo):
+        raise RuntimeError(f"Email '{subject}' could not be delivered")
+
+
+def deliver_bulk_job(bcc_list, html_body, subject, attachments=None):
+    """
+    Background-job handler (apps.jobs): one individual email per address.
+
+    Single bad addresses are logged and skipped; only a chunk where EVERY
+    send failed (SMTP down) raises, so a retry never duplicates mail.
+    """
+    decoded = _decode_attachments(attachments)
+    sent = sum(1 for addr in bcc_list if _deliver(subject, [addr], html_body, None, decoded, False))
+    if bcc_list and not sent:
+        raise RuntimeError(f"Bulk email '{subject}' failed for all {len(bcc_list)} recipients")
+
+
+def _enqueue_email(task, payload):
+    """Queue a delivery job; if the queue itself is unavailable, send inline."""
+    try:
+        from apps.jobs.services import enqueue
+        enqueue(f'apps.notifications.email_service.{task}', payload, queue='email', max_attempts=4)
+    except Exception as exc:  # noqa: BLE001 - never let queueing break the caller
+        logger.error("Could not queue email job (sending inline): %s", exc)
+        try:
+            globals()[task](**payload)
+        except Exception as send_exc:  # noqa: BLE001
+            logger.error("Inline email delivery failed: %s", send_exc)
+
+
 def send_branded_email(
     subject,
     to,
@@ -164,7 +223,7 @@ def send_branded_email(
         highlight: Optional emphasised block (e.g. an OTP code).
         cta_label/cta_url: Optional call-to-action button.
         accent_label/accent_color/accent_soft: Optional category pill + theming.
-        async_send: Send on a background thread (default True).
+        async_send: Send via the background job queue (default True).
         category: "notification" (default, honours per-user email opt-out) or
             "security" (OTP/password emails — always sent).
         attachment_links: Optional list of {"name", "url"} rows rendered as
@@ -231,18 +290,18 @@ def send_branded_email(
             logger.error("Failed to render email template for '%s': %s", subject, exc)
             return False
 
-        def _send_bulk_individual(bcc_list, html, subj, attach, logo):
-            for addr in bcc_list:
-                _deliver(subj, [addr], html, None, attach, logo)
-
         if async_send:
-            threading.Thread(
-                target=_send_bulk_individual,
-                args=(bcc, html_body_bcc, subject, attachments, False),
-                daemon=True,
-            ).start()
+            encoded = _encode_attachments(attachments)
+            for start in range(0, len(bcc), BULK_EMAIL_CHUNK):
+                _enqueue_email('deliver_bulk_job', {
+                    'bcc_list': bcc[start:start + BULK_EMAIL_CHUNK],
+                    'html_body': html_body_bcc,
+                    'subject': subject,
+                    'attachments': encoded,
+                })
         else:
-            _send_bulk_individual(bcc, html_body_bcc, subject, attachments, False)
+            for addr in bcc:
+                _deliver(subject, [addr], html_body_bcc, None, attachments, False)
         return True
 
     support_email, support_phone = _institute_contact()
@@ -285,11 +344,14 @@ def send_branded_email(
         return False
 
     if async_send:
-        threading.Thread(
-            target=_deliver,
-            args=(subject, recipients, html_body, bcc, attachments, inline_logo),
-            daemon=True,
-        ).start()
+        _enqueue_email('deliver_job', {
+            'subject': subject,
+            'recipients': recipients,
+            'html_body': html_body,
+            'bcc': bcc,
+            'attachments': _encode_attachments(attachments),
+            'inline_logo': inline_logo,
+        })
         return True
 
     return _deliver(subject, recipients, html_body, bcc, attachments, inline_logo)
@@ -13,7 +13,6 @@ subscription is retired after repeated failures.
 """
 import json
 import logging
-import threading
 
 from django.conf import settings
 from django.utils import timezone
@@ -161,40 +160,106 @@ def send_web_push_to_user(user, payload: dict) -> int:
             WebPushSubscription.objects.filter(pk__in=to_disable).update(is_active=False)
         return sent
     except Exception as exc:  # noqa: BLE001
-        logger.error("send_web_push_to_user failed for user %s: %s", getattr(user, "id", None), exc)
+        logger.error("send_web_push_to_user failed for user %s: %s", getattr(user, "id", user), exc)
         return 0
 
 
-def _threaded_send(user, payload: dict) -> None:
-    """Background worker: send, then release this thread's DB connection."""
-    try:
-        send_web_push_to_user(user, payload)
-    except Exception as exc:  # noqa: BLE001
-        logger.error("Threaded web push failed: %s", exc)
-    finally:
-        # This thread opened its own DB connection (subscription lookups/updates);
-        # close it so we don't leak connections under load.
-        try:
-            from django.db import connection
-            connection.close()
-        except Exception:  # noqa: BLE001
-            pass
+def send_push_job(user_id, payload: dict) -> None:
+    """Background-job handler (apps.jobs): push one payload to one user."""
+    send_web_push_to_user(user_id, payload)
 
 
 def send_push_for_notification(notification) -> None:
     """
-    Build the payload from a Notification and push it to the recipient on a
-    background daemon thread (fire-and-forget), mirroring the async email path.
-    This keeps the request fast even when a notice fans out to many recipients:
-    each push is a network POST to an external push service and must never block
-    the admin's publish request.
+    Build the payload from a Notification and queue the push on the
+    background job pool ("push" queue), mirroring the async email path.
+    This keeps the request fast even when a notice fans out to many
+    recipients: each push is a network POST to an external push service and
+    must never block the admin's publish request.
     """
     if notification is None or not push_enabled():
         return
     try:
-        payload = build_payload_from_notification(notification)
-        recipient = notification.recipient  # resolve FK in the caller's thread
+        from apps.jobs.services import enqueue
+
+        enqueue(
+            'apps.notifications.push_service.send_push_job',
+            {'user_id': notification.recipient_id,
+             'payload': build_payload_from_notification(notification)},
+            queue='push',
+            # _send_one already tracks per-subscription failures; re-sending
+            # would double-deliver to the devices that did succeed.
+            max_attempts=1,
+        )
     except Exception as exc:  # noqa: BLE001
-        logger.error("send_push_for_notification (build) failed: %s", exc)
+        logger.error("send_push_for_notification failed: %s", exc)
+
+
+def send_web_push_bulk(items) -> int:
+    """
+    Send many payloads in one pass. `items` is a list of (user_id, payload)
+    pairs; every recipient's active subscriptions are loaded with ONE query
+    and dead endpoints are pruned with ONE update. Returns the number of
+    successful sends. Never raises.
+    """
+    if not push_enabled() or not items:
+        return 0
+    try:
+        from .models import WebPushSubscription
+
+        by_user = {}
+        for sub in WebPushSubscription.objects.filter(
+            user_id__in={user_id for user_id, _ in items}, is_active=True,
+        ):
+            by_user.setdefault(sub.user_id, []).append(sub)
+        if not by_user:
+            return 0
+
+        sent, to_disable = 0, []
+        for user_id, payload in items:
+            subs = by_user.get(user_id)
+            if not subs:
+                continue
+            payload_json = json.dumps(payload)
+            for sub in subs:
+                result = _send_one(sub, payload_json)
+                if result == SENT:
+                    sent += 1
+                elif result == PRUNE:
+                    to_disable.append(sub.pk)
+
+        if to_disable:
+            WebPushSubscription.objects.filter(pk__in=to_disable).update(is_active=False)
+        return sent
+    except Exception as exc:  # noqa: BLE001
+        logger.error("send_web_push_bulk failed for %s recipients: %s", len(items), exc)
+        return 0
+
+
+def send_push_bulk_job(items) -> None:
+    """Background-job handler (apps.jobs): push a batch of payloads."""
+    send_web_push_bulk([(user_id, payload) for user_id, payload in items])
+
+
+def send_push_for_notifications(notifications) -> None:
+    """
+    Batch counterpart of `send_push_for_notification`: ONE background job
+    per batch of notifications instead of one per recipient.
+    """
+    if not notifications or not push_enabled():
         return
-    threading.Thread(target=_threaded_send, args=(recipient, payload), daemon=True).start()
+    try:
+        from apps.jobs.services import enqueue
+
+        items = [
+            [n.recipient_id, build_payload_from_notification(n)]
+            for n in notifications
+        ]
+        enqueue(
+            'apps.notifications.push_service.send_push_bulk_job',
+            {'items': items},
+            queue='push',
+            max_attempts=1,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.error("send_push_for_notifications failed: %s", exc)
@@ -15,6 +15,9 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT / per realtime batch when fanning out to many recipients.
+BULK_BATCH_SIZE = 500
+
 
 class NotificationService:
     """Service for managing notifications"""
@@ -112,6 +115,150 @@ class NotificationService:
                 getattr(notification, "id", None), exc,
             )
 
+    @staticmethod
+    def create_bulk_notifications(recipients, notification_type, title, message, data=None,
+                                  batch_size=BULK_BATCH_SIZE):
+        """
+        Fan one notification out to many users with a constant number of queries.
+
+        Preferences for every recipient are resolved in a single query,
+        notifications and their in-app delivery logs are written with
+        `bulk_create`, and realtime/web-push events are sent per batch instead
+        of per recipient. Behaviour per recipient matches `create_notification`.
+
+        Args:
+            recipients: Iterable/QuerySet of User objects
+            notification_type: Type of notification
+            title: Notification title
+            message: Notification message
+            data: Additional data (optional)
+            batch_size: Rows per INSERT / realtime batch
+
+        Returns:
+            List of created Notification objects
+        """
+        if data is None:
+            data = {}
+
+        users = NotificationService.deliverable_recipients(recipients, notification_type)
+        created = []
+        for start in range(0, len(users), batch_size):
+            chunk = users[start:start + batch_size]
+            notifications = Notification.objects.bulk_create([
+                Notification(
+                    recipient=user,
+                    notification_type=notification_type,
+                    title=title,
+                    message=message,
+                    data=data,
+                )
+                for user in chunk
+            ])
+            DeliveryLog.objects.bulk_create([
+                DeliveryLog(notification=notification, channel='in_app', status='pending')
+                for notification in notifications
+            ])
+            NotificationService._push_realtime_bulk(notifications)
+            NotificationService._push_webpush_bulk(notifications)
+            created.extend(notifications)
+        return created
+
+    @staticmethod
+    def _push_webpush_bulk(notifications):
+        """Batch counterpart of `_push_webpush` (one background job per batch)."""
+        try:
+            from .push_service import send_push_for_notifications
+            send_push_for_notifications(notifications)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Bulk web push failed for %s notifications: %s", len(notifications), exc)
+
+    @staticmethod
+    def _push_realtime_bulk(notifications):
+        """
+        Batch counterpart of `_push_realtime`: serializes the whole batch at
+        once and sends every group message from a single event-loop hop.
+        """
+        if not notifications:
+            return
+        try:
+            from channels.layers import get_channel_layer
+            from asgiref.sync import async_to_sync
+            from .serializers import NotificationSerializer
+
+            channel_layer = get_channel_layer()
+            if channel_layer is None:
+                return
+
+            payloads = json.loads(json.dumps(NotificationSerializer(notifications, many=True).data))
+
+            async def _send_all():
+                for notification, payload in zip(notifications, payloads):
+                    try:
+                        await channel_layer.group_send(
+                            f"notifications_{notification.recipient_id}",
+                            {"type": "notification_created", "notification": payload},
+                        )
+                    except Exception as exc:  # noqa: BLE001
+                        logger.warning(
+                            "Real-time push failed for notification %s: %s", notification.id, exc,
+                        )
+
+            async_to_sync(_send_all)()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Bulk real-time push failed for %s notifications: %s", len(notifications), exc)
+
+    @staticmethod
+    def push_event(user_id, event_type, data):
+        """
+        Send a transient event (not stored as a Notification, e.g. result
+        import progress) to a user's open sockets. The consumer relays it as
+        ``{"type": event_type, **data}``.
+
+        Best-effort, like `_push_realtime`: a missing channel layer or a
+        failed send is logged and swallowed.
+        """
+        try:
+            from channels.layers import get_channel_layer
+            from asgiref.sync import async_to_sync
+
+            channel_layer = get_channel_layer()
+            if channel_layer is None:
+                return
+
+            async_to_sync(channel_layer.group_send)(
+                f"notifications_{user_id}",
+                {"type": "user_event", "event": event_type, "data": json.loads(json.dumps(data))},
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Real-time %s event failed for user %s: %s", event_type, user_id, exc)
+
+    @staticmethod
+    def deliverable_recipients(recipients, notification_type):
+        """
+        Filter `recipients` down to users who have not disabled
+        `notification_type`, using one query for the whole group.
+
+        Same semantics as `should_deliver`: a missing preference row means
+        enabled. Duplicate users are collapsed; order is preserved.
+        """
+        users, seen = [], set()
+        for user in recipients:
+            if user is None or user.pk in seen:
+                continue
+            seen.add(user.pk)
+            users.append(user)
+        if not users:
+            return []
+
+        disabled = set(
+            NotificationPreferenceType.objects.filter(
+                preference__user_id__in=seen,
+                notification_type=notification_type,
+                enabled=False,
+            ).values_list('preference__user_id', flat=True)
+        )
+        return [user for user in users if user.pk not in disabled]
+
     @staticmethod
     def should_deliver(user, notification_type):
         """
@@ -150,22 +297,9 @@ class NotificationService:
         Returns:
             List of created Notification objects
         """
-        if data is None:
-            data = {}
-
-        notifications = []
-        for user in user_group:
-            notification = NotificationService.create_notification(
-                recipient=user,
-                notification_type=notification_type,
-                title=title,
-                message=message,
-                data=data
-            )
-            if notification:
-                notifications.append(notification)
-
-        return notifications
+        return NotificationService.create_bulk_notifications(
+            user_group, notification_type, title, message, data,
+        )
 
     @staticmethod
     def mark_as_read(notification):
@@ -217,6 +217,37 @@ class NotificationServiceTest(TestCase):
         count = NotificationService.get_unread_count(self.user)
         self.assertEqual(count, 1)
 
+    def test_create_bulk_notifications_respects_preferences(self):
+        """Bulk fan-out skips opted-out users and logs in-app delivery"""
+        from .services import NotificationService
+
+        others = [
+            User.objects.create_user(username=f'bulk{i}', email=f'bulk{i}@example.com', password='pass12345')
+            for i in range(3)
+        ]
+        preference = NotificationPreference.objects.create(user=others[0])
+        NotificationPreferenceType.objects.create(
+            preference=preference,
+            notification_type='system_announcement',
+            enabled=False
+        )
+
+        with self.assertNumQueries(3):
+            created = NotificationService.create_bulk_notifications(
+                [self.user] + others + [self.user],
+                'system_announcement',
+                'Bulk',
+                'Bulk message'
+            )
+
+        self.assertEqual(
+            sorted(n.recipient_id for n in created),
+            sorted([self.user.id, others[1].id, others[2].id])
+        )
+        self.assertEqual(
+            DeliveryLog.objects.filter(notification__in=created, channel='in_app').count(), 3
+        )
+
     def test_initialize_user_preferences(self):
         """Test initializing user preferences"""
         from .services import NotificationService
@@ -321,3 +352,85 @@ class DeliveryServiceTest(TestCase):
         
         self.assertEqual(failed.count(), 1)
         self.assertEqual(failed.first().status, 'failed')
+
+
+class BadgeCacheTest(TestCase):
+    """Sidebar badge counts are served from cache and refreshed by signals"""
+
+    def setUp(self):
+        from .badges import reconcile_all
+        reconcile_all()
+        self.admin = User.objects.create_user(
+            username='badgeadmin', password='testpass123', role='registrar'
+        )
+        self.author = User.objects.create_user(
+            username='badgeauthor', password='testpass123', role='registrar'
+        )
+
+    def _publish(self):
+        from apps.notices.models import Notice
+        return Notice.objects.create(
+            title='Badge notice', content='Content', created_by=self.author
+        )
+
+    def test_warm_poll_runs_no_queries(self):
+        from .badges import compute_badges
+        self._publish()
+        self.assertEqual(compute_badges(self.admin)['admin_notices'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(compute_badges(self.admin)['admin_notices'], 1)
+
+    def test_signal_recounts_only_affected_module(self):
+        from .badges import compute_badges
+        compute_badges(self.admin)
+        self._publish()
+        with self.assertNumQueries(1):
+            self.assertEqual(compute_badges(self.admin)['admin_notices'], 1)
+
+    def test_mark_seen_resets_cached_count(self):
+        from rest_framework.test import APIClient
+        from .badges import compute_badges
+        self._publish()
+        compute_badges(self.admin)
+
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        client.post('/api/badges/seen/', {'module': 'admin_notices'}, format='json')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(compute_badges(self.admin)['admin_notices'], 0)
+        self._publish()
+        self.assertEqual(compute_badges(self.admin)['admin_notices'], 1)
+
+    def test_owned_rows_recount_only_their_owner(self):
+        from datetime import date
+
+        from apps.attendance.models import AttendanceRecord
+        from apps.departments.models import Department
+        from apps.students.models import Student
+        from .badges import compute_badges
+
+        department = Department.objects.create(name='Badge Department', code='BDG')
+        accounts = []
+        for roll in ('BD001', 'BD002'):
+            student = Student.objects.create(
+                fullNameEnglish='Badge Student', fullNameBangla='ব্যাজ',
+                currentRollNumber=roll, currentRegistrationNumber=f'REG-{roll}',
+                department=department, semester=1, shift='Day', status='active',
+            )
+            accounts.append(User.objects.create_user(
+                username=f'badge{roll}', password='testpass123', role='student',
+                related_profile_id=student.id,
+            ))
+        owner, bystander = accounts
+        compute_badges(owner)
+        compute_badges(bystander)
+
+        AttendanceRecord.objects.create(
+            student_id=owner.related_profile_id, subject_code='CS101',
+            subject_name='Programming', semester=1, date=date(2024, 1, 7), is_present=True,
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(compute_badges(owner)['attendance'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(compute_badges(bystander)['attendance'], 0)
@@ -10,15 +10,21 @@ and considers only students who have an account in our database
 When a student sat the same semester more than once (a retake under a newer
 regulation), the most recent published result wins — one row per student.
 
-All aggregation runs in Python over the matched rows (one institute's
-students — a few thousand at most), which keeps the SQL trivial and the
-logic database-agnostic.
+The per-group figures are materialized in SemesterBucket, one row per
+(semester, department, shift), and refreshed incrementally: after an import
+completes or is deleted (`refresh_for_rolls`) and when a student's roll,
+department, shift or name changes (`refresh_for_groups`, from signals.py).
+The summary and sheet endpoints only read and merge buckets. Building a
+bucket runs in Python over one group's matched rows, which keeps the SQL
+trivial and the logic database-agnostic.
 """
 from __future__ import annotations
 
 from collections import Counter, defaultdict
 from decimal import Decimal
-from typing import Optional
+from typing import Iterable, Optional
+
+from django.db.models import Count
 
 from apps.students.models import Student
 
@@ -47,7 +53,7 @@ def ordinal(n: int) -> str:
 
 
 # ---------------------------------------------------------------------------
-# Core join: (student, result) rows for one semester
+# Core join: latest result per roll at one semester
 # ---------------------------------------------------------------------------
 
 def _latest_result_per_roll(semester: int, rolls: list[str]) -> dict[str, StudentResult]:
@@ -71,30 +77,6 @@ def _latest_result_per_roll(semester: int, rolls: list[str]) -> dict[str, Studen
     return latest
 
 
-def matched_rows(
-    semester: int,
-    department_id: Optional[str] = None,
-    shift: str = '',
-) -> list[tuple[Student, StudentResult]]:
-    """(student, result) pairs for enrolled students at ``semester``."""
-    students = Student.objects.select_related('department').exclude(currentRollNumber='')
-    if department_id:
-        students = students.filter(department_id=department_id)
-    if shift:
-        students = students.filter(shift=shift)
-    students = list(students)
-
-    by_roll = {s.currentRollNumber: s for s in students}
-    latest = _latest_result_per_roll(semester, list(by_roll))
-    pairs = [
-        (by_roll[roll], result)
-        for roll, result in latest.items()
-        if roll in by_roll
-    ]
-    pairs.sort(key=lambda pair: pair[0].currentRollNumber)
-    return pairs
-
-
 def available_semesters() -> list[dict]:
     """Semester numbers that have any result for one of our students.
 
@@ -125,7 +107,7 @@ def available_semesters() -> list[dict]:
 
 
 # ---------------------------------------------------------------------------
-# Aggregation
+# Materialized buckets (SemesterBucket): one per (semester, department, shift)
 # ---------------------------------------------------------------------------
 
 def _own_gpa(result: StudentResult) -> Optional[Decimal]:
@@ -144,89 +126,224 @@ def _referred_semester_labels(result: StudentResult) -> str:
     return ', '.join(ordinal(s) for s in semesters)
 
 
-def _bucket(pairs) -> dict:
-    stats = {key: 0 for key in _TYPE_KEYS.values()}
-    gpas: list[Decimal] = []
-    cgpas: list[Decimal] = []
-    for _, result in pairs:
-        stats[_TYPE_KEYS.get(result.resultType, 'failed')] += 1
+def _bucket_fields(pairs) -> dict:
+    """SemesterBucket column values for a group's (student, result) pairs."""
+    fields = {key: 0 for key in _TYPE_KEYS.values()}
+    fields.update(gpaSum=Decimal(0), gpaCount=0, cgpaSum=Decimal(0), cgpaCount=0)
+    subject_counts: Counter = Counter()
+    rows = []
+    for student, result in pairs:
+        fields[_TYPE_KEYS.get(result.resultType, 'failed')] += 1
         gpa = _own_gpa(result)
         if gpa is not None:
-            gpas.append(gpa)
+            fields['gpaSum'] += gpa
+            fields['gpaCount'] += 1
         if result.cgpa is not None:
-            cgpas.append(result.cgpa)
-    appeared = sum(stats.values())
+            fields['cgpaSum'] += result.cgpa
+            fields['cgpaCount'] += 1
+        subjects = list(result.subjects.all())
+        subject_counts.update(subject.subjectCode for subject in subjects)
+        rows.append({
+            'roll': student.currentRollNumber,
+            'name': student.fullNameEnglish,
+            'gender': student.gender or '',
+            'resultType': result.resultType,
+            'gpa': str(gpa) if gpa is not None else None,
+            'cgpa': str(result.cgpa) if result.cgpa is not None else None,
+            'subjects': ', '.join(_format_subject(s) for s in subjects),
+            'refSemesters': _referred_semester_labels(result),
+        })
+    fields['appeared'] = len(rows)
+    fields['subjectCounts'] = dict(subject_counts)
+    fields['rows'] = rows
+    return fields
+
+
+def refresh_buckets(semesters: Iterable[int], groups: Iterable[tuple]) -> None:
+    """Recompute the buckets of every (semester, (department_id, shift)) pair.
+
+    A group is small (one department shift), so each refresh reads only its
+    students and their results at the semester; groups without any matched
+    result lose their bucket.
+    """
+    from .models import SemesterBucket
+
+    semesters = sorted({s for s in semesters if s is not None})
+    for department_id, shift in set(groups):
+        students = (
+            Student.objects.filter(department_id=department_id, shift=shift)
+            .exclude(currentRollNumber='')
+        )
+        by_roll = {s.currentRollNumber: s for s in students}
+        for semester in semesters:
+            latest = _latest_result_per_roll(semester, list(by_roll))
+            pairs = sorted(
+                ((by_roll[roll], result) for roll, result in latest.items()),
+                key=lambda pair: pair[0].currentRollNumber,
+            )
+            if not pairs:
+                SemesterBucket.objects.filter(
+                    semester=semester, department_id=department_id, shift=shift,
+                ).delete()
+                continue
+            SemesterBucket.objects.update_or_create(
+                semester=semester, department_id=department_id, shift=shift,
+                defaults=_bucket_fields(pairs),
+            )
+
+
+def refresh_for_rolls(rolls: Iterable[str], semesters: Iterable[int]) -> None:
+    """Refresh ``semesters`` for the groups of the students holding ``rolls``
+    (after an import lands or is deleted)."""
+    rolls = [roll for roll in set(rolls) if roll]
+    groups = set()
+    for start in range(0, len(rolls), _CHUNK):
+        groups.update(
+            Student.objects.filter(currentRollNumber__in=rolls[start:start + _CHUNK])
+            .order_by()
+            .values_list('department_id', 'shift')
+            .distinct()
+        )
+    refresh_buckets(semesters, groups)
+
+
+def refresh_for_groups(groups: Iterable[tuple], rolls: Iterable[str]) -> None:
+    """Refresh ``groups`` at every semester ``rolls`` have results in (a
+    student with those rolls joined, left, moved between or was renamed in
+    the groups)."""
+    rolls = [roll for roll in set(rolls) if roll]
+    if not rolls:
+        return
+    semesters = set(
+        StudentResult.objects.filter(rollNumber__in=rolls)
+        .values_list('exam__semester', flat=True)
+        .distinct()
+    )
+    refresh_buckets(semesters, groups)
+
+
+def rebuild_semester(semester: int) -> None:
+    """Rebuild every bucket of ``semester`` from scratch."""
+    from .models import SemesterBucket
+
+    groups = set(
+        Student.objects.exclude(currentRollNumber='')
+        .order_by()
+        .values_list('department_id', 'shift')
+        .distinct()
+    )
+    SemesterBucket.objects.filter(semester=semester).delete()
+    refresh_buckets([semester], groups)
+
+
+def semester_buckets(semester: int, department_id: Optional[str] = None,
+                     shift: str = '') -> list:
+    """The semester's buckets, optionally narrowed to a department / shift.
+
+    A semester with no buckets at all (never materialized — e.g. results
+    that predate this table) is built once here.
+    """
+    from .models import SemesterBucket
+
+    queryset = SemesterBucket.objects.filter(semester=semester).select_related('department')
+    buckets = list(queryset)  # a handful of rows: departments x shifts
+    if not buckets:
+        rebuild_semester(semester)
+        buckets = list(queryset.all())
+    if department_id:
+        buckets = [b for b in buckets if str(b.department_id) == str(department_id)]
+    if shift:
+        buckets = [b for b in buckets if b.shift == shift]
+    return buckets
+
+
+def _stats(buckets) -> dict:
+    """Summary figures over one or more buckets."""
+    stats = {key: sum(getattr(b, key) for b in buckets) for key in _TYPE_KEYS.values()}
+    appeared = sum(b.appeared for b in buckets)
+    gpa_sum, gpa_count = sum(b.gpaSum for b in buckets), sum(b.gpaCount for b in buckets)
+    cgpa_sum, cgpa_count = sum(b.cgpaSum for b in buckets), sum(b.cgpaCount for b in buckets)
     stats['appeared'] = appeared
     stats['passRate'] = round(stats['passed'] * 100 / appeared, 1) if appeared else None
-    stats['avgGpa'] = round(float(sum(gpas) / len(gpas)), 2) if gpas else None
-    stats['avgCgpa'] = round(float(sum(cgpas) / len(cgpas)), 2) if cgpas else None
+    stats['avgGpa'] = round(float(gpa_sum / gpa_count), 2) if gpa_count else None
+    stats['avgCgpa'] = round(float(cgpa_sum / cgpa_count), 2) if cgpa_count else None
     return stats
 
 
+def _rows(buckets) -> list[dict]:
+    """Every bucket's sheet rows, ordered by roll."""
+    rows = [row for bucket in buckets for row in bucket.rows]
+    rows.sort(key=lambda row: row['roll'])
+    return rows
+
+
+def _passed_by_merit(rows) -> list[dict]:
+    """Passed rows with a GPA, best first (CGPA breaks ties, then roll)."""
+    scored = [row for row in rows if row['resultType'] == 'passed' and row['gpa'] is not None]
+    scored.sort(
+        key=lambda row: (Decimal(row['gpa']), Decimal(row['cgpa'] or 0)),
+        reverse=True,
+    )
+    return scored
+
+
 def semester_summary(semester: int) -> dict:
     """Institute + department + national summary for one semester."""
-    pairs = matched_rows(semester)
+    buckets = semester_buckets(semester)
 
     by_department: dict[str, list] = defaultdict(list)
-    department_meta: dict[str, dict] = {}
-    for student, result in pairs:
-        dept = student.department
-        key = str(dept.id)
-        by_department[key].append((student, result))
-        department_meta.setdefault(key, {
+    for bucket in buckets:
+        by_department[str(bucket.department_id)].append(bucket)
+
+    departments = []
+    for key, dept_buckets in by_department.items():
+        dept = dept_buckets[0].department
+        entry = {
             'id': key,
             'name': dept.name,
             'code': getattr(dept, 'code', '') or '',
-        })
-
-    departments = []
-    for key, dept_pairs in by_department.items():
-        entry = {**department_meta[key], **_bucket(dept_pairs)}
-        shifts = defaultdict(list)
-        for student, result in dept_pairs:
-            shifts[student.shift or 'Unspecified'].append((student, result))
+            **_stats(dept_buckets),
+        }
         entry['shifts'] = {
-            shift: {
-                'appeared': bucket['appeared'],
-                'passed': bucket['passed'],
-                'passRate': bucket['passRate'],
+            bucket.shift or 'Unspecified': {
+                'appeared': stats['appeared'],
+                'passed': stats['passed'],
+                'passRate': stats['passRate'],
             }
-            for shift, bucket in
-            ((shift, _bucket(shift_pairs)) for shift, shift_pairs in shifts.items())
+            for bucket, stats in ((bucket, _stats([bucket])) for bucket in dept_buckets)
         }
         departments.append(entry)
     departments.sort(key=lambda d: d['name'])
 
     subject_counter: Counter = Counter()
-    for _, result in pairs:
-        for subject in result.subjects.all():
-            subject_counter[subject.subjectCode] += 1
+    for bucket in buckets:
+        subject_counter.update(bucket.subjectCounts)
     top_failed_subjects = [
         {'subjectCode': code, 'students': count}
         for code, count in subject_counter.most_common(10)
     ]
 
-    scored = [
-        (gpa, student, result)
-        for student, result in pairs
-        if result.resultType == 'passed' and (gpa := _own_gpa(result)) is not None
-    ]
-    scored.sort(key=lambda item: (item[0], item[2].cgpa or Decimal(0)), reverse=True)
+    department_of = {}
+    for bucket in buckets:
+        for row in bucket.rows:
+            department_of[row['roll']] = (bucket.department.name, bucket.shift)
     top_performers = [
         {
-            'roll': student.currentRollNumber,
-            'name': student.fullNameEnglish,
-            'department': student.department.name,
-            'shift': student.shift,
-            'gpa': str(gpa),
-            'cgpa': str(result.cgpa) if result.cgpa is not None else None,
+            'roll': row['roll'],
+            'name': row['name'],
+            'department': department_of[row['roll']][0],
+            'shift': department_of[row['roll']][1],
+            'gpa': row['gpa'],
+            'cgpa': row['cgpa'],
         }
-        for gpa, student, result in scored[:10]
+        for row in _passed_by_merit(_rows(buckets))[:10]
     ]
 
     # National context: everyone in the imported PDFs at this semester.
     national_qs = StudentResult.objects.filter(exam__semester=semester)
-    national_by_type = Counter(national_qs.values_list('resultType', flat=True))
+    national_by_type = dict(
+        national_qs.order_by().values_list('resultType').annotate(n=Count('id'))
+    )
     national_total = sum(national_by_type.values())
     national = {
         'institutes': national_qs.values('institute').distinct().count(),
@@ -239,7 +356,7 @@ def semester_summary(semester: int) -> dict:
     return {
         'semester': semester,
         'label': f'{ordinal(semester)} Semester',
-        'institute': _bucket(pairs),
+        'institute': _stats(buckets),
         'departments': departments,
         'topFailedSubjects': top_failed_subjects,
         'topPerformers': top_performers,
@@ -252,30 +369,27 @@ def semester_summary(semester: int) -> dict:
 # ---------------------------------------------------------------------------
 
 def sheet_rows(semester: int, department_id: Optional[str] = None,
-               shift: str = '') -> dict:
+               shift: str = '', buckets: Optional[list] = None) -> dict:
     """Structured data for the official-style result sheet.
 
     Returns a dict with the header meta, per-student ``rows`` and the
-    aggregate ``summary`` block shown on the printed sheet.
+    aggregate ``summary`` block shown on the printed sheet. ``buckets`` are
+    the already-loaded `semester_buckets` for these filters, if any.
     """
-    pairs = matched_rows(semester, department_id=department_id, shift=shift)
+    if buckets is None:
+        buckets = semester_buckets(semester, department_id=department_id, shift=shift)
+    student_rows = _rows(buckets)
 
     # Position: rank passed students by own-semester GPA (CGPA tiebreak).
-    passed = sorted(
-        ((gpa, result.cgpa or Decimal(0), student.currentRollNumber)
-         for student, result in pairs
-         if result.resultType == 'passed' and (gpa := _own_gpa(result)) is not None),
-        key=lambda item: (item[0], item[1]),
-        reverse=True,
-    )
-    position_by_roll = {roll: index + 1 for index, (_, _, roll) in enumerate(passed)}
+    position_by_roll = {
+        row['roll']: index + 1 for index, row in enumerate(_passed_by_merit(student_rows))
+    }
 
     rows = []
     passed_n = referred_n = failed_n = 0
-    for index, (student, result) in enumerate(pairs, start=1):
-        gpa = _own_gpa(result)
-        is_pass = result.resultType == 'passed'
-        is_referred = result.resultType in ('referred', 'continuous_fail')
+    for index, row in enumerate(student_rows, start=1):
+        is_pass = row['resultType'] == 'passed'
+        is_referred = row['resultType'] in ('referred', 'continuous_fail')
         if is_pass:
             passed_n += 1
         elif is_referred:
@@ -283,24 +397,21 @@ def sheet_rows(semester: int, department_id: Optional[str] = None,
         else:
             failed_n += 1
 
-        subjects = ', '.join(
-            _format_subject(s) for s in result.subjects.all()
-        )
-        pos = position_by_roll.get(student.currentRollNumber)
+        pos = position_by_roll.get(row['roll'])
         rows.append({
             'sl': index,
-            'name': student.fullNameEnglish,
-            'gender': _gender_letter(student.gender),
-            'roll': student.currentRollNumber,
-            'gpa': str(gpa) if (is_pass and gpa is not None) else 'R',
+            'name': row['name'],
+            'gender': _gender_letter(row['gender']),
+            'roll': row['roll'],
+            'gpa': row['gpa'] if (is_pass and row['gpa'] is not None) else 'R',
             'passed': is_pass,
-            'referredSubjects': subjects if not is_pass else '',
-            'failedSubjects': '' if result.resultType != 'failed' else subjects,
-            'refSubSemWise': _referred_semester_labels(result) if not is_pass else '',
+            'referredSubjects': row['subjects'] if not is_pass else '',
+            'failedSubjects': '' if row['resultType'] != 'failed' else row['subjects'],
+            'refSubSemWise': row['refSemesters'] if not is_pass else '',
             'position': ordinal(pos) if pos and pos <= 3 else '',
         })
 
-    total = len(pairs)
+    total = len(student_rows)
     summary = {
         'totalStudent': total,
         'totalPass': passed_n,
@@ -312,12 +423,7 @@ def sheet_rows(semester: int, department_id: Optional[str] = None,
         'pctTotal': 100 if total else 0,
     }
 
-    department = None
-    if department_id:
-        department = next(
-            (s.department for s, _ in pairs if str(s.department_id) == str(department_id)),
-            None,
-        )
+    department = buckets[0].department if department_id and buckets else None
 
     return {
         'semester': semester,
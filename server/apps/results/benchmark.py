@@ -0,0 +1,293 @@
+"""
+Result-import benchmark: synthetic BTEB notices at real scale, timed stage
+by stage.
+
+`generate_pages` writes notice pages in the exact text grammar the parser
+expects (page furniture, institute headers, notice paragraphs, every record
+family, records wrapped across lines, columns and pages), deterministically
+from a seed. `run_benchmark` pushes them through the stage functions that
+`parse_result_pdf` and `import_result_pdf` are built from, timing each one
+separately:
+
+    extraction -> classification -> assembly -> grammar -> validation
+    -> persist (importer._persist) -> sync (sync_students_for_rolls)
+
+Extraction is only measured when the pages are rendered to a real PDF
+(``pdf=True``); otherwise the text is already in memory. The sync stage
+needs enrolled students to match: `students` profiles (default: one
+institute's worth) are seeded for rolls on the notice before it runs. The
+database stages run inside a transaction that is rolled back, so a
+benchmark never leaves rows (or queued result emails) behind. See the `benchmark_result_import`
+management command for the JSON report.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import platform
+import random
+import sys
+import textwrap
+import time
+from contextlib import contextmanager
+
+from utils.benchmark import git_revision
+
+from .parsing.assembler import assemble
+from .parsing.extraction import PageText, PypdfExtractor
+from .parsing.metadata import HeaderScanner
+from .parsing.pipeline import classify_pages, parse_document
+from .parsing.validation import validate
+
+#: Width at which record text is wrapped into lines, like the notice columns.
+WRAP_WIDTH = 56
+
+_PAGE_FOOTER = """Bangladesh Technical Education Board
+Office of the Controller of Examinations
+Agargaon, Sherebangla Nagar, Dhaka-1207
+Memo No. 57.17.0000.301.31.002.25.300
+Note:
+1. The result is hereby published subject to the final approval of the Bangladesh Technical Education Board. If any inadvertent error/mistake is detected later on in the result, the board as per rule holds the
+authority of correcting / altering / withdrawing the result at any time. No complain
+will be entertained after the expiry of the stipulated time.
+( Enrg. Md. Abul Kalam Azad )
+Controller of Examinations
+Bangladesh Technical Education Board,Dhaka
+Phone : 02-55006525
+Date : 28-04-2026
+NOTICE"""
+
+_PARAGRAPHS = """It is to be notified all concerned that roll numbers who have passed in all subjects in the {semester}th Semester ({regulation} Regulation) Examination of DIPLOMA IN ENGINEERING, 2025 held in January-March, 2026 are
+listed below in accordance with the regulation of the board. The obtained GPA of each semester are listed beside the respective roll numbers.
+It is to be notified all concerned that roll numbers who have failed in three or less subjects in the {semester}th Semester ({regulation} Regulation) Examination of DIPLOMA IN ENGINEERING, 2025 held in January-March, 2026
+are listed below in accordance with the regulation of the board. The obtained each semester GPA and referred subjects are listed beside the respective roll numbers."""
+
+_EXPELLED_HEADING = 'Expelled: (Combined Disciplinary Rule 1.3) -'
+
+#: Relative frequency of each record family on a real notice.
+_FAMILY_WEIGHTS = (
+    ('passed', 70),
+    ('referred', 18),
+    ('failed', 8),
+    ('continuous_fail', 2),
+    ('expelled', 2),
+)
+
+_FIRST_ROLL = 200000
+
+
+def _gpa(rng):
+    return f'{rng.uniform(2.0, 4.0):.2f}'
+
+
+def _subjects(rng, count, suffixed=True):
+    codes = rng.sample(range(25000, 29999), count)
+    if not suffixed:
+        return ', '.join(str(code) for code in codes)
+    return ', '.join(f'{code}({rng.choice(("T", "P", "T,P"))})' for code in codes)
+
+
+def _record(rng, roll, family, semester):
+    semesters = range(semester, 0, -1)
+    if family == 'passed':
+        return f'{roll} (' + ', '.join(f'gpa{s}: {_gpa(rng)}' for s in semesters) + ')'
+    if family == 'referred':
+        grades = ', '.join(f'gpa{s}: {"ref" if s == semester else _gpa(rng)}' for s in semesters)
+        return f'{roll} {{ {grades}, ref_sub: {_subjects(rng, rng.randint(1, 3))} }}'
+    if family == 'failed':
+        return f'{roll} {{ {_subjects(rng, rng.randint(4, 6))} }}'
+    if family == 'continuous_fail':
+        return (
+            f'{roll} ( continuousfail_sub- {_subjects(rng, 1, suffixed=False)}; '
+            f'reffered_sub- {_subjects(rng, 2)} )'
+        )
+    return (
+        f'{roll} ( Expelled_sub - {_subjects(rng, 1, suffixed=False)}; '
+        f'reffered_sub - {_subjects(rng, 2)} )'
+    )
+
+
+def _institute_lines(rng, code, rolls, semester, regulation):
+    families = [name for name, _ in _FAMILY_WEIGHTS]
+    weights = [weight for _, weight in _FAMILY_WEIGHTS]
+    regular, expelled = [], []
+    for roll in rolls:
+        family = rng.choices(families, weights)[0]
+        text = _record(rng, roll, family, semester)
+        (expelled if family == 'expelled' else regular).append(text)
+
+    lines = [f'{code} - Synthetic Polytechnic Institute {code}, Dhaka']
+    lines.extend(_PARAGRAPHS.format(semester=semester, regulation=regulation).splitlines())
+    for text in regular:
+        lines.extend(textwrap.wrap(text, WRAP_WIDTH, break_long_words=False, break_on_hyphens=False))
+    if expelled:
+        lines.append(_EXPELLED_HEADING)
+        for text in expelled:
+            lines.extend(textwrap.wrap(text, WRAP_WIDTH, break_long_words=False, break_on_hyphens=False))
+    return lines
+
+
+def generate_pages(*, pages=300, rolls=100_000, institutes=None, semester=5,
+                   regulation=2022, seed=0):
+    """
+    Synthetic notice text, one string per page, holding `rolls` records
+    spread over `institutes` sections (default: one per ~250 rolls). Content
+    flows across page breaks mid-record, as on real notices.
+    """
+    rng = random.Random(seed)
+    institutes = institutes or max(1, rolls // 250)
+    all_rolls = [str(_FIRST_ROLL + index) for index in range(rolls)]
+    per_institute = -(-rolls // institutes)
+
+    body = []
+    for index in range(institutes):
+        chunk = all_rolls[index * per_institute:(index + 1) * per_institute]
+        if chunk:
+            body.extend(_institute_lines(rng, 10000 + index, chunk, semester, regulation))
+
+    per_page = -(-len(body) // pages)
+    return [
+        f'Page {number + 1} of {pages}\n'
+        + '\n'.join(body[number * per_page:(number + 1) * per_page])
+        + '\n' + _PAGE_FOOTER
+        for number in range(pages)
+    ]
+
+
+def render_pdf(pages):
+    """Render page texts into a PDF (one text line per row) with reportlab."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    for text in pages:
+        lines = text.splitlines()
+        leading = min(12, (height - 40) / max(1, len(lines)))
+        obj = pdf.beginText(20, height - 20)
+        obj.setFont('Helvetica', max(2, leading - 1), leading)
+        for line in lines:
+            obj.textLine(line)
+        pdf.drawText(obj)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+class _Timer:
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round(time.perf_counter() - started, 4)
+
+
+def run_benchmark(*, pages=300, rolls=100_000, institutes=None, seed=0,
+                  pdf=False, workers=1, database=True, students=None):
+    """Generate a notice, time every import stage and return the report dict."""
+    timer = _Timer()
+    with timer.stage('generate'):
+        texts = generate_pages(pages=pages, rolls=rolls, institutes=institutes, seed=seed)
+
+    if pdf:
+        with timer.stage('render_pdf'):
+            pdf_bytes = render_pdf(texts)
+        with timer.stage('extraction'):
+            page_texts = PypdfExtractor(workers=workers).extract_pages(pdf_bytes)
+    else:
+        page_texts = [PageText(number=index + 1, text=text) for index, text in enumerate(texts)]
+
+    header = HeaderScanner()
+    with timer.stage('classification'):
+        # Materialized so classification is timed apart from assembly.
+        classified = list(classify_pages(page_texts, header))
+
+    with timer.stage('assembly'):
+        document = assemble(classified)
+    del classified
+
+    with timer.stage('grammar'):
+        outcome = parse_document(document, header, len(page_texts))
+
+    with timer.stage('validation'):
+        validate(outcome)
+
+    record_count = sum(len(institute.records) for institute in outcome.institutes)
+    database_counts = {}
+    if database:
+        if students is None:
+            students = len(outcome.institutes[0].records) if outcome.institutes else 0
+        database_counts = _time_database_stages(timer, outcome, seed, students)
+    return {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': sys.platform,
+        'scale': {
+            'pages': pages, 'rolls': rolls, 'institutes': len(outcome.institutes),
+            'seed': seed, 'pdf': pdf, 'workers': workers,
+        },
+        'counts': {
+            'records': record_count,
+            'issues': len(outcome.issues),
+            'errors': sum(1 for issue in outcome.issues if issue.severity == 'error'),
+            **database_counts,
+        },
+        'stages': timer.stages,
+        'totalSeconds': round(sum(timer.stages.values()), 4),
+    }
+
+
+def _seed_students(rolls, seed):
+    """Enrolled profiles for ``rolls`` (bulk, so no per-student signals)."""
+    from apps.departments.models import Department
+    from apps.students.models import Student
+
+    department, _ = Department.objects.get_or_create(
+        code=f'BM{seed}'[:10], defaults={'name': f'Benchmark {seed}'},
+    )
+    Student.objects.bulk_create(
+        [
+            Student(
+                fullNameEnglish=f'Benchmark Student {roll}',
+                currentRollNumber=roll,
+                currentRegistrationNumber=f'BENCH-{seed}-{roll}',
+                semester=1,
+                department=department,
+            )
+            for roll in rolls
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def _time_database_stages(timer, outcome, seed, students):
+    from django.db import transaction
+
+    from .importer import _persist
+    from .models import ResultImport, StudentResult
+    from .sync import sync_students_for_rolls
+
+    rolls = [parsed.roll for institute in outcome.institutes for parsed in institute.records]
+    with transaction.atomic():
+        _seed_students(rolls[:students], seed)
+        record = ResultImport.objects.create(
+            fileName=f'benchmark-{seed}.pdf',
+            fileSha256=hashlib.sha256(f'benchmark:{seed}:{time.time()}'.encode()).hexdigest(),
+            status='processing',
+        )
+        with timer.stage('persist'):
+            _persist(record, outcome)
+        persisted = StudentResult.objects.filter(importRecord=record).count()
+        with timer.stage('sync'):
+            synced = sync_students_for_rolls(rolls)
+        # Never keep benchmark rows; on_commit hooks (result emails) are
+        # discarded with the transaction.
+        transaction.set_rollback(True)
+    return {'persistedResults': persisted, 'seededStudents': students, **synced}
@@ -0,0 +1,126 @@
+"""
+Result-sheet exports (PDF / Excel), rendered once per data version and
+cached on disk.
+
+A sheet is fully determined by (format, semester, department, shift) and
+the analytics buckets it reads (analytics.SemesterBucket — refreshed on
+import and on student edits). The export file is therefore content-
+addressed by those inputs plus each bucket's refresh stamp:
+
+    <FILE_STORAGE_ROOT>/results/exports/<sha256>.pdf|.xlsx
+
+Repeat downloads of an unchanged sheet are served straight from disk (see
+utils.file_response: ETag = the address, Range requests, 304); any bucket
+refresh yields a new address, so stale files are never served. Files unused
+for RESULTS_EXPORT_MAX_AGE_DAYS are pruned whenever a new export is written.
+Bump RENDERER_VERSION when the sheet layout changes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+from .analytics import semester_buckets, sheet_rows
+from .reportsheet import write_excel, write_pdf
+
+logger = logging.getLogger(__name__)
+
+RENDERER_VERSION = 1
+
+FORMATS = {
+    'pdf': ('application/pdf', '.pdf', write_pdf),
+    'excel': (
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        '.xlsx',
+        write_excel,
+    ),
+}
+
+
+@dataclass
+class SheetExport:
+    path: Path
+    etag: str
+    filename: str
+    content_type: str
+
+
+def export_dir() -> Path:
+    root = Path(getattr(settings, 'FILE_STORAGE_ROOT', settings.BASE_DIR / 'storage'))
+    return root / 'results' / 'exports'
+
+
+def _data_version(buckets) -> str:
+    stamps = sorted(f'{bucket.pk}:{bucket.refreshedAt.isoformat()}' for bucket in buckets)
+    return hashlib.sha1('|'.join(stamps).encode()).hexdigest()
+
+
+def _filename(semester, department_id, shift, buckets, ext) -> str:
+    base = f'result_sheet_sem{semester}'
+    if department_id and buckets:
+        base += '_' + buckets[0].department.name.split()[0].lower()
+    if shift:
+        base += f'_{shift.lower()}'
+    return base + ext
+
+
+def get_export(semester: int, department_id: Optional[str] = None,
+               shift: str = '', fmt: str = 'pdf') -> SheetExport:
+    """The export file for these filters, rendering it on a cache miss."""
+    content_type, ext, writer = FORMATS[fmt]
+    buckets = semester_buckets(semester, department_id=department_id, shift=shift)
+    address = hashlib.sha256(json.dumps([
+        RENDERER_VERSION, fmt, semester, str(department_id or ''), shift,
+        _data_version(buckets),
+    ]).encode()).hexdigest()
+
+    directory = export_dir()
+    path = directory / f'{address}{ext}'
+    if path.exists():
+        os.utime(path)  # recently used: keep it past the next prune
+    else:
+        directory.mkdir(parents=True, exist_ok=True)
+        sheet = sheet_rows(semester, department_id=department_id, shift=shift, buckets=buckets)
+        # Render beside the target and rename, so a concurrent request never
+        # serves a half-written file.
+        handle, tmp_name = tempfile.mkstemp(dir=directory, suffix='.part')
+        try:
+            with os.fdopen(handle, 'wb') as tmp:
+                writer(sheet, tmp)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        prune_exports()
+
+    return SheetExport(
+        path=path,
+        etag=f'"{address[:32]}"',
+        filename=_filename(semester, department_id, shift, buckets, ext),
+        content_type=content_type,
+    )
+
+
+def prune_exports(max_age_days: Optional[int] = None) -> int:
+    """Delete exports unused for ``max_age_days``. Returns the number removed."""
+    if max_age_days is None:
+        max_age_days = getattr(settings, 'RESULTS_EXPORT_MAX_AGE_DAYS', 7)
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for entry in export_dir().glob('*'):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                entry.unlink()
+                removed += 1
+        except OSError as exc:
+            logger.warning("Could not prune result export %s: %s", entry, exc)
+    return removed
@@ -3,11 +3,17 @@ Database import of a parsed BTEB result PDF.
 
 Responsibilities:
 - deduplicate uploads by file hash (same official PDF can't import twice)
-- map the ParseOutcome onto ORM rows in one transaction
+- parse through parse_cache (one on-disk ParseOutcome per file hash and
+  parser version), then map the outcome onto ORM rows one institute per
+  transaction, checkpointing each on the ResultImport row; re-running an
+  interrupted or failed import resumes from the checkpoint without
+  re-parsing
 - replace previously-imported rolls of the same exam (BTEB republished /
   corrected notices win over older data)
 - persist every parser issue for the admin review screen
 - trigger automatic student-profile synchronisation afterwards
+- publish the current stage on ResultImport.progress for the admin UI and
+  push it to the uploader's notifications socket
 
 The parser itself stays Django-free; this module is the only bridge between
 ParseOutcome dataclasses and models.
@@ -18,7 +24,7 @@ import hashlib
 import logging
 import time
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 
 from django.db import transaction
 from django.utils import timezone
@@ -32,7 +38,9 @@ from .models import (
     SemesterGPA,
     StudentResult,
 )
-from .parsing import ParseOutcome, parse_result_pdf
+from . import parse_cache, payload_cache
+from .parsing import ParseOutcome, ParsedRecord
+from .ranking import cohorts_of, delete_import, refresh_ranks
 from .sync import sync_students_for_rolls
 
 logger = logging.getLogger(__name__)
@@ -68,52 +76,96 @@ def import_result_pdf(
 
     Raises AlreadyImportedError when the identical file was imported before
     and ``replace`` is False. Any other failure is recorded on the
-    ResultImport row (status='failed') and re-raised.
+    ResultImport row (status='failed') and re-raised; importing the same
+    file again resumes from the row's checkpoint.
     """
     sha256 = hashlib.sha256(file_bytes).hexdigest()
-    existing = ResultImport.objects.filter(fileSha256=sha256).first()
-    if existing is not None:
-        if existing.status == 'completed' and not replace:
-            raise AlreadyImportedError(existing)
-        # Interrupted or explicitly-replaced import: cascade-delete its data.
-        existing.delete()
-
-    record = ResultImport.objects.create(
-        fileName=file_name,
-        fileSha256=sha256,
-        uploadedBy=uploaded_by,
-        status='processing',
-    )
+    artifact = parse_cache.artifact_path(sha256)
+    record = ResultImport.objects.filter(fileSha256=sha256).first()
+    if record is not None:
+        if record.status == 'completed':
+            if not replace:
+                raise AlreadyImportedError(record)
+            delete_import(record)
+            record = None
+        elif not artifact.exists():
+            # Stopped before its outcome was cached (or the parser changed
+            # since): start over.
+            delete_import(record)
+            record = None
+
+    if record is None:
+        record = ResultImport.objects.create(
+            fileName=file_name,
+            fileSha256=sha256,
+            uploadedBy=uploaded_by,
+            status='processing',
+        )
+    else:
+        # Interrupted or failed mid-persist: resume from the checkpoint.
+        logger.info('Resuming result import %s from %s', record.id, record.checkpoint)
+        record.fileName = file_name
+        record.uploadedBy = uploaded_by or record.uploadedBy
+        record.status = 'processing'
+        record.errorMessage = ''
+        record.save(update_fields=['fileName', 'uploadedBy', 'status', 'errorMessage'])
+
     try:
+        _set_progress(record, 'parse')
         started = time.monotonic()
-        outcome = parse_result_pdf(file_bytes)
-        parse_seconds = time.monotonic() - started
-
+        outcome, cached = parse_cache.get_outcome(file_bytes, sha256)
         if outcome.exam.semester is None or outcome.exam.regulation_year is None:
             raise UnparsablePdfError(
                 'The exam identity (semester / regulation) could not be read '
                 'from the PDF — is this an official BTEB result notice?'
             )
+        parse_seconds = time.monotonic() - started
 
         started = time.monotonic()
-        with transaction.atomic():
-            stats = _persist(record, outcome)
+        stats = _persist(
+            record, outcome,
+            progress=lambda done, total: _set_progress(record, 'persist', done=done, total=total),
+        )
         db_seconds = time.monotonic() - started
 
         started = time.monotonic()
+        imported_rolls = {parsed.roll for inst in outcome.institutes for parsed in inst.records}
         stats['sync'] = sync_students_for_rolls(
-            {parsed.roll for inst in outcome.institutes for parsed in inst.records}
+            imported_rolls,
+            progress=lambda done, total, matched: _set_progress(
+                record, 'sync', done=done, total=total, matched=matched,
+            ),
         )
+        sync_seconds = time.monotonic() - started
+
+        _set_progress(record, 'analytics')
+        started = time.monotonic()
+        _refresh_analytics(imported_rolls, outcome.exam.semester)
         stats['timings'] = {
             'parseSeconds': round(parse_seconds, 2),
+            'parseCached': cached,
             'dbSeconds': round(db_seconds, 2),
-            'syncSeconds': round(time.monotonic() - started, 2),
+            'syncSeconds': round(sync_seconds, 2),
+            'analyticsSeconds': round(time.monotonic() - started, 2),
         }
 
         record.stats = stats
         record.status = 'completed'
+        record.progress = {'stage': 'done'}
+        record.checkpoint = {}
         record.completedAt = timezone.now()
-        record.save(update_fields=['stats', 'status', 'completedAt'])
+        record.save(update_fields=['stats', 'status', 'progress', 'checkpoint', 'completedAt'])
+        _push_progress(record)
+        if payload_cache.enabled():
+            from apps.jobs.services import enqueue
+
+            # Queued behind _persist's on-commit invalidation, never before it.
+            transaction.on_commit(lambda: enqueue(
+                'apps.results.views.warm_roll_payloads_job',
+                {'import_id': str(record.id)},
+                queue='results',
+                max_attempts=1,
+            ))
         return record
 
     except AlreadyImportedError:
@@ -124,9 +176,37 @@ def import_result_pdf(
         record.errorMessage = str(exc)
         record.completedAt = timezone.now()
         record.save(update_fields=['status', 'errorMessage', 'completedAt'])
+        _push_progress(record)
         raise
 
 
+def preview_result_pdf(*, file_bytes: bytes) -> dict:
+    """Dry run: parse a result PDF (through parse_cache) without touching the
+    database, returning what an import would record — the exam identity,
+    the outcome statistics and every parser issue."""
+    outcome, cached = parse_cache.get_outcome(file_bytes)
+    stats = outcome.stats()
+    stats['exam'] = {
+        'semester': outcome.exam.semester,
+        'regulationYear': outcome.exam.regulation_year,
+        'program': outcome.exam.program,
+        'heldIn': outcome.exam.held_in,
+        'publicationDate': outcome.exam.publication_date,
+    }
+    stats['parseCached'] = cached
+    stats['issues'] = [
+        {
+            'severity': issue.severity,
+            'stage': issue.stage,
+            'code': issue.code,
+            'message': issue.message,
+            'rollNumber': issue.roll,
+        }
+        for issue in outcome.issues
+    ]
+    return stats
+
+
 def import_subject_pdf(*, file_bytes: bytes, file_name: str) -> dict:
     """Parse a BTEB Probidhan course-structure PDF and upsert the subject
     catalog. Synchronous (these PDFs are a handful of pages).
@@ -171,6 +251,8 @@ def import_subject_pdf(*, file_bytes: bytes, file_name: str) -> dict:
                 created += 1
             else:
                 updated += 1
+    # Subject info is embedded in every cached roll payload.
+    transaction.on_commit(payload_cache.invalidate_all)
 
     return {
         'fileName': file_name,
@@ -187,6 +269,38 @@ def import_subject_pdf(*, file_bytes: bytes, file_name: str) -> dict:
     }
 
 
+def _refresh_analytics(rolls: set, semester: int) -> None:
+    """Refresh the analytics buckets of our students among ``rolls``."""
+    from .analytics import refresh_for_rolls
+
+    try:
+        refresh_for_rolls(rolls, [semester])
+    except Exception:
+        # The import itself succeeded; rebuild_result_analytics repairs this.
+        logger.exception('Analytics refresh failed after importing semester %s', semester)
+
+
+def _set_progress(record: ResultImport, stage: str, **counts) -> None:
+    """Publish the import's current stage (and counters) on its row and to
+    the uploader's notifications socket."""
+    record.progress = {'stage': stage, **counts}
+    ResultImport.objects.filter(pk=record.pk).update(progress=record.progress)
+    _push_progress(record)
+
+
+def _push_progress(record: ResultImport) -> None:
+    if record.uploadedBy_id is None:
+        return
+    from apps.notifications.services import NotificationService
+
+    NotificationService.push_event(record.uploadedBy_id, 'import_progress', {
+        'importId': str(record.id),
+        'status': record.status,
+        'progress': record.progress,
+        'errorMessage': record.errorMessage,
+    })
+
+
 def _publication_date(raw: str) -> Optional[datetime]:
     try:
         return datetime.strptime(raw, '%d-%m-%Y').date()
@@ -194,7 +308,61 @@ def _publication_date(raw: str) -> Optional[datetime]:
         return None
 
 
-def _persist(record: ResultImport, outcome: ParseOutcome) -> dict:
+def _persist(
+    record: ResultImport,
+    outcome: ParseOutcome,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> dict:
+    """Write the outcome one institute per transaction.
+
+    Each committed institute is recorded in ``record.checkpoint``, so a
+    re-run skips it; nothing holds locks for the whole national notice.
+    ``progress(done, total)`` is called after every institute.
+    """
+    with transaction.atomic():
+        exam = _persist_exam(record, outcome)
+        institutes = _persist_institutes(outcome)
+
+    batches, skipped_duplicates = _institute_batches(outcome)
+    done = set(record.checkpoint.get('institutes', []))
+    replaced = record.checkpoint.get('replaced', 0)
+    for index, (code, records) in enumerate(batches.items(), 1):
+        if code not in done:
+            with transaction.atomic():
+                replaced += _persist_institute(record, exam, institutes[code], records)
+                checkpoint = {'institutes': sorted(done | {code}), 'replaced': replaced}
+                ResultImport.objects.filter(pk=record.pk).update(checkpoint=checkpoint)
+            done.add(code)
+            record.checkpoint = checkpoint
+        if progress is not None:
+            progress(index, len(batches))
+
+    with transaction.atomic():
+        # Idempotent: a resumed import rewrites the issues it stored before.
+        ParserIssue.objects.filter(importRecord=record).delete()
+        ParserIssue.objects.bulk_create(
+            [
+                ParserIssue(
+                    importRecord=record,
+                    severity=issue.severity,
+                    stage=issue.stage,
+                    code=issue.code,
+                    message=issue.message,
+                    context=issue.context,
+                    rollNumber=issue.roll,
+                )
+                for issue in outcome.issues
+            ],
+            batch_size=_BULK_BATCH,
+        )
+
+    stats = outcome.stats()
+    stats['replacedExisting'] = replaced
+    stats['skippedDuplicateRolls'] = skipped_duplicates
+    return stats
+
+
+def _persist_exam(record: ResultImport, outcome: ParseOutcome) -> Exam:
     pub_date = _publication_date(outcome.exam.publication_date)
     exam, created = Exam.objects.get_or_create(
         semester=outcome.exam.semester,
@@ -216,7 +384,10 @@ def _persist(record: ResultImport, outcome: ParseOutcome) -> dict:
     record.exam = exam
     record.pageCount = outcome.page_count
     record.save(update_fields=['exam', 'pageCount'])
+    return exam
 
+
+def _persist_institutes(outcome: ParseOutcome) -> dict[str, Institute]:
     institutes: dict[str, Institute] = {}
     for parsed in outcome.institutes:
         institute, created = Institute.objects.get_or_create(
@@ -228,83 +399,91 @@ def _persist(record: ResultImport, outcome: ParseOutcome) -> dict:
             institute.name = parsed.name
             institute.save(update_fields=['name'])
         institutes[parsed.code] = institute
+    return institutes
 
-    # A re-published notice for the same exam replaces its rolls.
-    incoming_rolls = [r.roll for inst in outcome.institutes for r in inst.records]
-    replaced = StudentResult.objects.filter(
-        exam=exam, rollNumber__in=incoming_rolls,
-    ).delete()[1].get('results.StudentResult', 0)
-
-    results: list[StudentResult] = []
-    seen_rolls: set[str] = set()
-    skipped_duplicates = 0
+
+def _institute_batches(outcome: ParseOutcome) -> tuple[dict[str, list[ParsedRecord]], int]:
+    """{institute code: records to write}, keeping the first occurrence of
+    each roll (later duplicates were already reported by the validator),
+    and the number of duplicates dropped. Deterministic, so a resumed import
+    splits the outcome exactly as the interrupted run did."""
+    batches: dict[str, list[ParsedRecord]] = {}
+    seen: set[str] = set()
+    skipped = 0
     for inst in outcome.institutes:
+        batch = batches.setdefault(inst.code, [])
         for parsed in inst.records:
-            if parsed.roll in seen_rolls:
-                skipped_duplicates += 1  # already reported by the validator
+            if parsed.roll in seen:
+                skipped += 1
                 continue
-            seen_rolls.add(parsed.roll)
-            results.append(StudentResult(
+            seen.add(parsed.roll)
+            batch.append(parsed)
+    return batches, skipped
+
+
+def _persist_institute(
+    record: ResultImport,
+    exam: Exam,
+    institute: Institute,
+    records: list[ParsedRecord],
+) -> int:
+    """Write one institute's results; returns how many older rows it replaced."""
+    rolls = [parsed.roll for parsed in records]
+    # A re-published notice for the same exam replaces its rolls.
+    superseded = (
+        StudentResult.objects.filter(exam=exam, rollNumber__in=rolls)
+        .exclude(importRecord=record)
+    )
+    # Cohorts losing replaced rolls are re-ranked too, not just the new one.
+    ranked_cohorts = cohorts_of(superseded)
+    replaced = superseded.delete()[1].get('results.StudentResult', 0)
+
+    StudentResult.objects.bulk_create(
+        [
+            StudentResult(
                 exam=exam,
-                institute=institutes[inst.code],
+                institute=institute,
                 importRecord=record,
                 rollNumber=parsed.roll,
                 resultType=parsed.family.value,
                 cgpa=parsed.cgpa,
                 expelledRule=parsed.expelled_rule,
-            ))
-    StudentResult.objects.bulk_create(results, batch_size=_BULK_BATCH)
+            )
+            for parsed in records
+        ],
+        batch_size=_BULK_BATCH,
+    )
 
     # Backend-agnostic id mapping (bulk_create pk return varies by DB).
     id_by_roll = dict(
-        StudentResult.objects.filter(exam=exam, importRecord=record)
+        StudentResult.objects.filter(exam=exam, importRecord=record, institute=institute)
         .values_list('rollNumber', 'id')
     )
 
     gpas: list[SemesterGPA] = []
     subjects: list[ResultSubject] = []
-    emitted: set[str] = set()
-    for inst in outcome.institutes:
-        for parsed in inst.records:
-            result_id = id_by_roll.get(parsed.roll)
-            if result_id is None or parsed.roll in emitted:
-                continue
-            emitted.add(parsed.roll)
-            for grade in parsed.grades:
-                gpas.append(SemesterGPA(
-                    result_id=result_id,
-                    semester=grade.semester,
-                    gpa=grade.gpa,
-                    isReferred=grade.gpa is None,
-                ))
-            for subject in parsed.subjects:
-                subjects.append(ResultSubject(
-                    result_id=result_id,
-                    subjectCode=subject.code,
-                    role=subject.role.value,
-                    hasTheory=subject.theory,
-                    hasPractical=subject.practical,
-                ))
+    for parsed in records:
+        result_id = id_by_roll[parsed.roll]
+        for grade in parsed.grades:
+            gpas.append(SemesterGPA(
+                result_id=result_id,
+                semester=grade.semester,
+                gpa=grade.gpa,
+                isReferred=grade.gpa is None,
+            ))
+        for subject in parsed.subjects:
+            subjects.append(ResultSubject(
+                result_id=result_id,
+                subjectCode=subject.code,
+                role=subject.role.value,
+                hasTheory=subject.theory,
+                hasPractical=subject.practical,
+            ))
     SemesterGPA.objects.bulk_create(gpas, batch_size=_BULK_BATCH)
     ResultSubject.objects.bulk_create(subjects, batch_size=_BULK_BATCH)
 
-    ParserIssue.objects.bulk_create(
-        [
-            ParserIssue(
-                importRecord=record,
-                severity=issue.severity,
-                stage=issue.stage,
-                code=issue.code,
-                message=issue.message,
-                context=issue.context,
-                rollNumber=issue.roll,
-            )
-            for issue in outcome.issues
-        ],
-        batch_size=_BULK_BATCH,
-    )
-
-    stats = outcome.stats()
-    stats['replacedExisting'] = replaced
-    stats['skippedDuplicateRolls'] = skipped_duplicates
-    return stats
+    ranked_cohorts.add((exam.id, institute.id))
+    # The bulk writes above and the rank refresh drop the cached payloads
+    # of every roll they touch on commit (models.PayloadQuerySet).
+    refresh_ranks(ranked_cohorts)
+    return replaced
@@ -0,0 +1,58 @@
+"""
+Benchmark the result-PDF import pipeline on a synthetic BTEB notice.
+
+    python manage.py benchmark_result_import                          # 300 pages, 100k rolls
+    python manage.py benchmark_result_import --pages 20 --rolls 5000  # quick run
+    python manage.py benchmark_result_import --pdf --workers 4        # include pypdf extraction
+    python manage.py benchmark_result_import --output bench.json      # save the JSON report
+
+Every stage (extraction, classification, assembly, grammar, validation,
+DB persist, student sync) is timed separately; the sync stage runs against
+seeded student profiles. Database work is rolled back.
+Compare the JSON reports of two commits to spot regressions.
+"""
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from apps.results.benchmark import run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Time every stage of a result import on a synthetic notice and print a JSON report.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=300, help='Notice pages to generate')
+        parser.add_argument('--rolls', type=int, default=100_000, help='Result records to generate')
+        parser.add_argument('--institutes', type=int, default=None,
+                            help='Institute sections (default: one per ~250 rolls)')
+        parser.add_argument('--seed', type=int, default=0, help='Generator seed')
+        parser.add_argument('--pdf', action='store_true',
+                            help='Render a real PDF and time text extraction too (needs reportlab)')
+        parser.add_argument('--workers', type=int, default=1, help='Extraction processes with --pdf')
+        parser.add_argument('--no-db', action='store_true', help='Skip the persist and sync stages')
+        parser.add_argument('--students', type=int, default=None,
+                            help='Enrolled students seeded for the sync stage (default: one institute)')
+        parser.add_argument('--output', help='Also write the report to this file')
+
+    def handle(self, *args, **options):
+        report = run_benchmark(
+            pages=options['pages'],
+            rolls=options['rolls'],
+            institutes=options['institutes'],
+            seed=options['seed'],
+            pdf=options['pdf'],
+            workers=options['workers'],
+            database=not options['no_db'],
+            students=options['students'],
+        )
+        payload = json.dumps(report, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(payload + '\n')
+        self.stdout.write(payload)
+
+        if report['counts']['records'] != options['rolls']:
+            self.stderr.write(self.style.WARNING(
+                f'Parsed {report["counts"]["records"]} records from {options["rolls"]} generated rolls'
+            ))
@@ -3,12 +3,17 @@ Import an official BTEB result PDF from the command line.
 
     python manage.py import_result_pdf path/to/RESULT_5th_2022_Regulation.pdf
     python manage.py import_result_pdf path.pdf --replace   # re-import same file
+    python manage.py import_result_pdf path.pdf --dry-run   # parse + report only
+
+Parsed outcomes are cached per file and parser version (see
+apps.results.parse_cache), so dry runs and re-imports of a known file skip
+extraction.
 """
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
 
-from apps.results.importer import AlreadyImportedError, import_result_pdf
+from apps.results.importer import AlreadyImportedError, import_result_pdf, preview_result_pdf
 
 
 class Command(BaseCommand):
@@ -20,12 +25,20 @@ class Command(BaseCommand):
             '--replace', action='store_true',
             help='Re-import even if this exact file was imported before',
         )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Parse and report statistics and issues without writing to the database',
+        )
 
     def handle(self, *args, **options):
         path = Path(options['pdf_path'])
         if not path.is_file():
             raise CommandError(f'File not found: {path}')
 
+        if options['dry_run']:
+            self._report(preview_result_pdf(file_bytes=path.read_bytes()))
+            return
+
         try:
             record = import_result_pdf(
                 file_bytes=path.read_bytes(),
@@ -45,3 +58,17 @@ class Command(BaseCommand):
         self.stdout.write(f'  issues: {stats.get("issuesBySeverity") or "none"}')
         self.stdout.write(f'  student sync: {stats.get("sync")}')
         self.stdout.write(f'  timings: {stats.get("timings")}')
+
+    def _report(self, preview):
+        exam = preview['exam']
+        self.stdout.write(self.style.SUCCESS(
+            f'Dry run: {preview["recordCount"]} results '
+            f'from {preview["instituteCount"]} institutes, '
+            f'semester {exam["semester"]} ({exam["regulationYear"]} regulation)'
+            + (' [cached parse]' if preview['parseCached'] else '')
+        ))
+        self.stdout.write(f'  records by type: {preview["recordsByType"]}')
+        self.stdout.write(f'  issues: {preview["issuesBySeverity"] or "none"}')
+        for issue in preview['issues']:
+            roll = f' [{issue["rollNumber"]}]' if issue['rollNumber'] else ''
+            self.stdout.write(f'    {issue["severity"]:<7} {issue["code"]}{roll}: {issue["message"]}')
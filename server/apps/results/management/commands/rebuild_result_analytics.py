@@ -0,0 +1,34 @@
+"""
+Rebuild the materialized result-analytics buckets (SemesterBucket).
+
+    python manage.py rebuild_result_analytics              # every semester
+    python manage.py rebuild_result_analytics --semester 5
+
+Buckets are refreshed incrementally by imports and student edits; run this
+after bulk data fixes (raw SQL, restores) that bypass both.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.results.analytics import rebuild_semester
+from apps.results.models import Exam, SemesterBucket
+
+
+class Command(BaseCommand):
+    help = 'Recompute the semester/department/shift result analytics buckets.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', type=int, help='Only rebuild this semester')
+
+    def handle(self, *args, **options):
+        if options['semester']:
+            semesters = [options['semester']]
+        else:
+            semesters = sorted(
+                set(Exam.objects.values_list('semester', flat=True))
+                | set(SemesterBucket.objects.values_list('semester', flat=True))
+            )
+        for semester in semesters:
+            rebuild_semester(semester)
+            self.stdout.write(f'Semester {semester}: '
+                              f'{SemesterBucket.objects.filter(semester=semester).count()} buckets')
+        self.stdout.write(self.style.SUCCESS('Result analytics rebuilt'))
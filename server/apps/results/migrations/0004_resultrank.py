@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_ranks(apps, schema_editor):
+    from django.db.models import F
+
+    from apps.results.ranking import rank_cohorts
+
+    SemesterGPA = apps.get_model('results', 'SemesterGPA')
+    ResultRank = apps.get_model('results', 'ResultRank')
+    rows = (
+        SemesterGPA.objects
+        .filter(semester=F('result__exam__semester'), gpa__isnull=False)
+        .values_list('result_id', 'result__exam_id', 'result__institute_id', 'gpa')
+    )
+    ranked = rank_cohorts(
+        (result_id, (exam_id, institute_id), gpa)
+        for result_id, exam_id, institute_id, gpa in rows.iterator(chunk_size=2000)
+    )
+    ResultRank.objects.bulk_create(
+        [ResultRank(result_id=result_id, rank=rank, cohortSize=size) for result_id, rank, size in ranked],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0003_alter_subject_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultRank',
+            fields=[
+                ('result', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='merit', serialize=False, to='results.studentresult')),
+                ('rank', models.PositiveIntegerField()),
+                ('cohortSize', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'student_result_ranks',
+            },
+        ),
+        migrations.RunPython(backfill_ranks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0004_resultrank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resultimport',
+            name='progress',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
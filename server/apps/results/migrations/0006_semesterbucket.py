@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0003_department_autoattendancesync'),
+        ('results', '0005_resultimport_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SemesterBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.PositiveSmallIntegerField()),
+                ('shift', models.CharField(blank=True, max_length=20)),
+                ('appeared', models.PositiveIntegerField(default=0)),
+                ('passed', models.PositiveIntegerField(default=0)),
+                ('referred', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('expelled', models.PositiveIntegerField(default=0)),
+                ('continuousFail', models.PositiveIntegerField(default=0)),
+                ('gpaSum', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('gpaCount', models.PositiveIntegerField(default=0)),
+                ('cgpaSum', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('cgpaCount', models.PositiveIntegerField(default=0)),
+                ('subjectCounts', models.JSONField(blank=True, default=dict)),
+                ('rows', models.JSONField(blank=True, default=list)),
+                ('refreshedAt', models.DateTimeField(auto_now=True)),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='result_buckets', to='departments.department')),
+            ],
+            options={
+                'db_table': 'result_semester_buckets',
+                'unique_together': {('semester', 'department', 'shift')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0006_semesterbucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resultimport',
+            name='checkpoint',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -94,6 +94,13 @@ class ResultImport(models.Model):
     # Aggregate parse/import statistics (record counts by type, institute
     # count, sync summary, timings). Shape documented in importer.py.
     stats = models.JSONField(default=dict, blank=True)
+    # Live progress while processing, polled by the admin UI and pushed to
+    # the uploader's notifications socket:
+    # {stage: parse|persist|sync|analytics|done, done, total, matched}.
+    progress = models.JSONField(default=dict, blank=True)
+    # Resume point of a staged import: institute codes already persisted and
+    # the running replaced-roll count. Cleared on completion.
+    checkpoint = models.JSONField(default=dict, blank=True)
     errorMessage = models.TextField(blank=True)
     exam = models.ForeignKey(
         Exam, on_delete=models.SET_NULL, null=True, blank=True,
@@ -114,6 +121,93 @@ class ResultImport(models.Model):
         return f"{self.fileName} ({self.status})"
 
 
+class PayloadQuerySet(models.QuerySet):
+    """
+    Queryset of a table the public result payload is built from.
+
+    update(), delete(), bulk_create() and bulk_update() send no per-row
+    signals, so each of them drops the cached payloads of the rolls it
+    touches once the transaction commits (payload_cache.py). Nothing is
+    looked up while the payload cache is off.
+    """
+
+    #: Lookup from this model to the result's roll number.
+    roll_lookup = 'result__rollNumber'
+
+    def _rolls(self):
+        return set(self.order_by().values_list(self.roll_lookup, flat=True))
+
+    def _rolls_of(self, objs):
+        if self.roll_lookup == 'rollNumber':
+            return {obj.rollNumber for obj in objs}
+        result_ids = list({obj.result_id for obj in objs})
+        rolls = set()
+        for start in range(0, len(result_ids), 500):
+            rolls.update(
+                StudentResult.objects.filter(pk__in=result_ids[start:start + 500])
+                .values_list('rollNumber', flat=True)
+            )
+        return rolls
+
+    def _drop(self, rolls):
+        from . import payload_cache
+
+        payload_cache.invalidate_rolls_on_commit(rolls)
+
+    def update(self, **kwargs):
+        from . import payload_cache
+
+        if not payload_cache.enabled():
+            return super().update(**kwargs)
+        rolls = self._rolls()
+        if isinstance(kwargs.get('rollNumber'), str):
+            rolls.add(kwargs['rollNumber'])
+        updated = super().update(**kwargs)
+        self._drop(rolls)
+        return updated
+
+    update.alters_data = True
+
+    def delete(self):
+        from . import payload_cache
+
+        if not payload_cache.enabled():
+            return super().delete()
+        rolls = self._rolls()
+        deleted = super().delete()
+        self._drop(rolls)
+        return deleted
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from . import payload_cache
+
+        created = super().bulk_create(objs, *args, **kwargs)
+        if payload_cache.enabled():
+            self._drop(self._rolls_of(created))
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from . import payload_cache
+
+        if not payload_cache.enabled():
+            return super().bulk_update(objs, fields, *args, **kwargs)
+        objs = list(objs)
+        # The stored rolls too, in case rollNumber itself is being changed.
+        rolls = self.filter(pk__in=[obj.pk for obj in objs])._rolls() | self._rolls_of(objs)
+        updated = super().bulk_update(objs, fields, *args, **kwargs)
+        self._drop(rolls)
+        return updated
+
+    bulk_update.alters_data = True
+
+
+class StudentResultQuerySet(PayloadQuerySet):
+    roll_lookup = 'rollNumber'
+
+
 class StudentResult(models.Model):
     """One student's outcome in one exam, as published in the notice."""
 
@@ -150,6 +244,8 @@ class StudentResult(models.Model):
     expelledRule = models.CharField(max_length=100, blank=True)
     createdAt = models.DateTimeField(auto_now_add=True)
 
+    objects = StudentResultQuerySet.as_manager()
+
     class Meta:
         db_table = 'student_results'
         unique_together = [('exam', 'rollNumber')]
@@ -178,6 +274,8 @@ class SemesterGPA(models.Model):
     gpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
     isReferred = models.BooleanField(default=False)
 
+    objects = PayloadQuerySet.as_manager()
+
     class Meta:
         db_table = 'result_semester_gpas'
         unique_together = [('result', 'semester')]
@@ -188,6 +286,33 @@ class SemesterGPA(models.Model):
         return f"{self.result.rollNumber} sem{self.semester}: {value}"
 
 
+class ResultRank(models.Model):
+    """Institute-wise merit rank of one passed result, precomputed.
+
+    Rank = 1 + number of students of the same institute in the same exam with
+    a higher GPA for the exam's semester (ties share a rank); ``cohortSize``
+    counts every ranked student of that cohort. Results without a numeric
+    GPA for the exam semester (referred/failed/expelled) have no row.
+    Maintained by apps.results.ranking whenever an import adds, replaces or
+    deletes results.
+    """
+
+    result = models.OneToOneField(
+        StudentResult, on_delete=models.CASCADE, primary_key=True,
+        related_name='merit',
+    )
+    rank = models.PositiveIntegerField()
+    cohortSize = models.PositiveIntegerField()
+
+    objects = PayloadQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'student_result_ranks'
+
+    def __str__(self):
+        return f"{self.result_id}: {self.rank}/{self.cohortSize}"
+
+
 class ResultSubject(models.Model):
     """A subject code attached to a result (referred / expelled / CA-failed).
 
@@ -210,6 +335,8 @@ class ResultSubject(models.Model):
     hasTheory = models.BooleanField(default=False)
     hasPractical = models.BooleanField(default=False)
 
+    objects = PayloadQuerySet.as_manager()
+
     class Meta:
         db_table = 'result_subjects'
         ordering = ['subjectCode']
@@ -313,3 +440,46 @@ class ParserIssue(models.Model):
 
     def __str__(self):
         return f"[{self.severity}] {self.code}: {self.message[:60]}"
+
+
+class SemesterBucket(models.Model):
+    """Materialized analytics for one (semester, department, shift) group of
+    our enrolled students — what the admin summary and result sheet read.
+
+    Holds the group's result-type counts, GPA/CGPA sums, referred-subject
+    counts and the per-student sheet rows (latest result per student at the
+    semester). Refreshed group by group by apps.results.analytics whenever an
+    import completes or is deleted, or a student's roll, department, shift or
+    name changes; see ``analytics.refresh_for_rolls``.
+    """
+
+    semester = models.PositiveSmallIntegerField()
+    department = models.ForeignKey(
+        'departments.Department', on_delete=models.CASCADE,
+        related_name='result_buckets',
+    )
+    shift = models.CharField(max_length=20, blank=True)
+
+    appeared = models.PositiveIntegerField(default=0)
+    passed = models.PositiveIntegerField(default=0)
+    referred = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    expelled = models.PositiveIntegerField(default=0)
+    continuousFail = models.PositiveIntegerField(default=0)
+    gpaSum = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    gpaCount = models.PositiveIntegerField(default=0)
+    cgpaSum = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    cgpaCount = models.PositiveIntegerField(default=0)
+    # {subjectCode: students} over the group's result subjects.
+    subjectCounts = models.JSONField(default=dict, blank=True)
+    # One entry per student, ordered by roll: roll, name, gender,
+    # resultType, gpa, cgpa, subjects, refSemesters.
+    rows = models.JSONField(default=list, blank=True)
+    refreshedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'result_semester_buckets'
+        unique_together = [('semester', 'department', 'shift')]
+
+    def __str__(self):
+        return f"sem {self.semester} / {self.department_id} / {self.shift or '-'}"
@@ -0,0 +1,111 @@
+"""
+On-disk cache of parsed result PDFs.
+
+Parsing a national notice (pypdf extraction + grammar) is the slowest part
+of an import, and its output depends only on the file and the parser. The
+ParseOutcome is therefore stored once per (file hash, parser version) in the
+parsing.artifact format:
+
+    <FILE_STORAGE_ROOT>/results/parsed/<sha256>.p<PARSER_VERSION>.a<FORMAT_VERSION>.json.gz
+
+The importer stages every import through this cache (an interrupted import
+resumes from it), and replace/re-imports and ``import_result_pdf --dry-run``
+of a known file skip extraction entirely. Bumping PARSER_VERSION changes
+every address, so outcomes of an older parser are never reused; they are
+pruned with entries unused for RESULTS_PARSE_CACHE_MAX_AGE_DAYS whenever a
+new outcome is written.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+from .parsing import PARSER_VERSION, ParseOutcome, dump_outcome, load_outcome, parse_result_pdf
+from .parsing.artifact import FORMAT_VERSION
+from .parsing.extraction import PypdfExtractor
+
+logger = logging.getLogger(__name__)
+
+
+def cache_dir() -> Path:
+    root = Path(getattr(settings, 'FILE_STORAGE_ROOT', settings.BASE_DIR / 'storage'))
+    return root / 'results' / 'parsed'
+
+
+def artifact_path(sha256: str) -> Path:
+    """Where the current parser's outcome for the PDF with this hash lives."""
+    return cache_dir() / f'{sha256}.p{PARSER_VERSION}.a{FORMAT_VERSION}.json.gz'
+
+
+def cached_outcome(sha256: str) -> Optional[ParseOutcome]:
+    """The cached outcome for this hash, or None on a miss."""
+    path = artifact_path(sha256)
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    try:
+        outcome = load_outcome(data)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Discarding unreadable parse artifact %s: %s", path, exc)
+        path.unlink(missing_ok=True)
+        return None
+    os.utime(path)  # recently used: keep it past the next prune
+    return outcome
+
+
+def get_outcome(file_bytes: bytes, sha256: Optional[str] = None) -> tuple[ParseOutcome, bool]:
+    """(outcome, cache hit) for a result PDF, parsing and storing it on a miss."""
+    sha256 = sha256 or hashlib.sha256(file_bytes).hexdigest()
+    outcome = cached_outcome(sha256)
+    if outcome is not None:
+        return outcome, True
+    outcome = parse_result_pdf(
+        file_bytes,
+        extractor=PypdfExtractor(workers=getattr(settings, 'RESULTS_PDF_WORKERS', 1)),
+    )
+    store(sha256, outcome)
+    return outcome, False
+
+
+def store(sha256: str, outcome: ParseOutcome) -> None:
+    path = artifact_path(sha256)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write beside the target and rename: a crash never leaves a torn file
+    # that a resumed import would trust.
+    handle, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.part')
+    try:
+        with os.fdopen(handle, 'wb') as tmp:
+            tmp.write(dump_outcome(outcome))
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    prune()
+
+
+def prune(max_age_days: Optional[int] = None) -> int:
+    """Delete artifacts of other parser/format versions and those unused for
+    ``max_age_days``. Returns the number removed."""
+    if max_age_days is None:
+        max_age_days = getattr(settings, 'RESULTS_PARSE_CACHE_MAX_AGE_DAYS', 30)
+    cutoff = time.time() - max_age_days * 86400
+    current = f'.p{PARSER_VERSION}.a{FORMAT_VERSION}.json.gz'
+    removed = 0
+    for entry in cache_dir().glob('*'):
+        try:
+            stale = entry.stat().st_mtime < cutoff
+            # In-flight writes ('.part') only go once abandoned.
+            if stale or not entry.name.endswith(('.part', current)):
+                entry.unlink()
+                removed += 1
+        except OSError as exc:
+            logger.warning("Could not prune parse artifact %s: %s", entry, exc)
+    return removed
@@ -16,13 +16,15 @@ Pipeline stages (each independently replaceable):
     metadata    -> exam identity from the notice paragraphs
     validation  -> semantic checks + residual-token audit
     pipeline    -> orchestrates the above into a ParseOutcome
+    artifact    -> compact on-disk form of a ParseOutcome (staged imports)
 
 Design rule: nothing keys off page numbers or coordinates. Records are
 recognised purely by their own grammar, so BTEB re-flowing the layout does
 not break parsing; genuinely new constructs surface as residual-token
 issues instead of disappearing silently.
 """
-from .pipeline import parse_result_pdf
+from .artifact import dump_outcome, load_outcome
+from .pipeline import PARSER_VERSION, parse_result_pdf
 from .types import (
     ExamMeta,
     InstituteResults,
@@ -37,6 +39,9 @@ from .types import (
 
 __all__ = [
     'parse_result_pdf',
+    'PARSER_VERSION',
+    'dump_outcome',
+    'load_outcome',
     'ExamMeta',
     'InstituteResults',
     'ParseIssue',
@@ -0,0 +1,108 @@
+"""
+Compact on-disk form of a ParseOutcome.
+
+The importer parses a PDF once, writes the outcome with `dump_outcome` and
+persists from the artifact, so an interrupted import resumes without running
+pypdf again. The format is gzipped JSON with positional tuples for the
+high-volume parts (records, grades, subjects):
+
+    {"v": 1, "exam": {...}, "pages": N,
+     "institutes": [[code, name, [[roll, family, cgpa, expelled_rule,
+                                   [[semester, gpa], ...],
+                                   [[code, theory, practical, role], ...]],
+                                  ...]], ...],
+     "issues": [{...}, ...]}
+
+Decimals travel as strings so GPAs round-trip exactly.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import asdict
+from decimal import Decimal
+from typing import Optional
+
+from .types import (
+    ExamMeta,
+    InstituteResults,
+    ParseIssue,
+    ParseOutcome,
+    ParsedRecord,
+    RecordFamily,
+    SemesterGrade,
+    SubjectRef,
+    SubjectRole,
+)
+
+FORMAT_VERSION = 1
+
+
+def _decimal(value: Optional[str]) -> Optional[Decimal]:
+    return None if value is None else Decimal(value)
+
+
+def _text(value: Optional[Decimal]) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _record(record: ParsedRecord) -> list:
+    return [
+        record.roll,
+        record.family.value,
+        _text(record.cgpa),
+        record.expelled_rule,
+        [[grade.semester, _text(grade.gpa)] for grade in record.grades],
+        [[s.code, s.theory, s.practical, s.role.value] for s in record.subjects],
+    ]
+
+
+def dump_outcome(outcome: ParseOutcome) -> bytes:
+    """Serialize ``outcome`` to the artifact format."""
+    document = {
+        'v': FORMAT_VERSION,
+        'exam': asdict(outcome.exam),
+        'pages': outcome.page_count,
+        'institutes': [
+            [inst.code, inst.name, [_record(record) for record in inst.records]]
+            for inst in outcome.institutes
+        ],
+        'issues': [asdict(issue) for issue in outcome.issues],
+    }
+    return gzip.compress(
+        json.dumps(document, separators=(',', ':')).encode(), compresslevel=6,
+    )
+
+
+def load_outcome(data: bytes) -> ParseOutcome:
+    """Inverse of `dump_outcome`; ValueError for an unknown format."""
+    document = json.loads(gzip.decompress(data))
+    if document.get('v') != FORMAT_VERSION:
+        raise ValueError(f'Unsupported parse artifact version {document.get("v")!r}')
+    return ParseOutcome(
+        exam=ExamMeta(**document['exam']),
+        institutes=[
+            InstituteResults(
+                code=code,
+                name=name,
+                records=[
+                    ParsedRecord(
+                        roll=roll,
+                        family=RecordFamily(family),
+                        cgpa=_decimal(cgpa),
+                        expelled_rule=expelled_rule,
+                        grades=[SemesterGrade(semester, _decimal(gpa)) for semester, gpa in grades],
+                        subjects=[
+                            SubjectRef(code=subject, theory=theory, practical=practical,
+                                       role=SubjectRole(role))
+                            for subject, theory, practical, role in subjects
+                        ],
+                    )
+                    for roll, family, cgpa, expelled_rule, grades, subjects in records
+                ],
+            )
+            for code, name, records in document['institutes']
+        ],
+        issues=[ParseIssue(**issue) for issue in document['issues']],
+        page_count=document['pages'],
+    )
@@ -14,6 +14,7 @@ many pages it spans or whether the next section starts mid-page.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import Iterable
 
 from .lines import ClassifiedLine, LineKind
 
@@ -41,7 +42,7 @@ class AssembledDocument:
     orphan_stream: str = ''
 
 
-def assemble(lines: list[ClassifiedLine]) -> AssembledDocument:
+def assemble(lines: Iterable[ClassifiedLine]) -> AssembledDocument:
     sections: list[SectionStream] = []
     paragraph_parts: list[str] = []
     orphan_parts: list[str] = []
@@ -16,11 +16,22 @@ the backend swappable (PyMuPDF, or an OCR path if BTEB ever ships scans).
 from __future__ import annotations
 
 import io
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Protocol, Union
+from typing import Iterator, Optional, Protocol, Union
 
 Source = Union[str, bytes, io.IOBase]
 
+#: Pages handed to a worker process per task. Large enough to amortise the
+#: inter-process round trip, small enough to keep every worker busy.
+PAGES_PER_TASK = 8
+
+#: Below this many pages a process pool costs more to start than it saves.
+MIN_PARALLEL_PAGES = 32
+
 
 @dataclass(frozen=True)
 class PageText:
@@ -36,16 +47,87 @@ class TextExtractor(Protocol):
         ...
 
 
+def iter_source_pages(extractor: TextExtractor, source: Source) -> Iterator[PageText]:
+    """Pages of ``source`` one at a time, streaming when the backend can."""
+    iter_pages = getattr(extractor, 'iter_pages', None)
+    if iter_pages is not None:
+        return iter_pages(source)
+    return iter(extractor.extract_pages(source))
+
+
+def _open_reader(source: Source):
+    from pypdf import PdfReader
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return PdfReader(source)
+
+
+# Per-process state of pool workers: each opens the document once.
+_worker_reader = None
+
+
+def _init_worker(source: Union[str, bytes]) -> None:
+    global _worker_reader
+    _worker_reader = _open_reader(source)
+
+
+def _extract_range(start: int, stop: int) -> list[tuple[int, str]]:
+    return [
+        (index + 1, _worker_reader.pages[index].extract_text() or '')
+        for index in range(start, stop)
+    ]
+
+
 class PypdfExtractor:
-    """Default backend, built on pypdf."""
+    """Default backend, built on pypdf.
+
+    ``iter_pages`` yields pages lazily. With ``workers`` > 1 and a document
+    of at least MIN_PARALLEL_PAGES pages, text extraction — the expensive
+    part — is fanned out over a process pool in page order; at most two
+    tasks per worker are in flight, so memory stays bounded by the window
+    rather than the document. Output is identical in either mode.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or 1
 
     def extract_pages(self, source: Source) -> list[PageText]:
-        from pypdf import PdfReader
+        return list(self.iter_pages(source))
 
-        if isinstance(source, bytes):
-            source = io.BytesIO(source)
-        reader = PdfReader(source)
-        pages = []
+    def iter_pages(self, source: Source) -> Iterator[PageText]:
+        if isinstance(source, io.IOBase):
+            source = source.read()
+        reader = _open_reader(source)
+        page_count = len(reader.pages)
+        if self.workers > 1 and page_count >= MIN_PARALLEL_PAGES:
+            del reader
+            yield from self._iter_parallel(source, page_count)
+            return
         for index, page in enumerate(reader.pages):
-            pages.append(PageText(number=index + 1, text=page.extract_text() or ''))
-        return pages
+            yield PageText(number=index + 1, text=page.extract_text() or '')
+
+    def _iter_parallel(self, source: Union[str, bytes], page_count: int) -> Iterator[PageText]:
+        # spawn, not fork: the web process runs threads (job pool, log
+        # flushers) that must not be duplicated into the workers.
+        context = multiprocessing.get_context('spawn')
+        workers = min(self.workers, os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=context,
+            initializer=_init_worker, initargs=(source,),
+        ) as pool:
+            ranges = iter(
+                (start, min(start + PAGES_PER_TASK, page_count))
+                for start in range(0, page_count, PAGES_PER_TASK)
+            )
+            pending = deque()
+            for start, stop in ranges:
+                pending.append(pool.submit(_extract_range, start, stop))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                for number, text in pending.popleft().result():
+                    yield PageText(number=number, text=text)
+                next_range = next(ranges, None)
+                if next_range is not None:
+                    pending.append(pool.submit(_extract_range, *next_range))
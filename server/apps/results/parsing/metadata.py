@@ -15,6 +15,7 @@ from __future__ import annotations
 
 import re
 from collections import Counter
+from typing import Union
 
 from .types import ExamMeta, ParseIssue
 
@@ -31,9 +32,45 @@ _MEMO = re.compile(r'Memo No\.\s*(?P<memo>[\d.]+)(?!\()')
 _DATE = re.compile(r'Date\s*:\s*(?P<date>\d{2}-\d{2}-\d{4})')
 
 
+#: Chars of the previous page kept to catch a header split across pages.
+_BOUNDARY_CHARS = 256
+
+
+class HeaderScanner:
+    """Memo / date occurrences counted page by page, as pages stream past.
+
+    Counts are identical to scanning every page joined with newlines: matches
+    inside a page are counted as the page is fed, and a match that straddles
+    a page break is caught by rescanning the seam (tail of the stream so far
+    + the new page's head) and keeping only matches that cross it.
+    """
+
+    def __init__(self):
+        self.memos: Counter = Counter()
+        self.dates: Counter = Counter()
+        self._tail: str | None = None
+
+    def feed(self, text: str) -> None:
+        for pattern, counter, group in ((_MEMO, self.memos, 'memo'), (_DATE, self.dates, 'date')):
+            counter.update(m.group(group) for m in pattern.finditer(text))
+            if self._tail is not None:
+                seam = self._tail + '\n' + text[:_BOUNDARY_CHARS]
+                edge = len(self._tail) + 1
+                counter.update(
+                    m.group(group) for m in pattern.finditer(seam)
+                    if m.start() < edge - 1 and m.end() > edge
+                )
+        joined = text if self._tail is None else self._tail + '\n' + text
+        self._tail = joined[-_BOUNDARY_CHARS:]
+
+
 def extract_exam_meta(
-    paragraph_text: str, raw_pages_text: str, issues: list[ParseIssue],
+    paragraph_text: str,
+    raw_pages_text: Union[str, HeaderScanner],
+    issues: list[ParseIssue],
 ) -> ExamMeta:
+    """``raw_pages_text`` is the pages' text joined with newlines, or a
+    HeaderScanner that has already been fed every page."""
     meta = ExamMeta()
 
     sentences = Counter(
@@ -60,12 +97,15 @@ def extract_exam_meta(
             '(YYYY Regulation) Examination of …") in any notice paragraph',
         ))
 
-    memos = Counter(m.group('memo') for m in _MEMO.finditer(raw_pages_text))
-    if memos:
-        meta.memo_no = memos.most_common(1)[0][0].rstrip('.')
+    header = raw_pages_text
+    if isinstance(header, str):
+        header = HeaderScanner()
+        header.feed(raw_pages_text)
+
+    if header.memos:
+        meta.memo_no = header.memos.most_common(1)[0][0].rstrip('.')
 
-    dates = Counter(m.group('date') for m in _DATE.finditer(raw_pages_text))
-    if dates:
-        meta.publication_date = dates.most_common(1)[0][0]
+    if header.dates:
+        meta.publication_date = header.dates.most_common(1)[0][0]
 
     return meta
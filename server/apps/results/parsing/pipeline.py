@@ -6,39 +6,45 @@ roll length of the whole document is known, then residual tokens are audited
 against it (bare expelled rolls are promoted to records; everything else is
 reported). This keeps "what is a roll" adaptive per document instead of
 hardcoding today's 6-digit scheme.
+
+Pages are streamed: each page is classified and fed to the assembler as soon
+as it is extracted, so only the assembled section text is ever held, never
+the pages or the classified lines. The stages are also callable one by one
+(`classify_pages`, `assemble`, `parse_document`, `validate`), which is how
+apps.results.benchmark times them. Pass ``PypdfExtractor(workers=N)`` to
+spread extraction over N processes.
 """
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
-from .assembler import assemble
-from .extraction import PypdfExtractor, Source, TextExtractor
+from .assembler import AssembledDocument, assemble
+from .extraction import PageText, PypdfExtractor, Source, TextExtractor, iter_source_pages
 from .grammar import modal_roll_length, parse_section, resolve_residuals
-from .lines import classify_line
-from .metadata import extract_exam_meta
+from .lines import ClassifiedLine, classify_line
+from .metadata import HeaderScanner, extract_exam_meta
 from .types import InstituteResults, ParseIssue, ParseOutcome
 from .validation import validate
 
+#: Bump whenever a change to any stage can alter the ParseOutcome of an
+#: existing PDF: cached parse artifacts (apps.results.parse_cache) are keyed
+#: by it, so older ones are ignored and pruned.
+PARSER_VERSION = 1
 
-def parse_result_pdf(
-    source: Source, extractor: Optional[TextExtractor] = None,
-) -> ParseOutcome:
-    extractor = extractor or PypdfExtractor()
-    pages = extractor.extract_pages(source)
 
-    classified = [
-        classify_line(line, page.number)
-        for page in pages
-        for line in page.text.splitlines()
-    ]
-    document = assemble(classified)
+def classify_pages(pages: Iterable[PageText], header: HeaderScanner) -> Iterator[ClassifiedLine]:
+    """Classify every line of ``pages``, feeding the page text to ``header``."""
+    for page in pages:
+        header.feed(page.text)
+        for line in page.text.splitlines():
+            yield classify_line(line, page.number)
 
+
+def parse_document(document: AssembledDocument, header: HeaderScanner, page_count: int) -> ParseOutcome:
+    """Exam metadata and per-institute records of an assembled document
+    (both residual passes; validation is left to the caller)."""
     issues: list[ParseIssue] = []
-    exam = extract_exam_meta(
-        document.paragraph_text,
-        '\n'.join(page.text for page in pages),
-        issues,
-    )
+    exam = extract_exam_meta(document.paragraph_text, header, issues)
 
     if document.orphan_stream.strip():
         issues.append(ParseIssue(
@@ -55,7 +61,7 @@ def parse_result_pdf(
     all_records = [r for _, parse in section_parses for r in parse.records]
     roll_length = modal_roll_length(all_records)
 
-    outcome = ParseOutcome(exam=exam, issues=issues, page_count=len(pages))
+    outcome = ParseOutcome(exam=exam, issues=issues, page_count=page_count)
     for section, parsed in section_parses:
         resolve_residuals(
             parsed,
@@ -69,6 +75,23 @@ def parse_result_pdf(
             records=parsed.records,
         ))
         outcome.issues.extend(parsed.issues)
+    return outcome
+
+
+def parse_result_pdf(
+    source: Source, extractor: Optional[TextExtractor] = None,
+) -> ParseOutcome:
+    extractor = extractor or PypdfExtractor()
+    header = HeaderScanner()
+    page_count = 0
+
+    def pages() -> Iterator[PageText]:
+        nonlocal page_count
+        for page in iter_source_pages(extractor, source):
+            page_count += 1
+            yield page
 
+    document = assemble(classify_pages(pages(), header))
+    outcome = parse_document(document, header, page_count)
     validate(outcome)
     return outcome
@@ -0,0 +1,175 @@
+"""
+Per-roll cache of the public result payload (views._search_payload).
+
+A roll's payload only changes when an import (or an import deletion) touches
+that roll or its cohort's ranks, when an admin edits a result/student row, or
+when the subject catalog is re-imported. So the portal serves every roll
+search from one cache entry:
+
+    result_roll:g<generation>:<roll> -> {'etag': '"<sha1>"', 'payload': {...}, 'version': ...}
+
+Each roll also has a version token (result_roll:version:<roll>) that every
+invalidation replaces. A reader takes the version before building and
+stores the entry only if the version is still the same afterwards; the
+entry carries its version and is served only while it matches. A build
+that raced with an invalidation can therefore never be served stale.
+
+Invalidation:
+
+- every write through the StudentResult / SemesterGPA / ResultSubject /
+  ResultRank querysets (update, bulk_create, bulk_update, delete) drops
+  the rolls it touches after the transaction commits (models.PayloadQuerySet);
+- signals.py covers rows and students saved one at a time;
+- ranking.delete_import covers the rolls its cascade delete removes;
+- a subject-catalog import bumps the whole namespace (subject info is
+  embedded in every payload).
+
+Code that writes these tables in another way (raw SQL, a cascade from a
+parent row) must call `invalidate_rolls` itself.
+
+After an import the new rolls are re-built in the background
+(views.warm_roll_payloads_job) so the publication-day rush hits warm
+entries. The ETag lets browsers revalidate with If-None-Match and get a 304
+instead of the payload. RESULTS_PAYLOAD_CACHE_SECONDS = 0 turns caching off
+(the default under the test runner); ETags still work.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import uuid
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from utils.cache import GENERATION_TIMEOUT, bump, get_generation, make_key
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = 'result_roll'
+
+_BATCH = 1000
+
+
+def _timeout() -> int:
+    return getattr(settings, 'RESULTS_PAYLOAD_CACHE_SECONDS', 0)
+
+
+def enabled() -> bool:
+    return _timeout() > 0
+
+
+def etag_for(payload: dict) -> str:
+    """Strong ETag of a payload: a hash of its canonical JSON form."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return '"%s"' % hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def _entry(payload: dict, version=None) -> dict:
+    return {'etag': etag_for(payload), 'payload': payload, 'version': version}
+
+
+def _version_key(roll: str) -> str:
+    return f'{NAMESPACE}:version:{roll}'
+
+
+def _new_versions(rolls) -> dict:
+    """Fresh version tokens for `rolls`, written to the cache."""
+    versions = {roll: uuid.uuid4().hex for roll in rolls}
+    if versions:
+        cache.set_many({_version_key(roll): token for roll, token in versions.items()}, GENERATION_TIMEOUT)
+    return versions
+
+
+def _versions(rolls) -> dict:
+    """Current version token of each roll, creating missing ones."""
+    found = cache.get_many([_version_key(roll) for roll in rolls])
+    versions = {roll: found.get(_version_key(roll)) for roll in rolls}
+    versions.update(_new_versions([roll for roll, token in versions.items() if token is None]))
+    return versions
+
+
+def _store(entries: dict, generation) -> None:
+    """Cache {roll: entry}, skipping rolls invalidated since their build."""
+    current = cache.get_many([_version_key(roll) for roll in entries])
+    fresh = {
+        make_key(NAMESPACE, roll, generation=generation): entry
+        for roll, entry in entries.items()
+        if current.get(_version_key(roll)) == entry['version']
+    }
+    if fresh:
+        cache.set_many(fresh, _timeout())
+
+
+def get_entry(roll: str, builder: Callable[[str], dict]) -> dict:
+    """{'etag', 'payload'} for `roll`, built with `builder(roll)` on a miss."""
+    if not enabled():
+        return _entry(builder(roll))
+    generation = get_generation(NAMESPACE)
+    key = make_key(NAMESPACE, roll, generation=generation)
+    try:
+        found = cache.get_many([key, _version_key(roll)])
+        entry, version = found.get(key), found.get(_version_key(roll))
+        if entry is not None and version is not None and entry.get('version') == version:
+            return entry
+        if version is None:
+            version = _new_versions([roll])[roll]
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Cache unavailable reading %s: %s", key, exc)
+        return _entry(builder(roll))
+    entry = _entry(builder(roll), version)
+    try:
+        _store({roll: entry}, generation)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Cache unavailable writing %s: %s", key, exc)
+    return entry
+
+
+def store_many(rolls, builder: Callable[[list], dict]) -> None:
+    """Build and cache the payloads of `rolls` (used by the warm-up job).
+    ``builder(rolls)`` returns {roll: payload}."""
+    rolls = list(rolls)
+    if not enabled() or not rolls:
+        return
+    generation = get_generation(NAMESPACE)
+    try:
+        versions = _versions(rolls)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Cache unavailable warming %d roll payloads: %s", len(rolls), exc)
+        return
+    entries = {roll: _entry(payload, versions[roll]) for roll, payload in builder(rolls).items()}
+    try:
+        _store(entries, generation)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Cache unavailable warming %d roll payloads: %s", len(rolls), exc)
+
+
+def invalidate_rolls(rolls: Iterable[str]) -> None:
+    """Drop the cached payloads of `rolls` (by replacing their versions)."""
+    if not enabled():
+        return
+    rolls = [roll for roll in set(rolls) if roll]
+    if not rolls:
+        return
+    try:
+        for start in range(0, len(rolls), _BATCH):
+            _new_versions(rolls[start:start + _BATCH])
+    except Exception as exc:  # noqa: BLE001
+        # Entries we could not reach expire on their own TTL.
+        logger.warning("Cache unavailable invalidating %d roll payloads: %s", len(rolls), exc)
+
+
+def invalidate_rolls_on_commit(rolls: Iterable[str]) -> None:
+    """`invalidate_rolls` once the current transaction commits."""
+    rolls = set(rolls)
+    if rolls:
+        transaction.on_commit(lambda: invalidate_rolls(rolls))
+
+
+def invalidate_all() -> None:
+    """Drop every cached roll payload (subject catalog changed)."""
+    if enabled():
+        bump(NAMESPACE)
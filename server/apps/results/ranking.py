@@ -0,0 +1,115 @@
+"""
+Precomputed institute-wise merit ranks (ResultRank).
+
+A cohort is one (exam, institute) pair; its members are the results with a
+numeric GPA for the exam's own semester. Ranks only change when a cohort's
+membership changes, so they are recomputed per affected cohort — by the
+importer after it writes (or replaces) results, after an import is deleted,
+and by `refresh_ranks_job` for rows saved one at a time (signals.py) —
+never by the public roll search, which only reads ResultRank.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from . import payload_cache
+from .models import Exam, ResultRank, SemesterGPA
+
+_BULK_BATCH = 2000
+
+
+def rank_cohorts(rows: Iterable[tuple]) -> list[tuple]:
+    """(result_id, cohort_key, gpa) rows -> (result_id, rank, cohort_size).
+
+    Standard competition ranking: equal GPAs share a rank and the next GPA's
+    rank skips past them (3.80 -> 1, 3.50 -> 2, 3.50 -> 2, 3.20 -> 4).
+    """
+    cohorts: dict = defaultdict(list)
+    for result_id, key, gpa in rows:
+        cohorts[key].append((gpa, result_id))
+
+    ranked = []
+    for members in cohorts.values():
+        members.sort(key=lambda member: member[0], reverse=True)
+        size = len(members)
+        rank, previous = 0, None
+        for position, (gpa, result_id) in enumerate(members, start=1):
+            if gpa != previous:
+                rank, previous = position, gpa
+            ranked.append((result_id, rank, size))
+    return ranked
+
+
+def cohorts_of(results) -> set[tuple]:
+    """The (exam_id, institute_id) cohorts a StudentResult queryset touches."""
+    return set(results.values_list('exam_id', 'institute_id').distinct())
+
+
+def _cohort_filter(cohorts: set[tuple], prefix: str) -> Q:
+    institutes_by_exam: dict = defaultdict(set)
+    for exam_id, institute_id in cohorts:
+        institutes_by_exam[exam_id].add(institute_id)
+    condition = Q()
+    for exam_id, institute_ids in institutes_by_exam.items():
+        condition |= Q(**{
+            f'{prefix}exam_id': exam_id,
+            f'{prefix}institute_id__in': institute_ids,
+        })
+    return condition
+
+
+@transaction.atomic
+def refresh_ranks(cohorts: set[tuple]) -> int:
+    """Recompute the ranks of `cohorts`. Returns the number of ranked results."""
+    if not cohorts:
+        return 0
+    # Concurrent refreshes of an exam's cohorts (an import and a job) would
+    # interleave their delete + insert; the exam rows serialize them.
+    list(
+        Exam.objects.select_for_update()
+        .filter(pk__in={exam_id for exam_id, _ in cohorts})
+        .order_by('pk').values_list('pk', flat=True)
+    )
+    rows = (
+        SemesterGPA.objects
+        .filter(_cohort_filter(cohorts, 'result__'))
+        .filter(semester=F('result__exam__semester'), gpa__isnull=False)
+        .values_list('result_id', 'result__exam_id', 'result__institute_id', 'gpa')
+    )
+    ranked = rank_cohorts(
+        (result_id, (exam_id, institute_id), gpa)
+        for result_id, exam_id, institute_id, gpa in rows.iterator(chunk_size=_BULK_BATCH)
+    )
+    ResultRank.objects.filter(_cohort_filter(cohorts, 'result__')).delete()
+    ResultRank.objects.bulk_create(
+        [ResultRank(result_id=result_id, rank=rank, cohortSize=size)
+         for result_id, rank, size in ranked],
+        batch_size=_BULK_BATCH,
+    )
+    return len(ranked)
+
+
+def refresh_ranks_job(*, cohorts) -> None:
+    """Background-job handler (apps.jobs): re-rank ``cohorts``
+    ([[exam_id, institute_id], ...])."""
+    refresh_ranks({(exam_id, institute_id) for exam_id, institute_id in cohorts})
+
+
+@transaction.atomic
+def delete_import(record) -> None:
+    """Delete a ResultImport (cascading to its results), re-rank the cohorts
+    that lost members and refresh the affected analytics buckets."""
+    from .analytics import refresh_for_rolls
+
+    cohorts = cohorts_of(record.results.all())
+    deleted_rolls = set(record.results.values_list('rollNumber', flat=True))
+    semesters = set(record.results.order_by().values_list('exam__semester', flat=True).distinct())
+    record.delete()
+    refresh_ranks(cohorts)
+    refresh_for_rolls(deleted_rolls, semesters)
+    # The cascade bypasses PayloadQuerySet; refresh_ranks covers the cohorts.
+    payload_cache.invalidate_rolls_on_commit(deleted_rolls)
@@ -64,6 +64,13 @@ def _summary_lines(summary: dict) -> list[str]:
 # ---------------------------------------------------------------------------
 
 def render_pdf(sheet: dict) -> bytes:
+    buffer = BytesIO()
+    write_pdf(sheet, buffer)
+    return buffer.getvalue()
+
+
+def write_pdf(sheet: dict, target) -> None:
+    """Render the sheet PDF into ``target`` (a path or binary file object)."""
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import A4, landscape
     from reportlab.lib.units import mm
@@ -76,9 +83,8 @@ def render_pdf(sheet: dict) -> bytes:
     )
     from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 
-    buffer = BytesIO()
     doc = SimpleDocTemplate(
-        buffer, pagesize=landscape(A4),
+        target, pagesize=landscape(A4),
         leftMargin=10 * mm, rightMargin=10 * mm,
         topMargin=10 * mm, bottomMargin=10 * mm,
         title=f"Result Sheet — {sheet['semesterLabel']} Semester",
@@ -184,7 +190,6 @@ def render_pdf(sheet: dict) -> bytes:
     ))
 
     doc.build(story)
-    return buffer.getvalue()
 
 
 # ---------------------------------------------------------------------------
@@ -337,13 +342,25 @@ def render_student_pdf(payload: dict) -> bytes:
 # ---------------------------------------------------------------------------
 
 def render_excel(sheet: dict) -> bytes:
+    buffer = BytesIO()
+    write_excel(sheet, buffer)
+    return buffer.getvalue()
+
+
+def write_excel(sheet: dict, target) -> None:
+    """Write the sheet workbook into ``target`` (a path or binary file object).
+
+    Uses openpyxl's write-only mode: rows are streamed out as they are
+    appended, so memory stays flat for institute-wide sheets. Styles are
+    built once and shared by every cell.
+    """
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
     from openpyxl.utils import get_column_letter
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"{sheet['semesterLabel']} Semester"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(f"{sheet['semesterLabel']} Semester")
 
     def fill(hex_color: str) -> PatternFill:
         return PatternFill('solid', fgColor=hex_color.lstrip('#'))
@@ -352,6 +369,23 @@ def render_excel(sheet: dict) -> bytes:
     border = Border(left=thin, right=thin, top=thin, bottom=thin)
     center = Alignment(horizontal='center', vertical='center', wrap_text=True)
     left = Alignment(horizontal='left', vertical='center', wrap_text=True)
+    summary_alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
+    fills = {color: fill(color) for color in (
+        _HEADER_BG, _PASS_BG, _FAIL_BG, _REFERRED_BG, _SUMMARY_BG, _ALT_ROW, '#fde68a',
+    )}
+    bold = Font(bold=True)
+
+    def styled(value, *, font=None, alignment=None, cell_fill=None, cell_border=None):
+        c = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            c.font = font
+        if alignment is not None:
+            c.alignment = alignment
+        if cell_fill is not None:
+            c.fill = cell_fill
+        if cell_border is not None:
+            c.border = cell_border
+        return c
 
     headers = HEADERS_XLSX
     # 1-based Excel columns.
@@ -360,31 +394,35 @@ def render_excel(sheet: dict) -> bytes:
     col_position = _COL_POSITION + 1
     left_cols = {_COL_NAME + 1, _COL_REFERRED + 1, _COL_FAILED + 1}
 
-    # Title rows.
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(headers))
-    title_cell = ws.cell(row=1, column=1, value=INSTITUTE_NAME)
-    title_cell.font = Font(bold=True, size=14, color='1E3A8A')
-    title_cell.alignment = center
-
-    ws.merge_cells(start_row=2, start_column=1, end_row=2, end_column=len(headers))
-    sub_cell = ws.cell(row=2, column=1, value=_title(sheet))
-    sub_cell.font = Font(size=11, color='334155')
-    sub_cell.alignment = center
-
+    # Write-only sheets need layout set before the first row.
+    #          SL Name Gen Roll GPA Ref Fail RefSub Pos Summary
+    widths = [5, 30, 8, 12, 8, 34, 20, 16, 9, 26]
+    for col, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(col)].width = width
     header_row = 4
-    for col, name in enumerate(headers, start=1):
-        c = ws.cell(row=header_row, column=col, value=name)
-        c.fill = fill(_HEADER_BG)
-        c.font = Font(bold=True, color='FFFFFF', size=10)
-        c.alignment = center
-        c.border = border
+    start = header_row + 1
+    ws.freeze_panes = f'A{start}'
+
+    # Title rows.
+    last_col = get_column_letter(len(headers))
+    ws.append([styled(INSTITUTE_NAME, font=Font(bold=True, size=14, color='1E3A8A'),
+                      alignment=center)])
+    ws.merged_cells.add(f'A1:{last_col}1')
+    ws.append([styled(_title(sheet), font=Font(size=11, color='334155'), alignment=center)])
+    ws.merged_cells.add(f'A2:{last_col}2')
+    ws.append([])
+
+    header_font = Font(bold=True, color='FFFFFF', size=10)
+    ws.append([
+        styled(name, font=header_font, alignment=center,
+               cell_fill=fills[_HEADER_BG], cell_border=border)
+        for name in headers
+    ])
 
     summary = sheet['summary']
     summary_block = '\n'.join(_summary_lines(summary))
 
-    start = header_row + 1
     for index, row in enumerate(sheet['rows']):
-        r = start + index
         tint = _PASS_BG if row['passed'] else (_FAIL_BG if row['failedSubjects'] else _REFERRED_BG)
         # Full summary block goes in the first data row's summary cell (the
         # merge below shows only the top-left cell); newlines + wrap render it
@@ -395,36 +433,29 @@ def render_excel(sheet: dict) -> bytes:
             row['refSubSemWise'], row['position'],
             summary_block if index == 0 else '',
         ]
+        cells = []
         for col, value in enumerate(values, start=1):
-            c = ws.cell(row=r, column=col, value=value)
-            c.border = border
-            c.alignment = left if col in left_cols else center
+            cell_fill, font = None, None
+            alignment = left if col in left_cols else center
             if col == col_gpa:  # GPA cell tinted by outcome
-                c.fill = fill(tint)
+                cell_fill = fills[tint]
             elif col == col_summary:
-                c.fill = fill(_SUMMARY_BG)
+                cell_fill = fills[_SUMMARY_BG]
+                if index == 0:
+                    alignment = summary_alignment
             elif index % 2 == 1 and col <= _COL_ROLL + 1:
-                c.fill = fill(_ALT_ROW)
+                cell_fill = fills[_ALT_ROW]
             if col == col_position and row['position']:
-                c.fill = fill('#fde68a')
-                c.font = Font(bold=True)
+                cell_fill = fills['#fde68a']
+                font = bold
+            cells.append(styled(value, font=font, alignment=alignment,
+                                cell_fill=cell_fill, cell_border=border))
+        ws.append(cells)
 
     # Merge the summary column into one block.
     n_rows = len(sheet['rows'])
     if n_rows:
-        ws.merge_cells(start_row=start, start_column=col_summary,
-                       end_row=start + n_rows - 1, end_column=col_summary)
-        ws.cell(row=start, column=col_summary).alignment = Alignment(
-            horizontal='left', vertical='top', wrap_text=True,
-        )
+        summary_col = get_column_letter(col_summary)
+        ws.merged_cells.add(f'{summary_col}{start}:{summary_col}{start + n_rows - 1}')
 
-    #          SL Name Gen Roll GPA Ref Fail RefSub Pos Summary
-    widths = [5, 30, 8, 12, 8, 34, 20, 16, 9, 26]
-    for col, width in enumerate(widths, start=1):
-        ws.column_dimensions[get_column_letter(col)].width = width
-
-    ws.freeze_panes = ws.cell(row=start, column=1)
-
-    buffer = BytesIO()
-    wb.save(buffer)
-    return buffer.getvalue()
+    wb.save(target)
@@ -59,7 +59,7 @@ class ResultImportSerializer(serializers.ModelSerializer):
     class Meta:
         model = ResultImport
         fields = [
-            'id', 'fileName', 'pageCount', 'status', 'stats', 'errorMessage',
+            'id', 'fileName', 'pageCount', 'status', 'stats', 'progress', 'errorMessage',
             'exam', 'uploadedByName', 'createdAt', 'completedAt',
         ]
 
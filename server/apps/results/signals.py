@@ -6,18 +6,28 @@ cover the other direction: when an admin *edits a student's roll number*
 (or a new student is created with a roll that already has imported results),
 the profile picks up the matching results immediately — no re-import, no
 manual step.
+
+They also keep the per-roll result payload cache (payload_cache.py), the
+merit ranks (ranking.py) and the analytics buckets (analytics.py) in step
+with rows saved one at a time.
 """
 from __future__ import annotations
 
 import logging
 
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from apps.students.models import Student
 
+from . import payload_cache
+from .models import ResultSubject, SemesterGPA, StudentResult
+
 logger = logging.getLogger(__name__)
 
+# Student fields the analytics buckets (SemesterBucket) depend on.
+_ANALYTICS_FIELDS = ('currentRollNumber', 'department_id', 'shift', 'fullNameEnglish', 'gender')
+
 
 @receiver(pre_save, sender=Student, dispatch_uid='results_flag_roll_change')
 def flag_roll_change(sender, instance, **kwargs):
@@ -26,14 +36,18 @@ def flag_roll_change(sender, instance, **kwargs):
     if getattr(instance, '_result_sync_in_progress', False):
         return
     if instance.pk:
-        old_roll = (
+        old = (
             Student.objects.filter(pk=instance.pk)
-            .values_list('currentRollNumber', flat=True)
+            .values_list(*_ANALYTICS_FIELDS)
             .first()
         )
+        old_roll = old[0] if old else None
         instance._result_roll_changed = old_roll != instance.currentRollNumber
+        instance._result_old_roll = old_roll
+        instance._result_old_analytics = old
     else:
         instance._result_roll_changed = True
+        instance._result_old_analytics = None
 
 
 @receiver(post_save, sender=Student, dispatch_uid='results_sync_on_roll_change')
@@ -53,3 +67,120 @@ def sync_results_on_roll_change(sender, instance, created, **kwargs):
             'Auto result-sync failed for student %s (roll %s)',
             instance.pk, instance.currentRollNumber,
         )
+
+
+# ----------------------------------------------------------------------------
+# Per-roll payload cache (payload_cache.py). The importer invalidates what it
+# bulk-writes itself; these cover rows saved one at a time (Django admin,
+# shell fixes). Deletes are left to the importer / delete_import on purpose:
+# a post_delete receiver would make every cascade delete of an import fetch
+# and signal each of its rows.
+# ----------------------------------------------------------------------------
+
+@receiver(post_save, sender=StudentResult, dispatch_uid='results_payload_result_saved')
+def drop_payload_on_result_save(sender, instance, **kwargs):
+    payload_cache.invalidate_rolls([instance.rollNumber])
+
+
+@receiver(post_save, sender=SemesterGPA, dispatch_uid='results_payload_gpa_saved')
+@receiver(post_save, sender=ResultSubject, dispatch_uid='results_payload_subject_saved')
+def drop_payload_on_detail_save(sender, instance, **kwargs):
+    if not payload_cache.enabled():
+        return
+    payload_cache.invalidate_rolls(
+        StudentResult.objects.filter(pk=instance.result_id).values_list('rollNumber', flat=True)
+    )
+
+
+@receiver(post_save, sender=Student, dispatch_uid='results_payload_student_saved')
+def drop_payload_on_student_save(sender, instance, **kwargs):
+    """The payload shows the enrolled student's name."""
+    payload_cache.invalidate_rolls(
+        [instance.currentRollNumber, getattr(instance, '_result_old_roll', None)]
+    )
+
+
+# ----------------------------------------------------------------------------
+# Merit ranks (ranking.py). The importer re-ranks what it bulk-writes; a row
+# saved one at a time queues a re-rank of its cohort, so the public search
+# never has to rank on read. Deletes go through ranking.delete_import.
+# ----------------------------------------------------------------------------
+
+@receiver(post_save, sender=StudentResult, dispatch_uid='results_rank_result_saved')
+@receiver(post_save, sender=SemesterGPA, dispatch_uid='results_rank_gpa_saved')
+def rerank_on_result_save(sender, instance, **kwargs):
+    if sender is StudentResult:
+        cohort = (instance.exam_id, instance.institute_id)
+    else:
+        cohort = (
+            StudentResult.objects.filter(pk=instance.result_id)
+            .values_list('exam_id', 'institute_id')
+            .first()
+        )
+    if not cohort:
+        return
+    try:
+        from apps.jobs.services import enqueue
+
+        enqueue('apps.results.ranking.refresh_ranks_job', {'cohorts': [list(cohort)]})
+    except Exception:
+        logger.exception('Could not queue a re-rank of cohort %s', cohort)
+
+
+# ----------------------------------------------------------------------------
+# Analytics buckets (analytics.py). Imports refresh them in bulk; these cover
+# a student joining, leaving or moving between (department, shift) groups,
+# and result rows saved one at a time.
+# ----------------------------------------------------------------------------
+
+def _refresh_analytics(groups, rolls):
+    try:
+        from .analytics import refresh_for_groups
+
+        refresh_for_groups(groups, rolls)
+    except Exception:
+        # Stale analytics must never break a save; rebuild_result_analytics
+        # repairs them.
+        logger.exception('Analytics refresh failed for rolls %s', sorted(r for r in rolls if r))
+
+
+@receiver(post_save, sender=Student, dispatch_uid='results_analytics_student_saved')
+def refresh_analytics_on_student_save(sender, instance, created, **kwargs):
+    if getattr(instance, '_result_sync_in_progress', False):
+        return
+    old = getattr(instance, '_result_old_analytics', None)
+    new = tuple(getattr(instance, field) for field in _ANALYTICS_FIELDS)
+    if not created and (old is None or tuple(old) == new):
+        return
+    instance._result_old_analytics = new
+    groups = {(new[1], new[2])}
+    rolls = {new[0]}
+    if old:
+        groups.add((old[1], old[2]))
+        rolls.add(old[0])
+    _refresh_analytics(groups, rolls)
+
+
+@receiver(post_delete, sender=Student, dispatch_uid='results_analytics_student_deleted')
+def refresh_analytics_on_student_delete(sender, instance, **kwargs):
+    _refresh_analytics({(instance.department_id, instance.shift)}, {instance.currentRollNumber})
+
+
+@receiver(post_save, sender=StudentResult, dispatch_uid='results_analytics_result_saved')
+@receiver(post_save, sender=SemesterGPA, dispatch_uid='results_analytics_gpa_saved')
+@receiver(post_save, sender=ResultSubject, dispatch_uid='results_analytics_subject_saved')
+def refresh_analytics_on_result_save(sender, instance, **kwargs):
+    result_id = instance.pk if sender is StudentResult else instance.result_id
+    row = (
+        StudentResult.objects.filter(pk=result_id)
+        .values_list('rollNumber', 'exam__semester')
+        .first()
+    )
+    if row is None:
+        return
+    try:
+        from .analytics import refresh_for_rolls
+
+        refresh_for_rolls([row[0]], [row[1]])
+    except Exception:
+        logger.exception('Analytics refresh failed for roll %s', row[0])
@@ -14,8 +14,10 @@ no manual step, no extra button:
     * older semesters still marked "ref" keep whatever entry they already
       have (their subject list came from that semester's own import)
 - ``finalCgpa`` is set when a final-semester CGPA is published.
-- The existing pre-save signal keeps ``student.semester`` promoted, and the
-  student gets an in-app/push notification that a new result arrived.
+- The existing pre-save signal keeps ``student.semester`` promoted (the
+  batched import-time sync applies the same promotion in memory before its
+  ``bulk_update``), and the student gets an in-app/push notification and an
+  email that a new result arrived.
 
 Results are applied in exam order (oldest first) so the newest publication
 always wins on conflicts.
@@ -23,7 +25,10 @@ always wins on conflicts.
 from __future__ import annotations
 
 import logging
-from typing import Iterable
+from collections import defaultdict
+from typing import Callable, Iterable, Optional
+
+from django.utils import timezone
 
 from apps.students.models import Student
 
@@ -34,46 +39,146 @@ logger = logging.getLogger(__name__)
 _CHUNK = 500
 
 
-def sync_students_for_rolls(rolls: Iterable[str]) -> dict:
+def sync_students_for_rolls(rolls: Iterable[str], *, progress: Optional[Callable] = None) -> dict:
     """Sync every enrolled student whose roll appears in ``rolls``.
 
-    Called from the import background thread, so notification emails are sent
-    inline (sequentially) rather than spawning one thread per student.
+    Batched per chunk of rolls: one query finds the students, one prefetch
+    loads all their results, the new profile fields are computed in memory
+    and the changed students are written with one ``bulk_update``. In-app
+    notifications and result emails are handed to a background job per
+    chunk (`notify_synced_students_job`), so the import thread never waits
+    on SMTP. ``progress(done_rolls, total_rolls, matched)`` is called after
+    every chunk.
     """
     rolls = list({str(r) for r in rolls})
     matched = 0
     updated = 0
     for start in range(0, len(rolls), _CHUNK):
         chunk = rolls[start:start + _CHUNK]
-        for student in Student.objects.filter(currentRollNumber__in=chunk):
-            matched += 1
-            try:
-                if sync_student(student, email_async=False):
-                    updated += 1
-            except Exception:
-                # One bad profile must not abort the whole sync run.
-                logger.exception(
-                    'Result sync failed for student %s (roll %s)',
-                    student.pk, student.currentRollNumber,
-                )
+        students = list(Student.objects.filter(currentRollNumber__in=chunk))
+        matched += len(students)
+        if students:
+            updated += _sync_chunk(students)
+        if progress is not None:
+            progress(min(start + _CHUNK, len(rolls)), len(rolls), matched)
     return {'matchedStudents': matched, 'updatedStudents': updated}
 
 
-def sync_student(student: Student, email_async: bool = True) -> bool:
-    """Rebuild one student's result fields from all imported results.
+# Written by the batched sync; the pre-save promotion is applied in memory
+# (bulk_update sends no signals) and auto_now is set explicitly.
+_SYNC_FIELDS = ['semesterResults', 'finalCgpa', 'semester', 'updatedAt']
 
-    Returns True when something changed and was saved.
-    """
-    results = (
+
+def _sync_chunk(students: list) -> int:
+    by_roll: dict[str, list] = defaultdict(list)
+    for result in _results_for(student.currentRollNumber for student in students):
+        by_roll[result.rollNumber].append(result)
+
+    changed = []
+    for student in students:
+        try:
+            results = by_roll.get(student.currentRollNumber)
+            if not results:
+                continue
+            results_before = student.semesterResults or []
+            if not _apply_results(student, results):
+                continue
+            # What Student's pre-save signal does on a full save.
+            if student.semesterResults != results_before:
+                student.update_current_semester()
+            changed.append((student, results[-1]))
+        except Exception:
+            # One bad profile must not abort the whole sync run.
+            logger.exception(
+                'Result sync failed for student %s (roll %s)',
+                student.pk, student.currentRollNumber,
+            )
+    if not changed:
+        return 0
+
+    now = timezone.now()
+    for student, _ in changed:
+        student.updatedAt = now
+    Student.objects.bulk_update([student for student, _ in changed], _SYNC_FIELDS, batch_size=_CHUNK)
+    _invalidate_student_caches([student for student, _ in changed])
+
+    from apps.jobs.services import enqueue
+
+    enqueue(
+        'apps.results.sync.notify_synced_students_job',
+        {'pairs': [[str(student.pk), latest.pk] for student, latest in changed]},
+        queue='default',
+    )
+    return len(changed)
+
+
+def _results_for(rolls):
+    """Every result of ``rolls`` in exam order (oldest first)."""
+    return (
         StudentResult.objects
-        .filter(rollNumber=student.currentRollNumber)
+        .filter(rollNumber__in=list(rolls))
         .select_related('exam')
         .prefetch_related('semesterGpas', 'subjects')
         .order_by('exam__regulationYear', 'exam__semester', 'exam__heldIn')
     )
-    if not results:
+
+
+def _invalidate_student_caches(students) -> None:
+    """bulk_update bypasses post_save, so bump the caches fed by Student."""
+    try:
+        from apps.dashboard.views import STATS_CACHE_NAMESPACE
+        from apps.notifications.badges import invalidate_instances
+        from utils.cache import bump
+
+        bump(STATS_CACHE_NAMESPACE)
+        invalidate_instances('students.Student', students)
+    except Exception:
+        logger.exception('Cache invalidation after result sync failed')
+
+
+def notify_synced_students_job(*, pairs) -> None:
+    """Background-job handler (apps.jobs): tell synced students about their
+    new result. ``pairs`` is [[student_id, newest_result_id], ...]."""
+    student_ids = [student_id for student_id, _ in pairs]
+    students = {str(s.pk): s for s in Student.objects.filter(pk__in=student_ids)}
+    results = StudentResult.objects.select_related('exam').prefetch_related(
+        'semesterGpas', 'subjects',
+    ).in_bulk([result_id for _, result_id in pairs])
+
+    _notify_students(list(students.values()))
+    for student_id, result_id in pairs:
+        student, result = students.get(str(student_id)), results.get(result_id)
+        if student is not None and result is not None:
+            # Each email becomes its own job on the "email" queue.
+            _email_student(student, result, async_send=True)
+
+
+def sync_student(student: Student, email_async: bool = True) -> bool:
+    """Rebuild one student's result fields from all imported results.
+
+    Returns True when something changed and was saved.
+    """
+    results = list(_results_for([student.currentRollNumber]))
+    if not results or not _apply_results(student, results):
         return False
 
+    # Guard: apps.results.signals re-syncs students on save; this flag stops
+    # the sync-triggered save from recursing into another sync.
+    student._result_sync_in_progress = True
+    try:
+        student.save()  # full save: the pre-save signal may promote `semester`
+    finally:
+        student._result_sync_in_progress = False
+
+    latest = results[-1]  # exam-ordered, so last = newest publication
+    _notify_students([student])
+    _email_student(student, latest, async_send=email_async)
+    return True
+
+
+def _apply_results(student: Student, results: list) -> bool:
+    """Rebuild ``semesterResults`` / ``finalCgpa`` on the in-memory student
+    from its exam-ordered ``results``. Returns True when either changed."""
     # Key existing entries by an INT semester so re-imports update the same
     # slot instead of creating a parallel entry (e.g. a legacy entry storing
     # semester as "4" must collide with our int 4). Any entry whose semester
@@ -137,23 +242,10 @@ def sync_student(student: Student, email_async: bool = True) -> bool:
         new_results != (student.semesterResults or [])
         or final_cgpa != student.finalCgpa
     )
-    if not changed:
-        return False
-
-    student.semesterResults = new_results
-    student.finalCgpa = final_cgpa
-    # Guard: apps.results.signals re-syncs students on save; this flag stops
-    # the sync-triggered save from recursing into another sync.
-    student._result_sync_in_progress = True
-    try:
-        student.save()  # full save: the pre-save signal may promote `semester`
-    finally:
-        student._result_sync_in_progress = False
-
-    latest = list(results)[-1]  # exam-ordered, so last = newest publication
-    _notify_student(student)
-    _email_student(student, latest, async_send=email_async)
-    return True
+    if changed:
+        student.semesterResults = new_results
+        student.finalCgpa = final_cgpa
+    return changed
 
 
 def _format_subject(subject) -> str:
@@ -228,7 +320,7 @@ def _email_student(student: Student, result: StudentResult, async_send: bool = T
         logger.exception('Result email failed for student %s', student.pk)
 
 
-def _notify_student(student: Student) -> None:
+def _notify_students(students: list) -> None:
     """Best-effort in-app + push notification; never fails the sync."""
     try:
         from django.contrib.auth import get_user_model
@@ -236,19 +328,19 @@ def _notify_student(student: Student) -> None:
         from apps.notifications.services import NotificationService
 
         User = get_user_model()
-        for user in User.objects.filter(
-            related_profile_id=student.id, role__in=['student', 'captain'],
-        ):
-            NotificationService.create_notification(
-                recipient=user,
-                notification_type='system_announcement',
-                title='New board result published',
-                message=(
-                    'Your BTEB result has been imported and your profile was '
-                    'updated automatically. Check your result history for '
-                    'details.'
-                ),
-                data={'kind': 'result_sync', 'roll': student.currentRollNumber},
-            )
+        NotificationService.create_bulk_notifications(
+            User.objects.filter(
+                related_profile_id__in=[student.id for student in students],
+                role__in=['student', 'captain'],
+            ),
+            notification_type='system_announcement',
+            title='New board result published',
+            message=(
+                'Your BTEB result has been imported and your profile was '
+                'updated automatically. Check your result history for '
+                'details.'
+            ),
+            data={'kind': 'result_sync'},
+        )
     except Exception:
-        logger.exception('Result notification failed for student %s', student.pk)
+        logger.exception('Result notification failed for %d students', len(students))
@@ -1,6 +1,7 @@
 """
 Analytics endpoint tests: institute/department summaries, comparison data,
-CSV download.
+CSV download, and the incrementally refreshed SemesterBucket table behind
+them.
 """
 from decimal import Decimal
 
@@ -14,13 +15,21 @@ from apps.results.models import (
     Institute,
     ResultImport,
     ResultSubject,
+    SemesterBucket,
     SemesterGPA,
     StudentResult,
 )
 from apps.students.models import Student
+from utils.testing import TempStorageMixin
 
 
-class AnalyticsApiTests(APITestCase):
+def _body(response):
+    return b''.join(response.streaming_content)
+
+
+class AnalyticsApiTests(TempStorageMixin, APITestCase):
+    # Rendered exports are cached on disk under the storage root.
+
     @classmethod
     def setUpTestData(cls):
         cls.cst = Department.objects.create(name='Computer', code='CST')
@@ -121,7 +130,7 @@ class AnalyticsApiTests(APITestCase):
         response = self.client.get('/api/results/analytics/download/?semester=5')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response['Content-Type'], 'application/pdf')
-        self.assertTrue(response.content.startswith(b'%PDF'))
+        self.assertTrue(_body(response).startswith(b'%PDF'))
         self.assertIn('.pdf', response['Content-Disposition'])
 
     def test_excel_download(self):
@@ -131,7 +140,7 @@ class AnalyticsApiTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('spreadsheetml', response['Content-Type'])
         # xlsx is a zip: starts with PK.
-        self.assertTrue(response.content.startswith(b'PK'))
+        self.assertTrue(_body(response).startswith(b'PK'))
 
     def test_download_department_shift_filter(self):
         # Excel makes the row count easy to inspect via openpyxl.
@@ -143,7 +152,7 @@ class AnalyticsApiTests(APITestCase):
             f'/api/results/analytics/download/?semester=5'
             f'&department={self.eee.id}&shift=Morning&type=excel'
         )
-        wb = load_workbook(BytesIO(response.content))
+        wb = load_workbook(BytesIO(_body(response)))
         ws = wb.active
         names = [
             ws.cell(row=r, column=2).value
@@ -154,6 +163,75 @@ class AnalyticsApiTests(APITestCase):
         self.assertIn('Student 500004', names)
         self.assertNotIn('Student 500001', names)
 
+    def test_export_cached_per_data_version(self):
+        url = '/api/results/analytics/download/?semester=5&type=excel'
+        first = self.client.get(url)
+        body = _body(first)
+        etag = first['ETag']
+
+        again = self.client.get(url)
+        self.assertEqual(again['ETag'], etag)
+        self.assertEqual(_body(again), body)  # same file, not re-rendered
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        partial = self.client.get(url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual(partial.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(_body(partial), body[:10])
+        self.assertEqual(partial['Content-Range'], f'bytes 0-9/{len(body)}')
+        self.assertEqual(
+            self.client.get(url, HTTP_RANGE=f'bytes={len(body)}-').status_code,
+            status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        )
+
+        # A renamed student changes the data version -> a new export.
+        student = Student.objects.get(currentRollNumber='500001')
+        student.fullNameEnglish = 'Renamed Student'
+        student.save()
+        changed = self.client.get(url)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_summary_reads_materialized_buckets(self):
+        self.assertEqual(SemesterBucket.objects.filter(semester=5).count(), 3)
+        # Buckets + national counts only; no per-student result loading.
+        with self.assertNumQueries(3):
+            from apps.results.analytics import semester_summary
+
+            semester_summary(5)
+
+    def test_student_move_refreshes_buckets(self):
+        student = Student.objects.get(currentRollNumber='500003')
+        student.department = self.cst
+        student.save()
+        departments = {
+            d['name']: d for d in
+            self.client.get('/api/results/analytics/summary/?semester=5').json()['departments']
+        }
+        self.assertEqual(departments['Computer']['appeared'], 3)
+        self.assertEqual(departments['Electrical']['appeared'], 1)
+
+    def test_new_result_refreshes_buckets(self):
+        exam6 = Exam.objects.create(
+            semester=6, regulationYear=2022, program='DIPLOMA IN ENGINEERING',
+            heldIn='2026',
+        )
+        row = StudentResult.objects.create(
+            exam=exam6, institute=self.institute, importRecord=self.import_record,
+            rollNumber='500001', resultType='passed',
+        )
+        SemesterGPA.objects.create(result=row, semester=6, gpa=Decimal('3.70'))
+        bucket = SemesterBucket.objects.get(semester=6)
+        self.assertEqual((bucket.appeared, bucket.passed, bucket.gpaCount), (1, 1, 1))
+        self.assertEqual(bucket.rows[0]['gpa'], '3.70')
+
+    def test_lazy_rebuild_when_semester_not_materialized(self):
+        SemesterBucket.objects.all().delete()
+        data = self.client.get('/api/results/analytics/summary/?semester=5').json()
+        self.assertEqual(data['institute']['appeared'], 4)
+        self.assertEqual(SemesterBucket.objects.filter(semester=5).count(), 3)
+
     def test_analytics_denied_for_students(self):
         student_user = User.objects.create_user(
             username='plainstudent', email='pl@x.com', password='pw',
@@ -0,0 +1,56 @@
+"""
+The synthetic notice generator must speak the parser's grammar exactly, or
+the benchmark would be timing error paths instead of real imports.
+"""
+from django.test import TestCase
+
+from apps.results.benchmark import generate_pages, run_benchmark
+from apps.results.models import ResultImport, StudentResult
+from apps.students.models import Student
+from apps.results.parsing import parse_result_pdf
+
+from .fixtures import FakeExtractor
+
+
+class SyntheticNoticeTests(TestCase):
+    def test_generated_notice_parses_cleanly(self):
+        pages = generate_pages(pages=6, rolls=400, institutes=3, seed=7)
+        outcome = parse_result_pdf(b'', extractor=FakeExtractor(pages))
+
+        self.assertEqual(outcome.page_count, 6)
+        self.assertEqual(len(outcome.institutes), 3)
+        self.assertEqual(len(outcome.records), 400)
+        self.assertEqual(outcome.issues, [])
+        self.assertEqual(outcome.exam.semester, 5)
+        self.assertEqual(outcome.exam.memo_no, '57.17.0000.301.31.002.25.300')
+
+    def test_generation_is_deterministic(self):
+        self.assertEqual(
+            generate_pages(pages=3, rolls=50, seed=1),
+            generate_pages(pages=3, rolls=50, seed=1),
+        )
+
+    def test_benchmark_times_every_stage_and_rolls_back(self):
+        report = run_benchmark(pages=4, rolls=120, institutes=2)
+
+        counts = report['counts']
+        self.assertEqual(counts['records'], 120)
+        self.assertEqual(counts['errors'], 0)
+        # The database stages did real work: every record persisted, and the
+        # sync matched and rewrote the seeded students (one institute's worth).
+        self.assertEqual(counts['persistedResults'], 120)
+        self.assertEqual(counts['seededStudents'], 60)
+        self.assertEqual(counts['matchedStudents'], 60)
+        self.assertEqual(counts['updatedStudents'], 60)
+        for stage in ('classification', 'assembly', 'grammar', 'validation', 'persist', 'sync'):
+            self.assertGreater(report['stages'][stage], 0)
+        self.assertFalse(ResultImport.objects.exists())
+        self.assertFalse(StudentResult.objects.exists())
+        self.assertFalse(Student.objects.exists())
+
+    def test_benchmark_stages_match_the_parser(self):
+        pages = generate_pages(pages=3, rolls=90, institutes=2, seed=3)
+        report = run_benchmark(pages=3, rolls=90, institutes=2, seed=3, database=False)
+        outcome = parse_result_pdf(b'', extractor=FakeExtractor(pages))
+        self.assertEqual(report['counts']['records'], len(outcome.records))
+        self.assertEqual(report['counts']['issues'], len(outcome.issues))
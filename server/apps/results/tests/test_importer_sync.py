@@ -7,7 +7,8 @@ patched) so tests stay fast and PDF-free; sync tests build ORM rows directly.
 from decimal import Decimal
 from unittest import mock
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 from apps.departments.models import Department
 from apps.results.importer import AlreadyImportedError, import_result_pdf
@@ -16,19 +17,24 @@ from apps.results.models import (
     Institute,
     ParserIssue,
     ResultImport,
+    ResultRank,
     ResultSubject,
     SemesterGPA,
     StudentResult,
 )
-from apps.results.sync import sync_student
+from apps.results.sync import sync_student, sync_students_for_rolls
 from apps.students.models import Student
+from utils.testing import TempStorageMixin
 
 from .fixtures import parse_standard
 
-_PARSE = 'apps.results.importer.parse_result_pdf'
+_PARSE = 'apps.results.parse_cache.parse_result_pdf'
 
 
-class ImporterTests(TestCase):
+class ImporterTests(TempStorageMixin, TestCase):
+    # Parse artifacts are staged under the storage root; a fresh one per
+    # test so no test sees another's cached parse.
+
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
@@ -43,6 +49,7 @@ class ImporterTests(TestCase):
     def test_full_import(self):
         record = self._import()
         self.assertEqual(record.status, 'completed')
+        self.assertEqual(record.progress, {'stage': 'done'})
         self.assertEqual(record.stats['recordCount'], 8)
         self.assertEqual(record.stats['instituteCount'], 2)
         self.assertEqual(Exam.objects.count(), 1)
@@ -78,6 +85,128 @@ class ImporterTests(TestCase):
         self.assertEqual(StudentResult.objects.count(), 8)  # no duplicates
         self.assertEqual(Exam.objects.count(), 1)
 
+    def test_merit_ranks_precomputed_and_maintained(self):
+        """Ranks are written at import time and follow replacements/deletes."""
+        from apps.results.ranking import delete_import
+
+        self._import(payload=b'pdf-1')
+        ranks = dict(ResultRank.objects.values_list('result__rollNumber', 'rank'))
+        # Only results with a numeric GPA for the exam semester are ranked.
+        self.assertEqual(ranks, {'100001': 1, '200001': 1})
+
+        record = self._import(payload=b'pdf-2', name='corrected.pdf')
+        self.assertEqual(ResultRank.objects.count(), 2)
+
+        delete_import(record)
+        self.assertFalse(ResultRank.objects.exists())
+
+    @override_settings(RESULTS_PAYLOAD_CACHE_SECONDS=300)
+    def test_import_refreshes_cached_payloads(self):
+        from apps.results.payload_cache import NAMESPACE
+        from utils.cache import make_key
+
+        cache.clear()
+        stale_key = make_key(NAMESPACE, '100001')
+        cache.set(stale_key, {'etag': '"stale"', 'payload': {'found': False}})
+        with self.captureOnCommitCallbacks(execute=True):
+            self._import()
+        # Invalidated on commit, then rebuilt by the warm-up job.
+        entry = cache.get(stale_key)
+        self.assertNotEqual(entry['etag'], '"stale"')
+        self.assertTrue(entry['payload']['found'])
+        self.assertEqual(entry['payload']['results'][0]['rank'], 1)
+
+    def test_interrupted_import_resumes_from_checkpoint(self):
+        from apps.results import importer, parse_cache
+
+        persist_institute = importer._persist_institute
+        calls = []
+
+        def crash_on_second(record, exam, institute, records):
+            calls.append(institute.code)
+            if len(calls) == 2:
+                raise RuntimeError('worker died')
+            return persist_institute(record, exam, institute, records)
+
+        with mock.patch.object(importer, '_persist_institute', side_effect=crash_on_second):
+            with self.assertRaises(RuntimeError):
+                self._import()
+        record = ResultImport.objects.get()
+        self.assertEqual(record.status, 'failed')
+        self.assertEqual(record.checkpoint, {'institutes': ['99001'], 'replaced': 0})
+        # The first institute committed on its own; the second rolled back.
+        self.assertEqual(StudentResult.objects.count(), 6)
+
+        # Re-running resumes from the staged artifact: no re-parse, and only
+        # the missing institute is written.
+        with mock.patch(_PARSE) as parse:
+            resumed = import_result_pdf(file_bytes=b'pdf-1', file_name='test.pdf')
+        parse.assert_not_called()
+        self.assertEqual(resumed.pk, record.pk)
+        self.assertEqual(resumed.status, 'completed')
+        self.assertEqual(resumed.checkpoint, {})
+        self.assertEqual(resumed.stats['recordCount'], 8)
+        self.assertEqual(StudentResult.objects.count(), 8)
+        self.assertEqual(SemesterGPA.objects.count(), 18)
+        self.assertEqual(
+            ParserIssue.objects.filter(code='bare-expelled-roll').count(), 1,
+        )
+        # The parsed outcome stays cached for later re-imports.
+        self.assertTrue(parse_cache.artifact_path(record.fileSha256).exists())
+
+    def test_reimport_and_dry_run_reuse_cached_parse(self):
+        from apps.results import parse_cache
+        from apps.results.importer import preview_result_pdf
+
+        record = self._import(payload=b'pdf-cache')
+        self.assertFalse(record.stats['timings']['parseCached'])
+        with mock.patch(_PARSE) as parse:
+            preview = preview_result_pdf(file_bytes=b'pdf-cache')
+            record = import_result_pdf(
+                file_bytes=b'pdf-cache', file_name='test.pdf', replace=True,
+            )
+        parse.assert_not_called()
+        self.assertTrue(preview['parseCached'])
+        self.assertEqual(preview['recordCount'], 8)
+        self.assertEqual(preview['exam']['semester'], 5)
+        self.assertTrue(any(i['code'] == 'bare-expelled-roll' for i in preview['issues']))
+        self.assertTrue(record.stats['timings']['parseCached'])
+        self.assertEqual(StudentResult.objects.count(), 8)
+
+        # A parser-version bump ignores (and prunes) the old outcome.
+        with mock.patch('apps.results.parse_cache.PARSER_VERSION', 2):
+            with mock.patch(_PARSE, return_value=self.outcome) as parse:
+                preview = preview_result_pdf(file_bytes=b'pdf-cache')
+            parse.assert_called_once()
+            self.assertFalse(preview['parseCached'])
+        self.assertFalse(parse_cache.artifact_path(record.fileSha256).exists())
+
+    def test_progress_pushed_to_uploader(self):
+        from apps.authentication.models import User
+
+        admin = User.objects.create_user(
+            username='importer', email='importer@example.com', password='x',
+            role='registrar',
+        )
+        with mock.patch(
+            'apps.notifications.services.NotificationService.push_event',
+        ) as push:
+            with mock.patch(_PARSE, return_value=self.outcome):
+                record = import_result_pdf(
+                    file_bytes=b'pdf-1', file_name='test.pdf', uploaded_by=admin,
+                )
+        events = [call.args for call in push.call_args_list]
+        self.assertTrue(all(
+            user_id == admin.pk and kind == 'import_progress' and data['importId'] == str(record.id)
+            for user_id, kind, data in events
+        ))
+        stages = [data['progress']['stage'] for _, _, data in events]
+        self.assertEqual(stages[0], 'parse')
+        self.assertIn({'stage': 'persist', 'done': 2, 'total': 2},
+                      [data['progress'] for _, _, data in events])
+        self.assertEqual(stages[-1], 'done')
+        self.assertEqual(events[-1][2]['status'], 'completed')
+
     def test_failed_parse_recorded(self):
         with mock.patch(_PARSE, side_effect=RuntimeError('boom')):
             with self.assertRaises(RuntimeError):
@@ -149,6 +278,36 @@ class SyncTests(TestCase):
         self.assertEqual(by_semester[5]['resultType'], 'gpa')
         self.assertIsNone(student.finalCgpa)
 
+    def test_batched_sync_for_rolls(self):
+        from django.core import mail
+
+        students = [self._student(roll) for roll in ('700101', '700102', '700103')]
+        Student.objects.filter(pk=students[0].pk).update(email='batch@example.com')
+        for roll in ('700101', '700102'):
+            self._result(
+                self.exam5, self.import5, roll, 'passed',
+                grades=[(5, '3.50'), (4, '3.40'), (3, '3.30'), (2, '3.20'), (1, '3.10')],
+            )
+        calls = []
+        mail.outbox.clear()
+        summary = sync_students_for_rolls(
+            ['700101', '700102', '700103', '999999'],
+            progress=lambda *args: calls.append(args),
+        )
+        self.assertEqual(summary, {'matchedStudents': 3, 'updatedStudents': 2})
+        self.assertEqual(calls[-1], (4, 4, 3))
+
+        synced = Student.objects.get(pk=students[0].pk)
+        self.assertEqual(synced.semester, 6)  # promoted without a full save
+        self.assertEqual({e['semester']: e['gpa'] for e in synced.semesterResults}[5], 3.5)
+        self.assertFalse(Student.objects.get(pk=students[2].pk).semesterResults)
+        self.assertEqual([m.to for m in mail.outbox], [['batch@example.com']])
+
+        # Nothing changed: no writes, no emails.
+        mail.outbox.clear()
+        self.assertEqual(sync_students_for_rolls(['700101', '700102'])['updatedStudents'], 0)
+        self.assertEqual(mail.outbox, [])
+
     def test_referred_then_cleared(self):
         """5th-sem referred entry is replaced once the 8th-sem history
         publishes a numeric GPA for semester 5."""
@@ -6,7 +6,13 @@ from decimal import Decimal
 
 from django.test import SimpleTestCase
 
-from apps.results.parsing import RecordFamily, SubjectRole, parse_result_pdf
+from apps.results.parsing import (
+    RecordFamily,
+    SubjectRole,
+    dump_outcome,
+    load_outcome,
+    parse_result_pdf,
+)
 from apps.results.parsing.grammar import parse_section
 from apps.results.parsing.lines import LineKind, classify_line
 
@@ -123,6 +129,11 @@ class StandardDocumentTests(SimpleTestCase):
         )
         self.assertEqual(by_institute['99002'], {'200001', '200002'})
 
+    def test_artifact_round_trip(self):
+        restored = load_outcome(dump_outcome(self.outcome))
+        self.assertEqual(restored, self.outcome)
+        self.assertEqual(restored.stats(), self.outcome.stats())
+
 
 class LineClassifierTests(SimpleTestCase):
     def test_boilerplate_lines(self):
@@ -194,3 +205,36 @@ gpa2: 3.00, gpa1: 3.00)
         outcome = parse_result_pdf(b'', extractor=FakeExtractor(pages))
         codes = {i.code for i in outcome.issues}
         self.assertIn('gpa-out-of-range', codes)
+
+
+class StreamingExtractionTests(SimpleTestCase):
+    def test_header_scanner_matches_joined_text(self):
+        from collections import Counter
+        from apps.results.parsing.metadata import HeaderScanner, _DATE, _MEMO
+
+        pages = STANDARD_PAGES + ['Memo No.', ' 57.17.0000.301.31.002.25.300\nDate', '', ': 01-05-2026']
+        scanner = HeaderScanner()
+        for text in pages:
+            scanner.feed(text)
+
+        joined = '\n'.join(pages)
+        self.assertEqual(scanner.memos, Counter(m.group('memo') for m in _MEMO.finditer(joined)))
+        self.assertEqual(scanner.dates, Counter(m.group('date') for m in _DATE.finditer(joined)))
+
+    def test_parallel_extraction_matches_serial(self):
+        import io
+        from reportlab.pdfgen import canvas
+        from apps.results.parsing.extraction import MIN_PARALLEL_PAGES, PypdfExtractor
+
+        buffer = io.BytesIO()
+        pdf = canvas.Canvas(buffer)
+        for number in range(MIN_PARALLEL_PAGES + 5):
+            pdf.drawString(72, 720, f'12053 - Page {number} Institute, Thakurgaon')
+            pdf.drawString(72, 700, f'{600000 + number} (gpa5: 3.{number % 10}0)')
+            pdf.showPage()
+        pdf.save()
+
+        serial = PypdfExtractor().extract_pages(buffer.getvalue())
+        parallel = PypdfExtractor(workers=2).extract_pages(buffer.getvalue())
+        self.assertEqual(len(serial), MIN_PARALLEL_PAGES + 5)
+        self.assertEqual(parallel, serial)
@@ -1,11 +1,12 @@
 """
 Public result-portal API tests: recent exams (cached, anonymous), personal
-result PDF download, and search speed sanity.
+result PDF download, per-roll payload cache + ETag, and search speed sanity.
 """
 import time
 from decimal import Decimal
 
 from django.core.cache import cache
+from django.test import override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -155,6 +156,93 @@ class PublicPortalApiTests(APITestCase):
         self.assertEqual(rank_of('700002'), (2, 3))
         self.assertEqual(rank_of('700003'), (3, 3))
 
+    def test_search_never_writes_ranks(self):
+        """Ranking is the import/job path's work; the public read only reads."""
+        from apps.results.models import ResultRank
+
+        ResultRank.objects.all().delete()
+        data = self.client.get('/api/results/public/search/', {'roll': '608617'}).json()
+        self.assertIsNone(data['results'][0]['rank'])
+        self.assertFalse(ResultRank.objects.exists())
+
+    def test_rank_ties_share_a_position(self):
+        from apps.results.ranking import rank_cohorts
+
+        ranked = rank_cohorts([
+            (1, 'c', Decimal('3.80')), (2, 'c', Decimal('3.50')),
+            (3, 'c', Decimal('3.50')), (4, 'c', Decimal('3.20')),
+            (5, 'other', Decimal('2.00')),
+        ])
+        self.assertEqual(sorted(ranked), [(1, 1, 4), (2, 2, 4), (3, 2, 4), (4, 4, 4), (5, 1, 1)])
+
+    def test_search_etag_not_modified(self):
+        first = self.client.get('/api/results/public/search/', {'roll': '608617'})
+        etag = first['ETag']
+        self.assertTrue(etag.startswith('"'))
+        again = self.client.get(
+            '/api/results/public/search/', {'roll': '608617'}, HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(again['ETag'], etag)
+        self.assertEqual(again.content, b'')
+
+        SemesterGPA.objects.filter(result=self.result, semester=8).update(gpa=Decimal('3.60'))
+        changed = self.client.get(
+            '/api/results/public/search/', {'roll': '608617'}, HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    @override_settings(RESULTS_PAYLOAD_CACHE_SECONDS=300)
+    def test_search_payload_cached_per_roll(self):
+        first = self.client.get('/api/results/public/search/', {'roll': '608617'}).json()
+        with self.assertNumQueries(0):
+            cached = self.client.get('/api/results/public/search/', {'roll': '608617'}).json()
+        self.assertEqual(cached, first)
+
+        # A row saved outside the importer drops the roll's entry.
+        with self.captureOnCommitCallbacks(execute=True):
+            ResultSubject.objects.create(result=self.result, subjectCode='27072', hasTheory=True)
+        data = self.client.get('/api/results/public/search/', {'roll': '608617'}).json()
+        codes = {s['subjectCode'] for s in data['results'][0]['subjects']}
+        self.assertEqual(codes, {'27071', '27072'})
+
+    @override_settings(RESULTS_PAYLOAD_CACHE_SECONDS=300)
+    def test_queryset_update_drops_cached_payload(self):
+        before = self.client.get('/api/results/public/search/', {'roll': '608617'})
+        with self.captureOnCommitCallbacks(execute=True):
+            SemesterGPA.objects.filter(result=self.result, semester=8).update(gpa=Decimal('3.10'))
+        after = self.client.get('/api/results/public/search/', {'roll': '608617'})
+        self.assertNotEqual(after['ETag'], before['ETag'])
+
+    @override_settings(RESULTS_PAYLOAD_CACHE_SECONDS=300)
+    def test_build_racing_an_invalidation_is_not_served(self):
+        from apps.results import payload_cache
+
+        cache.clear()
+
+        def stale_builder(roll):
+            # A write commits (and invalidates) while this build is running.
+            payload_cache.invalidate_rolls([roll])
+            return {'version': 'stale'}
+
+        payload_cache.get_entry('999999', stale_builder)
+        entry = payload_cache.get_entry('999999', lambda roll: {'version': 'fresh'})
+        self.assertEqual(entry['payload'], {'version': 'fresh'})
+
+    @override_settings(RESULTS_PAYLOAD_CACHE_SECONDS=300)
+    def test_deleting_import_drops_cached_payloads(self):
+        from apps.results.ranking import delete_import
+
+        self.assertTrue(
+            self.client.get('/api/results/public/search/', {'roll': '608617'}).json()['found']
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            delete_import(self.import_record)
+        self.assertFalse(
+            self.client.get('/api/results/public/search/', {'roll': '608617'}).json()['found']
+        )
+
     def test_search_is_fast(self):
         """Indexed lookup — generous CI bound, real target is <300ms."""
         started = time.monotonic()
@@ -13,16 +13,19 @@ Student portal (authenticated student):
     GET    /api/results/my/                 own result history
 
 Public (AllowAny, throttled):
-    GET    /api/results/public/search/?roll=  roll search
+    GET    /api/results/public/search/?roll=  roll search (ETag, 304 on If-None-Match)
 
-The upload endpoint parses and imports in a background thread — a national
-PDF holds 37k+ records and must not depend on proxy timeouts — and the
-frontend polls the import row until status becomes completed/failed.
+The upload endpoint parses and imports as a background job (apps.jobs,
+"results" queue) — a national PDF holds 37k+ records and must not depend on
+proxy timeouts — and the frontend polls the import row until status becomes
+completed/failed. The PDF is spooled to disk first, so an import interrupted
+by a restart is resumed by `manage.py drain_jobs`.
 """
 import logging
-import threading
+import time
+from pathlib import Path
 
-from django.db import close_old_connections
+from django.conf import settings
 from rest_framework import status
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -33,8 +36,10 @@ from rest_framework.views import APIView
 from apps.authentication.permissions import IsAdminRole
 from apps.students.models import Student
 
+from . import payload_cache
 from .importer import AlreadyImportedError, import_result_pdf
 from .models import ParserIssue, ResultImport, StudentResult
+from .ranking import delete_import
 from .serializers import (
     ExamSerializer,
     ParserIssueSerializer,
@@ -46,6 +51,36 @@ logger = logging.getLogger(__name__)
 
 MAX_UPLOAD_BYTES = 100 * 1024 * 1024
 
+# How long the upload request waits for the job to create its ResultImport
+# row, so the response can carry the import id for polling.
+IMPORT_START_WAIT_SECONDS = 0.5
+
+
+def _import_spool_dir() -> Path:
+    root = Path(getattr(settings, 'FILE_STORAGE_ROOT', settings.BASE_DIR / 'storage'))
+    return root / 'results' / 'incoming'
+
+
+def run_import_job(*, path, file_name, uploaded_by_id=None, replace=False) -> None:
+    """Background-job handler (apps.jobs): import a spooled result PDF."""
+    from django.contrib.auth import get_user_model
+
+    spooled = Path(path)
+    try:
+        uploaded_by = None
+        if uploaded_by_id is not None:
+            uploaded_by = get_user_model().objects.filter(pk=uploaded_by_id).first()
+        import_result_pdf(
+            file_bytes=spooled.read_bytes(),
+            file_name=file_name,
+            uploaded_by=uploaded_by,
+            replace=replace,
+        )
+    except AlreadyImportedError:
+        pass  # concurrent duplicate upload; the first one wins
+    finally:
+        spooled.unlink(missing_ok=True)
+
 
 def _attach_subject_info(serialized_results: list) -> None:
     """Enrich each referred/failed subject with the catalog entry (name,
@@ -92,101 +127,140 @@ def _attach_ranks(result_objs: list, serialized: list) -> None:
 
     Rank = position among all students of the same institute in the same
     exam, ordered by that semester's GPA (highest first). Referred/failed
-    students (no numeric semester GPA) are not ranked. One query per distinct
-    (exam, institute, semester) — a roll's results share an institute, so
-    this is a small, bounded number of queries.
+    students (no numeric semester GPA) are not ranked. Ranks are precomputed
+    (ResultRank, see ranking.py) and select_related by the caller; this is a
+    read path, so a result whose cohort has not been ranked yet shows none.
     """
-    from .models import SemesterGPA
+    from django.core.exceptions import ObjectDoesNotExist
 
-    cohort_cache: dict[tuple, list] = {}
-    by_id = {obj.id: obj for obj in result_objs}
+    ranks = {}
+    for obj in result_objs:
+        try:
+            ranks[obj.id] = (obj.merit.rank, obj.merit.cohortSize)
+        except ObjectDoesNotExist:
+            pass
 
     for row in serialized:
-        obj = by_id.get(row['id'])
-        if obj is None:
-            continue
-        semester = obj.exam.semester
-        own = next(
-            (g.gpa for g in obj.semesterGpas.all() if g.semester == semester),
-            None,
-        )
-        if own is None:
-            row['rank'] = None
-            row['rankTotal'] = None
-            continue
-        key = (obj.exam_id, obj.institute_id, semester)
-        cohort = cohort_cache.get(key)
-        if cohort is None:
-            cohort = sorted(
-                SemesterGPA.objects.filter(
-                    result__exam_id=obj.exam_id,
-                    result__institute_id=obj.institute_id,
-                    semester=semester,
-                    gpa__isnull=False,
-                ).values_list('gpa', flat=True),
-                reverse=True,
-            )
-            cohort_cache[key] = cohort
-        row['rank'] = sum(1 for g in cohort if g > own) + 1
-        row['rankTotal'] = len(cohort)
+        row['rank'], row['rankTotal'] = ranks.get(row['id'], (None, None))
 
 
-def _search_payload(roll: str) -> dict:
-    """Full result history for one roll, newest exam first.
+def _search_payloads(rolls) -> dict:
+    """Full result history per roll, newest exam first: {roll: payload}.
 
     De-duplicated to ONE result per semester: when BTEB re-publishes a
     corrected notice for the same semester it can land as a second exam row
     (a changed date/memo, or a hair's-difference in the exam-session text),
     and the correction must SUPERSEDE the original — never be merged or shown
     alongside it. The most-recently-published result for each semester wins.
+
+    Batched (a fixed number of queries for any number of rolls) so the
+    post-import warm-up can build thousands of payloads at once.
     """
     from datetime import date
 
-    all_results = list(
+    rolls = list(dict.fromkeys(rolls))
+    by_roll: dict[str, list] = {roll: [] for roll in rolls}
+    for result in (
         StudentResult.objects
-        .filter(rollNumber=roll)
-        .select_related('exam', 'institute')
+        .filter(rollNumber__in=rolls)
+        .select_related('exam', 'institute', 'merit')
         .prefetch_related('semesterGpas', 'subjects')
-    )
-    # Newest publication first (undated rows sort last), stable by id.
-    all_results.sort(
-        key=lambda r: (r.exam.publicationDate or date.min, r.id),
-        reverse=True,
-    )
-    seen_semesters: set[int] = set()
-    results = []
-    for result in all_results:
-        if result.exam.semester in seen_semesters:
-            continue
-        seen_semesters.add(result.exam.semester)
-        results.append(result)
-    results.sort(key=lambda r: (r.exam.regulationYear, r.exam.semester), reverse=True)
-
-    serialized = StudentResultSerializer(results, many=True).data
-    _attach_subject_info(serialized)
-    _attach_ranks(results, serialized)
-    latest_cgpa = next((r.cgpa for r in results if r.cgpa is not None), None)
+    ):
+        by_roll[result.rollNumber].append(result)
+
+    chosen: dict[str, list] = {}
+    for roll, all_results in by_roll.items():
+        # Newest publication first (undated rows sort last), stable by id.
+        all_results.sort(
+            key=lambda r: (r.exam.publicationDate or date.min, r.id),
+            reverse=True,
+        )
+        seen_semesters: set[int] = set()
+        results = []
+        for result in all_results:
+            if result.exam.semester in seen_semesters:
+                continue
+            seen_semesters.add(result.exam.semester)
+            results.append(result)
+        results.sort(key=lambda r: (r.exam.regulationYear, r.exam.semester), reverse=True)
+        chosen[roll] = results
+
+    flat = [result for results in chosen.values() for result in results]
+    serialized_flat = StudentResultSerializer(flat, many=True).data
+    _attach_subject_info(serialized_flat)
+    _attach_ranks(flat, serialized_flat)
 
     # Student name for our institute's enrolled students (public result
     # sheets in Bangladesh customarily show the name; BTEB notices don't
     # carry names, so this is only available for rolls we know).
-    student_name = ''
-    if serialized:
-        student_name = (
-            Student.objects.filter(currentRollNumber=roll)
-            .values_list('fullNameEnglish', flat=True)
-            .first()
-            or ''
-        )
-    return {
-        'roll': roll,
-        'found': bool(serialized),
-        'studentName': student_name,
-        'institute': serialized[0]['institute'] if serialized else None,
-        # String to match how serializer decimal fields render.
-        'finalCgpa': str(latest_cgpa) if latest_cgpa is not None else None,
-        'results': serialized,
-    }
+    names: dict[str, str] = {}
+    found_rolls = [roll for roll, results in chosen.items() if results]
+    if found_rolls:
+        for roll, name in (
+            Student.objects.filter(currentRollNumber__in=found_rolls)
+            .order_by('pk')
+            .values_list('currentRollNumber', 'fullNameEnglish')
+        ):
+            names.setdefault(roll, name)
+
+    payloads = {}
+    position = 0
+    for roll, results in chosen.items():
+        serialized = serialized_flat[position:position + len(results)]
+        position += len(results)
+        latest_cgpa = next((r.cgpa for r in results if r.cgpa is not None), None)
+        payloads[roll] = {
+            'roll': roll,
+            'found': bool(serialized),
+            'studentName': names.get(roll) or '',
+            'institute': serialized[0]['institute'] if serialized else None,
+            # String to match how serializer decimal fields render.
+            'finalCgpa': str(latest_cgpa) if latest_cgpa is not None else None,
+            'results': serialized,
+        }
+    return payloads
+
+
+def _search_payload(roll: str) -> dict:
+    """Full result history for one roll (see `_search_payloads`)."""
+    return _search_payloads([roll])[roll]
+
+
+def _cached_payload(roll: str) -> dict:
+    """{'etag', 'payload'} for `roll`, from the per-roll payload cache."""
+    return payload_cache.get_entry(roll, _search_payload)
+
+
+def _payload_response(request, roll: str) -> Response:
+    """The roll's payload with an ETag; 304 when the client's copy is current."""
+    entry = _cached_payload(roll)
+    if_none_match = request.headers.get('If-None-Match', '')
+    client_tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    if entry['etag'] in client_tags or '*' in client_tags:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(entry['payload'])
+    response['ETag'] = entry['etag']
+    # Let browsers keep the payload but revalidate it on every search.
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+#: Rolls per batch when warming the payload cache after an import.
+WARM_BATCH = 500
+
+
+def warm_roll_payloads_job(*, import_id) -> None:
+    """Background-job handler (apps.jobs): pre-build the cached payloads of
+    every roll in a completed import."""
+    if not payload_cache.enabled():
+        return
+    rolls = list(
+        StudentResult.objects.filter(importRecord_id=import_id)
+        .values_list('rollNumber', flat=True)
+    )
+    for start in range(0, len(rolls), WARM_BATCH):
+        payload_cache.store_many(rolls[start:start + WARM_BATCH], _search_payloads)
 
 
 class ImportListCreateView(APIView):
@@ -233,41 +307,44 @@ class ImportListCreateView(APIView):
                 status=status.HTTP_409_CONFLICT,
             )
 
-        placeholder = {'started': threading.Event(), 'importId': None}
+        from apps.jobs.services import enqueue
 
-        def run() -> None:
-            close_old_connections()
-            try:
-                record = import_result_pdf(
-                    file_bytes=file_bytes,
-                    file_name=upload.name,
-                    uploaded_by=request.user,
-                    replace=replace,
-                )
-                placeholder['importId'] = str(record.id)
-            except AlreadyImportedError:
-                pass  # concurrent duplicate upload; the first one wins
-            except Exception:
-                logger.exception('Background result import failed')
-            finally:
-                placeholder['started'].set()
-                close_old_connections()
-
-        thread = threading.Thread(target=run, daemon=True)
-        thread.start()
-        # Wait briefly so the ResultImport row exists and we can return its id;
-        # the heavy parsing continues in the background.
-        placeholder['started'].wait(timeout=0.5)
+        spool_dir = _import_spool_dir()
+        spool_dir.mkdir(parents=True, exist_ok=True)
+        spooled = spool_dir / f'{sha256}.pdf'
+        spooled.write_bytes(file_bytes)
 
-        record = (
-            ResultImport.objects.filter(fileSha256=sha256)
-            .order_by('-createdAt')
-            .first()
+        # Import failures are recorded on the ResultImport row (and are
+        # deterministic for a given PDF), so the job is not retried; a crash
+        # mid-import leaves the job 'running' for drain_jobs to resume.
+        enqueue(
+            'apps.results.views.run_import_job',
+            {
+                'path': str(spooled),
+                'file_name': upload.name,
+                'uploaded_by_id': request.user.pk,
+                'replace': replace,
+            },
+            queue='results',
+            max_attempts=1,
         )
+
+        # Wait briefly so the ResultImport row exists and we can return its id;
+        # the heavy parsing continues in the background.
+        deadline = time.monotonic() + IMPORT_START_WAIT_SECONDS
+        while True:
+            record = (
+                ResultImport.objects.filter(fileSha256=sha256)
+                .order_by('-createdAt')
+                .first()
+            )
+            if record is not None or time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
         return Response(
             {
                 'message': 'Import started. Poll the import for progress.',
-                'importId': str(record.id) if record else placeholder['importId'],
+                'importId': str(record.id) if record else None,
             },
             status=status.HTTP_202_ACCEPTED,
         )
@@ -292,7 +369,9 @@ class ImportDetailView(APIView):
         record = self.get_object(import_id)
         if record is None:
             return Response(status=status.HTTP_404_NOT_FOUND)
-        record.delete()  # cascades to results/gpas/subjects/issues
+        # Cascades to results/gpas/subjects/issues; the institutes' remaining
+        # results are re-ranked.
+        delete_import(record)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -317,7 +396,7 @@ class AdminRollSearchView(APIView):
                 {'error': 'Provide a numeric roll number, e.g. ?roll=612120.'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        return Response(_search_payload(roll))
+        return Response(_cached_payload(roll)['payload'])
 
 
 class PublicRollSearchView(APIView):
@@ -335,7 +414,7 @@ class PublicRollSearchView(APIView):
                 {'error': 'Provide a numeric roll number, e.g. ?roll=612120.'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        return Response(_search_payload(roll))
+        return _payload_response(request, roll)
 
 
 class SubjectImportView(APIView):
@@ -506,7 +585,7 @@ class PublicResultPdfView(APIView):
                 {'error': 'Provide a numeric roll number, e.g. ?roll=612120.'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        payload = _search_payload(roll)
+        payload = _cached_payload(roll)['payload']
         if not payload['found']:
             return Response(
                 {'error': f'No result found for roll {roll}.'},
@@ -565,7 +644,9 @@ class AnalyticsDownloadView(APIView):
     """Result-sheet download for one semester, filtered by department + shift.
 
     GET …/download/?semester=<n>[&department=<uuid>][&shift=Morning][&type=pdf|excel]
-    Renders the institute's official tabulation-sheet layout.
+    Renders the institute's official tabulation-sheet layout. Rendered once
+    per data version and served from disk (see exports.py), with ETag and
+    Range support.
 
     Note: the export type is ``type``, not ``format`` — DRF reserves the
     ``format`` query parameter for content negotiation.
@@ -574,10 +655,9 @@ class AnalyticsDownloadView(APIView):
     permission_classes = [IsAdminRole]
 
     def get(self, request):
-        from django.http import HttpResponse
+        from utils.file_response import serve_file
 
-        from .analytics import sheet_rows
-        from .reportsheet import render_excel, render_pdf
+        from .exports import get_export
 
         semester = _semester_param(request)
         if semester is None:
@@ -587,29 +667,15 @@ class AnalyticsDownloadView(APIView):
             )
         department_id = request.query_params.get('department') or None
         shift = (request.query_params.get('shift') or '').strip()
-        fmt = (request.query_params.get('type') or 'pdf').lower()
-
-        sheet = sheet_rows(semester, department_id=department_id, shift=shift)
-
-        base = f"result_sheet_sem{semester}"
-        if department_id and sheet['departmentName'] != 'All Departments':
-            base += '_' + sheet['departmentName'].split()[0].lower()
-        if shift:
-            base += f'_{shift.lower()}'
-
-        if fmt == 'excel':
-            content = render_excel(sheet)
-            response = HttpResponse(
-                content,
-                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            )
-            response['Content-Disposition'] = f'attachment; filename="{base}.xlsx"'
-            return response
-
-        content = render_pdf(sheet)
-        response = HttpResponse(content, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{base}.pdf"'
-        return response
+        fmt = 'excel' if (request.query_params.get('type') or 'pdf').lower() == 'excel' else 'pdf'
+
+        export = get_export(semester, department_id=department_id, shift=shift, fmt=fmt)
+        return serve_file(
+            request, export.path,
+            content_type=export.content_type,
+            filename=export.filename,
+            etag=export.etag,
+        )
 
 
 class ClassmateResultsView(APIView):
@@ -729,4 +795,4 @@ class MyResultsView(APIView):
                 {'error': 'No student profile linked to this account.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        return Response(_search_payload(student.currentRollNumber))
+        return Response(_cached_payload(student.currentRollNumber)['payload'])
@@ -219,6 +219,20 @@ class FileUploadValidationPropertyTest(HypothesisAPITestCase):
     10MB for documents) or with invalid types should be rejected with HTTP 400.
     """
     
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Accepted photos are written to disk; keep them out of client/assets.
+        import shutil
+        import tempfile
+        from django.test import override_settings
+
+        images_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, images_root, ignore_errors=True)
+        override = override_settings(CLIENT_IMAGES_ROOT=images_root)
+        override.enable()
+        cls.addClassCleanup(override.disable)
+
     def setUp(self):
         """Create test department and student"""
         self.department = Department.objects.create(name=f'Computer Science {uuid.uuid4().hex[:6]}', code=f'CSE{uuid.uuid4().hex[:5]}'
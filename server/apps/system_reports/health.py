@@ -114,6 +114,15 @@ def _resources():
     return info
 
 
+def _activity_log_buffer():
+    """Buffered / written / dropped counters of this process's audit writer."""
+    try:
+        from apps.activity_logs.buffer import activity_log_buffer
+        return activity_log_buffer.stats()
+    except Exception as exc:  # noqa: BLE001
+        return {'error': str(exc)[:300]}
+
+
 def health_snapshot():
     """Full health snapshot dict for the dashboard."""
     return {
@@ -121,6 +130,7 @@ def health_snapshot():
         'cache': _check_cache(),
         'realtime': _check_realtime(),
         'resources': _resources(),
+        'activity_log_buffer': _activity_log_buffer(),
         'psutil_available': psutil is not None,
         'checked_at': time.time(),
     }
@@ -8,7 +8,9 @@ Automatic capture of request-level problems:
   - slow database queries (per-query timing via execute_wrapper)
 
 Everything is grouped by fingerprint and recorded best-effort — capture can
-never affect the response returned to the user.
+never affect the response returned to the user. Errors are written right
+away; the high-volume kinds (401/403, slow requests, slow queries) are merged
+in memory and flushed periodically (see services.record_occurrence).
 """
 import time
 import traceback
@@ -16,7 +18,7 @@ import traceback
 from django.conf import settings
 from django.db import connection
 
-from .services import record_report, categorize_exception, make_fingerprint
+from .services import record_report, record_occurrence, categorize_exception, make_fingerprint
 
 # Thresholds (seconds); overridable from settings.
 SLOW_REQUEST_SECONDS = getattr(settings, 'SYSTEM_REPORTS_SLOW_REQUEST_SECONDS', 3.0)
@@ -96,7 +98,7 @@ class SystemReportMiddleware:
         # 401 / 403 — authentication & authorization failures (grouped per path).
         elif status in (401, 403) and request.path.startswith('/api') \
                 and not any(request.path.startswith(p) for p in _AUTH_NOISE_PATHS):
-            record_report(
+            record_occurrence(
                 category='auth_failure',
                 severity='low',
                 title=f"HTTP {status} {'unauthorized' if status == 401 else 'forbidden'} on {request.path}",
@@ -109,7 +111,7 @@ class SystemReportMiddleware:
 
         # Slow request — performance issue.
         if duration >= SLOW_REQUEST_SECONDS:
-            record_report(
+            record_occurrence(
                 category='performance',
                 severity='medium' if duration < SLOW_REQUEST_SECONDS * 2 else 'high',
                 title=f"Slow request: {request.method} {request.path}",
@@ -124,7 +126,7 @@ class SystemReportMiddleware:
         # Slow database queries.
         for sql, elapsed in slow_queries:
             sql_head = ' '.join(str(sql).split())[:300]
-            record_report(
+            record_occurrence(
                 category='slow_query',
                 severity='medium' if elapsed < SLOW_QUERY_SECONDS * 3 else 'high',
                 title=f"Slow query ({elapsed:.2f}s) during {request.method} {request.path}",
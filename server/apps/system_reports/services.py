@@ -6,11 +6,21 @@ funnels into `record_report`, which groups identical events by fingerprint so
 repeated errors never flood the table. Recording is guarded against recursion
 (a failure while recording must never trigger another recording) and never
 raises into the caller.
+
+High-volume, low-urgency events (401/403 storms, slow requests, slow queries)
+go through `record_occurrence` instead: occurrences are merged in memory per
+fingerprint and written by a periodic flush, so a burst of identical events
+costs one UPDATE per fingerprint per interval rather than a locked
+read-modify-write of the same row on every request.
 """
+import atexit
 import hashlib
 import logging
 import threading
+import time
 
+from django.conf import settings
+from django.db import close_old_connections
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -32,6 +42,29 @@ def make_fingerprint(*parts):
     return hashlib.sha256(raw.encode('utf-8', errors='replace')).hexdigest()[:64]
 
 
+def _build_defaults(*, category, title, severity, message, exception_type, stack_trace,
+                    path, method, status_code, user, ip_address, extra, source):
+    # Anonymous / non-persisted users can't be linked.
+    if user is not None and (not getattr(user, 'is_authenticated', False) or not getattr(user, 'pk', None)):
+        user = None
+    return {
+        'category': category,
+        'severity': severity if severity in _SEVERITY_RANK else 'medium',
+        'title': str(title)[:255],
+        'message': str(message or '')[:MAX_MESSAGE],
+        'exception_type': str(exception_type or '')[:255],
+        'stack_trace': str(stack_trace or '')[:MAX_STACK_TRACE],
+        'path': str(path or '')[:500],
+        'method': str(method or '')[:10],
+        'status_code': status_code,
+        'ip_address': ip_address or None,
+        'user': user,
+        'user_display': (getattr(user, 'username', '') or '')[:150],
+        'extra': extra or {},
+        'source': source,
+    }
+
+
 def record_report(
     *,
     category,
@@ -66,26 +99,13 @@ def record_report(
             parts = fingerprint_parts or [category, exception_type or title, path]
             fingerprint = make_fingerprint(*parts)
 
-        # Anonymous / non-persisted users can't be linked.
-        if user is not None and (not getattr(user, 'is_authenticated', False) or not getattr(user, 'pk', None)):
-            user = None
-
-        defaults = {
-            'category': category,
-            'severity': severity if severity in _SEVERITY_RANK else 'medium',
-            'title': str(title)[:255],
-            'message': str(message or '')[:MAX_MESSAGE],
-            'exception_type': str(exception_type or '')[:255],
-            'stack_trace': str(stack_trace or '')[:MAX_STACK_TRACE],
-            'path': str(path or '')[:500],
-            'method': str(method or '')[:10],
-            'status_code': status_code,
-            'ip_address': ip_address or None,
-            'user': user,
-            'user_display': (getattr(user, 'username', '') or '')[:150],
-            'extra': extra or {},
-            'source': source,
-        }
+        defaults = _build_defaults(
+            category=category, title=title, severity=severity, message=message,
+            exception_type=exception_type, stack_trace=stack_trace, path=path,
+            method=method, status_code=status_code, user=user,
+            ip_address=ip_address, extra=extra, source=source,
+        )
+        user = defaults['user']
 
         report, created = SystemReport.objects.get_or_create(
             fingerprint=fingerprint, defaults=defaults,
@@ -129,6 +149,202 @@ def record_report(
         _guard.active = False
 
 
+class OccurrenceAggregator:
+    """
+    Per-process buffer of report occurrences, merged by fingerprint.
+
+    A daemon thread flushes every SYSTEM_REPORTS_FLUSH_SECONDS. A fingerprint
+    is written at most once per SYSTEM_REPORTS_MIN_WRITE_INTERVAL_SECONDS;
+    occurrences arriving in between keep accumulating in memory. Each write
+    is a single conditional UPDATE (count, last_seen, latest context,
+    severity escalation, regression reopen); only a fingerprint with no row
+    yet costs an INSERT.
+    """
+
+    # Fingerprints tracked for rate-limiting before the oldest are forgotten.
+    MAX_TRACKED = 5000
+
+    def __init__(self, flush_interval=None, min_write_interval=None):
+        self.flush_interval = flush_interval or getattr(settings, 'SYSTEM_REPORTS_FLUSH_SECONDS', 10.0)
+        self.min_write_interval = (
+            min_write_interval if min_write_interval is not None
+            else getattr(settings, 'SYSTEM_REPORTS_MIN_WRITE_INTERVAL_SECONDS', 60.0)
+        )
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_written = {}
+        self._thread = None
+
+    def add(self, fingerprint, defaults):
+        now = timezone.now()
+        with self._lock:
+            entry = self._pending.get(fingerprint)
+            if entry is None:
+                self._pending[fingerprint] = {'defaults': defaults, 'count': 1, 'last_seen': now}
+            else:
+                entry['count'] += 1
+                entry['last_seen'] = now
+                merged = entry['defaults']
+                # Keep the most recent context, never downgrade severity.
+                for key in ('message', 'stack_trace', 'status_code', 'user', 'user_display', 'ip_address'):
+                    if defaults[key]:
+                        merged[key] = defaults[key]
+                if defaults['extra']:
+                    merged['extra'] = {**merged['extra'], **defaults['extra']}
+                if _SEVERITY_RANK[defaults['severity']] > _SEVERITY_RANK[merged['severity']]:
+                    merged['severity'] = defaults['severity']
+        self._ensure_thread()
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, force=False):
+        """Write every due fingerprint. Returns the number of fingerprints written."""
+        clock = time.monotonic()
+        with self._lock:
+            due = {
+                fp: entry for fp, entry in self._pending.items()
+                if force or clock - self._last_written.get(fp, float('-inf')) >= self.min_write_interval
+            }
+            for fp in due:
+                del self._pending[fp]
+                self._last_written[fp] = clock
+            if len(self._last_written) > self.MAX_TRACKED:
+                for fp in sorted(self._last_written, key=self._last_written.get)[:len(self._last_written) // 2]:
+                    del self._last_written[fp]
+
+        written = 0
+        for fingerprint, entry in due.items():
+            if getattr(_guard, 'active', False):
+                break
+            _guard.active = True
+            try:
+                self._write(fingerprint, entry)
+                written += 1
+            except Exception as exc:  # noqa: BLE001 - reporting must never break the app
+                logger.debug("system_reports: failed to flush %s: %s", fingerprint, exc)
+            finally:
+                _guard.active = False
+        return written
+
+    def _write(self, fingerprint, entry):
+        from django.db.models import Case, F, Value, When
+        from .models import SystemReport
+
+        defaults, count = entry['defaults'], entry['count']
+        lower = [s for s, rank in _SEVERITY_RANK.items() if rank < _SEVERITY_RANK[defaults['severity']]]
+        changes = {
+            'occurrence_count': F('occurrence_count') + count,
+            'last_seen': entry['last_seen'],
+            'updated_at': timezone.now(),
+            'severity': Case(When(severity__in=lower, then=Value(defaults['severity'])), default=F('severity')),
+            # A resolved issue that happens again is a regression.
+            'status': Case(When(status='resolved', then=Value('open')), default=F('status')),
+            'resolved_at': Case(
+                When(status='resolved', then=Value(None)), default=F('resolved_at'),
+                output_field=SystemReport._meta.get_field('resolved_at'),
+            ),
+            'resolved_by': Case(
+                When(status='resolved', then=Value(None)), default=F('resolved_by'),
+                output_field=SystemReport._meta.get_field('resolved_by').target_field,
+            ),
+        }
+        for key in ('message', 'stack_trace', 'status_code'):
+            if defaults[key]:
+                changes[key] = defaults[key]
+        if defaults['user'] is not None:
+            changes['user'] = defaults['user']
+            changes['user_display'] = defaults['user_display']
+        if defaults['extra']:
+            # Merge into the stored context, as the unaggregated path does.
+            stored = list(SystemReport.objects.filter(fingerprint=fingerprint).values_list('extra', flat=True)[:1])
+            merged = dict(stored[0] or {}) if stored else {}
+            merged.update(defaults['extra'])
+            changes['extra'] = merged
+
+        if SystemReport.objects.filter(fingerprint=fingerprint).update(**changes):
+            return
+        report, created = SystemReport.objects.get_or_create(
+            fingerprint=fingerprint,
+            defaults={**defaults, 'occurrence_count': count},
+        )
+        if created:
+            SystemReport.objects.filter(pk=report.pk).update(last_seen=entry['last_seen'])
+        else:
+            SystemReport.objects.filter(fingerprint=fingerprint).update(**changes)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name='system-reports-flusher', daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001 - keep the flusher alive
+                pass
+            finally:
+                close_old_connections()
+
+
+occurrence_aggregator = OccurrenceAggregator()
+atexit.register(occurrence_aggregator.flush, force=True)
+
+
+def record_occurrence(
+    *,
+    category,
+    title,
+    severity='medium',
+    message='',
+    exception_type='',
+    stack_trace='',
+    path='',
+    method='',
+    status_code=None,
+    user=None,
+    ip_address=None,
+    extra=None,
+    source='auto_middleware',
+    fingerprint=None,
+    fingerprint_parts=None,
+):
+    """
+    Buffered counterpart of `record_report` for high-volume events.
+
+    Same arguments and grouping; the occurrence is merged in memory and
+    written by the periodic flush. Falls back to `record_report` when
+    SYSTEM_REPORTS_AGGREGATE is off (as under the test runner).
+    """
+    kwargs = dict(
+        category=category, title=title, severity=severity, message=message,
+        exception_type=exception_type, stack_trace=stack_trace, path=path,
+        method=method, status_code=status_code, user=user,
+        ip_address=ip_address, extra=extra, source=source,
+    )
+    if not getattr(settings, 'SYSTEM_REPORTS_AGGREGATE', True):
+        return record_report(**kwargs, fingerprint=fingerprint, fingerprint_parts=fingerprint_parts)
+    if getattr(_guard, 'active', False):
+        return None
+    try:
+        if not fingerprint:
+            parts = fingerprint_parts or [category, exception_type or title, path]
+            fingerprint = make_fingerprint(*parts)
+        occurrence_aggregator.add(fingerprint, _build_defaults(**kwargs))
+    except Exception as exc:  # noqa: BLE001 - reporting must never break the app
+        logger.debug("system_reports: failed to buffer occurrence: %s", exc)
+    return None
+
+
 def categorize_exception(exc, path=''):
     """Best-effort (category, severity) for an unhandled exception."""
     from django.db import DatabaseError
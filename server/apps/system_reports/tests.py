@@ -0,0 +1,82 @@
+from django.test import TestCase, override_settings
+
+from apps.authentication.models import User
+
+from .models import SystemReport
+from .services import OccurrenceAggregator, make_fingerprint, record_occurrence
+
+
+class OccurrenceAggregatorTest(TestCase):
+    def setUp(self):
+        self.aggregator = OccurrenceAggregator(flush_interval=3600, min_write_interval=0)
+        self.aggregator._ensure_thread = lambda: None  # flush manually in tests
+
+    def _add(self, fingerprint, severity='low', message='denied', extra=None):
+        from .services import _build_defaults
+        self.aggregator.add(fingerprint, _build_defaults(
+            category='auth_failure', title='HTTP 403 forbidden on /api/x', severity=severity,
+            message=message, exception_type='', stack_trace='', path='/api/x', method='GET',
+            status_code=403, user=None, ip_address='10.0.0.1', extra=extra or {}, source='auto_middleware',
+        ))
+
+    def test_burst_is_merged_into_one_row(self):
+        fp = make_fingerprint('auth', 403, '/api/x')
+        for _ in range(25):
+            self._add(fp)
+
+        self.assertEqual(self.aggregator.flush(), 1)
+        report = SystemReport.objects.get(fingerprint=fp)
+        self.assertEqual(report.occurrence_count, 25)
+
+        for _ in range(5):
+            self._add(fp, severity='high', message='still denied')
+        with self.assertNumQueries(1):
+            self.aggregator.flush()
+        report.refresh_from_db()
+        self.assertEqual(report.occurrence_count, 30)
+        self.assertEqual(report.severity, 'high')
+        self.assertEqual(report.message, 'still denied')
+
+    def test_later_occurrence_extra_is_merged(self):
+        fp = make_fingerprint('auth', 403, '/api/extra')
+        self._add(fp, extra={'first': 1, 'shared': 'old'})
+        self.aggregator.flush()
+        self._add(fp, extra={'second': 2, 'shared': 'new'})
+        self.aggregator.flush()
+        report = SystemReport.objects.get(fingerprint=fp)
+        self.assertEqual(report.extra, {'first': 1, 'second': 2, 'shared': 'new'})
+        self.assertEqual(report.occurrence_count, 2)
+
+    def test_resolved_report_reopens_on_recurrence(self):
+        fp = make_fingerprint('auth', 403, '/api/y')
+        resolver = User.objects.create_user(username='resolver', password='pass12345', role='registrar')
+        SystemReport.objects.create(
+            fingerprint=fp, title='old', category='auth_failure',
+            status='resolved', resolved_by=resolver,
+        )
+        self._add(fp)
+        self.aggregator.flush()
+        report = SystemReport.objects.get(fingerprint=fp)
+        self.assertEqual(report.status, 'open')
+        self.assertIsNone(report.resolved_by)
+        self.assertEqual(report.occurrence_count, 2)
+
+    def test_write_rate_is_capped_per_fingerprint(self):
+        self.aggregator.min_write_interval = 3600
+        fp = make_fingerprint('auth', 403, '/api/z')
+        self._add(fp)
+        self.assertEqual(self.aggregator.flush(), 1)
+        self._add(fp)
+        self._add(fp)
+        self.assertEqual(self.aggregator.flush(), 0)
+        self.assertEqual(self.aggregator.pending_count(), 1)
+        self.assertEqual(self.aggregator.flush(force=True), 1)
+        self.assertEqual(SystemReport.objects.get(fingerprint=fp).occurrence_count, 3)
+
+    @override_settings(SYSTEM_REPORTS_AGGREGATE=False)
+    def test_record_occurrence_writes_immediately_when_disabled(self):
+        record_occurrence(
+            category='performance', title='Slow request: GET /api/x',
+            fingerprint_parts=['slow_request', 'GET', '/api/x'],
+        )
+        self.assertEqual(SystemReport.objects.filter(category='performance').count(), 1)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class SystemSettingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.system_settings'
+
+    def ready(self):
+        from utils.cache import invalidate_on_change
+        from .models import SystemSettings
+        invalidate_on_change('system_settings', SystemSettings)
@@ -63,6 +63,16 @@ class SystemSettings(models.Model):
     
     @classmethod
     def get_settings(cls):
-        """Get or create system settings (singleton pattern)"""
+        """Get or create system settings (singleton pattern).
+
+        Served from the shared cache; any save/delete of the row bumps the
+        'system_settings' namespace (see apps.py), so every worker sees
+        changes immediately.
+        """
+        from utils.cache import get_or_set
+        return get_or_set('system_settings', 'singleton', loader=cls._load_settings, timeout=60 * 60)
+
+    @classmethod
+    def _load_settings(cls):
         settings, created = cls.objects.get_or_create(pk=cls.objects.first().pk if cls.objects.exists() else uuid.uuid4())
         return settings
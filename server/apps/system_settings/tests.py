@@ -21,6 +21,15 @@ class SystemSettingsModelTest(TestCase):
         self.assertEqual(settings.current_semester, 1)
         self.assertTrue(settings.enable_email_notifications)
 
+    def test_get_settings_is_cached_and_invalidated_on_save(self):
+        settings = SystemSettings.get_settings()
+        with self.assertNumQueries(0):
+            SystemSettings.get_settings()
+
+        settings.current_semester = 3
+        settings.save()
+        self.assertEqual(SystemSettings.get_settings().current_semester, 3)
+
 
 class SystemSettingsViewTest(TestCase):
     def setUp(self):
@@ -5,3 +5,8 @@ class WebsiteConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.website'
     verbose_name = 'Public Website'
+
+    def ready(self):
+        from utils.cache import invalidate_on_change
+        from .models import SiteSetting
+        invalidate_on_change('site_setting', SiteSetting)
@@ -121,7 +121,16 @@ class SiteSetting(TimeStampedModel):
 
     @classmethod
     def get_solo(cls):
-        """Return the single settings row, creating it on first access."""
+        """Return the single settings row, creating it on first access.
+
+        Served from the shared cache; saves bump the 'site_setting'
+        namespace (see apps.py).
+        """
+        from utils.cache import get_or_set
+        return get_or_set('site_setting', 'solo', loader=cls._load_solo, timeout=60 * 60)
+
+    @classmethod
+    def _load_solo(cls):
         obj = cls.objects.first()
         if obj is None:
             obj = cls.objects.create()
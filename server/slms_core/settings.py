@@ -71,6 +71,7 @@ INSTALLED_APPS = [
     'apps.results',
     'apps.routines',
     'apps.website',
+    'apps.jobs',
 ]
 
 # --------------------------------------------------
@@ -133,6 +134,49 @@ CHANNEL_LAYERS = {
     },
 }
 
+# --------------------------------------------------
+# CACHE (shared across workers)
+# --------------------------------------------------
+# Every gunicorn/uvicorn worker must see the same cache, otherwise cached
+# pages/counters and their invalidation diverge per process. Production uses
+# the Redis instance channels already requires (a separate DB number);
+# CACHE_BACKEND=locmem gives a process-local in-memory cache for local
+# development without Redis, and the test runner always uses it. Keys are
+# namespaced/versioned by utils.cache.
+CACHE_BACKEND = config('CACHE_BACKEND', default='redis')
+if CACHE_BACKEND == 'locmem' or 'test' in sys.argv:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'sipi-local',
+            'KEY_PREFIX': 'sipi',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config(
+                'REDIS_CACHE_URL',
+                default='redis://{}:{}/1'.format(
+                    config('REDIS_HOST', default='127.0.0.1'),
+                    config('REDIS_PORT', default=6379, cast=int),
+                ),
+            ),
+            'KEY_PREFIX': 'sipi',
+            'TIMEOUT': 300,
+        },
+    }
+
+# Sidebar badge counts are cached per user and kept current by model signals
+# (apps.notifications.badges). Every entry is fully recounted at least this
+# often, which corrects drift from writes that bypass signals.
+BADGE_RECONCILE_SECONDS = config('BADGE_RECONCILE_SECONDS', default=600, cast=int)
+
+# Admin dashboard statistics are cached this long; saves/deletes of the
+# counted models (students, alumni, applications, ...) invalidate earlier.
+DASHBOARD_CACHE_SECONDS = config('DASHBOARD_CACHE_SECONDS', default=60, cast=int)
+
 # --------------------------------------------------
 # DATABASE
 # --------------------------------------------------
@@ -186,6 +230,29 @@ MEDIA_ROOT = BASE_DIR / 'media'
 FILE_STORAGE_ROOT = BASE_DIR / 'storage'
 FILE_STORAGE_URL = '/files/'
 
+# Profile photos saved by utils.file_handler (<root>/students/, ...).
+CLIENT_IMAGES_ROOT = BASE_DIR.parent / 'client' / 'assets' / 'images'
+
+# Who sends file bytes once SecureFileView (and other utils.file_response
+# callers) have authorised a download: 'python' streams from the app worker;
+# 'x-accel' hands nginx an X-Accel-Redirect to FILE_ACCEL_REDIRECT_PREFIX +
+# the path under FILE_STORAGE_ROOT (an `internal` location aliased to it);
+# 'x-sendfile' sends the absolute path for Apache mod_xsendfile / lighttpd.
+FILE_DELIVERY_MODE = config('FILE_DELIVERY_MODE', default='python')
+FILE_ACCEL_REDIRECT_PREFIX = config('FILE_ACCEL_REDIRECT_PREFIX', default='/protected-files/')
+
+# Store each uploaded document's bytes once, under their SHA-256 in
+# storage/blobs/, with the structured paths as hard links to the blob (needs
+# both on one filesystem; see utils.structured_file_storage). Existing files
+# are converted by `manage.py dedupe_storage`.
+DOCUMENT_STORAGE_DEDUP = config('DOCUMENT_STORAGE_DEDUP', default=False, cast=bool)
+
+# Document thumbnails live under FILE_STORAGE_ROOT/thumbnails, keyed by file
+# hash (apps.documents.thumbnails). Least recently served ones are deleted
+# by the nightly `manage.py prune_thumbnails` once the directory grows past
+# this many megabytes.
+DOCUMENT_THUMBNAIL_CACHE_MAX_MB = config('DOCUMENT_THUMBNAIL_CACHE_MAX_MB', default=256, cast=int)
+
 # Maximum file sizes (in bytes)
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB default
 MAX_FILE_SIZES = {
@@ -519,6 +586,69 @@ SYSTEM_REPORTS_SLOW_QUERY_SECONDS = 1.0
 SYSTEM_REPORTS_CPU_ALERT_PERCENT = 90
 SYSTEM_REPORTS_MEMORY_ALERT_PERCENT = 90
 SYSTEM_REPORTS_DISK_ALERT_PERCENT = 90
+# 401/403, slow-request and slow-query reports are merged in memory and
+# flushed every SYSTEM_REPORTS_FLUSH_SECONDS; a single fingerprint is written
+# at most once per SYSTEM_REPORTS_MIN_WRITE_INTERVAL_SECONDS. Written
+# immediately under the test runner.
+SYSTEM_REPORTS_AGGREGATE = 'test' not in sys.argv
+SYSTEM_REPORTS_FLUSH_SECONDS = 10.0
+SYSTEM_REPORTS_MIN_WRITE_INTERVAL_SECONDS = 60.0
+
+# --------------------------------------------------
+# ACTIVITY LOG BUFFER (apps.activity_logs.buffer)
+# --------------------------------------------------
+# Request audit entries are buffered in memory and written with bulk_create
+# every ACTIVITY_LOG_FLUSH_SECONDS or once ACTIVITY_LOG_BUFFER_SIZE entries
+# are pending. ACTIVITY_LOG_MAX_PENDING bounds memory if the DB is down.
+# Synchronous under the test runner so tests can assert on the rows.
+ACTIVITY_LOG_ASYNC = 'test' not in sys.argv
+ACTIVITY_LOG_BUFFER_SIZE = 200
+ACTIVITY_LOG_FLUSH_SECONDS = 2.0
+ACTIVITY_LOG_MAX_PENDING = 10000
+
+# --------------------------------------------------
+# BACKGROUND JOBS (apps.jobs)
+# --------------------------------------------------
+# Web push, outgoing email and result imports run on a bounded in-process
+# thread pool backed by the `background_jobs` table (see apps.jobs.services).
+# JOBS_MAX_WORKERS caps threads per server process; each queue additionally
+# has its own concurrency limit so one kind of work can't starve another.
+JOBS_MAX_WORKERS = config('JOBS_MAX_WORKERS', default=8, cast=int)
+JOBS_QUEUE_CONCURRENCY = {
+    'default': 2,
+    'push': 4,
+    'email': 2,
+    # A national result PDF is CPU + DB heavy; one at a time per process.
+    'results': 1,
+    # Document thumbnails (Pillow / pypdf decoding is CPU bound).
+    'thumbnails': 1,
+}
+# Base delay before the first retry; doubles on every further attempt.
+JOBS_RETRY_BACKOFF_SECONDS = 30
+# Under the test runner jobs run inline so tests stay deterministic.
+JOBS_ALWAYS_EAGER = 'test' in sys.argv
+
+# Processes used to extract text from a result PDF (large notices only; see
+# apps.results.parsing.extraction). Capped at the machine's CPU count.
+RESULTS_PDF_WORKERS = config('RESULTS_PDF_WORKERS', default=4, cast=int)
+
+# Rendered result-sheet exports (apps.results.exports) unused for this many
+# days are deleted from FILE_STORAGE_ROOT/results/exports.
+RESULTS_EXPORT_MAX_AGE_DAYS = config('RESULTS_EXPORT_MAX_AGE_DAYS', default=7, cast=int)
+
+# Parsed result PDFs (apps.results.parse_cache), keyed by file hash and
+# parser version, unused for this many days are deleted from
+# FILE_STORAGE_ROOT/results/parsed.
+RESULTS_PARSE_CACHE_MAX_AGE_DAYS = config('RESULTS_PARSE_CACHE_MAX_AGE_DAYS', default=30, cast=int)
+
+# Per-roll public result payloads (apps.results.payload_cache). Entries are
+# invalidated by imports and edits, so the TTL only bounds memory. 0 disables
+# the cache — the default under the test runner, where fixtures write rows
+# straight through the ORM.
+RESULTS_PAYLOAD_CACHE_SECONDS = (
+    0 if 'test' in sys.argv
+    else config('RESULTS_PAYLOAD_CACHE_SECONDS', default=60 * 60 * 24, cast=int)
+)
 
 # --------------------------------------------------
 # OTP CONFIGURATION
@@ -52,8 +52,9 @@ urlpatterns = [
     path('api/website/', include('apps.website.urls')),
 
     # Secure file serving
-    re_path(r'^files/(?P<file_path>.+)$', SecureFileView.as_view(), name='secure-file'),
+    # Before the catch-all files/ pattern, which would otherwise shadow it.
     path('files/thumbnail/<uuid:document_id>/', DocumentThumbnailView.as_view(), name='document-thumbnail'),
+    re_path(r'^files/(?P<file_path>.+)$', SecureFileView.as_view(), name='secure-file'),
 ]
 
 # Serve media files in development
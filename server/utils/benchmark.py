@@ -0,0 +1,15 @@
+"""
+Shared helpers for the benchmark management commands.
+"""
+import subprocess
+
+
+def git_revision():
+    """Short revision of the checkout being benchmarked (None outside git)."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except Exception:  # noqa: BLE001 - not a git checkout / no git binary
+        return None
@@ -0,0 +1,116 @@
+"""
+Shared cache helpers.
+
+All application cache keys go through `make_key`, which places them in a
+namespace carrying a generation number:
+
+    <namespace>:g<generation>:<part>:<part>...
+
+Invalidating a whole namespace is then one `bump(namespace)` — an atomic
+INCR of the generation counter — instead of deleting keys one by one; the
+old entries simply become unreachable and expire on their own TTL. Every
+helper here is best-effort: if the cache backend is unreachable the loader
+runs against the database and the caller never sees the error.
+
+The backend is configured in settings.CACHES (Redis in production, a local
+in-memory cache under the test runner or with CACHE_BACKEND=locmem).
+"""
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Generation counters outlive the entries they version.
+GENERATION_TIMEOUT = 60 * 60 * 24 * 30
+
+
+def _generation_key(namespace):
+    return f'gen:{namespace}'
+
+
+def get_generation(namespace):
+    """Current generation number of `namespace` (1 when never bumped)."""
+    try:
+        generation = cache.get(_generation_key(namespace))
+        if generation is None:
+            cache.add(_generation_key(namespace), 1, GENERATION_TIMEOUT)
+            generation = cache.get(_generation_key(namespace)) or 1
+        return generation
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Cache unavailable reading generation of %s: %s", namespace, exc)
+        return 0
+
+
+def get_generations(namespaces):
+    """
+    Generation numbers of several namespaces in one cache round trip.
+    Raises if the cache is unreachable; callers decide how to degrade.
+    """
+    keys = {_generation_key(ns): ns for ns in namespaces}
+    found = cache.get_many(list(keys))
+    for key in set(keys) - set(found):
+        cache.add(key, 1, GENERATION_TIMEOUT)
+    return {ns: found.get(key, 1) for key, ns in keys.items()}
+
+
+def bump(namespace):
+    """Invalidate every key in `namespace` in O(1)."""
+    key = _generation_key(namespace)
+    try:
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Missing counter: start past the implicit generation 1.
+            if cache.add(key, 2, GENERATION_TIMEOUT):
+                return 2
+            return cache.incr(key)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Cache unavailable bumping %s: %s", namespace, exc)
+        return None
+
+
+def make_key(namespace, *parts, generation=None):
+    """Versioned cache key inside `namespace`."""
+    if generation is None:
+        generation = get_generation(namespace)
+    suffix = ':'.join(str(part) for part in parts)
+    return f'{namespace}:g{generation}:{suffix}' if suffix else f'{namespace}:g{generation}'
+
+
+def get_or_set(namespace, *parts, loader, timeout=300):
+    """
+    Return the cached value for (namespace, parts), computing it with
+    `loader()` on a miss. `None` results are not cached.
+    """
+    key = make_key(namespace, *parts)
+    try:
+        value = cache.get(key)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Cache unavailable reading %s: %s", key, exc)
+        return loader()
+    if value is not None:
+        return value
+    value = loader()
+    if value is not None:
+        try:
+            cache.set(key, value, timeout)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Cache unavailable writing %s: %s", key, exc)
+    return value
+
+
+def invalidate_on_change(namespace, *models):
+    """
+    Connect post_save/post_delete of `models` to `bump(namespace)`.
+    Call from an AppConfig.ready().
+    """
+    from django.db.models.signals import post_delete, post_save
+
+    def _bump(sender, **kwargs):
+        bump(namespace)
+
+    for model in models:
+        uid = f'utils.cache:{namespace}:{model._meta.label}'
+        post_save.connect(_bump, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+        post_delete.connect(_bump, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
@@ -115,30 +115,29 @@ class DuplicateDetector:
             dict: Statistics about duplicates
         """
         from apps.documents.models import Document
-        from django.db.models import Count
+        from django.db.models import Count, Max
         
-        # Find files with same hash
-        duplicates = Document.objects.filter(
+        # Find files with same hash (size per group in the same query)
+        duplicates = list(Document.objects.filter(
             status='active'
         ).values('fileHash').annotate(
-            count=Count('id')
-        ).filter(count__gt=1)
+            count=Count('id'),
+            file_size=Max('fileSize'),
+        ).filter(count__gt=1).order_by())
         
         total_duplicates = sum(d['count'] - 1 for d in duplicates)
         
         # Calculate wasted space
-        wasted_space = 0
-        for dup in duplicates:
-            docs = Document.objects.filter(
-                fileHash=dup['fileHash'],
-                status='active'
-            )
-            if docs.exists():
-                file_size = docs.first().fileSize
-                wasted_space += file_size * (dup['count'] - 1)
+        wasted_space = sum(d['file_size'] * (d['count'] - 1) for d in duplicates)
+        
+        # Copies already sharing one blob (DOCUMENT_STORAGE_DEDUP) waste nothing.
+        from utils.structured_file_storage import structured_storage
+        deduplicated = structured_storage.get_storage_stats()['shared_size_bytes']
+        wasted_space = max(0, wasted_space - deduplicated)
         
         return {
             'unique_duplicates': len(duplicates),
+            'deduplicated_space_bytes': deduplicated,
             'total_duplicate_files': total_duplicates,
             'wasted_space_bytes': wasted_space,
             'wasted_space_mb': round(wasted_space / (1024 * 1024), 2),
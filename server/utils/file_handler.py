@@ -6,6 +6,14 @@ import os
 import uuid
 from pathlib import Path
 
+from django.conf import settings
+
+
+def _images_root():
+    """client/assets/images/, or the CLIENT_IMAGES_ROOT setting."""
+    default = Path(__file__).resolve().parent.parent.parent / 'client' / 'assets' / 'images'
+    return Path(getattr(settings, 'CLIENT_IMAGES_ROOT', default))
+
 
 def save_uploaded_file(uploaded_file, subdirectory):
     """
@@ -26,11 +34,8 @@ def save_uploaded_file(uploaded_file, subdirectory):
     if subdirectory not in valid_subdirs:
         raise ValueError(f"Invalid subdirectory. Must be one of: {valid_subdirs}")
     
-    # Get project root (server directory)
-    base_dir = Path(__file__).resolve().parent.parent
-    
     # Navigate to client/assets/images/
-    upload_dir = base_dir.parent / 'client' / 'assets' / 'images' / subdirectory
+    upload_dir = _images_root() / subdirectory
     
     # Create directory if it doesn't exist
     upload_dir.mkdir(parents=True, exist_ok=True)
@@ -64,8 +69,7 @@ def delete_file(relative_path):
     if not relative_path:
         return False
     
-    base_dir = Path(__file__).resolve().parent.parent
-    file_path = base_dir.parent / 'client' / 'assets' / 'images' / relative_path
+    file_path = _images_root() / relative_path
     
     if file_path.exists() and file_path.is_file():
         file_path.unlink()
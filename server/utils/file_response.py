@@ -0,0 +1,157 @@
+"""
+Serving files from disk with HTTP caching and byte-range support.
+
+`serve_file` wraps Django's FileResponse with what browsers and download
+managers expect for large, immutable-by-name files:
+
+- ``ETag`` + ``If-None-Match`` -> 304 Not Modified
+- ``Accept-Ranges: bytes`` and a single ``Range: bytes=a-b`` -> 206 Partial
+  Content (resumed downloads); unsatisfiable ranges -> 416
+
+Multi-range requests are answered with the full file, which RFC 9110
+allows.
+
+Who sends the bytes is set by FILE_DELIVERY_MODE:
+
+- ``python`` (default): the app worker streams the file itself;
+- ``x-accel``: the response carries ``X-Accel-Redirect:
+  <FILE_ACCEL_REDIRECT_PREFIX><path under FILE_STORAGE_ROOT>`` and nginx
+  serves the file from its internal location, ranges included;
+- ``x-sendfile``: ``X-Sendfile: <absolute path>`` (Apache mod_xsendfile,
+  lighttpd).
+
+Access checks and the 304 short-circuit stay in Django either way; only the
+byte transfer moves to the web server. A file outside FILE_STORAGE_ROOT
+cannot be mapped for x-accel and is streamed by Python.
+"""
+import os
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match or not etag:
+        return False
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return etag in tags or '*' in tags
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single-range ``Range`` header, None when the
+    header is absent or not a single byte range, and ValueError when it can
+    not be satisfied for a file of ``size`` bytes.
+    """
+    match = _RANGE_RE.match((header or '').strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('empty suffix range')
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError('range not satisfiable')
+    return start, end
+
+
+def _offload_header(path):
+    """(header, value) handing ``path`` to the web server, or None to stream it."""
+    mode = getattr(settings, 'FILE_DELIVERY_MODE', 'python')
+    if mode == 'x-sendfile':
+        return 'X-Sendfile', str(Path(path).resolve())
+    if mode == 'x-accel':
+        root = Path(getattr(settings, 'FILE_STORAGE_ROOT', settings.BASE_DIR / 'storage')).resolve()
+        try:
+            relative = Path(path).resolve().relative_to(root)
+        except ValueError:
+            return None
+        prefix = getattr(settings, 'FILE_ACCEL_REDIRECT_PREFIX', '/protected-files/').rstrip('/')
+        return 'X-Accel-Redirect', f'{prefix}/{quote(relative.as_posix())}'
+    return None
+
+
+def _content_disposition(filename, as_attachment):
+    disposition = 'attachment' if as_attachment else 'inline'
+    try:
+        filename.encode('ascii')
+        return f'{disposition}; filename="{filename}"'
+    except UnicodeEncodeError:
+        return f"{disposition}; filename*=utf-8''{quote(filename)}"
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, path, *, content_type, filename=None, etag=None,
+               cache_control='private, no-cache', as_attachment=True):
+    """
+    Serve ``path`` honouring If-None-Match and a single byte Range, or hand
+    it to the web server (see FILE_DELIVERY_MODE). ``filename`` is sent as
+    an attachment name, or inline with ``as_attachment=False``.
+    """
+    if _etag_matches(request.headers.get('If-None-Match'), etag):
+        response = HttpResponse(status=304)
+    elif (offload := _offload_header(path)) is not None:
+        # The web server answers Range / If-Range itself.
+        response = HttpResponse(content_type=content_type)
+        response[offload[0]] = offload[1]
+        if filename:
+            response['Content-Disposition'] = _content_disposition(filename, as_attachment)
+    else:
+        size = os.path.getsize(path)
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        # A stale If-Range validator means the client's partial copy is of
+        # another version: send the whole file.
+        if_range = request.headers.get('If-Range')
+        if byte_range is not None and if_range and if_range != etag:
+            byte_range = None
+
+        if byte_range is None:
+            response = FileResponse(
+                open(path, 'rb'), content_type=content_type,
+                as_attachment=filename is not None and as_attachment, filename=filename or '',
+            )
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _read_range(path, start, end - start + 1),
+                status=206, content_type=content_type,
+            )
+            response['Content-Length'] = str(end - start + 1)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            if filename:
+                response['Content-Disposition'] = _content_disposition(filename, as_attachment)
+
+    response['Accept-Ranges'] = 'bytes'
+    if etag:
+        response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
@@ -8,10 +8,10 @@ import hashlib
 import mimetypes
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Optional, Tuple, Union
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ImproperlyConfigured, ValidationError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,6 +22,10 @@ class FileStorageService:
     Enhanced file storage service with security, validation, and organization
     """
     
+    # File catalog of this root (apps.documents.catalog.RootCatalog), set by
+    # DocumentsConfig.ready(); without one, writes are not catalogued.
+    catalog = None
+    
     def __init__(self):
         self.storage_root = getattr(settings, 'FILE_STORAGE_ROOT', settings.BASE_DIR / 'storage')
         self.storage_url = getattr(settings, 'FILE_STORAGE_URL', '/files/')
@@ -91,6 +95,9 @@ class FileStorageService:
         file_hash = self._save_file_with_hash(uploaded_file, file_info['storage_path'])
         file_info['file_hash'] = file_hash
         
+        if self.catalog is not None:
+            self.catalog.record(file_info['file_path'], file_info['storage_path'], file_hash)
+        
         logger.info(f"File saved: {file_info['file_path']} ({file_info['file_size']} bytes)")
         
         return file_info
@@ -117,6 +124,8 @@ class FileStorageService:
         try:
             if full_path.exists() and full_path.is_file():
                 full_path.unlink()
+                if self.catalog is not None:
+                    self.catalog.forget([file_path])
                 logger.info(f"File deleted: {file_path}")
                 
                 # Clean up empty directories
@@ -223,6 +232,8 @@ class FileStorageService:
             
             # Move file
             old_full_path.rename(new_full_path)
+            if self.catalog is not None:
+                self.catalog.move(old_path, new_path)
             
             # Clean up old directory if empty
             self._cleanup_empty_directories(old_full_path.parent)
@@ -237,63 +248,55 @@ class FileStorageService:
         """
         Get storage statistics
         
+        Aggregated from the file catalog for everything stored under this
+        root: legacy uploads and the structured storage.
+        
         Returns:
             Dict with storage statistics
         """
-        total_size = 0
-        file_count = 0
-        
-        try:
-            for root, dirs, files in os.walk(self.storage_root):
-                for file in files:
-                    file_path = Path(root) / file
-                    try:
-                        total_size += file_path.stat().st_size
-                        file_count += 1
-                    except OSError:
-                        continue
-        except OSError:
-            pass
-        
-        return {
-            'total_files': file_count,
-            'total_size_bytes': total_size,
-            'total_size_mb': round(total_size / (1024 * 1024), 2),
+        stats = self._require_catalog().stats()
+        stats.update({
             'storage_root': str(self.storage_root),
-            'storage_url': self.storage_url
-        }
+            'storage_url': self.storage_url,
+        })
+        return stats
     
-    def cleanup_orphaned_files(self, valid_paths: List[str]) -> Dict[str, int]:
+    def cleanup_orphaned_files(self, valid_paths) -> Dict[str, int]:
         """
-        Clean up files not referenced in database
+        Clean up legacy files not referenced in database
+        
+        Only catalogued legacy uploads are candidates; the structured
+        storage, thumbnails, blob store and result caches that share this
+        root are never touched.
         
         Args:
-            valid_paths: List of file paths that should be kept
+            valid_paths: File paths that should be kept (list or values_list queryset)
             
         Returns:
             Dict with cleanup statistics
         """
-        valid_paths_set = set(valid_paths)
+        catalog = self._require_catalog()
         deleted_count = 0
         deleted_size = 0
-        
-        try:
-            for root, dirs, files in os.walk(self.storage_root):
-                for file in files:
-                    file_path = Path(root) / file
-                    relative_path = str(file_path.relative_to(self.storage_root))
-                    
-                    if relative_path not in valid_paths_set:
-                        try:
-                            file_size = file_path.stat().st_size
-                            file_path.unlink()
-                            deleted_count += 1
-                            deleted_size += file_size
-                            logger.info(f"Deleted orphaned file: {relative_path}")
-                        except OSError as e:
-                            logger.error(f"Failed to delete orphaned file {relative_path}: {e}")
-        except OSError as e:
-            logger.error(f"Failed to cleanup orphaned files: {e}")
+        removed = []
+        
+        for relative_path in catalog.orphans(valid_paths).values_list('path', flat=True).iterator():
+            file_path = self._get_secure_path(relative_path)
+            try:
+                if file_path is None:
+                    raise FileNotFoundError(relative_path)
+                file_size = file_path.stat().st_size
+                file_path.unlink()
+                deleted_count += 1
+                deleted_size += file_size
+                logger.info(f"Deleted orphaned file: {relative_path}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Failed to delete orphaned file {relative_path}: {e}")
+                continue
+            removed.append(relative_path)
+        catalog.forget(removed)
         
         return {
             'deleted_count': deleted_count,
@@ -301,6 +304,11 @@ class FileStorageService:
             'deleted_size_mb': round(deleted_size / (1024 * 1024), 2)
         }
     
+    def _require_catalog(self):
+        if self.catalog is None:
+            raise ImproperlyConfigured("No file catalog registered (is apps.documents installed?)")
+        return self.catalog
+    
     def _validate_file(self, uploaded_file: UploadedFile, category: str) -> None:
         """
         Internal file validation
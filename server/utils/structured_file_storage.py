@@ -7,12 +7,15 @@ import uuid
 import hashlib
 import mimetypes
 import re
+import shutil
+import tempfile
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Union
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ImproperlyConfigured, ValidationError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,8 +33,24 @@ class StructuredFileStorage:
                         ├── photo.jpg
                         ├── birth_certificate.pdf
                         └── ...
+
+    With DOCUMENT_STORAGE_DEDUP enabled the bytes are stored once, under
+    their SHA-256, in a blob store next to the structured root:
+
+    blobs/
+    └── {hash[:2]}/
+        └── {hash}
+
+    and every structured path is a hard link to its blob. The link count is
+    the reference count: a blob whose only remaining link is itself is
+    garbage (see collect_blob_garbage). Readers are unaffected — structured
+    paths are still ordinary files.
     """
     
+    # File catalog of this root (apps.documents.catalog.RootCatalog), set by
+    # DocumentsConfig.ready(); without one, writes are not catalogued.
+    catalog = None
+    
     # Document type configurations
     DOCUMENT_TYPES = {
         'student': 'Student_Documents',
@@ -60,6 +79,9 @@ class StructuredFileStorage:
         'other': {'extensions': ['pdf', 'jpg', 'jpeg', 'png', 'doc', 'docx'], 'filename': None},
     }
     
+    # Leftover .part files younger than this may belong to an upload in flight
+    BLOB_PART_GRACE_SECONDS = 3600
+
     # Maximum file sizes (in bytes)
     MAX_FILE_SIZES = {
         'photo': 5 * 1024 * 1024,  # 5MB
@@ -76,6 +98,19 @@ class StructuredFileStorage:
         
         # Ensure storage root exists
         self.storage_root.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def dedup_enabled(self) -> bool:
+        return getattr(settings, 'DOCUMENT_STORAGE_DEDUP', False)
+
+    @property
+    def blob_root(self) -> Path:
+        # A sibling of the structured root: same filesystem (hard links), and
+        # outside the tree the file catalog covers.
+        return Path(self.storage_root).parent / 'blobs'
+
+    def blob_path(self, file_hash: str) -> Path:
+        return self.blob_root / file_hash[:2] / file_hash
     
     def save_student_document(
         self,
@@ -362,8 +397,12 @@ class StructuredFileStorage:
         
         return documents
     
-    def delete_file(self, file_path: str) -> bool:
-        """Delete file from storage"""
+    def delete_file(self, file_path: str, file_hash: Optional[str] = None) -> bool:
+        """
+        Delete file from storage. ``file_hash`` (Document.fileHash) names the
+        blob the file may share; without it the catalog's recorded hash is
+        used. The file is never re-read to find its blob.
+        """
         if not file_path:
             return False
         
@@ -374,7 +413,11 @@ class StructuredFileStorage:
         
         try:
             if full_path.exists() and full_path.is_file():
+                blob = self._shared_blob(full_path, file_hash or self._catalog_hash(file_path))
                 full_path.unlink()
+                if blob is not None:
+                    self._release_blob(blob)
+                self._catalog_forget([file_path])
                 logger.info(f"File deleted: {file_path}")
                 
                 # Clean up empty directories
@@ -445,73 +488,111 @@ class StructuredFileStorage:
         logger.info(f"System document saved: {file_info['file_path']} ({file_info['file_size']} bytes)")
         return file_info
 
-    def cleanup_orphaned_files(self, valid_paths: List[str]) -> Dict[str, int]:
-        """Delete files under the structured root that are not in valid_paths."""
-        valid = {str(p).replace('\\', '/') for p in valid_paths if p}
+    def cleanup_orphaned_files(self, valid_paths) -> Dict[str, int]:
+        """
+        Delete catalogued files whose path is not in valid_paths — a list of
+        paths or a values_list queryset, which is matched in the database
+        instead of in memory.
+        """
+        catalog = self._require_catalog()
         deleted_count = 0
         deleted_size = 0
-        try:
-            for root, _dirs, files in os.walk(self.storage_root):
-                for name in files:
-                    full = Path(root) / name
-                    rel = str(full.relative_to(self.storage_root)).replace('\\', '/')
-                    if rel not in valid:
-                        try:
-                            size = full.stat().st_size
-                            full.unlink()
-                            deleted_count += 1
-                            deleted_size += size
-                        except OSError as exc:
-                            logger.error(f"Failed to delete orphaned file {rel}: {exc}")
-        except OSError as exc:
-            logger.error(f"Orphan cleanup failed: {exc}")
+        removed = []
+        orphaned = catalog.orphans(valid_paths)
+        for rel in orphaned.values_list('path', flat=True).iterator():
+            full = self._get_secure_path(rel)
+            try:
+                if full is None:
+                    raise FileNotFoundError(rel)
+                stat = full.stat()
+                full.unlink()
+                deleted_count += 1
+                # A hard link into the blob store frees nothing by itself;
+                # its blob is collected below once no other path shares it.
+                if stat.st_nlink == 1:
+                    deleted_size += stat.st_size
+            except FileNotFoundError:
+                pass  # already gone: just drop the stale row
+            except OSError as exc:
+                logger.error(f"Failed to delete orphaned file {rel}: {exc}")
+                continue
+            removed.append(rel)
+        catalog.forget(removed)
+        blobs = self.collect_blob_garbage()
+        deleted_size += blobs['deleted_size_bytes']
         return {
             'deleted_count': deleted_count,
             'deleted_size_bytes': deleted_size,
             'deleted_size_mb': round(deleted_size / (1024 * 1024), 2),
+            'blobs_deleted': blobs['deleted_count'],
         }
+
+    def collect_blob_garbage(self) -> Dict[str, int]:
+        """
+        Delete blobs no structured path links to any more (link count 1),
+        plus stale .part files from interrupted uploads.
+        """
+        deleted_count = 0
+        deleted_size = 0
+        stale_before = time.time() - self.BLOB_PART_GRACE_SECONDS
+        for root, _dirs, files in os.walk(self.blob_root):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                    if name.endswith('.part'):
+                        if stat.st_mtime > stale_before:
+                            continue
+                    elif stat.st_nlink > 1:
+                        continue
+                    os.unlink(path)
+                except OSError as exc:
+                    logger.error(f"Failed to collect blob {path}: {exc}")
+                    continue
+                deleted_count += 1
+                deleted_size += stat.st_size
+        return {'deleted_count': deleted_count, 'deleted_size_bytes': deleted_size}
+
+    def get_blob_stats(self) -> Dict[str, int]:
+        """Blob store usage: bytes on disk vs bytes the structured paths refer to."""
+        stats = {'blobs': 0, 'references': 0, 'stored_bytes': 0, 'referenced_bytes': 0}
+        for root, _dirs, files in os.walk(self.blob_root):
+            for name in files:
+                if name.endswith('.part'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                references = stat.st_nlink - 1
+                stats['blobs'] += 1
+                stats['references'] += references
+                stats['stored_bytes'] += stat.st_size
+                stats['referenced_bytes'] += stat.st_size * references
+        stats['saved_bytes'] = max(0, stats['referenced_bytes'] - stats['stored_bytes'])
+        return stats
+
+    def adopt_into_blob_store(self, file_path: str) -> Optional[str]:
+        """
+        Move an existing structured file into the blob store (hashing it once)
+        and replace it with a link, so identical copies collapse into one.
+        Returns the file hash, or None when the file is missing.
+        """
+        full_path = self._get_secure_path(file_path)
+        if not full_path or not full_path.is_file():
+            return None
+        with open(full_path, 'rb') as source:
+            file_hash = self._save_to_blob_store(iter(lambda: source.read(1024 * 1024), b''), full_path)
+        self._catalog_record(full_path, file_hash)
+        return file_hash
     
     def get_storage_stats(self) -> Dict[str, Union[int, str, Dict]]:
-        """Get storage statistics"""
-        stats = {
-            'total_files': 0,
-            'total_size_bytes': 0,
-            'by_type': {},
-            'storage_root': str(self.storage_root),
-        }
-        
-        try:
-            for doc_type, folder_name in self.DOCUMENT_TYPES.items():
-                type_path = self.storage_root / folder_name
-                if not type_path.exists():
-                    continue
-                
-                type_files = 0
-                type_size = 0
-                
-                for file_path in type_path.rglob('*'):
-                    if file_path.is_file():
-                        try:
-                            type_size += file_path.stat().st_size
-                            type_files += 1
-                        except OSError:
-                            continue
-                
-                stats['by_type'][doc_type] = {
-                    'files': type_files,
-                    'size_bytes': type_size,
-                    'size_mb': round(type_size / (1024 * 1024), 2),
-                }
-                
-                stats['total_files'] += type_files
-                stats['total_size_bytes'] += type_size
-            
-            stats['total_size_mb'] = round(stats['total_size_bytes'] / (1024 * 1024), 2)
-            stats['total_size_gb'] = round(stats['total_size_bytes'] / (1024 * 1024 * 1024), 2)
-        
-        except OSError as e:
-            logger.error(f"Failed to get storage stats: {e}")
-        
+        """
+        Get storage statistics (aggregated from the file catalog — no walk
+        of the storage tree)
+        """
+        stats = self._require_catalog().stats()
+        stats['storage_root'] = str(self.storage_root)
         return stats
     
     def _validate_file(self, uploaded_file: UploadedFile, document_category: str) -> None:
@@ -591,15 +672,117 @@ class StructuredFileStorage:
         }
     
     def _save_file_with_hash(self, uploaded_file: UploadedFile, storage_path: Path) -> str:
-        """Save file and calculate SHA256 hash"""
+        """Save file and calculate SHA256 hash (in the same pass as the write)"""
+        if self.dedup_enabled:
+            file_hash = self._save_to_blob_store(uploaded_file.chunks(), storage_path)
+            self._catalog_record(storage_path, file_hash)
+            return file_hash
+
         hash_sha256 = hashlib.sha256()
         
-        with open(storage_path, 'wb') as destination:
-            for chunk in uploaded_file.chunks():
-                hash_sha256.update(chunk)
-                destination.write(chunk)
-        
-        return hash_sha256.hexdigest()
+        # Written beside the target and renamed over it: re-uploading a
+        # category file (photo.jpg, ...) must replace the directory entry,
+        # never truncate an inode another path may share.
+        handle, tmp_name = tempfile.mkstemp(dir=storage_path.parent, suffix='.part')
+        try:
+            with os.fdopen(handle, 'wb') as destination:
+                for chunk in uploaded_file.chunks():
+                    hash_sha256.update(chunk)
+                    destination.write(chunk)
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, storage_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        
+        file_hash = hash_sha256.hexdigest()
+        self._catalog_record(storage_path, file_hash)
+        return file_hash
+
+    def _require_catalog(self):
+        if self.catalog is None:
+            raise ImproperlyConfigured("No file catalog registered (is apps.documents installed?)")
+        return self.catalog
+
+    def _catalog_record(self, full_path: Path, file_hash: str) -> None:
+        """Keep the file catalog in step with a write"""
+        if self.catalog is None:
+            return
+        rel = Path(full_path).resolve().relative_to(Path(self.storage_root).resolve()).as_posix()
+        self.catalog.record(rel, full_path, file_hash)
+
+    def _catalog_forget(self, file_paths: List[str]) -> None:
+        if self.catalog is not None:
+            self.catalog.forget(file_paths)
+
+    def _catalog_hash(self, file_path: str) -> str:
+        """SHA-256 the catalog recorded for ``file_path`` ('' when unknown)."""
+        return self.catalog.recorded_hash(file_path) if self.catalog is not None else ''
+
+    def _save_to_blob_store(self, chunks, storage_path: Path) -> str:
+        """
+        Stream ``chunks`` into the blob store, hashing while writing, and
+        make ``storage_path`` a hard link to the blob for that hash. Bytes
+        already stored under the hash are reused and the new copy dropped.
+        """
+        self.blob_root.mkdir(parents=True, exist_ok=True)
+        hash_sha256 = hashlib.sha256()
+        handle, tmp_name = tempfile.mkstemp(dir=self.blob_root, suffix='.part')
+        link_name = storage_path.parent / f'.{storage_path.name}.{uuid.uuid4().hex[:8]}.part'
+        try:
+            with os.fdopen(handle, 'wb') as destination:
+                for chunk in chunks:
+                    hash_sha256.update(chunk)
+                    destination.write(chunk)
+            os.chmod(tmp_name, 0o644)
+            file_hash = hash_sha256.hexdigest()
+
+            blob = self.blob_path(file_hash)
+            blob.parent.mkdir(exist_ok=True)
+            try:
+                os.link(tmp_name, blob)
+            except FileExistsError:
+                pass
+            try:
+                os.link(blob, link_name)
+            except FileNotFoundError:
+                # Collected between the two links: keep this upload's copy.
+                os.link(tmp_name, link_name)
+            except OSError as exc:
+                # Different filesystem, link limit, no hard links at all:
+                # store a plain copy rather than fail the upload.
+                logger.warning(f"Blob store link failed ({exc}); storing a copy of {storage_path.name}")
+                shutil.copyfile(tmp_name, link_name)
+                os.chmod(link_name, 0o644)
+            os.replace(link_name, storage_path)
+        finally:
+            # Also covers an identical re-upload to the same path: rename()
+            # between two links of one inode is a no-op and leaves link_name.
+            link_name.unlink(missing_ok=True)
+            Path(tmp_name).unlink(missing_ok=True)
+        return file_hash
+
+    def _shared_blob(self, full_path: Path, file_hash: Optional[str]) -> Optional[Path]:
+        """The blob ``full_path`` is a link to, or None for a plain file.
+        An unknown hash leaves the blob to collect_blob_garbage."""
+        if not file_hash:
+            return None
+        try:
+            if full_path.stat().st_nlink < 2:
+                return None
+            blob = self.blob_path(file_hash)
+            return blob if blob.exists() and os.path.samefile(blob, full_path) else None
+        except OSError:
+            return None
+
+    def _release_blob(self, blob: Path) -> None:
+        """Delete a blob once no structured path links to it."""
+        try:
+            if blob.stat().st_nlink == 1:
+                blob.unlink()
+                logger.info(f"Blob released: {blob.name}")
+        except OSError:
+            pass
     
     def _get_secure_path(self, file_path: str) -> Optional[Path]:
         """Get secure absolute path, preventing path traversal"""
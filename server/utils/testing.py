@@ -0,0 +1,41 @@
+"""
+Shared test helpers.
+"""
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import override_settings
+
+
+class TempStorageMixin:
+    """
+    Give each test a fresh, empty storage tree: FILE_STORAGE_ROOT is a temp
+    directory (``self.storage_root``), STRUCTURED_STORAGE_ROOT is its
+    ``Documents`` folder, and the shared storage service instances point at
+    them too. ``storage_settings`` adds more setting overrides.
+    """
+
+    storage_settings = {}
+
+    def setUp(self):
+        super().setUp()
+        from utils.file_storage import file_storage
+        from utils.structured_file_storage import structured_storage
+
+        self.storage_root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.storage_root, ignore_errors=True)
+        structured_root = self.storage_root / 'Documents'
+        structured_root.mkdir()
+
+        override = override_settings(
+            FILE_STORAGE_ROOT=self.storage_root, STRUCTURED_STORAGE_ROOT=structured_root,
+            **self.storage_settings,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        for service, root in ((file_storage, self.storage_root), (structured_storage, structured_root)):
+            patcher = mock.patch.object(service, 'storage_root', root)
+            patcher.start()
+            self.addCleanup(patcher.stop)